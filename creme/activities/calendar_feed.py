@@ -0,0 +1,226 @@
+# -*- coding: utf-8 -*-
+
+################################################################################
+#    Creme is a free/open-source Customer Relationship Management software
+#    Copyright (C) 2021  Hybird
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU Affero General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#
+#    GNU Affero General Public License for more details.
+#    You should have received a copy of the GNU Affero General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+################################################################################
+
+
+"""Retrieving of the activities displayed by the calendar view.
+
+A user can display many calendars (his ones & the public ones) & reloads
+often the displayed period ; so the activities are retrieved as dictionaries
+(no instance of model is built), with one row per couple (activity, calendar),
+& they can be cached (see the setting "ACTIVITIES_CALENDAR_CACHE_TIMEOUT").
+The cached data related to a calendar are invalidated when its activities or
+the calendar itself are modified.
+"""
+
+import logging
+from hashlib import sha1
+from typing import Iterable, List, Optional
+from uuid import uuid4
+
+from django.conf import settings
+from django.core.cache import DEFAULT_CACHE_ALIAS, caches
+from django.db.models import F, Q
+
+from creme.creme_core.models import EntityCredentials
+
+from . import get_activity_model
+
+logger = logging.getLogger(__name__)
+
+
+class CalendarFeedCache:
+    """Cache for the activities of the calendar view.
+    Each calendar has a "generation" which is used to build the keys ;
+    invalidating the data of a calendar just means changing its generation
+    (the old data will expire).
+    """
+    key_prefix = 'activities-calendar_feed'
+
+    def __init__(self, cache_alias: str = DEFAULT_CACHE_ALIAS):
+        self._cache_alias = cache_alias
+
+    @property
+    def cache(self):
+        return caches[self._cache_alias]
+
+    @property
+    def timeout(self) -> int:
+        return settings.ACTIVITIES_CALENDAR_CACHE_TIMEOUT
+
+    @property
+    def enabled(self) -> bool:
+        return self.timeout > 0
+
+    def _generation_key(self, calendar_id: int) -> str:
+        return f'{self.key_prefix}-generation-{calendar_id}'
+
+    def _get_generations(self, calendar_ids: List[int]) -> List[str]:
+        cache = self.cache
+        keys = [self._generation_key(cal_id) for cal_id in calendar_ids]
+        generations = cache.get_many(keys)
+
+        for key in keys:
+            if key not in generations:
+                # NB: add() to avoid overriding the generation set by another process.
+                cache.add(key, uuid4().hex, None)
+                generations[key] = cache.get(key)
+
+        return [generations[key] for key in keys]
+
+    def invalidate(self, calendar_ids: Iterable[int]) -> None:
+        "Invalidate the data related to some calendars."
+        if self.enabled:
+            self.cache.set_many(
+                {self._generation_key(cal_id): uuid4().hex for cal_id in calendar_ids},
+                None,
+            )
+
+    def build_key(self, *, user, calendar_ids: List[int], start, end) -> Optional[str]:
+        "@return: A string, or None if the cache is disabled."
+        if not self.enabled:
+            return None
+
+        calendar_ids = sorted(calendar_ids)
+        raw_key = '{user}-{role}-{calendars}-{generations}-{start}-{end}'.format(
+            user=user.id,
+            role='superuser' if user.is_superuser else user.role_id,
+            calendars=','.join(map(str, calendar_ids)),
+            generations=','.join(self._get_generations(calendar_ids)),
+            start=start.isoformat(),
+            end=end.isoformat(),
+        )
+
+        return f'{self.key_prefix}-{sha1(raw_key.encode()).hexdigest()}'
+
+    def get(self, key: str) -> Optional[list]:
+        return self.cache.get(key)
+
+    def set(self, key: str, rows: list) -> None:
+        self.cache.set(key, rows, self.timeout)
+
+
+calendar_feed_cache = CalendarFeedCache()
+
+
+class CalendarFeed:
+    """Retrieve the activities of some calendars for a user, as dictionaries.
+
+    Each dictionary contains the values of the fields in 'fields', the ID of
+    the calendar (key "calendar") & a boolean "editable". An activity which
+    belongs to several calendars produces one dictionary per calendar.
+    """
+    fields = ['id', 'title', 'start', 'end', 'is_all_day', 'type__name']
+
+    def __init__(self, user, calendar_ids: Iterable[int], cache=calendar_feed_cache):
+        self.user = user
+        self.calendar_ids = [*calendar_ids]
+        self.cache = cache
+
+    @staticmethod
+    def date_q(start, end) -> Q:
+        """Q for the activities which overlap a period.
+        NB: the conditions are ANDed (no OR) to help the DBMS to use the
+            indices on the dates.
+        """
+        return Q(start__lte=end, end__gte=start) & ~Q(end=start, start__lt=start)
+
+    def _queryset(self):
+        return EntityCredentials.filter(
+            self.user,
+            get_activity_model().objects.filter(
+                is_deleted=False, calendars__in=self.calendar_ids,
+            ),
+        )
+
+    def _rows(self, queryset) -> List[dict]:
+        # NB: the join on the calendars of the filtering is re-used, so we get
+        #     a row per (activity, selected calendar) without DISTINCT & copy.
+        rows = [*queryset.values(*self.fields, calendar=F('calendars'))]
+
+        if rows:
+            editable_ids = {
+                *EntityCredentials.filter(
+                    self.user,
+                    get_activity_model().objects.filter(id__in={row['id'] for row in rows}),
+                    perm=EntityCredentials.CHANGE,
+                ).values_list('id', flat=True),
+            }
+
+            for row in rows:
+                row['editable'] = row['id'] in editable_ids
+
+        return rows
+
+    def rows(self, start, end) -> List[dict]:
+        "Get the dictionaries of the activities which overlap a period."
+        if not self.calendar_ids:
+            return []
+
+        cache = self.cache
+        key = cache.build_key(
+            user=self.user, calendar_ids=self.calendar_ids, start=start, end=end,
+        )
+
+        if key is not None:
+            rows = cache.get(key)
+
+            if rows is not None:
+                return rows
+
+        rows = self._rows(self._queryset().filter(self.date_q(start=start, end=end)))
+
+        if key is not None:
+            cache.set(key, rows)
+
+        return rows
+
+    def changes(self, start, end, since):
+        """Get the activities modified after a date.
+        @return: A tuple (rows, modified_ids) ; "rows" are the dictionaries of
+                 the modified activities which overlap the period (see rows()),
+                 & "modified_ids" is the set of IDs of the modified activities
+                 which the user can see (the ones which are not in "rows" --
+                 moved, removed from the calendar, sent to the trash... -- must
+                 be removed by the client).
+        """
+        if not self.calendar_ids:
+            return [], set()
+
+        # NB: the activities which have been removed from the calendars are
+        #     retrieved with the period (their dates have not changed) ; an
+        #     activity removed from the calendars & moved out of the period
+        #     between 2 calls is not retrieved (it remains displayed until the
+        #     next full fetch).
+        modified_ids = {
+            *EntityCredentials.filter(
+                self.user,
+                get_activity_model().objects.filter(
+                    Q(calendars__in=self.calendar_ids) | self.date_q(start=start, end=end),
+                    modified__gt=since,
+                ),
+            ).values_list('id', flat=True),
+        }
+        rows = self._rows(
+            self._queryset().filter(
+                self.date_q(start=start, end=end), id__in=modified_ids,
+            )
+        ) if modified_ids else []
+
+        return rows, modified_ids
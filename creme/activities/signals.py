@@ -23,11 +23,15 @@ import logging
 from django.conf import settings
 from django.db.models import signals
 from django.dispatch import receiver
+from django.utils.timezone import now
 
 from creme.creme_core.models import Relation
+from creme.creme_core.signals import post_replace_in_bulk
 from creme.persons import constants as persons_constants
 from creme.persons import get_organisation_model
 
+from . import get_activity_model
+from .calendar_feed import calendar_feed_cache
 from .constants import (
     REL_OBJ_PART_2_ACTIVITY,
     REL_SUB_ACTIVITY_SUBJECT,
@@ -38,6 +42,7 @@ from .utils import is_auto_orga_subject_enabled
 
 logger = logging.getLogger(__name__)
 Organisation = get_organisation_model()
+Activity = get_activity_model()
 
 
 @receiver(signals.post_delete, sender=Relation)
@@ -116,3 +121,66 @@ def _transfer_default_calendar(sender, instance, **kwargs):
     #     different from the original default Calendar (ie: the default Calendar
     #     of this User can change 'silently').
     Calendar.objects.filter(user=instance, is_default=True).update(is_default=False)
+
+
+# Calendar feed ----------------------------------------------------------------
+
+@receiver(signals.post_save, sender=Activity)
+@receiver(signals.pre_delete, sender=Activity)
+def _invalidate_calendar_feed_of_activity(sender, instance, **kwargs):
+    if calendar_feed_cache.enabled:
+        calendar_feed_cache.invalidate(
+            instance.calendars.values_list('id', flat=True)
+        )
+
+
+@receiver(post_replace_in_bulk, sender=Activity)
+def _invalidate_calendar_feed_of_activities(sender, instances, **kwargs):
+    if calendar_feed_cache.enabled:
+        calendar_feed_cache.invalidate({
+            *Activity.calendars.through.objects.filter(
+                activity__in=[instance.id for instance in instances],
+            ).values_list('calendar_id', flat=True),
+        })
+
+
+@receiver((signals.post_save, signals.post_delete), sender=Calendar)
+def _invalidate_calendar_feed_of_calendar(sender, instance, **kwargs):
+    calendar_feed_cache.invalidate([instance.id])
+
+
+@receiver(signals.m2m_changed, sender=Activity.calendars.through)
+def _invalidate_calendar_feed_on_calendars_change(sender, instance, action, reverse, pk_set,
+                                                  **kwargs):
+    if action == 'pre_clear':
+        # NB: the calendars/activities are not available anymore in "post_clear".
+        if reverse:
+            instance._calendar_feed_cleared_ids = [
+                *instance.activity_set.values_list('id', flat=True),
+            ]
+            calendar_feed_cache.invalidate([instance.id])
+        else:
+            calendar_feed_cache.invalidate(
+                instance.calendars.values_list('id', flat=True)
+            )
+
+        return
+
+    if action == 'post_clear':
+        activity_ids = (
+            getattr(instance, '_calendar_feed_cleared_ids', ()) if reverse else [instance.id]
+        )
+    elif action in ('post_add', 'post_remove'):
+        if reverse:
+            calendar_feed_cache.invalidate([instance.id])
+            activity_ids = pk_set
+        else:
+            calendar_feed_cache.invalidate(pk_set)
+            activity_ids = [instance.id]
+    else:
+        return
+
+    # The activities are marked as modified, in order to be retrieved by the
+    # incremental mode of the calendar view.
+    if activity_ids:
+        Activity.objects.filter(id__in=activity_ids).update(modified=now())
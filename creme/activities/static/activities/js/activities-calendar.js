@@ -148,10 +148,14 @@ creme.activities = creme.activities || {};
 creme.activities.CalendarController = creme.component.Component.sub({
     _init_: function(options) {
         options = $.extend({
-            debounceDelay: 200
+            debounceDelay: 200,
+            incrementalFetch: false
         }, options || {});
 
+        this._fetchCache = {};
+
         this.debounceDelay(options.debounceDelay);
+        this.incrementalFetch(options.incrementalFetch);
         this.owner(options.owner || '');
         this.eventSelectUrl(options.eventSelectUrl || '');
         this.eventUpdateUrl(options.eventUpdateUrl || '');
@@ -183,6 +187,12 @@ creme.activities.CalendarController = creme.component.Component.sub({
         return Object.property(this, '_debounceDelay', delay);
     },
 
+    /* If enabled, the events of each couple (calendars, period) are kept, &
+     * only the events modified since the last fetch are retrieved. */
+    incrementalFetch: function(state) {
+        return Object.property(this, '_incrementalFetch', state);
+    },
+
     calendar: function() {
         return this._element.find('.calendar');
     },
@@ -483,6 +493,10 @@ creme.activities.CalendarController = creme.component.Component.sub({
     },
 
     _onCalendarEventFetch: function(calendar, range, callback) {
+        if (this.incrementalFetch()) {
+            return this._onCalendarEventIncrementalFetch(calendar, range, callback);
+        }
+
         this._query({
                 url: this.eventFetchUrl(),
                 backend: {dataType: 'json'}
@@ -497,6 +511,40 @@ creme.activities.CalendarController = creme.component.Component.sub({
             .start();
     },
 
+    _onCalendarEventIncrementalFetch: function(calendar, range, callback) {
+        var fetchCache = this._fetchCache;
+        var calendarIds = this.visibleCalendarIds();
+        var start = range.start.unix();  // timestamp in SECOND
+        var end = range.end.unix();      // timestamp in SECOND
+        var key = [calendarIds.slice().sort().join(','), start, end].join('|');
+        var cached = fetchCache[key];
+
+        this._query({
+                url: this.eventFetchUrl(),
+                backend: {dataType: 'json'}
+             }, {
+                calendar_id: calendarIds,
+                start: start,
+                end: end,
+                since: cached ? cached.timestamp : ''
+             })
+            .onDone(function(event, data) {
+                var events = data.activities;
+
+                if (data.incremental && cached) {
+                    var modified = data.modified;
+
+                    events = cached.events.filter(function(e) {
+                        return modified.indexOf(e.id) === -1;
+                    }).concat(events);
+                }
+
+                fetchCache[key] = {timestamp: data.timestamp, events: events};
+                callback(events);
+             })
+            .start();
+    },
+
     _onCalendarEventCreate: function(calendar, event) {
         var data = {
             start: event.start.format(),
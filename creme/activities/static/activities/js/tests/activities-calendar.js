@@ -100,6 +100,27 @@ QUnit.module("creme.activities.CalendarController", new QUnitMixin(QUnitEventMix
                      var ids = data.calendar_id || [];
                      return ids.indexOf(item.calendar) !== -1;
                  }));
+             },
+            'mock/calendar/events/incremental': function(url, data, options) {
+                 if (data.since) {
+                     // Event #2 has been moved, Event #10-1 has been deleted
+                     return backend.responseJSON(200, {
+                         activities: [$.extend(_defaultCalendarData()[1], {
+                             start: todayAt({hours: 11}).toISOString(),
+                             end: todayAt({hours: 12}).toISOString()
+                         })],
+                         modified: ['2', '3'],
+                         incremental: true,
+                         timestamp: 2000
+                     });
+                 }
+
+                 return backend.responseJSON(200, {
+                     activities: _defaultCalendarData(),
+                     modified: [],
+                     incremental: false,
+                     timestamp: 1000
+                 });
              }
         });
 
@@ -537,6 +558,49 @@ QUnit.test('creme.activities.CalendarController.bind (fetch)', function(assert)
     ], this.getCalendarEvents(element));
 });
 
+QUnit.test('creme.activities.CalendarController.bind (fetch, incremental)', function(assert) {
+    var element = $(this.createDefaultCalendarHtml()).appendTo(this.qunitFixture());
+    var controller = new creme.activities.CalendarController({
+                         eventFetchUrl: 'mock/calendar/events/incremental',
+                         incrementalFetch: true
+                     }).bind(element);
+    var view = controller.fullCalendar().view;
+
+    equal(true, controller.incrementalFetch());
+    deepEqual([[
+        'mock/calendar/events/incremental', 'GET', {
+            calendar_id: ['1', '2', '10', '11', '20'],
+            start: view.start.unix(),
+            end: view.end.unix(),
+            since: ''
+        }
+    ]], this.mockBackendUrlCalls());
+    deepEqual(['1', '2', '3', '4', '5', '6'], this.getCalendarEvents(element).map(function(e) { return e.id; }));
+
+    this.resetMockBackendCalls();
+    controller.fullCalendar('refetchEvents');
+
+    deepEqual([[
+        'mock/calendar/events/incremental', 'GET', {
+            calendar_id: ['1', '2', '10', '11', '20'],
+            start: view.start.unix(),
+            end: view.end.unix(),
+            since: 1000
+        }
+    ]], this.mockBackendUrlCalls());
+
+    var events = this.getCalendarEvents(element);
+    deepEqual(['1', '2', '4', '5', '6'], events.map(function(e) { return e.id; }));
+    deepEqual({
+        allDay: false,
+        start: todayAt({hours: 11}).toString(),
+        end: todayAt({hours: 12}).toString(),
+        title: "Event #2",
+        calendar: '1',
+        id: '2'
+    }, events[1]);
+});
+
 QUnit.test('creme.activities.CalendarController.rendering (month view)', function(assert) {
     var element = $(this.createDefaultCalendarHtml()).appendTo(this.qunitFixture());
     var controller = new creme.activities.CalendarController({
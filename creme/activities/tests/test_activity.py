@@ -1,6 +1,6 @@
 # -*- coding: utf-8 -*-
 
-from datetime import timedelta
+from datetime import time, timedelta
 from functools import partial
 
 from django.apps import apps
@@ -50,7 +50,7 @@ from ..forms.activity import (
     UserMessagesSubCell,
 )
 from ..models import ActivitySubType, ActivityType, Calendar, Status
-from ..utils import check_activity_collisions
+from ..utils import CollisionsChecker, check_activity_collisions
 from .base import (
     Activity,
     Contact,
@@ -1995,6 +1995,130 @@ class ActivityTestCase(_ActivitiesTestCase):
             busy=False, participants=[c1, c2],
         )
 
+    @skipIfCustomContact
+    def test_collisions_checker(self):
+        "Several periods & participants at once."
+        user = self.login()
+
+        create_dt = self.create_datetime
+        create_activity = partial(
+            Activity.objects.create,
+            user=user, type_id=constants.ACTIVITYTYPE_MEETING,
+        )
+        act1 = create_activity(
+            title='meet01',
+            start=create_dt(year=2010, month=10, day=1, hour=12, minute=0),
+            end=create_dt(year=2010, month=10, day=1, hour=13, minute=0),
+        )
+        act2 = create_activity(
+            title='meet02',
+            start=create_dt(year=2010, month=10, day=1, hour=8, minute=0),
+            end=create_dt(year=2010, month=10, day=1, hour=18, minute=0),
+        )
+        act3 = create_activity(
+            title='meet03',
+            start=create_dt(year=2010, month=10, day=2, hour=9, minute=0),
+            end=create_dt(year=2010, month=10, day=2, hour=10, minute=0),
+            busy=True,
+        )
+        act4 = create_activity(
+            title='meet04 (deleted)',
+            start=create_dt(year=2010, month=10, day=3, hour=9, minute=0),
+            end=create_dt(year=2010, month=10, day=3, hour=10, minute=0),
+            is_deleted=True,
+        )
+
+        create_contact = partial(Contact.objects.create, user=user)
+        c1 = create_contact(first_name='Spike', last_name='Spiegel')
+        c2 = create_contact(first_name='Jet',   last_name='Black')
+        c3 = create_contact(first_name='Faye',  last_name='Valentine')
+
+        create_rel = partial(
+            Relation.objects.create, type_id=constants.REL_SUB_PART_2_ACTIVITY, user=user,
+        )
+        create_rel(subject_entity=c1, object_entity=act1)
+        create_rel(subject_entity=c2, object_entity=act2)
+        create_rel(subject_entity=c1, object_entity=act3)
+        create_rel(subject_entity=c2, object_entity=act3)
+        create_rel(subject_entity=c1, object_entity=act4)
+
+        checker = CollisionsChecker([c1, c2, c3])
+        periods = [
+            # c1 => act1, c2 => act2
+            (
+                create_dt(year=2010, month=10, day=1, hour=12, minute=30),
+                create_dt(year=2010, month=10, day=1, hour=14, minute=0),
+            ),
+            # c2 => act2
+            (
+                create_dt(year=2010, month=10, day=1, hour=9, minute=0),
+                create_dt(year=2010, month=10, day=1, hour=10, minute=0),
+            ),
+            # c1 & c2 => act3
+            (
+                create_dt(year=2010, month=10, day=2, hour=9, minute=30),
+                create_dt(year=2010, month=10, day=2, hour=11, minute=0),
+            ),
+            # Deleted activity
+            (
+                create_dt(year=2010, month=10, day=3, hour=9, minute=0),
+                create_dt(year=2010, month=10, day=3, hour=10, minute=0),
+            ),
+            # No start
+            (None, None),
+        ]
+
+        with self.assertNumQueries(1):
+            collisions = checker.search(periods)
+
+        self.assertEqual(5, len(collisions))
+
+        def simplify(period_collisions):
+            return [(c.participant, c.activity_id) for c in period_collisions]
+
+        self.assertListEqual([(c1, act1.id), (c2, act2.id)], simplify(collisions[0]))
+        self.assertListEqual([(c2, act2.id)],                simplify(collisions[1]))
+        self.assertListEqual([(c1, act3.id), (c2, act3.id)], simplify(collisions[2]))
+        self.assertListEqual([], collisions[3])
+        self.assertListEqual([], collisions[4])
+
+        # Not busy => only collisions with busy activities
+        not_busy_collisions = checker.search(periods, busy=False)
+        self.assertListEqual([], not_busy_collisions[0])
+        self.assertListEqual([], not_busy_collisions[1])
+        self.assertListEqual([(c1, act3.id), (c2, act3.id)], simplify(not_busy_collisions[2]))
+
+        # Excluded activity
+        self.assertListEqual(
+            [(c2, act2.id)],
+            simplify(
+                CollisionsChecker([c1, c2], exclude_activity_ids=[act1.id]).search(periods[:1])[0]
+            ),
+        )
+
+        # Message
+        self.assertListEqual(
+            [
+                _(
+                    '{participant} already participates to the activity '
+                    '«{activity}» between {start} and {end}.'
+                ).format(
+                    participant=c1, activity=act1,
+                    start=time(hour=12, minute=30), end=time(hour=13, minute=0),
+                ),
+                _(
+                    '{participant} already participates to the activity '
+                    '«{activity}» between {start} and {end}.'
+                ).format(
+                    participant=c2, activity=act2,
+                    start=time(hour=12, minute=30), end=time(hour=14, minute=0),
+                ),
+            ],
+            checker.messages(*periods[0]),
+        )
+
+        self.assertListEqual([[]], CollisionsChecker([]).search(periods[:1]))
+
     def test_listviews(self):
         user = self.login()
         self.assertFalse(Activity.objects.all())
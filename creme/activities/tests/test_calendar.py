@@ -27,6 +27,7 @@ from creme.creme_core.models import (
 from creme.creme_core.tests.base import CremeTestCase
 
 from .. import constants, get_activity_model
+from ..calendar_feed import CalendarFeed, CalendarFeedCache
 from ..management.commands.activities_create_default_calendars import (
     Command as CalCommand,
 )
@@ -967,6 +968,188 @@ class CalendarTestCase(_ActivitiesTestCase):
         )
         self.assertEqual(act4.id, data[3]['id'])
 
+    @skipIfCustomActivity
+    def test_activities_data_since(self):
+        "Incremental mode."
+        user = self.login()
+        cal = Calendar.objects.get_default_calendar(user)
+
+        create_dt = self.create_datetime
+        start = create_dt(year=2013, month=3, day=1)
+        end   = create_dt(year=2013, month=3, day=31, hour=23, minute=59)
+
+        create = partial(
+            Activity.objects.create,
+            user=user, type_id=constants.ACTIVITYTYPE_TASK,
+        )
+        act1 = create(
+            title='Act#1',
+            start=start + timedelta(days=1), end=start + timedelta(days=2),
+        )
+        act2 = create(
+            title='Act#2',
+            start=start + timedelta(days=3), end=start + timedelta(days=4),
+        )
+        act3 = create(
+            title='Act#3',
+            start=start + timedelta(days=5), end=start + timedelta(days=6),
+        )
+
+        for act in (act1, act2, act3):
+            act.calendars.set([cal])
+
+        # Other calendar & out of the period
+        act4 = create(
+            title='Act#4',
+            start=end + timedelta(days=1), end=end + timedelta(days=2),
+        )
+        act4.calendars.set([Calendar.objects.create(user=user, name='Other')])
+
+        url = reverse('activities__calendars_activities')
+        data = {
+            'calendar_id': [cal.id],
+            'start': start.strftime('%s'),
+            'end': end.strftime('%s'),
+        }
+
+        # Not incremental ---
+        response1 = self.assertGET200(url, data={**data, 'since': ''})
+        content1 = response1.json()
+        self.assertIsInstance(content1, dict)
+        self.assertIs(content1.get('incremental'), False)
+        self.assertListEqual([], content1.get('modified'))
+        self.assertListEqual(
+            [act3.id, act2.id, act1.id],
+            [d['id'] for d in content1.get('activities')],
+        )
+
+        timestamp = content1.get('timestamp')
+        self.assertIsInstance(timestamp, float)
+
+        # Incremental ---
+        act1.title = 'Act#1 (edited)'
+        act1.save()
+
+        act2.calendars.clear()
+
+        act4.title = 'Act#4 (edited)'
+        act4.save()
+
+        response2 = self.assertGET200(url, data={**data, 'since': timestamp})
+        content2 = response2.json()
+        self.assertIs(content2.get('incremental'), True)
+        self.assertCountEqual([act1.id, act2.id], content2.get('modified'))
+
+        activities = content2.get('activities')
+        self.assertEqual(1, len(activities))
+        self.assertEqual(act1.id,           activities[0]['id'])
+        self.assertEqual('Act#1 (edited)', activities[0]['title'])
+        self.assertGreaterEqual(content2.get('timestamp'), timestamp)
+
+    def test_activities_data_date_q(self):
+        user = self.login()
+        cal = Calendar.objects.get_default_calendar(user)
+
+        create_dt = self.create_datetime
+        start = create_dt(year=2013, month=3, day=1)
+        end   = create_dt(year=2013, month=3, day=31)
+
+        create = partial(
+            Activity.objects.create,
+            user=user, type_id=constants.ACTIVITYTYPE_TASK,
+        )
+        acts = [
+            create(title='Inside', start=start + timedelta(days=1), end=start + timedelta(days=2)),
+            create(title='Over', start=start - timedelta(days=1), end=end + timedelta(days=1)),
+            create(title='Ends at start', start=start - timedelta(days=1), end=start),
+            create(title='Punctual at start', start=start, end=start),
+            create(title='Starts at end', start=end, end=end + timedelta(days=1)),
+            create(title='Before', start=start - timedelta(days=2), end=start - timedelta(days=1)),
+            create(title='After', start=end + timedelta(days=1), end=end + timedelta(days=2)),
+        ]
+
+        for act in acts:
+            act.calendars.set([cal])
+
+        self.assertCountEqual(
+            ['Inside', 'Over', 'Punctual at start', 'Starts at end'],
+            Activity.objects.filter(
+                CalendarFeed.date_q(start=start, end=end),
+            ).values_list('title', flat=True),
+        )
+
+    @override_settings(ACTIVITIES_CALENDAR_CACHE_TIMEOUT=60)
+    def test_calendar_feed_cache(self):
+        user = self.login()
+        cal1 = Calendar.objects.get_default_calendar(user)
+        cal2 = Calendar.objects.create(user=user, name='Other Cal #1', is_custom=True)
+
+        create_dt = self.create_datetime
+        start = create_dt(year=2013, month=3, day=1)
+        end   = create_dt(year=2013, month=3, day=31)
+
+        activity = Activity.objects.create(
+            user=user, type_id=constants.ACTIVITYTYPE_TASK, title='Act#1',
+            start=start + timedelta(days=1), end=start + timedelta(days=2),
+        )
+        activity.calendars.set([cal1])
+
+        feed_cache = CalendarFeedCache()
+        self.assertTrue(feed_cache.enabled)
+
+        key1 = feed_cache.build_key(user=user, calendar_ids=[cal1.id], start=start, end=end)
+        self.assertIsInstance(key1, str)
+        self.assertEqual(
+            key1,
+            feed_cache.build_key(user=user, calendar_ids=[cal1.id], start=start, end=end),
+        )
+        self.assertNotEqual(
+            key1,
+            feed_cache.build_key(
+                user=user, calendar_ids=[cal1.id, cal2.id], start=start, end=end,
+            ),
+        )
+
+        feed = CalendarFeed(user=user, calendar_ids=[cal1.id], cache=feed_cache)
+        rows = feed.rows(start=start, end=end)
+        self.assertListEqual(['Act#1'], [row['title'] for row in rows])
+
+        with self.assertNumQueries(0):
+            self.assertListEqual(rows, feed.rows(start=start, end=end))
+
+        # Invalidation
+        activity.title = 'Act#1 (edited)'
+        activity.save()
+
+        self.assertNotEqual(
+            key1,
+            feed_cache.build_key(user=user, calendar_ids=[cal1.id], start=start, end=end),
+        )
+        self.assertListEqual(
+            ['Act#1 (edited)'], [row['title'] for row in feed.rows(start=start, end=end)],
+        )
+
+        activity.calendars.add(cal2)
+        feed2 = CalendarFeed(user=user, calendar_ids=[cal1.id, cal2.id], cache=feed_cache)
+        self.assertCountEqual(
+            [cal1.id, cal2.id],
+            [row['calendar'] for row in feed2.rows(start=start, end=end)],
+        )
+
+    @override_settings(ACTIVITIES_CALENDAR_CACHE_TIMEOUT=0)
+    def test_calendar_feed_cache_disabled(self):
+        user = self.login()
+        cal = Calendar.objects.get_default_calendar(user)
+
+        create_dt = self.create_datetime
+        feed_cache = CalendarFeedCache()
+        self.assertFalse(feed_cache.enabled)
+        self.assertIsNone(feed_cache.build_key(
+            user=user, calendar_ids=[cal.id],
+            start=create_dt(year=2013, month=3, day=1),
+            end=create_dt(year=2013, month=3, day=31),
+        ))
+
     @skipIfCustomActivity
     @override_settings(ACTIVITIES_DEFAULT_CALENDAR_IS_PUBLIC=False)
     def test_activities_data_multiple_users_private_default(self):
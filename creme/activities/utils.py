@@ -2,7 +2,7 @@
 
 ################################################################################
 #    Creme is a free/open-source Customer Relationship Management software
-#    Copyright (C) 2009-2020  Hybird
+#    Copyright (C) 2009-2021  Hybird
 #
 #    This program is free software: you can redistribute it and/or modify
 #    it under the terms of the GNU Affero General Public License as published by
@@ -18,14 +18,20 @@
 #    along with this program.  If not, see <http://www.gnu.org/licenses/>.
 ################################################################################
 
-from django.db.models.query_utils import Q
+from bisect import bisect_left
+from collections import defaultdict
+from datetime import datetime
+from itertools import accumulate
+from typing import Iterable, List, NamedTuple, Tuple
+
+from django.db.models import F
 from django.utils.timezone import localtime
 from django.utils.translation import gettext as _
 
-from creme.creme_core.models import Relation, SettingValue
+from creme.creme_core.models import CremeEntity, SettingValue
 
 from . import get_activity_model
-from .constants import FLOATING_TIME, NARROW, REL_SUB_PART_2_ACTIVITY
+from .constants import FLOATING_TIME, NARROW, REL_OBJ_PART_2_ACTIVITY
 from .setting_keys import auto_subjects_key
 
 
@@ -41,6 +47,159 @@ def get_last_day_of_a_month(date):
     return last_day
 
 
+class Collision(NamedTuple):
+    participant: CremeEntity
+    activity_id: int
+    activity_title: str
+    start: datetime
+    end: datetime
+
+
+class CollisionsChecker:
+    """Search the collisions between some periods (candidate activities) & the
+    activities of some participants.
+
+    The activities of all the participants which overlap the periods are
+    retrieved with one query, & the overlapping is computed in memory ; so
+    many periods can be checked at once (recurrent activities, import...).
+
+    Hint: use check_activity_collisions() to check only one period.
+    """
+    def __init__(self, participants: Iterable[CremeEntity], exclude_activity_ids=()):
+        """Constructor.
+        @param participants: Instances of CremeEntity (generally Contacts).
+        @param exclude_activity_ids: IDs of the activities to ignore (eg: the
+               activity which is edited).
+        """
+        self.participants = [*participants]
+        self.exclude_activity_ids = [*exclude_activity_ids]
+
+    def _get_busy_intervals(self, start, end, only_busy):
+        "@return: Dictionary <participant_id: list of rows sorted by 'start'>."
+        intervals = defaultdict(list)
+        participant_ids = {p.id for p in self.participants}
+
+        if not participant_ids:
+            return intervals
+
+        filter_kwargs = {'busy': True} if only_busy else {}
+        # NB: the join on the Relations is re-used by the annotation, so we get
+        #     a row per couple (activity, participant).
+        rows = get_activity_model().objects.filter(
+            relations__type=REL_OBJ_PART_2_ACTIVITY,
+            relations__object_entity__in=participant_ids,
+            is_deleted=False,
+            floating_type__in=(NARROW, FLOATING_TIME),
+            end__gt=start, start__lt=end,
+            **filter_kwargs
+        ).exclude(
+            id__in=self.exclude_activity_ids,
+        ).order_by('start').values(
+            'id', 'title', 'start', 'end',
+            participant_id=F('relations__object_entity'),
+        )
+
+        for row in rows:
+            intervals[row['participant_id']].append(row)
+
+        return intervals
+
+    @staticmethod
+    def _search_interval(intervals, starts, max_ends, start, end):
+        """Search the activity which overlaps a period & starts the last
+        (like the old behaviour).
+        @param intervals: Rows sorted by 'start'.
+        @param starts: starts[i] is the 'start' of intervals[i].
+        @param max_ends: max_ends[i] is the maximum 'end' of intervals[:i+1].
+        """
+        # Index of the first interval which starts after the end of the period.
+        i = bisect_left(starts, end)
+
+        for j in range(i - 1, -1, -1):
+            if max_ends[j] <= start:
+                # No interval before can end after the start of the period.
+                break
+
+            row = intervals[j]
+            if row['end'] > start:
+                return row
+
+        return None
+
+    def search(self,
+               periods: Iterable[Tuple[datetime, datetime]],
+               busy=True,
+               ) -> List[List[Collision]]:
+        """Search the collisions.
+        @param periods: Couples (start, end) ; the periods without start are ignored.
+        @param busy: Boolean ; if <False>, the periods only collide with the
+               busy activities.
+        @return: A list of collisions for each period (same order) ; each
+                 participant appears at most once per list.
+        """
+        periods = [*periods]
+        dated_periods = [(start, end) for start, end in periods if start]
+
+        if not dated_periods:
+            return [[] for __ in periods]
+
+        indices = {
+            participant_id: (
+                intervals,
+                [row['start'] for row in intervals],
+                [*accumulate((row['end'] for row in intervals), max)],
+            ) for participant_id, intervals in self._get_busy_intervals(
+                start=min(start for start, __ in dated_periods),
+                end=max(end for __, end in dated_periods),
+                only_busy=not busy,
+            ).items()
+        }
+
+        result = []
+        for start, end in periods:
+            collisions = []
+
+            if start:
+                for participant in self.participants:
+                    index = indices.get(participant.id)
+                    if index is None:
+                        continue
+
+                    row = self._search_interval(*index, start=start, end=end)
+                    if row is not None:
+                        collisions.append(Collision(
+                            participant=participant,
+                            activity_id=row['id'],
+                            activity_title=row['title'],
+                            start=row['start'],
+                            end=row['end'],
+                        ))
+
+            result.append(collisions)
+
+        return result
+
+    @staticmethod
+    def collision_message(collision: Collision, start: datetime, end: datetime) -> str:
+        "Get a message for a collision with a period (start, end)."
+        return _(
+            '{participant} already participates to the activity '
+            '«{activity}» between {start} and {end}.'
+        ).format(
+            participant=collision.participant,
+            activity=collision.activity_title,
+            start=max(start.time(), localtime(collision.start).time()),
+            end=min(end.time(), localtime(collision.end).time()),
+        )
+
+    def messages(self, start, end, busy=True) -> List[str]:
+        "Get the messages for the collisions with a period."
+        return [
+            self.collision_message(collision, start=start, end=end)
+            for collision in self.search([(start, end)], busy=busy)[0]
+        ]
+
+
 def check_activity_collisions(
         activity_start,
         activity_end,
@@ -50,59 +209,10 @@ def check_activity_collisions(
     if not activity_start:
         return
 
-    collision_test = ~(Q(end__lte=activity_start) | Q(start__gte=activity_end))
-    collisions = []
-
-    for participant in participants:
-        # Find activities of participant
-        activity_req = Relation.objects.filter(
-            subject_entity=participant.id, type=REL_SUB_PART_2_ACTIVITY,
-        )
-
-        # Exclude current activity if asked
-        if exclude_activity_id is not None:
-            activity_req = activity_req.exclude(object_entity=exclude_activity_id)
-
-        # Get id of activities of participant
-        activity_ids = activity_req.values_list('object_entity__id', flat=True)
-
-        # Do collision request
-        # TODO: can be done with less queries ?
-        #       eg:  Activity.objects.filter(
-        #                relations__object_entity=participant.id,
-        #                relations__object_entity__type=REL_OBJ_PART_2_ACTIVITY,
-        #            ).filter(collision_test)
-        busy_args = {} if busy else {'busy': True}
-        # TODO: test is_deleted=True
-        colliding_activity = get_activity_model().objects.filter(
-            collision_test,
-            is_deleted=False,
-            pk__in=activity_ids,
-            floating_type__in=(NARROW, FLOATING_TIME),
-            **busy_args
-        ).first()
-
-        if colliding_activity is not None:
-            collision_start = max(
-                activity_start.time(), localtime(colliding_activity.start).time(),
-            )
-            collision_end = min(
-                activity_end.time(), localtime(colliding_activity.end).time(),
-            )
-
-            collisions.append(
-                _(
-                    '{participant} already participates to the activity '
-                    '«{activity}» between {start} and {end}.'
-                ).format(
-                    participant=participant,
-                    activity=colliding_activity,
-                    start=collision_start,
-                    end=collision_end,
-                )
-            )
-
-    return collisions
+    return CollisionsChecker(
+        participants,
+        exclude_activity_ids=() if exclude_activity_id is None else [exclude_activity_id],
+    ).messages(start=activity_start, end=activity_end, busy=busy)
 
 
 def get_ical_date(date_time):
@@ -20,14 +20,14 @@
 
 import logging
 from collections import defaultdict
-from copy import copy
 from datetime import datetime, timedelta
 from functools import partial
+from types import SimpleNamespace
 
 from django.conf import settings
 from django.contrib.contenttypes.models import ContentType
 from django.core.exceptions import PermissionDenied
-from django.db.models import Prefetch, Q
+from django.db.models import Q
 from django.db.transaction import atomic
 from django.http import HttpResponse
 from django.shortcuts import render
@@ -38,13 +38,14 @@ from django.utils.translation import gettext_lazy as _
 
 from creme.creme_core.core.exceptions import ConflictError
 from creme.creme_core.http import CremeJsonResponse
-from creme.creme_core.models import DeletionCommand, EntityCredentials, Job
+from creme.creme_core.models import DeletionCommand, Job
 from creme.creme_core.utils import bool_from_str_extended, get_from_POST_or_404
 from creme.creme_core.utils.dates import make_aware_dt
 from creme.creme_core.utils.unicode_collation import collator
 from creme.creme_core.views import generic
 
 from .. import constants, get_activity_model
+from ..calendar_feed import CalendarFeed
 from ..forms import calendar as calendar_forms
 from ..models import Calendar
 from ..utils import check_activity_collisions, get_last_day_of_a_month
@@ -199,12 +200,28 @@ class CalendarsMixin:
 
 
 class ActivitiesData(CalendarsMixin, generic.CheckedView):
+    """Get the activities of some calendars which overlap a period, as JSON.
+
+    If the GET argument "since" is given, the response is a dictionary with
+    the keys:
+      - "activities": list of activities ; only the ones which have been
+        modified after "since" (a timestamp in seconds), excepted if "since"
+        is empty (all the activities are returned).
+      - "modified": list of IDs of the activities modified after "since" ; the
+        ones which are not in "activities" must be removed by the client.
+      - "incremental": boolean ; <False> means "since" was empty/invalid.
+      - "timestamp": timestamp (in seconds) to use as "since" in the next call.
+    Otherwise the response is the list of activities.
+    """
     response_class = CremeJsonResponse
     start_arg = 'start'
     end_arg = 'end'
+    since_arg = 'since'
+    feed_class = CalendarFeed
 
-    # Example of possible format (NB: "activity" is passed in the context)
-    # label = '[{activity.status}] {activity.title}'
+    # Example of possible format (NB: "activity" is passed in the context, &
+    # its attributes are the fields retrieved by the feed -- see 'feed_class.fields')
+    # label = '{activity.title} ({activity.type__name})'
     label = '{activity.title}'
     calendar_ids_session_key = CalendarView.calendar_ids_session_key
 
@@ -217,35 +234,32 @@ class ActivitiesData(CalendarsMixin, generic.CheckedView):
     def get_activity_label(self, activity):
         return self.label.format(activity=activity)
 
-    # @staticmethod
-    # def _activity_2_dict(activity, user):
-    def _activity_2_dict(self, activity, user):
-        "Returns a 'jsonifiable' dictionary."
+    def _row_2_dict(self, row, colors):
+        "Returns a 'jsonifiable' dictionary from a row of the feed."
         tz = get_current_timezone()
-        start = make_naive(activity.start, tz)
-        end = make_naive(activity.end, tz)
+        start = make_naive(row['start'], tz)
+        end = make_naive(row['end'], tz)
 
-        if activity.is_all_day:
+        if row['is_all_day']:
             end = datetime(year=end.year, month=end.month, day=end.day) + timedelta(days=1)
 
-        # NB: _get_one_activity_per_calendar() adds this 'attribute'
-        calendar = activity.calendar
+        activity_id = row['id']
+        calendar_id = row['calendar']
 
         return {
-            'id':    activity.id,
-            # 'title': activity.title,
-            'title': self.get_activity_label(activity),
+            'id':    activity_id,
+            'title': self.get_activity_label(SimpleNamespace(**row)),
 
             'start':  start.isoformat(),
             'end':    end.isoformat(),
-            'allDay': activity.is_all_day,
+            'allDay': row['is_all_day'],
 
-            'url': reverse('activities__view_activity_popup', args=(activity.id,)),
+            'url': reverse('activities__view_activity_popup', args=(activity_id,)),
 
-            'color':    f'#{calendar.get_color}',
-            'editable': user.has_perm_to_change(activity),
-            'calendar': calendar.id,
-            'type':     activity.type.name,
+            'color':    f'#{colors[calendar_id]}',
+            'editable': row['editable'],
+            'calendar': calendar_id,
+            'type':     row['type__name'],
         }
 
     @staticmethod
@@ -258,52 +272,49 @@ class ActivitiesData(CalendarsMixin, generic.CheckedView):
             except Exception:
                 logger.exception('ActivitiesData._get_datetime(key=%s)', key)
 
-    @staticmethod
-    def _get_one_activity_per_calendar(activities):
-        for activity in activities:
-            # "concerned_calendars" is added by get_activities_data()
-            for calendar in activity.concerned_calendars:
-                copied = copy(activity)
-                copied.calendar = calendar
-                yield copied
-
     def get_activities_data(self, request):
         user = request.user
 
-        calendar_ids = [cal.id for cal in self.get_calendars(request)]
+        calendars = [*self.get_calendars(request)]
+        calendar_ids = [cal.id for cal in calendars]
         self.save_calendar_ids(request, calendar_ids)
 
         start = self.get_start(request)
         end   = self.get_end(request=request, start=start)
 
         # TODO: label when no calendar related to the participant of an unavailability
-        activities = EntityCredentials.filter(
-            user,
-            Activity.objects
-                    .filter(is_deleted=False)
-                    .filter(self.get_date_q(start=start, end=end))
-                    .filter(calendars__in=calendar_ids)
-                    .distinct()
-            # NB: we already filter by calendars ; maybe a future Django version
-            #     will allow us to annotate the calendar ID directly
-            #     (distinct() would have to be removed of course)
-                    .prefetch_related(Prefetch(
-                        'calendars',
-                        queryset=Calendar.objects.filter(id__in=calendar_ids),
-                        to_attr='concerned_calendars',
-                    ))
-        )
+        feed = self.feed_class(user=user, calendar_ids=calendar_ids)
+        colors = {cal.id: cal.get_color for cal in calendars}
 
-        activity_2_dict = partial(self._activity_2_dict, user=user)
+        def serialize(rows):
+            row_2_dict = partial(self._row_2_dict, colors=colors)
 
-        return [
-            activity_2_dict(activity=a)
-            for a in self._get_one_activity_per_calendar(activities)
-        ]
+            return [row_2_dict(row) for row in rows]
+
+        if self.since_arg not in request.GET:
+            return serialize(feed.rows(start=start, end=end))
+
+        # NB: the timestamp is computed before the queries, so the modifications
+        #     performed during the queries are returned by the next call.
+        timestamp = now().timestamp()
+        since = self._get_datetime(request=request, key=self.since_arg)
+
+        if since is None:
+            rows = feed.rows(start=start, end=end)
+            modified_ids = ()
+        else:
+            rows, modified_ids = feed.changes(start=start, end=end, since=since)
+
+        return {
+            'activities': serialize(rows),
+            'modified': [*modified_ids],
+            'incremental': since is not None,
+            'timestamp': timestamp,
+        }
 
     @staticmethod
     def get_date_q(start, end):
-        return Q(start__range=(start, end)) | Q(end__gt=start, start__lt=end)
+        return CalendarFeed.date_q(start=start, end=end)
 
     def get_end(self, request, start):
         return (
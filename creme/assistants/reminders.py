@@ -2,7 +2,7 @@
 
 ################################################################################
 #    Creme is a free/open-source Customer Relationship Management software
-#    Copyright (C) 2009-2020  Hybird
+#    Copyright (C) 2009-2021  Hybird
 #
 #    This program is free software: you can redistribute it and/or modify
 #    it under the terms of the GNU Affero General Public License as published by
@@ -26,7 +26,7 @@ from django.utils.timezone import localtime, now
 from django.utils.translation import gettext as _
 
 from creme.creme_core.core.reminder import Reminder
-from creme.creme_core.models import SettingValue
+from creme.creme_core.models import CremeEntity, SettingValue
 
 from .models import Alert, ToDo
 from .setting_keys import todo_reminder_key
@@ -36,6 +36,12 @@ TODO_REMINDER_DAYS_BEFORE = 1
 
 
 class AssistantReminder(Reminder):
+    def get_queryset(self):
+        return super().get_queryset().select_related('user', 'entity')
+
+    def populate(self, instances):
+        CremeEntity.populate_real_entities([instance.entity for instance in instances])
+
     def get_emails(self, object):
         user = object.user
 
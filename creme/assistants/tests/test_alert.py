@@ -2,10 +2,13 @@
 
 from datetime import datetime, timedelta
 from functools import partial
+from smtplib import SMTPServerDisconnected
+from unittest.mock import patch
 
 from django.contrib.auth import get_user_model
 from django.contrib.contenttypes.models import ContentType
 from django.core import mail
+from django.core.mail.backends.locmem import EmailBackend
 from django.db.models.query_utils import Q
 from django.test.utils import override_settings
 from django.urls import reverse
@@ -17,17 +20,20 @@ from creme.creme_core.core.function_field import function_field_registry
 # Should be a test queue
 # from creme.creme_core.core.job import JobSchedulerQueue
 from creme.creme_core.core.job import get_queue
+from creme.creme_core.creme_jobs import reminder_type
 from creme.creme_core.forms.listview import TextLVSWidget
 from creme.creme_core.models import (
     BrickState,
     CremeEntity,
     DateReminder,
     FakeOrganisation,
+    JobResult,
 )
 
 from ..bricks import AlertsBrick
 from ..constants import BRICK_STATE_HIDE_VALIDATED_ALERTS
 from ..models import Alert
+from ..reminders import ReminderAlert
 from .base import AssistantsTestCase
 
 
@@ -313,6 +319,183 @@ class AlertTestCase(AssistantsTestCase):
         self.assertFalse(DateReminder.objects.exclude(id__in=[*reminder_ids, reminder.id]))
         self.assertEqual(1, len(mail.outbox))
 
+    @override_settings(DEFAULT_TIME_ALERT_REMIND=60)
+    def test_reminder_chunks(self):
+        "Several chunks."
+        user = self.user
+        now_value = now()
+        job = self.get_reminder_job()
+
+        reminder_ids = [*DateReminder.objects.values_list('id', flat=True)]
+        contact = self.entity
+        orga = FakeOrganisation.objects.create(user=user, name='Nerv')
+
+        create_alert = partial(
+            Alert.objects.create,
+            user=user, trigger_date=now_value + timedelta(minutes=30),
+        )
+        alerts = [
+            create_alert(title=f'Alert#{i}', creme_entity=contact if i % 2 else orga)
+            for i in range(5)
+        ]
+        create_alert(title='Alert#validated', creme_entity=orga, is_validated=True)
+
+        reminder = ReminderAlert()
+        reminder.chunk_size = 2
+        self.assertListEqual(
+            [[*alerts[:2]], [*alerts[2:4]], [alerts[4]]],
+            [*reminder.iter_chunks()],
+        )
+
+        reminder.execute(job)
+
+        self.assertCountEqual(
+            [alert.id for alert in alerts],
+            DateReminder.objects.exclude(
+                id__in=reminder_ids,
+            ).values_list('model_id', flat=True),
+        )
+        self.assertFalse(Alert.objects.filter(id__in=[a.id for a in alerts], reminded=False))
+
+        messages = mail.outbox
+        self.assertEqual(5, len(messages))
+        self.assertCountEqual(
+            [
+                *(
+                    _('Reminder concerning a Creme CRM alert related to {entity}').format(
+                        entity=contact,
+                    ) for __ in range(2)
+                ),
+                *(
+                    _('Reminder concerning a Creme CRM alert related to {entity}').format(
+                        entity=orga,
+                    ) for __ in range(3)
+                ),
+            ],
+            [message.subject for message in messages],
+        )
+
+        # Nothing to remind anymore
+        self.assertListEqual([], [*reminder.iter_chunks()])
+
+    @override_settings(DEFAULT_TIME_ALERT_REMIND=60)
+    def test_reminder_chunks_error(self):
+        "The connection is not re-used by the next messages after an error."
+        user = self.user
+        job = self.get_reminder_job()
+        self.assertFalse(JobResult.objects.filter(job=job))
+
+        create_alert = partial(
+            Alert.objects.create,
+            user=user, creme_entity=self.entity,
+            trigger_date=now() + timedelta(minutes=30),
+        )
+        alerts = [create_alert(title=f'Alert#{i}') for i in range(5)]
+
+        class DisconnectedBackend(EmailBackend):
+            def send_messages(self, messages):
+                raise SMTPServerDisconnected('Connection unexpectedly closed')
+
+        connections = []
+
+        def get_connection():
+            connection = (EmailBackend if connections else DisconnectedBackend)()
+            connections.append(connection)
+
+            return connection
+
+        reminder = ReminderAlert()
+        reminder.chunk_size = 2
+
+        with patch('creme.creme_core.core.reminder.get_connection', get_connection):
+            reminder.execute(job)
+
+        self.assertEqual(2, len(connections))
+        self.assertEqual(4, len(mail.outbox))
+        self.assertEqual(1, JobResult.objects.filter(job=job).count())
+
+        # The alert which has not been sent is retried later
+        self.assertListEqual(
+            [alerts[0].id],
+            [*Alert.objects.filter(
+                id__in=[a.id for a in alerts], reminded=False,
+            ).values_list('id', flat=True)],
+        )
+        self.assertFalse(DateReminder.objects.filter(model_id=alerts[0].id))
+
+    @override_settings(DEFAULT_TIME_ALERT_REMIND=60)
+    def test_reminder_chunks_error02(self):
+        "One message fails in the middle of a chunk."
+        user = self.user
+        job = self.get_reminder_job()
+
+        create_alert = partial(
+            Alert.objects.create,
+            user=user, creme_entity=self.entity,
+            trigger_date=now() + timedelta(minutes=30),
+        )
+        alerts = [create_alert(title=f'Alert#{i}') for i in range(4)]
+        failing_title = alerts[1].title
+
+        class FlakyBackend(EmailBackend):
+            def send_messages(self, messages):
+                for message in messages:
+                    if failing_title in message.body:
+                        raise SMTPServerDisconnected('Connection unexpectedly closed')
+
+                return super().send_messages(messages)
+
+        connections = []
+
+        def get_connection():
+            connection = FlakyBackend()
+            connections.append(connection)
+
+            return connection
+
+        reminder = ReminderAlert()
+        reminder.chunk_size = 4
+
+        with patch('creme.creme_core.core.reminder.get_connection', get_connection):
+            reminder.execute(job)
+
+        self.assertEqual(2, len(connections))
+
+        messages = mail.outbox
+        self.assertEqual(3, len(messages))
+        self.assertFalse([m for m in messages if failing_title in m.body])
+
+        jresults = [*JobResult.objects.filter(job=job)]
+        self.assertEqual(1, len(jresults))
+        self.assertEqual(
+            _('Original error: {}').format('Connection unexpectedly closed'),
+            jresults[0].messages[1],
+        )
+
+        self.assertFalse(self.refresh(alerts[1]).reminded)
+        self.assertFalse(DateReminder.objects.filter(model_id=alerts[1].id))
+
+        for alert in (alerts[0], *alerts[2:]):
+            self.assertTrue(self.refresh(alert).reminded)
+
+        self.assertCountEqual(
+            [alerts[0].id, alerts[2].id, alerts[3].id],
+            DateReminder.objects.filter(
+                model_id__in=[a.id for a in alerts],
+            ).values_list('model_id', flat=True),
+        )
+
+        # The job is woken up later to retry
+        now_value = now()
+        job.last_run = now_value
+        self.assertEqual(
+            now_value + reminder_type.retry_delay,
+            reminder_type.next_wakeup(job, now_value),
+        )
+
+        JobResult.objects.filter(job=job).delete()
+        self.assertLess(reminder_type.next_wakeup(job, now_value), now_value)
+
     @override_settings(DEFAULT_TIME_ALERT_REMIND=30)
     def test_next_wakeup(self):
         now_value = now()
@@ -503,7 +503,7 @@ class TodoTestCase(AssistantsTestCase, BrickTestCaseMixin):
         job = self.execute_reminder_job()
 
         self.assertTrue(send_messages_called)
-        self.assertEqual(1, DateReminder.objects.exclude(id__in=reminder_ids).count())
+        self.assertFalse(DateReminder.objects.exclude(id__in=reminder_ids))
 
         jresults = JobResult.objects.filter(job=job)
         self.assertEqual(1, len(jresults))
@@ -521,9 +521,10 @@ class TodoTestCase(AssistantsTestCase, BrickTestCaseMixin):
 
         EmailBackend.send_messages = self.original_send_messages
 
+        # The ToDo which has not been sent is retried
         create_todo('Todo#2')
         job = self.execute_reminder_job()
-        self.assertEqual(1, len(mail.outbox))
+        self.assertEqual(2, len(mail.outbox))
         self.assertEqual(2, DateReminder.objects.exclude(id__in=reminder_ids).count())
         self.assertFalse(JobResult.objects.filter(job=job))
 
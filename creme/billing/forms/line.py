@@ -35,6 +35,7 @@ from creme.creme_core.models import Relation, Vat
 from creme.products.forms.fields import CategoryField
 
 from .. import constants
+from ..models import DeferredTotalsUpdate
 
 ProductLine = billing.get_product_line_model()
 ServiceLine = billing.get_service_line_model()
@@ -79,10 +80,11 @@ class _LineMultipleAddForm(core_forms.CremeForm):
             vat_value=cdata['vat'],
         )
 
-        for item in cdata['items']:
-            create_item(
-                related_item=item, unit_price=item.unit_price, unit=item.unit,
-            )
+        with DeferredTotalsUpdate():
+            for item in cdata['items']:
+                create_item(
+                    related_item=item, unit_price=item.unit_price, unit=item.unit,
+                )
 
 
 class ProductLineMultipleAddForm(_LineMultipleAddForm):
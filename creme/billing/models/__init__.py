@@ -1,7 +1,7 @@
 # -*- coding: utf-8 -*-
 
 from .algo import ConfigBillingAlgo, SimpleBillingAlgo  # NOQA
-from .base import Base  # NOQA
+from .base import Base, DeferredTotalsUpdate, update_totals  # NOQA
 from .credit_note import AbstractCreditNote, CreditNote  # NOQA
 from .exporters import ExporterConfigItem  # NOQA
 from .invoice import AbstractInvoice, Invoice  # NOQA
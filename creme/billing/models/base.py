@@ -22,6 +22,7 @@ import logging
 # import warnings
 from datetime import date
 from functools import partial
+from typing import Dict, Iterable, List, Optional
 
 from django.conf import settings
 from django.core.exceptions import ValidationError
@@ -30,7 +31,9 @@ from django.db.transaction import atomic
 from django.utils.translation import gettext
 from django.utils.translation import gettext_lazy as _
 
+from creme import billing
 from creme.creme_core.constants import DEFAULT_CURRENCY_PK
+from creme.creme_core.global_info import get_global_info, set_global_info
 from creme.creme_core.models import (
     CREME_REPLACE_NULL,
     CremeEntity,
@@ -46,6 +49,7 @@ from ..constants import (
     REL_OBJ_LINE_RELATED_ITEM,
     REL_SUB_BILL_ISSUED,
     REL_SUB_BILL_RECEIVED,
+    REL_SUB_CREDIT_NOTE_APPLIED,
     REL_SUB_HAS_LINE,
 )
 from . import other_models
@@ -134,6 +138,10 @@ class Base(CremeEntity):
     _target = None
     _target_rel = None
     _creditnotes_cache = None
+    _raw_totals_cache = None
+
+    # Totals computed by update_totals() which are used by the next call to save()
+    _precomputed_totals = None
 
     class Meta:
         abstract = True
@@ -179,6 +187,7 @@ class Base(CremeEntity):
     def invalidate_cache(self):
         self._lines_cache.clear()
         self._creditnotes_cache = None
+        self._raw_totals_cache = None
 
     @property
     def source(self):
@@ -309,25 +318,25 @@ class Base(CremeEntity):
         for line_cls in lines_registry:
             yield from self.get_lines(line_cls)
 
+    def _get_raw_totals(self) -> 'RawTotals':
+        raw_totals = self._raw_totals_cache
+
+        if raw_totals is None:
+            self._raw_totals_cache = raw_totals = (
+                compute_raw_totals([self])[self.id] if self.id else RawTotals()
+            )
+
+        return raw_totals
+
     def _get_lines_total_n_creditnotes_total(self):
-        creditnotes_total = sum(
-            credit_note.total_no_vat for credit_note in self.get_credit_notes()
-        )
-        lines_total = sum(
-            line.get_price_exclusive_of_tax(self) for line in self.iter_all_lines()
-        )
+        raw_totals = self._get_raw_totals()
 
-        return lines_total, creditnotes_total
+        return raw_totals.lines, raw_totals.creditnotes
 
     def _get_lines_total_n_creditnotes_total_with_tax(self):
-        creditnotes_total = sum(
-            credit_note.total_vat for credit_note in self.get_credit_notes()
-        )
-        lines_total_with_tax = sum(
-            line.get_price_inclusive_of_tax(self) for line in self.iter_all_lines()
-        )
+        raw_totals = self._get_raw_totals()
 
-        return lines_total_with_tax, creditnotes_total
+        return raw_totals.lines_with_tax, raw_totals.creditnotes_with_tax
 
     def _get_total(self):
         lines_total, creditnotes_total = self._get_lines_total_n_creditnotes_total()
@@ -374,8 +383,9 @@ class Base(CremeEntity):
     def _post_clone(self, source):
         source.invalidate_cache()
 
-        for line in source.iter_all_lines():
-            line.clone(self)
+        with DeferredTotalsUpdate():
+            for line in source.iter_all_lines():
+                line.clone(self)
 
     # TODO: factorise with persons ??
     def _post_save_clone(self, source):
@@ -495,10 +505,21 @@ class Base(CremeEntity):
 
             self._create_addresses()
         else:  # Edition
-            self.invalidate_cache()
+            precomputed_totals = self._precomputed_totals
+
+            if precomputed_totals is not None:
+                self._precomputed_totals = None
+                self.total_no_vat, self.total_vat = precomputed_totals
+            else:
+                deferred_update = DeferredTotalsUpdate.get_current()
+
+                if deferred_update is None:
+                    self.invalidate_cache()
 
-            self.total_vat    = self._get_total_with_tax()
-            self.total_no_vat = self._get_total()
+                    self.total_vat    = self._get_total_with_tax()
+                    self.total_no_vat = self._get_total()
+                else:
+                    deferred_update.add(self)
 
             super().save(*args, **kwargs)
 
@@ -516,3 +537,134 @@ class Base(CremeEntity):
                 self._target_rel = create_relation(
                     type_id=REL_SUB_BILL_RECEIVED, object_entity=target,
                 )
+
+    def refresh_totals(self) -> None:
+        """Re-compute the totals & save them ; it must be called when the lines
+        or the credit notes have been modified.
+        If a DeferredTotalsUpdate is active, the totals are updated when it is exited.
+        """
+        deferred_update = DeferredTotalsUpdate.get_current()
+
+        if deferred_update is None:
+            update_totals([self])
+        else:
+            deferred_update.add(self)
+
+
+class RawTotals:
+    "Sums of the prices of the lines & of the credit notes of a billing document."
+    __slots__ = ('lines', 'lines_with_tax', 'creditnotes', 'creditnotes_with_tax')
+
+    def __init__(self):
+        self.lines = self.lines_with_tax = DEFAULT_DECIMAL
+        self.creditnotes = self.creditnotes_with_tax = DEFAULT_DECIMAL
+
+
+def compute_raw_totals(documents: Iterable[Base]) -> Dict[int, RawTotals]:
+    """Compute the sums of the lines & of the credit notes of several billing
+    documents, with 1 query per type of line & 1 query for the credit notes
+    (whatever the numbers of documents & lines).
+    @param documents: Saved instances of Base.
+    @return: Dictionary with documents' IDs as keys & RawTotals as values.
+    """
+    from ..registry import lines_registry
+
+    docs_per_id = {doc.id: doc for doc in documents}
+    raw_totals = {doc_id: RawTotals() for doc_id in docs_per_id}
+
+    if not raw_totals:
+        return raw_totals
+
+    # NB: the prices are computed with the methods of Line (& not with an
+    #     aggregation in SQL) in order to keep the rounding of each line.
+    for line_cls in lines_registry:
+        for line in line_cls.objects.filter(
+            relations__type=REL_OBJ_HAS_LINE,
+            relations__object_entity__in=docs_per_id.keys(),
+        ).annotate(
+            related_document_id=models.F('relations__object_entity'),
+        ).select_related('vat_value'):
+            document = docs_per_id[line.related_document_id]
+            doc_totals = raw_totals[document.id]
+            doc_totals.lines += line.get_price_exclusive_of_tax(document)
+            doc_totals.lines_with_tax += line.get_price_inclusive_of_tax(document)
+
+    for doc_id, total_no_vat, total_vat in billing.get_credit_note_model().objects.filter(
+        is_deleted=False,
+        relations__type=REL_SUB_CREDIT_NOTE_APPLIED,
+        relations__object_entity__in=docs_per_id.keys(),
+    ).values_list('relations__object_entity', 'total_no_vat', 'total_vat'):
+        doc_totals = raw_totals[doc_id]
+        doc_totals.creditnotes += total_no_vat or DEFAULT_DECIMAL
+        doc_totals.creditnotes_with_tax += total_vat or DEFAULT_DECIMAL
+
+    return raw_totals
+
+
+def update_totals(documents: Iterable[Base]) -> None:
+    """Re-compute the totals of several billing documents in bulk (see
+    compute_raw_totals()), & save them.
+    It's useful when the lines of several documents are modified (bulk edition,
+    mass import, cloning...).
+    @param documents: Instances of Base (the not saved ones are ignored).
+    """
+    # NB: if there are several instances of a document, the last one is used.
+    docs_per_id: Dict[int, Base] = {
+        document.pk: document for document in documents if document.pk
+    }
+
+    raw_totals = compute_raw_totals(docs_per_id.values())
+
+    for doc_id, document in docs_per_id.items():
+        document.invalidate_cache()
+        document._raw_totals_cache = raw_totals[doc_id]
+
+        document._precomputed_totals = (
+            document._get_total(), document._get_total_with_tax(),
+        )
+        document.save()
+
+
+class DeferredTotalsUpdate:
+    """Context manager which defers the re-computation of the totals of the
+    billing documents ; when several lines (or credit notes) of a document are
+    created/edited/deleted within the context, the totals of this document are
+    updated only once (with update_totals()) when the context is exited.
+
+    Usage:
+        with atomic(), DeferredTotalsUpdate():
+            for line in lines:
+                [...]
+                line.save()
+    """
+    _GLOBAL_KEY = 'billing-deferred_totals_update'
+
+    def __init__(self):
+        self._documents: List[Base] = []
+        self._previous: Optional[DeferredTotalsUpdate] = None
+
+    def __enter__(self):
+        self._previous = get_global_info(self._GLOBAL_KEY)
+        set_global_info(**{self._GLOBAL_KEY: self})
+
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        set_global_info(**{self._GLOBAL_KEY: self._previous})
+        self._previous = None
+
+        documents = self._documents
+        self._documents = []
+
+        # NB: the DB is maybe in a broken state (transaction to roll back).
+        if exc_type is None:
+            update_totals(documents)
+
+    @classmethod
+    def get_current(cls) -> Optional['DeferredTotalsUpdate']:
+        "Get the instance currently used by the current thread (None if there is none)."
+        return get_global_info(cls._GLOBAL_KEY)
+
+    def add(self, document: Base) -> None:
+        "Mark a document as needing an update of its totals."
+        self._documents.append(document)
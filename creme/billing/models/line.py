@@ -35,9 +35,6 @@ from ..utils import round_to_2
 logger = logging.getLogger(__name__)
 
 
-# TODO: use a smart workflow engine to update the BillingModel only once when
-#  several lines are edited for the moment when have to re-save the model manually.
-
 class Line(CremeEntity):
     class Discount(models.IntegerChoices):
         PERCENT     = 1, _('Percent'),
@@ -268,6 +265,5 @@ class Line(CremeEntity):
         else:
             super().save(*args, **kwargs)
 
-        # TODO: problem, if several lines are added/edited at once, lots of
-        #  useless queries (workflow engine ??)
-        self.related_document.save()  # Update totals
+        # NB: use DeferredTotalsUpdate when several lines are added/edited at once.
+        self.related_document.refresh_totals()
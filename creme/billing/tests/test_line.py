@@ -25,6 +25,7 @@ from ..constants import (  # DISCOUNT_ITEM_AMOUNT DISCOUNT_LINE_AMOUNT DISCOUNT_
     REL_SUB_HAS_LINE,
     REL_SUB_LINE_RELATED_ITEM,
 )
+from ..models import DeferredTotalsUpdate, update_totals
 from .base import (
     Invoice,
     ProductLine,
@@ -1412,3 +1413,54 @@ class LineTestCase(_BillingTestCase):
         self.assertEqual(comment, self.refresh(pline).comment)
 
         self.assertGET(400, build_url(pline, 'on_the_fly_item'))
+
+    @skipIfCustomProductLine
+    @skipIfCustomServiceLine
+    def test_deferred_totals_update(self):
+        user = self.login()
+
+        invoice = self.create_invoice_n_orgas('Invoice001', discount=0)[0]
+        vat = Vat.objects.get_or_create(value=Decimal('20.00'))[0]
+        create_pline = partial(
+            ProductLine.objects.create,
+            user=user, related_document=invoice, vat_value=vat,
+        )
+
+        with DeferredTotalsUpdate():
+            create_pline(on_the_fly_item='Fly1', unit_price=Decimal('10'))
+            create_pline(on_the_fly_item='Fly2', unit_price=Decimal('5.5'), quantity=2)
+            ServiceLine.objects.create(
+                user=user, related_document=invoice, vat_value=vat,
+                on_the_fly_item='Fly3', unit_price=Decimal('4'),
+            )
+
+            # Not updated yet
+            invoice = self.refresh(invoice)
+            self.assertEqual(Decimal('0'), invoice.total_no_vat)
+
+        invoice = self.refresh(invoice)
+        self.assertEqual(Decimal('25.00'), invoice.total_no_vat)
+        self.assertEqual(Decimal('30.00'), invoice.total_vat)
+
+    @skipIfCustomProductLine
+    def test_update_totals(self):
+        user = self.login()
+
+        invoice1, source, target = self.create_invoice_n_orgas('Invoice001', discount=0)
+        invoice2 = self.create_invoice('Invoice002', source, target, discount=10)
+
+        create_pline = partial(ProductLine.objects.create, user=user)
+        create_pline(related_document=invoice1, on_the_fly_item='Fly1', unit_price=Decimal('10'))
+        create_pline(related_document=invoice1, on_the_fly_item='Fly2', unit_price=Decimal('20'))
+        create_pline(related_document=invoice2, on_the_fly_item='Fly3', unit_price=Decimal('50'))
+
+        # Totals are broken (eg: lines edited with update())
+        Invoice.objects.filter(id__in=[invoice1.id, invoice2.id]).update(
+            total_no_vat=Decimal('0'), total_vat=Decimal('0'),
+        )
+        invoice1 = self.refresh(invoice1)
+        invoice2 = self.refresh(invoice2)
+
+        update_totals([invoice1, invoice2])
+        self.assertEqual(Decimal('30.00'), self.refresh(invoice1).total_no_vat)
+        self.assertEqual(Decimal('45.00'), self.refresh(invoice2).total_no_vat)
@@ -41,6 +41,7 @@ from creme.creme_core.views import generic
 from .. import constants
 from ..core import BILLING_MODELS
 from ..forms import line as line_forms
+from ..models import DeferredTotalsUpdate
 from ..registry import lines_registry
 
 ProductLine = billing.get_product_line_model()
@@ -198,7 +199,9 @@ def multi_save_lines(request, document_id):
         )
 
     # Save all formset now that we haven't detect any errors
-    for formset in formset_to_save:
-        formset.save()
+    # NB: the totals of the document are computed once, at the end.
+    with DeferredTotalsUpdate():
+        for formset in formset_to_save:
+            formset.save()
 
     return HttpResponse()
@@ -19,6 +19,7 @@
 ################################################################################
 
 from datetime import timedelta
+from time import monotonic
 
 from django.conf import settings
 from django.contrib.contenttypes.models import ContentType
@@ -27,9 +28,11 @@ from django.core.mail.message import EmailMessage
 from django.utils.timezone import now
 from django.utils.translation import gettext
 from django.utils.translation import gettext_lazy as _
+from django.utils.translation import ngettext
 
 from creme.creme_core.creme_jobs.base import JobType
-from creme.creme_core.models import JobResult
+from creme.creme_core.models import JobResult, Relation
+from creme.creme_core.utils.chunktools import iter_as_chunk
 from creme.persons.constants import REL_SUB_CUSTOMER_SUPPLIER
 
 
@@ -44,85 +47,113 @@ class _ComApproachesEmailsSendType(JobType):
     # TODO: add a config form which stores the rules in job.data
     list_target_orga = [(REL_SUB_CUSTOMER_SUPPLIER, 30)]
 
-    def _execute(self, job):
+    chunk_size = 256
+
+    def _neglected_organisations(self, rtype, delay, now_value, managed_orga_ids):
+        """Get the IDs of the organisations without recent commercial approach.
+        The organisations which are covered by an approach (linked to the
+        organisation itself, to one of its managers/employees, or to an
+        Opportunity which targets it) are computed with a few set-based queries
+        instead of several queries per organisation.
+
+        @return: A tuple (number_of_candidates, set of neglected IDs).
+        """
         from creme import persons
         from creme.opportunities import get_opportunity_model
         from creme.opportunities.constants import REL_SUB_TARGETS
+        from creme.persons.constants import REL_SUB_EMPLOYED_BY, REL_SUB_MANAGES
 
         from .models import CommercialApproach
 
         Organisation = persons.get_organisation_model()
-        Contact = persons.get_contact_model()
-        Opportunity = get_opportunity_model()
 
-        emails = []
+        candidate_ids = {
+            *Organisation.objects.filter(
+                is_managed=False,
+                relations__type=rtype,
+                relations__object_entity__in=managed_orga_ids,
+            ).values_list('id', flat=True),
+        }
+        if not candidate_ids:
+            return 0, candidate_ids
 
         get_ct = ContentType.objects.get_for_model
-        ct_orga    = get_ct(Organisation)
-        ct_contact = get_ct(Contact)
-        ct_opp     = get_ct(Opportunity)
+        approached_ids = CommercialApproach.objects.filter(
+            creation_date__gt=now_value - timedelta(days=delay),
+        ).values_list('entity_id', flat=True)
+
+        def approached(model):
+            return approached_ids.filter(entity_content_type=get_ct(model))
+
+        relations = Relation.objects.values_list('object_entity_id', flat=True)
+        neglected_ids = candidate_ids.difference(
+            approached(Organisation),
+            # Managers & employees
+            relations.filter(
+                type__in=(REL_SUB_MANAGES, REL_SUB_EMPLOYED_BY),
+                subject_entity__in=approached(persons.get_contact_model()),
+                subject_entity__is_deleted=False,
+            ),
+            # Opportunities targeting the organisation
+            relations.filter(
+                type=REL_SUB_TARGETS,
+                subject_entity__in=approached(get_opportunity_model()),
+            ),
+        )
+
+        return len(candidate_ids), neglected_ids
+
+    def _execute(self, job):
+        from creme import persons
+
+        Organisation = persons.get_organisation_model()
+
+        data = job.data or {}
+        dry_run = data.get('dry_run', False)
+        stats = {'candidates': 0, 'neglected': 0, 'sent': 0}
+        start_time = monotonic()
+
+        emails = []
 
         now_value = now()
         managed_orga_ids = [
             *Organisation.objects.filter(is_managed=True).values_list('id', flat=True),
         ]
-        opp_filter = Opportunity.objects.filter
 
         EMAIL_SENDER = settings.EMAIL_SENDER
 
         for rtype, delay in self.list_target_orga:
-            com_apps_filter = CommercialApproach.objects.filter(
-                creation_date__gt=now_value - timedelta(days=delay),
-            ).filter
-
-            # TODO: are 'values_list' real optimizations here ??
-            #       ==> remove them when CommercialApproach use real ForeignKey
-            for orga in Organisation.objects.filter(
-                is_managed=False,
-                relations__type=rtype,
-                relations__object_entity__in=managed_orga_ids,
-            ):
-                if com_apps_filter(entity_content_type=ct_orga, entity_id=orga.id).exists():
-                    continue
-
-                if com_apps_filter(
-                    entity_content_type=ct_contact,
-                    entity_id__in=orga.get_managers().values_list('id', flat=True),
-                ).exists():
-                    continue
-
-                if com_apps_filter(
-                    entity_content_type=ct_contact,
-                    entity_id__in=orga.get_employees().values_list('id', flat=True),
-                ).exists():
-                    continue
-
-                if com_apps_filter(
-                    entity_content_type=ct_opp,
-                    entity_id__in=opp_filter(
-                        relations__type=REL_SUB_TARGETS,
-                        relations__object_entity=orga,
-                    ).values_list('id', flat=True),
-                ).exists():
-                    continue
-
-                emails.append(EmailMessage(
-                    gettext('[CremeCRM] The organisation «{}» seems neglected').format(orga),
-                    gettext(
-                        "It seems you haven't created a commercial approach for "
-                        "the organisation «{orga}» since {delay} days."
-                    ).format(
-                        orga=orga,
-                        delay=delay,
-                    ),
-                    EMAIL_SENDER, [orga.user.email],
-                ))
+            candidates_count, neglected_ids = self._neglected_organisations(
+                rtype=rtype, delay=delay,
+                now_value=now_value, managed_orga_ids=managed_orga_ids,
+            )
+            stats['candidates'] += candidates_count
+            stats['neglected'] += len(neglected_ids)
+
+            if dry_run:
+                continue
+
+            for ids_chunk in iter_as_chunk(sorted(neglected_ids), self.chunk_size):
+                for orga in Organisation.objects.filter(
+                    id__in=ids_chunk,
+                ).select_related('user'):
+                    emails.append(EmailMessage(
+                        gettext('[CremeCRM] The organisation «{}» seems neglected').format(orga),
+                        gettext(
+                            "It seems you haven't created a commercial approach for "
+                            "the organisation «{orga}» since {delay} days."
+                        ).format(
+                            orga=orga,
+                            delay=delay,
+                        ),
+                        EMAIL_SENDER, [orga.user.email],
+                    ))
 
         # TODO: factorise jobs which send emails
         if emails:
             try:
                 with get_connection() as connection:
-                    connection.send_messages(emails)
+                    stats['sent'] = connection.send_messages(emails) or 0
             except Exception as e:
                 JobResult.objects.create(
                     job=job,
@@ -132,6 +163,9 @@ class _ComApproachesEmailsSendType(JobType):
                     ],
                 )
 
+        stats['duration'] = round(monotonic() - start_time, 3)
+        job.data = {**data, 'stats': stats}
+
     def get_description(self, job):
         return [
             gettext(
@@ -152,6 +186,37 @@ class _ComApproachesEmailsSendType(JobType):
             ),
         ]
 
+    def get_config_form_class(self, job):
+        from .forms.job import ComApproachesEmailsSendJobForm
+
+        return ComApproachesEmailsSendJobForm
+
+    def get_stats(self, job):
+        stats = (job.data or {}).get('stats')
+
+        if not stats:
+            return []
+
+        neglected = stats['neglected']
+        lines = [
+            ngettext(
+                '{count} customer organisation has been checked.',
+                '{count} customer organisations have been checked.',
+                stats['candidates']
+            ).format(count=stats['candidates']),
+            ngettext(
+                '{count} organisation seems neglected.',
+                '{count} organisations seem neglected.',
+                neglected
+            ).format(count=neglected),
+            gettext('Duration: {} seconds').format(stats['duration']),
+        ]
+
+        if (job.data or {}).get('dry_run'):
+            lines.append(gettext('Dry run: no email has been sent.'))
+
+        return lines
+
 
 com_approaches_emails_send_type = _ComApproachesEmailsSendType()
 jobs = (com_approaches_emails_send_type,)
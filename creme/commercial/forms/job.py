@@ -0,0 +1,43 @@
+# -*- coding: utf-8 -*-
+
+################################################################################
+#    Creme is a free/open-source Customer Relationship Management software
+#    Copyright (C) 2021  Hybird
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU Affero General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU Affero General Public License for more details.
+#
+#    You should have received a copy of the GNU Affero General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+################################################################################
+
+from django.forms import BooleanField
+from django.utils.translation import gettext_lazy as _
+
+from creme.creme_core.forms.job import JobForm
+
+
+class ComApproachesEmailsSendJobForm(JobForm):
+    dry_run = BooleanField(
+        label=_('Dry run'), required=False,
+        help_text=_(
+            'The neglected organisations are counted, but no email is sent '
+            '(see the statistics of the job).'
+        ),
+    )
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.fields['dry_run'].initial = (self.instance.data or {}).get('dry_run', False)
+
+    def save(self, *args, **kwargs):
+        self.instance.data = {'dry_run': self.cleaned_data['dry_run']}
+
+        return super().save(*args, **kwargs)
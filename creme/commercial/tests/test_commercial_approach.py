@@ -9,8 +9,10 @@ from django.contrib.contenttypes.models import ContentType
 from django.core import mail
 from django.core.mail.backends.locmem import EmailBackend
 from django.urls import reverse
-from django.utils.timezone import now
+from django.utils.formats import date_format
+from django.utils.timezone import localtime, now
 from django.utils.translation import gettext as _
+from django.utils.translation import ngettext
 
 from creme.activities.constants import (
     ACTIVITYSUBTYPE_MEETING_QUALIFICATION,
@@ -631,3 +633,120 @@ class CommercialApproachTestCase(CremeTestCase, BrickTestCaseMixin):
             ],
             jresult.messages
         )
+
+    @skipIfCustomOrganisation
+    @skipIfCustomContact
+    def test_job09(self):
+        "Several customers, stats."
+        user = self.user
+        mngd_orga, customer1 = self._build_orgas()
+
+        create_orga = partial(Organisation.objects.create, user=user)
+        customer2 = create_orga(name='Seele')
+        customer3 = create_orga(name='Gehirn')
+
+        create_rel = partial(
+            Relation.objects.create,
+            user=user, type_id=REL_SUB_CUSTOMER_SUPPLIER, object_entity=mngd_orga,
+        )
+        create_rel(subject_entity=customer2)
+        create_rel(subject_entity=customer3)
+
+        # Customer of 2 managed organisations => only one email
+        mngd_orga2 = create_orga(name='Wille', is_managed=True)
+        create_rel(subject_entity=customer2, object_entity=mngd_orga2)
+
+        # Deleted manager => ignored
+        manager = Contact.objects.create(
+            user=user, first_name='Gendo', last_name='Ikari', is_deleted=True,
+        )
+        Relation.objects.create(
+            user=user, subject_entity=manager, type_id=REL_SUB_MANAGES,
+            object_entity=customer3,
+        )
+        CommercialApproach.objects.create(
+            title='Commapp01', description='A commercial approach',
+            creme_entity=manager,
+        )
+
+        CommercialApproach.objects.create(
+            title='Commapp02', description='A commercial approach',
+            creme_entity=customer1,
+        )
+
+        job = self._send_mails()
+        self.assertCountEqual(
+            [
+                _('[CremeCRM] The organisation «{}» seems neglected').format(customer2),
+                _('[CremeCRM] The organisation «{}» seems neglected').format(customer3),
+            ],
+            [message.subject for message in mail.outbox],
+        )
+
+        stats = self.refresh(job).data.get('stats')
+        self.assertIsInstance(stats, dict)
+        self.assertEqual(3, stats.get('candidates'))
+        self.assertEqual(2, stats.get('neglected'))
+        self.assertEqual(2, stats.get('sent'))
+        self.assertIn('duration', stats)
+
+        self.assertListEqual(
+            [
+                ngettext(
+                    '{count} customer organisation has been checked.',
+                    '{count} customer organisations have been checked.',
+                    3
+                ).format(count=3),
+                ngettext(
+                    '{count} organisation seems neglected.',
+                    '{count} organisations seem neglected.',
+                    2
+                ).format(count=2),
+                _('Duration: {} seconds').format(stats['duration']),
+            ],
+            com_approaches_emails_send_type.get_stats(job),
+        )
+
+    @skipIfCustomOrganisation
+    def test_job10(self):
+        "Dry run."
+        self._build_orgas()
+
+        job = self.get_object_or_fail(Job, type_id=com_approaches_emails_send_type.id)
+        job.data = {'dry_run': True}
+        job.save()
+
+        com_approaches_emails_send_type.execute(job)
+        self.assertFalse(mail.outbox)
+
+        job = self.refresh(job)
+        self.assertTrue(job.data.get('dry_run'))
+
+        stats = job.data.get('stats')
+        self.assertEqual(1, stats.get('candidates'))
+        self.assertEqual(1, stats.get('neglected'))
+        self.assertEqual(0, stats.get('sent'))
+        self.assertIn(
+            _('Dry run: no email has been sent.'),
+            com_approaches_emails_send_type.get_stats(job),
+        )
+
+    def test_job_config(self):
+        job = self.get_object_or_fail(Job, type_id=com_approaches_emails_send_type.id)
+
+        url = job.get_edit_absolute_url()
+        self.assertGET200(url)
+
+        response = self.client.post(
+            url,
+            data={
+                'reference_run': date_format(
+                    localtime(job.reference_run), 'DATETIME_FORMAT',
+                ),
+                'periodicity_0': 'days',
+                'periodicity_1': '1',
+                'dry_run': 'on',
+            },
+        )
+        self.assertNoFormError(response)
+        self.assertDictEqual({'dry_run': True}, self.refresh(job).data)
@@ -18,7 +18,7 @@
 #    along with this program.  If not, see <http://www.gnu.org/licenses/>.
 ################################################################################
 
-from typing import TYPE_CHECKING, Dict, Optional, Type
+from typing import TYPE_CHECKING, Dict, List, Optional, Sequence, Type
 
 from django.db.models import Q, QuerySet
 
@@ -87,6 +87,43 @@ class EntityCredentials:
 
         self._value = value
 
+    @classmethod
+    def build_many(cls,
+                   user,
+                   entities: Sequence['CremeEntity'],
+                   ) -> List['EntityCredentials']:
+        """Equivalent to building an instance for each entity, but the
+        credentials which use EntityFilters check all the entities with grouped
+        queries (see UserRole.get_perms_many()).
+        @param user: <django.contrib.auth.get_user_model()> instance.
+        @param entities: Sequence of CremeEntity (or child class) instances.
+        @return: A list of EntityCredentials, in the order of the entities.
+        """
+        if user.is_superuser:
+            values = [cls._ALL_CREDS] * len(entities)
+        else:
+            role = user.role
+            assert role is not None
+
+            allowed_entities = [
+                entity for entity in entities
+                if entity.sandbox_id is None
+                or cls._sandbox_is_allowed(sandbox=entity.sandbox, user=user)
+            ]
+            perms = dict(zip(
+                (entity.id for entity in allowed_entities),
+                role.get_perms_many(user, allowed_entities),
+            ))
+            values = [perms.get(entity.id, cls.NONE) for entity in entities]
+
+        creds_list = []
+        for value in values:
+            creds = cls.__new__(cls)
+            creds._value = value
+            creds_list.append(creds)
+
+        return creds_list
+
     def __str__(self):
         return f'EntityCredentials(value="{self._value}")'
 
@@ -18,7 +18,10 @@
 #    along with this program.  If not, see <http://www.gnu.org/licenses/>.
 ################################################################################
 
-from django.http.response import HttpResponseBase
+from typing import BinaryIO, Iterable, Iterator, Sequence
+
+from django.http.response import HttpResponseBase, StreamingHttpResponse
+from django.template.defaultfilters import slugify
 
 
 class ImportBackend:
@@ -53,13 +56,29 @@ class ExportBackend:
     id: unique export backend identifier: the file extension matching this backend.
     verbose_name: defines the backend for the user, used in the select backend popup.
     help_text: currently unused.
+    extension: extension of the generated files.
+    streamable: <True> means that the backend can produce its content chunk by
+                chunk (see stream()), so it can be sent directly with a
+                StreamingHttpResponse.
+
+    Besides the historical API (writerow() + save() + response), the backends
+    implement an incremental API, which consumes lazily an iterable of rows
+    (so the whole content does not have to be built in memory):
+        - write() writes the rows in a file-like object.
+        - stream() builds a StreamingHttpResponse (only for streamable backends).
     """
     id: str = 'OVERLOAD ME'
     verbose_name: str = 'OVERLOAD ME'
     help_text: str = 'OVERLOAD ME'
+    extension: str = 'OVERLOAD ME'
+    streamable: bool = False
 
     response: HttpResponseBase
 
+    def get_filename(self, name: str) -> str:
+        "Get the name of the generated file (with extension) from a base name."
+        return f'{slugify(name)}.{self.extension}'
+
     def writerow(self, row):
         """
         Appends a row.
@@ -74,3 +93,27 @@ class ExportBackend:
               instance of <django.contrib.auth.get_user_model()>.
         """
         raise NotImplementedError
+
+    def write(self, rows: Iterable[Sequence], fileobj: BinaryIO) -> int:
+        """Write incrementally rows in a file.
+        @param rows: Iterable of rows (sequences of values) ; it is consumed
+               lazily, so a generator producing rows page by page can be used
+               to get a constant memory usage.
+        @param fileobj: binary file-like object, opened for writing.
+        @return: The number of written rows.
+        """
+        raise NotImplementedError
+
+    def stream(self, rows: Iterable[Sequence], filename: str) -> StreamingHttpResponse:
+        """Build a response which sends the content chunk by chunk.
+        Only available if the attribute 'streamable' is <True>.
+        @param rows: Iterable of rows ; consumed lazily while the response is sent.
+        @param filename: file name (without extension).
+        """
+        raise NotImplementedError
+
+    def iter_chunks(self, rows: Iterable[Sequence]) -> Iterator[bytes]:
+        """Generate the content of the file, chunk by chunk.
+        Only available if the attribute 'streamable' is <True>.
+        """
+        raise NotImplementedError
@@ -20,23 +20,36 @@
 
 import csv
 
-from django.http import HttpResponse
+from django.http import HttpResponse, StreamingHttpResponse
 from django.template.defaultfilters import slugify
 from django.utils.translation import gettext_lazy as _
 
 from .base import ExportBackend
 
 
+class _EchoBuffer:
+    "Pseudo-buffer which returns the written value instead of storing it."
+    def write(self, value):
+        return value
+
+
 class CSVExportBackend(ExportBackend):
     id = 'csv'
     verbose_name = _("CSV File (delimiter: ',')")
     delimiter: str = ','
     help_text = ''
+    extension = 'csv'
+    streamable = True
+    content_type = 'text/csv'
+    encoding = 'utf-8'
 
     def __init__(self):
-        self.response = HttpResponse(content_type='text/csv')
-        self.writer = csv.writer(
-            self.response,
+        self.response = HttpResponse(content_type=self.content_type)
+        self.writer = self._build_writer(self.response)
+
+    def _build_writer(self, buffer):
+        return csv.writer(
+            buffer,
             quoting=csv.QUOTE_ALL,
             delimiter=self.delimiter,
         )
@@ -47,6 +60,31 @@ class CSVExportBackend(ExportBackend):
     def save(self, filename, user):
         self.response['Content-Disposition'] = f'attachment; filename="{slugify(filename)}.csv"'
 
+    def iter_chunks(self, rows):
+        writerow = self._build_writer(_EchoBuffer()).writerow
+        encoding = self.encoding
+
+        for row in rows:
+            yield writerow(row).encode(encoding)
+
+    def write(self, rows, fileobj):
+        count = 0
+        write = fileobj.write
+
+        for chunk in self.iter_chunks(rows):
+            write(chunk)
+            count += 1
+
+        return count
+
+    def stream(self, rows, filename):
+        response = StreamingHttpResponse(
+            self.iter_chunks(rows), content_type=self.content_type,
+        )
+        response['Content-Disposition'] = f'attachment; filename="{self.get_filename(filename)}"'
+
+        return response
+
 
 class SemiCSVExportBackend(CSVExportBackend):
     id = 'scsv'
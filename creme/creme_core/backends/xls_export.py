@@ -35,7 +35,11 @@ class XLSExportBackend(ExportBackend):
     id = 'xls'
     verbose_name = _('XLS File')
     help_text = ''
+    extension = 'xls'
     dir_parts = ('xls',)  # Sub-directory under {settings.MEDIA_ROOT}/upload
+    # The rows are flushed into the compact internal storage of xlwt by chunks
+    # of this size (see write()).
+    flush_size = 1000
 
     def __init__(self, encoding='utf-8'):
         super().__init__()
@@ -58,3 +62,23 @@ class XLSExportBackend(ExportBackend):
 
     def writerow(self, row):
         self.writer.writerow(row)
+
+    def write(self, rows, fileobj):
+        # NB: the XLS format cannot really be streamed (the whole workbook is
+        #     written at the end) ; but the rows are consumed lazily & their
+        #     memory representation is compacted regularly.
+        writer = self.writer
+        writerow = writer.writerow
+        flush_size = self.flush_size
+        count = 0
+
+        for row in rows:
+            writerow(row)
+            count += 1
+
+            if not count % flush_size:
+                writer.flush()
+
+        writer.save(fileobj)
+
+        return count
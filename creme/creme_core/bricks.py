@@ -23,6 +23,7 @@ from collections import defaultdict
 
 from django.conf import settings
 from django.contrib.contenttypes.models import ContentType
+from django.db.models import Q
 from django.utils.translation import gettext_lazy as _
 
 from .core.entity_cell import EntityCellCustomField
@@ -243,7 +244,7 @@ class HistoryBrick(QuerysetBrick):
 
     def detailview_display(self, context):
         pk = context['object'].pk
-        btc = self.get_template_context(context, HistoryLine.objects.filter(entity=pk))
+        btc = self.get_template_context(context, HistoryLine.with_archives(Q(entity=pk)))
         hlines = btc['page'].object_list
         user = context['user']
 
@@ -263,6 +264,8 @@ class HistoryBrick(QuerysetBrick):
     def home_display(self, context):
         btc = self.get_template_context(
             context,
+            # NB: the archived lines are not displayed (the union with the
+            #     whole archive would be too expensive).
             HistoryLine.objects.exclude(type__in=(TYPE_SYM_RELATION, TYPE_SYM_REL_DEL)),
             HIDDEN_VALUE=settings.HIDDEN_VALUE,
         )
@@ -463,6 +466,18 @@ class MassImportJobErrorsBrick(JobErrorsBrick):
     template_name = 'creme_core/bricks/massimport-errors.html'
 
 
+class MassExportJobErrorsBrick(JobErrorsBrick):
+    id_ = QuerysetBrick.generate_id('creme_core', 'mass_export_job_errors')
+    # verbose_name  = 'Mass export job errors'
+    template_name = 'creme_core/bricks/massexport-errors.html'
+
+    def _extra_context(self, job):
+        ctxt = super()._extra_context(job)
+        ctxt['fileref'] = job.type.get_fileref(job)
+
+        return ctxt
+
+
 class JobsBrick(QuerysetBrick):
     id_ = QuerysetBrick.generate_id('creme_core', 'jobs')
     verbose_name = _('Jobs')
@@ -33,7 +33,7 @@ from typing import (  # Callable
 
 from django.core.exceptions import FieldDoesNotExist
 from django.db import models
-from django.db.models import Field, Model
+from django.db.models import Field, Model, prefetch_related_objects
 from django.utils.functional import cached_property
 from django.utils.html import escape, format_html, format_html_join
 from django.utils.translation import gettext
@@ -96,6 +96,12 @@ class EntityCell:
     _listview_css_class = None
     _header_listview_css_class = None
 
+    # Output => name of the method used by render_column()
+    RENDER_METHODS = {
+        'html': 'render_html',
+        'csv':  'render_csv',
+    }
+
     def __init__(self,
                  model: Type[Model],
                  value: str = '',
@@ -231,6 +237,57 @@ class EntityCell:
     def render_csv(self, entity: CremeEntity, user) -> str:
         raise NotImplementedError
 
+    def render_column(self,
+                      entities: Sequence[CremeEntity],
+                      user,
+                      output: str = 'html',
+                      ) -> List[str]:
+        """Render the cell for several entities at once.
+        Child classes can override this method to share some work between the
+        entities (the caches of the entities are expected to be filled before ;
+        see populate_entities() & render_rows()).
+        @param entities: Instances of CremeEntities (or subclass).
+        @param user: Instance of <contrib.auth.get_user_model()>.
+        @param output: "html" or "csv".
+        @return: A list of strings, one for each entity (same order).
+        """
+        render = getattr(self, self.RENDER_METHODS[output])
+        column = []
+
+        for entity in entities:
+            try:
+                rendered = render(entity, user)
+            except Exception as e:
+                logger.debug('Exception when rendering the cell %s: %s', self, e)
+                rendered = ''
+
+            column.append(rendered)
+
+        return column
+
+    @staticmethod
+    def render_rows(cells: Sequence['EntityCell'],
+                    entities: Sequence[CremeEntity],
+                    user,
+                    output: str = 'html',
+                    ) -> List[List[str]]:
+        """Render several cells for several entities, column by column.
+        The caches of the entities are filled before (see mixed_populate_entities()),
+        so the number of queries does not depend on the number of entities.
+        @param cells: Instances of (subclasses of) EntityCell.
+        @param entities: Instances of CremeEntities (or subclass) ;
+               NB: iterated several times -> not an iterator.
+        @param user: Instance of <contrib.auth.get_user_model()>.
+        @param output: "html" or "csv".
+        @return: A list of rows (one per entity) ; each row is a list of
+                 strings (one per cell).
+        """
+        EntityCell.mixed_populate_entities(cells=cells, entities=entities, user=user)
+
+        columns = [cell.render_column(entities, user, output) for cell in cells]
+
+        return [[*row] for row in zip(*columns)] if columns else [[] for __ in entities]
+
     @property
     def title(self) -> str:
         raise NotImplementedError
@@ -439,6 +496,22 @@ class EntityCellRegularField(EntityCell):
     def populate_entities(cells, entities, user):
         populate_related(entities, [cell.value for cell in cells])
 
+        # The ManyToManyFields are prefetched (populate_related() only
+        # manages ForeignKeys), in order to avoid a query per entity.
+        m2m_lookups = set()
+        for cell in cells:
+            names = []
+
+            for field in cell.field_info:
+                names.append(field.name)
+
+                if field.many_to_many:
+                    m2m_lookups.add('__'.join(names))
+                    break
+
+        if m2m_lookups:
+            prefetch_related_objects([*entities], *m2m_lookups)
+
     def render_html(self, entity, user):
         printer = self._printer_html
 
@@ -743,6 +816,48 @@ class EntityCellRelation(EntityCell):
             key=collator.sort_key,
         ))
 
+    def render_column(self, entities, user, output='html'):
+        if output != 'csv':
+            return super().render_column(entities, user, output)
+
+        # The same entities are often linked to many entities of the column
+        # (eg: the employer of several contacts) ; so the credentials & the
+        # string representations are computed once per related entity.
+        rtype_id = self.value
+        has_perm = user.has_perm_to_view
+        labels: Dict[int, Optional[str]] = {}
+
+        def get_label(related):
+            label = labels.get(related.id, False)
+
+            if label is False:
+                labels[related.id] = label = str(related) if has_perm(related) else None
+
+            return label
+
+        sort_key = collator.sort_key
+        column = []
+
+        for entity in entities:
+            try:
+                rendered = '/'.join(sorted(
+                    (
+                        label
+                        for label in map(
+                            get_label, entity.get_related_entities(rtype_id, True),
+                        )
+                        if label is not None
+                    ),
+                    key=sort_key,
+                ))
+            except Exception as e:
+                logger.debug('Exception when rendering the cell %s: %s', self, e)
+                rendered = ''
+
+            column.append(rendered)
+
+        return column
+
     @property
     def title(self):
         return self._rtype.predicate
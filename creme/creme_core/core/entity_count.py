@@ -0,0 +1,209 @@
+# -*- coding: utf-8 -*-
+
+################################################################################
+#    Creme is a free/open-source Customer Relationship Management software
+#    Copyright (C) 2021  Hybird
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU Affero General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU Affero General Public License for more details.
+#
+#    You should have received a copy of the GNU Affero General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+################################################################################
+
+"""Cache & estimation of the numbers of entities displayed by the list-views.
+
+A list-view counts its entities (with the filtering on credentials, the
+EntityFilter, the search...) at each rendering, i.e. each time the user
+changes the page or the ordering ; with big tables the count dominates the
+response time.
+
+So the counts are stored in the cache of Django (see the setting
+"LISTVIEW_COUNT_CACHE_TIMEOUT"), with keys built from the query (type of
+entity, EntityFilter & its revision, extra Q, search, credentials of the user)
+but not from the ordering or the page.
+The counts related to a type of entity are invalidated when entities of this
+type are saved/deleted, or when their relationships/properties change.
+"""
+
+import json
+import logging
+from hashlib import sha1
+from typing import Optional, Type
+from uuid import uuid4
+
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import DEFAULT_CACHE_ALIAS, caches
+from django.db import connections
+from django.db.models import Q
+
+from ..auth.entity_credentials import EntityCredentials
+from ..models import CremeEntity, EntityFilter, SetCredentials
+from ..utils.queries import QSerializer
+
+logger = logging.getLogger(__name__)
+
+
+class EntitiesCountCache:
+    """Cache for the numbers of entities of the list-views.
+    The counts of a type of entity are stored with a "generation" of this type
+    in their keys ; invalidating the counts of a type just means changing its
+    generation (the old counts will expire).
+    """
+    key_prefix = 'creme_core-entities_count'
+
+    def __init__(self, cache_alias: str = DEFAULT_CACHE_ALIAS):
+        self._cache_alias = cache_alias
+
+    @property
+    def cache(self):
+        return caches[self._cache_alias]
+
+    @property
+    def timeout(self) -> int:
+        return settings.LISTVIEW_COUNT_CACHE_TIMEOUT
+
+    @property
+    def enabled(self) -> bool:
+        return self.timeout > 0
+
+    def _generation_key(self, ctype_id: int) -> str:
+        return f'{self.key_prefix}-generation-{ctype_id}'
+
+    def _get_generation(self, ctype_id: int) -> str:
+        cache = self.cache
+        key = self._generation_key(ctype_id)
+        generation = cache.get(key)
+
+        if generation is None:
+            # NB: add() to avoid overriding the generation set by another process.
+            cache.add(key, uuid4().hex, None)
+            generation = cache.get(key)
+
+        return generation
+
+    def invalidate(self, ctype_id: int) -> None:
+        "Invalidate the counts related to a type of entity."
+        if self.enabled:
+            self.cache.set(self._generation_key(ctype_id), uuid4().hex, None)
+
+    @staticmethod
+    def _credentials_signature(ctype_id: int, user) -> Optional[tuple]:
+        if user.is_superuser:
+            return ('superuser',)
+
+        role = user.role
+        if role is None:
+            return None
+
+        VIEW = EntityCredentials.VIEW
+        allowed_ctype_ids = {None, ctype_id}
+        key = SetCredentials._compilation_key(
+            [
+                sc
+                for sc in role._get_setcredentials()
+                if sc.ctype_id in allowed_ctype_ids and sc.value & VIEW
+            ],
+            user,
+        )
+
+        return None if key is None else (role.id, key)
+
+    def build_key(self, *,
+                  model: Type[CremeEntity],
+                  user,
+                  entity_filter: Optional[EntityFilter] = None,
+                  extra_q: Q = Q(),
+                  search_q: Q = Q(),
+                  ) -> Optional[str]:
+        """Build the key of the count for a list-view's query.
+        @return: A string, or None if the count cannot be cached (the cache is
+                 disabled, the query depends on the context...).
+        """
+        if not self.enabled:
+            return None
+
+        if entity_filter is None:
+            efilter_signature = None
+        elif entity_filter.is_dynamic:
+            return None
+        else:
+            efilter_signature = (entity_filter.id, entity_filter.revision.hex)
+
+        ctype_id = ContentType.objects.get_for_model(model).id
+        creds_signature = self._credentials_signature(ctype_id, user)
+        if creds_signature is None:
+            return None
+
+        serialize = QSerializer().serialize
+
+        try:
+            raw_key = json.dumps(
+                [
+                    efilter_signature,
+                    serialize(extra_q),
+                    serialize(search_q),
+                    creds_signature,
+                ],
+                default=str,
+            )
+        except Exception as e:
+            logger.debug('EntitiesCountCache.build_key(): the query cannot be serialized (%s)', e)
+            return None
+
+        return '{prefix}-{ctype_id}-{generation}-{hash}'.format(
+            prefix=self.key_prefix,
+            ctype_id=ctype_id,
+            generation=self._get_generation(ctype_id),
+            hash=sha1(raw_key.encode()).hexdigest(),
+        )
+
+    def get(self, key: str) -> Optional[int]:
+        return self.cache.get(key)
+
+    def set(self, key: str, count: int) -> None:
+        self.cache.set(key, count, self.timeout)
+
+
+entities_count_cache = EntitiesCountCache()
+
+
+def estimate_count(model: Type[CremeEntity]) -> Optional[int]:
+    """Get the number of rows of the table of a model from the statistics of
+    the DBMS, which is very fast compared to a "COUNT(*)" on a big table.
+    The value is approximated, & it includes the entities in the trash.
+    @return: An integer, or None if the DBMS does not provide statistics
+             (only PostgreSQL & MySQL are managed).
+    """
+    connection = connections[model.objects.db]
+    vendor = connection.vendor
+
+    if vendor == 'postgresql':
+        sql = 'SELECT reltuples FROM pg_class WHERE relname = %s'
+    elif vendor == 'mysql':
+        sql = (
+            'SELECT table_rows FROM information_schema.tables '
+            'WHERE table_schema = DATABASE() AND table_name = %s'
+        )
+    else:
+        return None
+
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [model._meta.db_table])
+        row = cursor.fetchone()
+
+    # NB: PostgreSQL returns -1 for tables which have never been analyzed.
+    return int(row[0]) if row and row[0] is not None and row[0] >= 0 else None
+
+
+def invalidate_entities_count(entity: CremeEntity) -> None:
+    "Invalidate the counts related to the type of an entity."
+    entities_count_cache.invalidate(entity.entity_type_id)
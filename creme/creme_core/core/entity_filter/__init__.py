@@ -20,10 +20,10 @@
 
 import logging
 from collections import OrderedDict
-from typing import TYPE_CHECKING, Dict, Iterator, Optional, Type
+from typing import TYPE_CHECKING, Dict, Iterator, Optional, Sequence, Set, Type
 
 if TYPE_CHECKING:
-    from creme.creme_core.models import CremeEntity
+    from creme.creme_core.models import CremeEntity, CustomField
 
     from .condition_handler import FilterConditionHandler
     from .operands import ConditionDynamicOperand
@@ -229,3 +229,58 @@ entity_filter_registries = _EntityFilterSuperRegistry().register(
         verbose_name='Regular filter (usable in list-view...',
     ),
 )
+
+
+class ConditionsPrefetcher:
+    """Collect the data needed by some conditions to check entities in memory
+    (see FilterConditionHandler.declare_prefetch()), & retrieve them for
+    several entities with grouped queries (see EntityFilter.accept_many()).
+    """
+    def __init__(self):
+        self.relation_type_ids: Set[str] = set()
+        self.custom_fields: Dict[int, 'CustomField'] = {}
+        self.properties = False
+        self.field_names: Set[str] = set()
+
+    def add_relation_type(self, rtype_id: str) -> 'ConditionsPrefetcher':
+        "The Relations with this type are needed (see CremeEntity.get_relations())."
+        self.relation_type_ids.add(rtype_id)
+        return self
+
+    def add_custom_field(self, custom_field: 'CustomField') -> 'ConditionsPrefetcher':
+        "The values of this CustomField are needed (see CremeEntity.get_custom_value())."
+        self.custom_fields[custom_field.id] = custom_field
+        return self
+
+    def add_properties(self) -> 'ConditionsPrefetcher':
+        "The CremeProperties are needed (see CremeEntity.get_properties())."
+        self.properties = True
+        return self
+
+    def add_field(self, field_name: str) -> 'ConditionsPrefetcher':
+        "The ForeignKeys of this field (eg: 'image__user') are needed."
+        self.field_names.add(field_name)
+        return self
+
+    def populate(self, entities: Sequence['CremeEntity']) -> None:
+        """Fill the caches of the given entities.
+        @param entities: Instances of CremeEntity (generally real entities, with
+               the same type).
+        """
+        from creme.creme_core.models import CremeEntity
+        from creme.creme_core.utils.db import populate_related
+
+        if not entities:
+            return
+
+        if self.relation_type_ids:
+            CremeEntity.populate_relations(entities, [*self.relation_type_ids])
+
+        if self.custom_fields:
+            CremeEntity.populate_custom_values(entities, [*self.custom_fields.values()])
+
+        if self.properties:
+            CremeEntity.populate_properties(entities)
+
+        if self.field_names:
+            populate_related(entities, self.field_names)
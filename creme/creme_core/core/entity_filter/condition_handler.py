@@ -56,6 +56,7 @@ from creme.creme_core.utils.meta import FieldInfo, is_date_field
 
 from . import (
     EF_USER,
+    ConditionsPrefetcher,
     _EntityFilterRegistry,
     entity_filter_registries,
     operands,
@@ -124,6 +125,13 @@ class FilterConditionHandler:
         "Get an instance of FilterConditionHandler from serialized data."
         raise NotImplementedError
 
+    def declare_prefetch(self, prefetcher: ConditionsPrefetcher) -> None:
+        """Declare the data which accept() needs, in order to retrieve them for
+        several entities at once (see EntityFilter.accept_many()).
+        Nothing is declared by default.
+        """
+        pass
+
     def description(self, user):
         "Human-readable string explaining the handler."
         raise NotImplementedError
@@ -138,6 +146,16 @@ class FilterConditionHandler:
         """
         return None
 
+    @property
+    def is_dynamic(self) -> bool:
+        """Does the query returned by get_q() depend on the context (current
+        user, current date...) ?
+        The queries of the static handlers are cached by EntityFilter.get_q() ;
+        so override this property only if you are sure the query only depends
+        on the data of the handler.
+        """
+        return True
+
     @classmethod
     def formfield(cls, form_class=None, **kwargs):
         raise NotImplementedError
@@ -226,6 +244,13 @@ class SubFilterConditionHandler(FilterConditionHandler):
     def accept(self, *, entity, user):
         return self.subfilter.accept(entity=entity, user=user)
 
+    def declare_prefetch(self, prefetcher):
+        subfilter = self.subfilter
+
+        if subfilter:
+            for condition in subfilter.get_conditions():
+                condition.handler.declare_prefetch(prefetcher)
+
     @property
     def applicable_on_entity_base(self):
         return self.subfilter.applicable_on_entity_base
@@ -277,6 +302,10 @@ class SubFilterConditionHandler(FilterConditionHandler):
     def get_q(self, user):
         return self.subfilter.get_q(user)
 
+    @property
+    def is_dynamic(self):
+        return self.subfilter.is_dynamic
+
     @classmethod
     def query_for_parent_conditions(cls, ctype):
         return Q(
@@ -305,6 +334,14 @@ class OperatorConditionHandlerMixin:
     def get_operator(cls, operator_id: int) -> Optional[operators.ConditionOperator]:
         return cls.efilter_registry.get_operator(operator_id)
 
+    @property
+    def is_dynamic(self):
+        "The dynamic operands (eg: current user) are resolved by get_q()."
+        return any(
+            self.get_operand(value=value, user=None) is not None
+            for value in self._values
+        )
+
     @classmethod
     def resolve_operands(cls, values, user):
         """Return a list where:
@@ -413,6 +450,16 @@ class RegularFieldConditionHandler(OperatorConditionHandlerMixin,
         )
 
     # TODO: multi-value is stupid for some operator (LT, GT etc...) => improve checking ???
+    def declare_prefetch(self, prefetcher):
+        field_info = self.field_info
+
+        if len(field_info) > 1:
+            # NB: the instances of the last ForeignKey are not needed (see accept()).
+            if isinstance(field_info[-1], ForeignKey):
+                field_info = field_info[:-1]
+
+            prefetcher.add_field('__'.join(field.name for field in field_info))
+
     @classmethod
     def build(cls, *, model, name, data):
         try:
@@ -632,6 +679,11 @@ class DateFieldHandlerMixin:
 
         return '??'
 
+    @property
+    def is_dynamic(self):
+        "Named ranges (eg: 'current_year') depend on the current date."
+        return bool(self._range_name)
+
     def _get_date_range(self):
         "Get a <creme_core.utils.date_range.DateRange> instance from the attributes."
         return date_range_registry.get_range(
@@ -687,7 +739,19 @@ class DateRegularFieldConditionHandler(DateFieldHandlerMixin,
         BaseRegularFieldConditionHandler.__init__(self, model=model, field_name=field_name)
         DateFieldHandlerMixin.__init__(self, **kwargs)
 
-    # def accept(self, *, entity, user):  TODO ? (not needed currently for credentials filters)
+    def accept(self, *, entity, user):
+        field_value = self.field_info.value_from(entity)
+        accept = partial(self._get_date_range().accept, now=now())
+
+        return (
+            any(accept(value) for value in field_value)
+            if isinstance(field_value, list) else
+            accept(field_value)
+        )
+
+    def declare_prefetch(self, prefetcher):
+        if len(self.field_info) > 1:
+            prefetcher.add_field(self._field_name)
 
     @classmethod
     def build(cls, *, model, name, data):
@@ -879,6 +943,12 @@ class CustomFieldConditionHandler(OperatorConditionHandlerMixin,
             accept(field_value=field_value)
         )
 
+    def declare_prefetch(self, prefetcher):
+        cfield = self.custom_field
+
+        if cfield:
+            prefetcher.add_custom_field(cfield)
+
     @classmethod
     def build(cls, *, model, name, data):
         try:
@@ -1069,7 +1139,18 @@ class DateCustomFieldConditionHandler(DateFieldHandlerMixin,
         )
         DateFieldHandlerMixin.__init__(self, **kwargs)
 
-    # def accept(self, *, entity, user):  TODO ? (not needed currently for credentials filters)
+    def accept(self, *, entity, user):
+        cfvalue = entity.get_custom_value(self.custom_field)
+
+        # NB: like get_q(), an entity without value is never accepted
+        #     (even with the range "is empty").
+        return cfvalue is not None and self._get_date_range().accept(cfvalue.value, now=now())
+
+    def declare_prefetch(self, prefetcher):
+        cfield = self.custom_field
+
+        if cfield:
+            prefetcher.add_custom_field(cfield)
 
     @classmethod
     def build(cls, *, model, name, data):
@@ -1218,8 +1299,8 @@ class RelationConditionHandler(BaseRelationConditionHandler):
 
     def accept(self, *, entity, user):
         # NB: we use get_relations() in order to get a cached result, & so avoid
-        #     additional queries when calling several times this method.
-        # TODO: add a system to populate relations when checking several entities
+        #     additional queries when calling several times this method
+        #     (see declare_prefetch()).
         relations = entity.get_relations(relation_type_id=self._rtype_id)
 
         if self._entity_id:
@@ -1237,6 +1318,9 @@ class RelationConditionHandler(BaseRelationConditionHandler):
 
         return not found if self._exclude else found
 
+    def declare_prefetch(self, prefetcher):
+        prefetcher.add_relation_type(self._rtype_id)
+
     @classmethod
     def build(cls, *, model, name, data):
         try:
@@ -1376,6 +1460,10 @@ class RelationConditionHandler(BaseRelationConditionHandler):
 
         return query
 
+    @property
+    def is_dynamic(self):
+        return False
+
 
 class RelationSubFilterConditionHandler(BaseRelationConditionHandler):
     """Filter entities which are have (or have not) certain Relations.
@@ -1492,6 +1580,10 @@ class RelationSubFilterConditionHandler(BaseRelationConditionHandler):
 
         return query
 
+    @property
+    def is_dynamic(self):
+        return self.subfilter.is_dynamic
+
     @classmethod
     def query_for_parent_conditions(cls, ctype):
         # NB: we do not use "ctype" because an EntityFilter on a model can have
@@ -1537,12 +1629,15 @@ class PropertyConditionHandler(FilterConditionHandler):
     def accept(self, *, entity, user):
         ptype_id = self._ptype_id
         # NB: we use get_properties() in order to get a cached result, & so avoid
-        #     additional queries when calling several times this method.
-        # TODO: add a system to populate properties when checking several entities
+        #     additional queries when calling several times this method
+        #     (see declare_prefetch()).
         accepted = any(prop.type_id == ptype_id for prop in entity.get_properties())
 
         return not accepted if self._exclude else accepted
 
+    def declare_prefetch(self, prefetcher):
+        prefetcher.add_properties()
+
     @classmethod
     def build(cls, *, model, name, data):
         if not isinstance(data, bool):
@@ -1597,6 +1692,10 @@ class PropertyConditionHandler(FilterConditionHandler):
 
         return query
 
+    @property
+    def is_dynamic(self):
+        return False
+
     @property
     def property_type(self) -> Union[CremePropertyType, bool]:
         ptype = self._ptype
@@ -19,12 +19,18 @@
 ################################################################################
 
 import logging
-from collections import deque
+from collections import Counter, defaultdict, deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from datetime import MAXYEAR, datetime, timedelta
+from functools import partial
 from heapq import heapify, heappop, heappush
-from typing import Optional, Set
+from multiprocessing import get_context
+from threading import current_thread, main_thread
+from typing import DefaultDict, Dict, Optional, Set
 
 from django.conf import settings
+from django.core.cache import cache
 from django.db.models import Q
 from django.utils.formats import date_format
 from django.utils.timezone import localtime, now
@@ -37,10 +43,162 @@ from creme.creme_core.utils.system import (
     python_subprocess,
 )
 
+from .. import job_worker
 from .queue import Command, get_queue
 
 logger = logging.getLogger(__name__)
 
+# Key of the metrics of the job scheduler in the cache "default" of Django.
+METRICS_CACHE_KEY = 'creme_core-job_scheduler-metrics'
+
+
+class SubprocessJobLauncher:
+    """Run each job in its own (new) process ; so the Python interpreter is
+    started & Django is set up for each job.
+    """
+    def __init__(self):
+        self._procs = {}  # key: job.id; value: subprocess.Popen instance
+
+    def __len__(self):
+        return len(self._procs)
+
+    def start(self, job: Job) -> None:
+        self._procs[job.id] = python_subprocess(
+            f'import django; '
+            f'django.setup(); '
+            f'from creme.creme_core.core.job import job_type_registry; '
+            f'job_type_registry({job.id})'
+        )
+
+    def end(self, job: Job) -> None:
+        proc = self._procs.pop(job.id, None)
+        if proc is not None:
+            proc.wait()  # TODO: use return code ??
+
+    def shutdown(self) -> None:
+        pass
+
+
+class PoolJobLauncher:
+    """Run the jobs in a pool of worker processes, which are re-used ; so
+    Django is set up only once per worker (see the module 'job_worker').
+    When all the workers are busy, the jobs wait for a free worker.
+
+    If a worker dies (OOM killer, segfault...), the pool is broken (all its
+    jobs fail) ; the jobs which have failed are marked as errors & ended (so
+    their slots are released), & a new pool is created for the next jobs.
+    """
+    def __init__(self, size: int):
+        self._size = size
+        self._executor = self._create_executor()
+        self._futures: Dict[int, Future] = {}  # key: job.id
+
+    def __len__(self):
+        return len(self._futures)
+
+    def _create_executor(self) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(
+            max_workers=self._size,
+            # NB: we do not fork the process of the scheduler (which uses
+            #     connections to the DB/broker).
+            mp_context=get_context('spawn'),
+            initializer=job_worker.initialize,
+        )
+
+    @staticmethod
+    def _abort_job(job_id: int, error: BaseException) -> None:
+        """Mark a job as failed, & send the END command the job has not sent
+        (so the scheduler releases its slot).
+        """
+        from django.db import connection
+
+        try:
+            job = Job.objects.get(id=job_id)
+            job.status = Job.STATUS_ERROR
+            job.error = f'The worker process failed: {error}'
+            Job.objects.filter(id=job_id).update(status=job.status, error=job.error)
+
+            get_queue().end_job(job)
+        except Exception:
+            logger.exception('JobScheduler: error when aborting the job id=%s', job_id)
+        finally:
+            # NB: this code is run by a thread of the executor, which does not
+            #     need to keep its connection.
+            if current_thread() is not main_thread():
+                connection.close()
+
+    def _job_done(self, job_id: int, future: Future) -> None:
+        if future.cancelled():
+            return
+
+        e = future.exception()
+        if e is not None:
+            # NB: the jobs catch their errors ; an exception here means that the
+            #     job has not been run until its end (broken pool, invalid job...).
+            logger.critical('JobScheduler: the worker of the job id=%s failed: %s', job_id, e)
+            self._abort_job(job_id, e)
+
+    def start(self, job: Job) -> None:
+        job_id = job.id
+
+        try:
+            future = self._executor.submit(job_worker.run_job, job_id)
+        except BrokenProcessPool:
+            logger.critical('JobScheduler: the pool of workers is broken ; it is re-created.')
+            self._executor.shutdown(wait=False)
+            self._executor = self._create_executor()
+            future = self._executor.submit(job_worker.run_job, job_id)
+
+        self._futures[job_id] = future
+        future.add_done_callback(partial(self._job_done, job_id))
+
+    def end(self, job: Job) -> None:
+        self._futures.pop(job.id, None)
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False)
+
+
+class JobMetrics:
+    """Statistics about the jobs run by the scheduler, per type of job.
+    The durations are in seconds.
+    """
+    def __init__(self):
+        self.count: Counter = Counter()
+        self.wait_time: DefaultDict[str, float] = defaultdict(float)
+        self.run_time: DefaultDict[str, float] = defaultdict(float)
+        self.max_wait_time: DefaultDict[str, float] = defaultdict(float)
+        self.max_run_time: DefaultDict[str, float] = defaultdict(float)
+
+    def add(self, job_type_id: str, wait_time: float, run_time: float) -> None:
+        self.count[job_type_id] += 1
+        self.wait_time[job_type_id] += wait_time
+        self.run_time[job_type_id] += run_time
+        self.max_wait_time[job_type_id] = max(self.max_wait_time[job_type_id], wait_time)
+        self.max_run_time[job_type_id] = max(self.max_run_time[job_type_id], run_time)
+
+    def as_dict(self) -> Dict[str, dict]:
+        "@return: Dictionary; key: ID of JobType; values: dictionary of statistics."
+        return {
+            jtype_id: {
+                'count': count,
+                'mean_wait_time': self.wait_time[jtype_id] / count,
+                'max_wait_time': self.max_wait_time[jtype_id],
+                'mean_run_time': self.run_time[jtype_id] / count,
+                'max_run_time': self.max_run_time[jtype_id],
+            } for jtype_id, count in self.count.items()
+        }
+
+
+def get_metrics() -> Optional[dict]:
+    """Get the metrics stored by the running job scheduler.
+    @return: A dictionary (see JobScheduler.metrics() ; the key "date" gives
+             the date of the last update, in ISO format), or None if no
+             metrics are stored (notice that the cache "default" of Django
+             must be shared between the processes).
+    """
+    return cache.get(METRICS_CACHE_KEY)
+
 
 # TODO: should we rely on a watch dog?
 class JobScheduler:
@@ -53,7 +211,23 @@ class JobScheduler:
           there can be as many processes for them than there are enabled system
           Jobs.
         - User jobs are executed with a pool of processes, and its size is given
-          by settings.MAX_USER_JOBS.
+          by settings.MAX_USER_JOBS. When several user jobs are waiting, the
+          jobs with the greatest priority are run first (see JobType.priority),
+          & the number of running jobs per type can be limited (see
+          JobType.max_concurrency).
+
+    By default each job is run in a new process ; if
+    settings.JOB_WORKERS_POOL_SIZE is greater than 0, the jobs are run by a
+    pool of worker processes (so Django is set up only once per worker, which
+    reduces a lot the starting time of short jobs).
+
+    Notice that the system jobs are not limited by settings.MAX_USER_JOBS ;
+    only the pool of workers (if it is used) limits them.
+
+    Some metrics (queue depth, waiting time & running time of jobs) are
+    available with the method metrics(), & logged at the end of each job.
+    They are stored in the cache of Django too, so another process can read
+    them (see get_metrics() & the command "creme_job_manager --metrics").
 
     If the execution of a (pseudo-)periodic Job takes too long time (more than
     its period), the Job is scheduled to the next valid time, and not executed
@@ -67,7 +241,11 @@ class JobScheduler:
         self._max_user_jobs = settings.MAX_USER_JOBS
         # self._queue = JobSchedulerQueue.get_main_queue()
         self._queue = get_queue()
-        self._procs = {}  # key: job.id; value: subprocess.Popen instance
+
+        pool_size = settings.JOB_WORKERS_POOL_SIZE
+        self._launcher = (
+            PoolJobLauncher(size=pool_size) if pool_size > 0 else SubprocessJobLauncher()
+        )
 
         # Heap, which elements are (wakeup_date, job_instance)
         #   => closer wakeup in the first element.
@@ -76,6 +254,12 @@ class JobScheduler:
         self._system_jobs_starts = {}
         self._users_jobs = deque()
         self._running_userjob_ids: Set[int] = set()
+        self._running_userjobs_per_type: Counter = Counter()
+
+        # Metrics
+        self._queued_times: Dict[int, datetime] = {}  # key: job.id
+        self._start_times: Dict[int, datetime] = {}  # key: job.id
+        self._job_metrics = JobMetrics()
 
     class _DeferredJob:
         """
@@ -133,6 +317,7 @@ class JobScheduler:
                     )
 
                 users_jobs.appendleft(job)
+                self._queued_times[job.id] = now_value
             else:  # System jobs
                 if jtype.periodic != JobType.NOT_PERIODIC:
                     heappush(system_jobs, (self._next_wakeup(job, now_value), job.id, job))
@@ -178,6 +363,7 @@ class JobScheduler:
             # Avoids a possible race condition: the job could be already in the list
             if user_job.id not in (j.id for j in users_jobs):
                 users_jobs.appendleft(user_job)
+                self._queued_times[user_job.id] = now()
         else:
             logger.warning(
                 'JobScheduler: try to start the job "%s", which is a'
@@ -185,24 +371,71 @@ class JobScheduler:
                 repr(user_job),
             )
 
+    def _pop_user_job(self) -> Optional[Job]:
+        """Get the next user job to run (& remove it from the waiting jobs).
+        It's the oldest job with the greatest priority, which type has not
+        reached its maximum number of running jobs.
+        @return: A Job instance, or None if no job can be run.
+        """
+        users_jobs = self._users_jobs
+        running_per_type = self._running_userjobs_per_type
+        selected = None
+        selected_priority = None
+
+        # NB: the oldest jobs are at the end
+        for job in reversed(users_jobs):
+            jtype = job.type
+            max_concurrency = jtype.max_concurrency
+
+            if max_concurrency is not None and running_per_type[jtype.id] >= max_concurrency:
+                continue
+
+            if selected is None or jtype.priority > selected_priority:
+                selected = job
+                selected_priority = jtype.priority
+
+        if selected is not None:
+            users_jobs.remove(selected)
+
+        return selected
+
     def _start_job(self, job: Job):
         logger.info('JobScheduler: start %s', repr(job))
 
-        self._procs[job.id] = python_subprocess(
-            f'import django; '
-            f'django.setup(); '
-            f'from creme.creme_core.core.job import job_type_registry; '
-            f'job_type_registry({job.id})'
-        )
+        self._start_times[job.id] = now()
+        self._launcher.start(job)
 
     def _end_job(self, job: Job):
-        logger.info('JobScheduler: end %s', repr(job))
-        proc = self._procs.pop(job.id, None)
-        if proc is not None:
-            proc.wait()  # TODO: use return code ??
+        job_id = job.id
+        end_time = now()
+        launch_time = self._start_times.pop(job_id, end_time)
+        # NB: system jobs are not queued (they are launched at their wake up)
+        queued_time = self._queued_times.pop(job_id, launch_time)
+
+        # NB: with a pool of workers, a launched job can wait for a free worker ;
+        #     so we use the date stored by the job when its execution begins.
+        last_run = job.last_run
+        start_time = (
+            last_run
+            if last_run is not None and launch_time <= last_run <= end_time else
+            launch_time
+        )
+
+        wait_time = (start_time - queued_time).total_seconds()
+        run_time = (end_time - start_time).total_seconds()
+        self._job_metrics.add(job.type_id, wait_time=wait_time, run_time=run_time)
+
+        logger.info(
+            'JobScheduler: end %s (waiting time: %.2fs, running time: %.2fs, '
+            'waiting user jobs: %s)',
+            repr(job), wait_time, run_time, len(self._users_jobs),
+        )
+        self._launcher.end(job)
+        self._store_metrics()
 
     def _handle_kill(self, *args):
-        logger.info('Job manager stops: %d running job(s)', len(self._procs))
+        logger.info('Job manager stops: %d running job(s)', len(self._launcher))
+        self._launcher.shutdown()
         self._queue.destroy()
         exit()
 
@@ -215,7 +448,9 @@ class JobScheduler:
             logger.warning('JobScheduler.handle_command_end() -> invalid jod ID: %s', job_id)
         else:
             if job.user:
-                self._running_userjob_ids.discard(job.id)
+                if job.id in self._running_userjob_ids:
+                    self._running_userjob_ids.discard(job.id)
+                    self._running_userjobs_per_type[job.type_id] -= 1
             else:
                 if job.type.periodic == JobType.NOT_PERIODIC:
                     logger.critical(
@@ -330,6 +565,30 @@ class JobScheduler:
         else:
             self._push_user_job(job)
 
+    def metrics(self) -> dict:
+        """Get some statistics about the jobs.
+        @return: A dictionary with the keys:
+            - "waiting_user_jobs": number of user jobs which wait to be run.
+            - "running_jobs": number of running jobs.
+            - "jobs": dictionary of statistics about the finished jobs, per
+              type of job (see JobMetrics.as_dict()).
+        """
+        return {
+            'waiting_user_jobs': len(self._users_jobs),
+            'running_jobs': len(self._launcher),
+            'jobs': self._job_metrics.as_dict(),
+        }
+
+    def _store_metrics(self) -> None:
+        try:
+            cache.set(
+                METRICS_CACHE_KEY,
+                {**self.metrics(), 'date': now().isoformat()},
+                timeout=None,
+            )
+        except Exception:
+            logger.exception('JobScheduler: error when storing the metrics')
+
     def start(self, verbose: bool = True) -> None:
         logger.info('Job scheduler starts')
 
@@ -339,6 +598,7 @@ class JobScheduler:
         #       (with a problem which is not a catchable) ?
         self._queue.clear()
         self._retrieve_jobs()
+        self._store_metrics()
 
         enable_exit_handler(self._handle_kill)
 
@@ -373,6 +633,9 @@ class JobScheduler:
             else:
                 print('No user job at the moment.')
 
+            if isinstance(self._launcher, PoolJobLauncher):
+                print(f'\nThe jobs are run by {settings.JOB_WORKERS_POOL_SIZE} worker(s).')
+
             print('\nQuit the server with CTRL-BREAK.')
 
         MAX_USER_JOBS = self._max_user_jobs
@@ -433,9 +696,13 @@ class JobScheduler:
                 timeout = 0
 
             while len(running_userjob_ids) <= MAX_USER_JOBS and users_jobs:
-                job = users_jobs.pop()
+                job = self._pop_user_job()
+                if job is None:  # All the waiting jobs have reached their limit
+                    break
+
                 self._start_job(job)
                 running_userjob_ids.add(job.id)
+                self._running_userjobs_per_type[job.type_id] += 1
 
             cmd = self._queue.get_command(timeout)
             if cmd is None:  # Time out -> time to run a system job
@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+
+################################################################################
+#    Creme is a free/open-source Customer Relationship Management software
+#    Copyright (C) 2021  Hybird
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU Affero General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU Affero General Public License for more details.
+#
+#    You should have received a copy of the GNU Affero General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+################################################################################
+
+"""Functions executed by the processes of the pool of workers used by the
+JobScheduler (see settings.JOB_WORKERS_POOL_SIZE).
+
+NB: this module must be importable before django is set up (the initializer
+    is sent to the new processes before the configuration is loaded) ; so it
+    is not in the package 'job' (which imports the models).
+"""
+
+
+def initialize() -> None:
+    "Initializer of the worker processes: Django is set up once per process."
+    import django
+
+    django.setup()
+
+
+def run_job(job_id: int) -> None:
+    "Execute a Job in a worker process (which is re-used by other jobs)."
+    from django.db import close_old_connections
+    from django.utils.translation import deactivate
+
+    from creme.creme_core.global_info import clear_global_info
+
+    from .job import job_type_registry
+
+    close_old_connections()
+
+    try:
+        job_type_registry(job_id)
+    finally:
+        # We clean the environment for the next job
+        clear_global_info()
+        deactivate()
+        close_old_connections()
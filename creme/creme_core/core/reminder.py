@@ -23,7 +23,9 @@ from datetime import datetime
 from typing import Dict, Iterator, List, Optional, Type
 
 from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
 from django.core.mail import EmailMessage, get_connection
+from django.db.models import QuerySet
 from django.db.models.query_utils import Q
 from django.db.transaction import atomic
 from django.utils.timezone import now
@@ -39,6 +41,9 @@ class Reminder:
     id: str = ''  # Override with generate_id()
     model: Type[CremeModel]  # Override with a CremeModel sub-class
 
+    # Number of instances retrieved (& marked as reminded) at once.
+    chunk_size: int = 100
+
     def __init__(self):
         pass
 
@@ -66,24 +71,39 @@ class Reminder:
     def generate_email_body(self, object: CremeModel) -> str:
         pass
 
-    def get_Q_filter(self) -> Q:  # TODO: get_queryset instead ????
+    def get_Q_filter(self) -> Q:
+        pass
+
+    def get_queryset(self) -> QuerySet:
+        "Get the instances which have to be reminded."
+        return self.model.objects.filter(self.get_Q_filter()).exclude(reminded=True)
+
+    def populate(self, instances: List[CremeModel]) -> None:
+        """Hook called before the emails of a chunk of instances are built ;
+        override it to retrieve the related data of all instances at once.
+        """
         pass
 
     def ok_for_continue(self) -> bool:
         return True
 
-    def send_mails(self, instance: CremeModel, job: Job) -> bool:
+    def build_messages(self, instance: CremeModel) -> List[EmailMessage]:
         body    = self.generate_email_body(instance)
         subject = self.generate_email_subject(instance)
 
         EMAIL_SENDER = settings.EMAIL_SENDER
-        messages = [
+
+        return [
             EmailMessage(subject, body, EMAIL_SENDER, [email])
             for email in self.get_emails(instance)
         ]
 
+    def _send_messages(self, messages: List[EmailMessage], job: Job, connection=None) -> bool:
         try:
-            with get_connection() as connection:
+            if connection is None:
+                with get_connection() as connection:
+                    connection.send_messages(messages)
+            else:
                 connection.send_messages(messages)
         except Exception as e:
             logger.critical('Error while sending reminder emails (%s)', e)
@@ -101,24 +121,96 @@ class Reminder:
 
         return True  # Means 'OK'
 
+    def send_mails(self, instance: CremeModel, job: Job) -> bool:
+        return self._send_messages(self.build_messages(instance), job)
+
+    def iter_chunks(self) -> Iterator[List[CremeModel]]:
+        """Iterate on the instances to remind, by chunks.
+        NB: the instances are retrieved by increasing ID (keyset pagination),
+            so the reminded instances can be modified between 2 chunks.
+        """
+        queryset = self.get_queryset().order_by('pk')
+        chunk_size = self.chunk_size
+        last_pk = None
+
+        while True:
+            chunk = [
+                *(
+                    queryset if last_pk is None else queryset.filter(pk__gt=last_pk)
+                )[:chunk_size]
+            ]
+            if not chunk:
+                break
+
+            yield chunk
+
+            if len(chunk) < chunk_size:
+                break
+
+            last_pk = chunk[-1].pk
+
+    def _mark_as_reminded(self, instances: List[CremeModel], date_of_remind: datetime) -> None:
+        ctype = ContentType.objects.get_for_model(self.model)
+
+        with atomic():
+            DateReminder.objects.bulk_create([
+                DateReminder(
+                    date_of_remind=date_of_remind,
+                    ident=FIRST_REMINDER,
+                    model_content_type=ctype,
+                    model_id=instance.pk,
+                ) for instance in instances
+            ])
+            self.model.objects.filter(
+                pk__in=[instance.pk for instance in instances],
+            ).update(reminded=True)
+
+        for instance in instances:
+            instance.reminded = True
+
     def execute(self, job: Job) -> None:
         if not self.ok_for_continue():
             return
 
         dt_now = now().replace(microsecond=0, second=0)
+        connection = None
 
-        for instance in self.model.objects.filter(self.get_Q_filter()).exclude(reminded=True):
-            self.send_mails(instance, job)
-
-            with atomic():
-                DateReminder.objects.create(
-                    date_of_remind=dt_now,
-                    ident=FIRST_REMINDER,
-                    object_of_reminder=instance,
-                )
+        try:
+            for chunk in self.iter_chunks():
+                self.populate(chunk)
+                sent = []
+
+                for instance in chunk:
+                    # NB: one connection is used for all the chunks, but the
+                    #     messages are sent one by one, so an error does not
+                    #     prevent the other instances from being reminded.
+                    for message in self.build_messages(instance):
+                        if connection is None:
+                            connection = get_connection()
+
+                        if not self._send_messages([message], job, connection=connection):
+                            # NB: the SMTP backend does not re-open a dead
+                            #     connection, so the next messages use a new one.
+                            self._close_connection(connection)
+                            connection = None
+                            break
+                    else:
+                        sent.append(instance)
+
+                # NB: the instances which have not been sent are retried by the
+                #     next run of the job (see creme_jobs.reminder).
+                if sent:
+                    self._mark_as_reminded(sent, date_of_remind=dt_now)
+        finally:
+            if connection is not None:
+                self._close_connection(connection)
 
-                instance.reminded = True
-                instance.save()
+    @staticmethod
+    def _close_connection(connection) -> None:
+        try:
+            connection.close()
+        except Exception:
+            logger.exception('Reminder: error when closing the connection')
 
     def next_wakeup(self, now_value: datetime) -> Optional[datetime]:
         """Returns the next time when the job manager should wake up in order
@@ -27,7 +27,9 @@ from django.db.models import Model
 from django.db.models.query import Q, QuerySet
 
 from ..core import entity_cell
+from ..core.search_index import get_search_index_backend
 from ..models import CustomField, FieldsConfig, SearchConfigItem
+from ..utils import split_filter
 # from ..models.search import SearchField
 from ..utils.string import smart_split
 
@@ -146,6 +148,32 @@ class Searcher:
 
         return result_q
 
+    def _build_index_query(self, backend, model, words, cells) -> Q:
+        """Build a Q with given cells for the given search, by using a search
+        index backend.
+        Each word must be contained in (at least) one cell ; the cells which
+        cannot be indexed are searched with the classical way.
+
+        @param backend: Instance of
+               <creme_core.core.search_index.SearchIndexBackend>.
+        @param model: Class inheriting <creme_core.models.CremeEntity>.
+        @param words: Searched strings.
+        @param cells: Sequence of <creme_core.core.entity_cell.EntityCell> objects.
+        @return: Instance of <django.db.models.query.Q>.
+        """
+        indexed_cells, other_cells = split_filter(backend.is_indexable, cells)
+        result_q = Q()
+
+        for word in words:
+            word_q = backend.search_q(model, indexed_cells, word) if indexed_cells else Q()
+
+            if other_cells:
+                word_q |= self._build_query([word], other_cells)
+
+            result_q &= word_q
+
+        return result_q
+
     # def get_fields(self, model):
     #     """Get the list of SearchFields instances used to search in 'model'.
     #
@@ -176,6 +204,16 @@ class Searcher:
 
         strings = smart_split(research)
 
+        backend = get_search_index_backend()
+        if backend is not None:
+            if not cells:
+                return None
+
+            qs = model.objects.filter(self._build_index_query(backend, model, strings, cells))
+
+            # NB: the index is queried with sub-queries (no JOIN)
+            return qs if all(map(backend.is_indexable, cells)) else qs.distinct()
+
         # TODO: distinct() only if there is a JOIN...
         # return model.objects.filter(
         #     self._build_query(strings, searchfields)
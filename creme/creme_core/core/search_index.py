@@ -0,0 +1,310 @@
+# -*- coding: utf-8 -*-
+
+################################################################################
+#    Creme is a free/open-source Customer Relationship Management software
+#    Copyright (C) 2021  Hybird
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU Affero General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU Affero General Public License for more details.
+#
+#    You should have received a copy of the GNU Affero General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+################################################################################
+
+"""Search-index backends.
+
+The global search & the quick search (see creme_core.core.search.Searcher)
+use by default some "LIKE" queries on all the configured fields, which is very
+slow with big databases. A search-index backend stores the searched contents
+in a dedicated table (see the model SearchIndexEntry), & can use the full-text
+features of the DBMS to query it.
+
+The backend is selected by the setting "SEARCH_INDEX_BACKEND" ; the index is
+kept up-to-date when the entities (& their custom-values) are saved/deleted,
+& it can be (re-)built with the command "creme_search_index".
+The cells which depend on other instances (e.g. "sector__title") are not
+indexed (see SearchIndexBackend.is_indexable()) ; they are searched with the
+classical queries.
+"""
+
+import logging
+import re
+from collections import defaultdict
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Type
+
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+
+from ..global_info import get_per_request_cache
+from ..models import (
+    CremeEntity,
+    CustomField,
+    SearchConfigItem,
+    SearchIndexEntry,
+)
+from ..utils.imports import import_object
+from . import entity_cell
+
+logger = logging.getLogger(__name__)
+
+_WORD_RE = re.compile(r'\w+')
+
+
+def normalize_content(content: str) -> str:
+    "Normalize a content (indexed content or searched word) to get case-insensitive searches."
+    return content.casefold()
+
+
+class SearchIndexBackend:
+    """Base class for the search-index backends.
+
+    The contents of the configured cells (see SearchConfigItem) are stored in
+    instances of SearchIndexEntry (one instance per couple (entity, cell));
+    the sub-classes just have to implement the method 'word_q()' which filters
+    the entries containing a word.
+    """
+    # Types of cells which can be indexed ; other types are searched with the
+    # classical way (see Searcher).
+    indexable_cell_types = {
+        entity_cell.EntityCellRegularField.type_id,
+        entity_cell.EntityCellCustomField.type_id,
+    }
+
+    def is_indexable(self, cell: entity_cell.EntityCell) -> bool:
+        """Can a cell be indexed?
+        NB: the cells which depend on other instances (ForeignKeys,
+            ManyToManyFields, choices of custom-fields) are not indexed,
+            because their entries would not be updated when these instances
+            are modified.
+        """
+        if cell.type_id not in self.indexable_cell_types:
+            return False
+
+        if isinstance(cell, entity_cell.EntityCellCustomField):
+            return cell.custom_field.field_type not in (CustomField.ENUM, CustomField.MULTI_ENUM)
+
+        return not any(field.is_relation for field in cell.field_info)
+
+    def get_cells(self, ctype: ContentType) -> List[entity_cell.EntityCell]:
+        """Get the cells which are indexed for a type of entity, i.e. the union
+        of the cells of all the search configurations (all roles) of this type.
+        """
+        cache = get_per_request_cache()
+        cache_key = f'creme_core-search_index_cells-{ctype.id}'
+        cells = cache.get(cache_key)
+
+        if cells is None:
+            sc_items = [*SearchConfigItem.objects.filter(content_type=ctype)]
+
+            # The default configuration is used when no configuration exists
+            # for the role of the user.
+            if not any(sci.role_id is None and not sci.superuser for sci in sc_items):
+                sc_items.append(SearchConfigItem(content_type=ctype))
+
+            cells_per_key: Dict[str, entity_cell.EntityCell] = {}
+            for sci in sc_items:
+                if not sci.disabled:
+                    for cell in sci.refined_cells:
+                        if self.is_indexable(cell):
+                            cells_per_key.setdefault(cell.key, cell)
+
+            cache[cache_key] = cells = [*cells_per_key.values()]
+
+        return cells
+
+    @staticmethod
+    def get_cell_content(cell: entity_cell.EntityCell, entity: CremeEntity) -> str:
+        if isinstance(cell, entity_cell.EntityCellCustomField):
+            cvalue = entity.get_custom_value(cell.custom_field)
+
+            return '' if cvalue is None else str(cvalue)
+
+        value = cell.field_info.value_from(entity)
+
+        return '' if value is None else str(value)
+
+    def _build_entries(self,
+                       ctype: ContentType,
+                       entities: Sequence[CremeEntity],
+                       ) -> Iterator[SearchIndexEntry]:
+        cells = self.get_cells(ctype)
+        if not cells:
+            return
+
+        entity_cell.EntityCell.mixed_populate_entities(cells, entities, user=None)
+
+        get_content = self.get_cell_content
+
+        for entity in entities:
+            for cell in cells:
+                try:
+                    content = get_content(cell, entity)
+                except Exception as e:
+                    logger.warning(
+                        'SearchIndexBackend: cannot index the cell "%s" of "%s" (%s)',
+                        cell.key, entity.id, e,
+                    )
+                    continue
+
+                if content:
+                    yield SearchIndexEntry(
+                        entity_id=entity.id,
+                        entity_ctype=ctype,
+                        cell_key=cell.key,
+                        content=normalize_content(content),
+                    )
+
+    def index(self, entities: Iterable[CremeEntity]) -> int:
+        """(Re-)Index some entities.
+        @param entities: Instances of CremeEntity ; they should be real entities
+               (instances of the final classes).
+        @return: The number of created entries.
+        """
+        get_ct = ContentType.objects.get_for_model
+        entities_per_ctype = defaultdict(list)
+
+        for entity in entities:
+            ctype = get_ct(entity)
+
+            if ctype.id != entity.entity_type_id:
+                entity = entity.get_real_entity()
+                ctype = entity.entity_type
+
+            entities_per_ctype[ctype].append(entity)
+
+        count = 0
+
+        for ctype, ctype_entities in entities_per_ctype.items():
+            self.unindex([e.id for e in ctype_entities])
+            count += len(SearchIndexEntry.objects.bulk_create(
+                self._build_entries(ctype, ctype_entities),
+            ))
+
+        return count
+
+    def unindex(self, entity_ids: Iterable[int]) -> None:
+        SearchIndexEntry.objects.filter(entity_id__in=entity_ids).delete()
+
+    def rebuild(self, model: Type[CremeEntity], chunk_size: int = 256) -> int:
+        """Rebuild the index for all the entities of a type.
+        @param model: Class inheriting CremeEntity.
+        @param chunk_size: Number of entities which are indexed at once.
+        @return: The number of created entries.
+        """
+        ctype = ContentType.objects.get_for_model(model)
+        SearchIndexEntry.objects.filter(entity_ctype=ctype).delete()
+
+        count = 0
+        last_id = 0
+
+        while True:
+            entities = [*model.objects.filter(id__gt=last_id).order_by('id')[:chunk_size]]
+            if not entities:
+                break
+
+            count += len(SearchIndexEntry.objects.bulk_create(
+                self._build_entries(ctype, entities),
+            ))
+            last_id = entities[-1].id
+
+        return count
+
+    def word_q(self, word: str) -> Q:
+        """Build the Q instance which filters the SearchIndexEntries containing
+        a searched word.
+        @param word: Normalized word (see normalize_content()).
+        """
+        raise NotImplementedError
+
+    def search_q(self,
+                 model: Type[CremeEntity],
+                 cells: Iterable[entity_cell.EntityCell],
+                 word: str,
+                 ) -> Q:
+        """Build the Q instance which filters the entities containing a word
+        in (at least) one of the given cells.
+        @param model: Class inheriting CremeEntity.
+        @param cells: Indexable cells (see is_indexable()).
+        @param word: Searched string.
+        @return: A Q instance to filter instances of 'model'.
+        """
+        return Q(
+            pk__in=SearchIndexEntry.objects.filter(
+                entity_ctype=ContentType.objects.get_for_model(model),
+                cell_key__in=[cell.key for cell in cells],
+            ).filter(
+                self.word_q(normalize_content(word)),
+            ).values('entity_id')
+        )
+
+
+class PythonSearchIndexBackend(SearchIndexBackend):
+    """Backend which works with all DBMS.
+    The entries are searched with "LIKE" queries, but only one table is scanned
+    (instead of all the tables of the searched fields).
+    """
+    def word_q(self, word):
+        return Q(content__contains=word)
+
+
+class SQLiteFTS5SearchIndexBackend(SearchIndexBackend):
+    """Backend using the extension FTS5 of SQLite.
+    The full-text table is created (& kept synchronized) by the migrations of
+    creme_core ; the words are searched as prefixes of the indexed words.
+    """
+    fts_table = 'creme_core_searchindexentry_fts'
+
+    def word_q(self, word):
+        if not _WORD_RE.search(word):
+            return Q(content__contains=word)
+
+        escaped = word.replace('"', '""')
+
+        return Q(id__in=RawSQL(
+            f'SELECT rowid FROM {self.fts_table} WHERE {self.fts_table} MATCH %s',
+            [f'"{escaped}"*'],
+        ))
+
+
+class PostgreSQLSearchIndexBackend(SearchIndexBackend):
+    """Backend using the tsvector of PostgreSQL.
+    The GIN index is created by the migrations of creme_core ; the words are
+    searched as prefixes of the indexed words.
+    """
+    def word_q(self, word):
+        tokens = _WORD_RE.findall(word)
+        if not tokens:
+            return Q(content__contains=word)
+
+        return Q(id__in=RawSQL(
+            "SELECT id FROM creme_core_searchindexentry "
+            "WHERE to_tsvector('simple', content) @@ to_tsquery('simple', %s)",
+            [' <-> '.join(f'{token}:*' for token in tokens)],
+        ))
+
+
+_BACKENDS: Dict[str, SearchIndexBackend] = {}
+
+
+def get_search_index_backend() -> Optional[SearchIndexBackend]:
+    """Get the backend configured by the setting "SEARCH_INDEX_BACKEND".
+    @return: An instance of SearchIndexBackend, or None if no index is used.
+    """
+    path = settings.SEARCH_INDEX_BACKEND
+    if not path:
+        return None
+
+    backend = _BACKENDS.get(path)
+    if backend is None:
+        _BACKENDS[path] = backend = import_object(path)()
+
+    return backend
@@ -76,6 +76,11 @@ class JobType:
     PERIODIC: these system Jobs are run every Job.periodicity.as_timedelta().
     PSEUDO_PERIODIC: these Jobs have a dynamic 'period' (so it is not really a period).
                      They can compute the next time they should be run.
+
+    These meta-data are used by the JobScheduler to choose the next User Job to run :
+        - priority: the waiting Jobs with the greatest priority are run first.
+        - max_concurrency: maximum number of Jobs of this type which can run
+                           at the same time (<None> means no limit).
     """
     # JobType 'periodic' constants
     NOT_PERIODIC    = 0
@@ -85,6 +90,8 @@ class JobType:
     id: str = ''   # Overload with a string ; use generate_id()
     verbose_name: str = 'JOB'  # Overload with a gettext_lazy object
     periodic: int = NOT_PERIODIC
+    priority: int = 0
+    max_concurrency: Optional[int] = None
 
     class Error(Exception):
         pass
@@ -31,7 +31,12 @@ from django.utils.translation import ngettext
 
 from ..core.batch_process import BatchAction
 from ..core.paginator import FlowPaginator
-from ..models import EntityCredentials, EntityFilter, EntityJobResult
+from ..models import (
+    EntityCredentials,
+    EntityFilter,
+    EntityJobResult,
+    HistoryLineBuffer,
+)
 from .base import JobProgress, JobType
 
 logger = logging.getLogger(__name__)
@@ -102,34 +107,37 @@ class _BatchProcessType(JobType):
         actions = [*self._get_actions(model, job_data)]
         create_result = partial(EntityJobResult.objects.create, job=job)
 
-        for entities_page in paginator.pages():
-            for entity in entities_page.object_list:
-                if entity.id in already_processed:
-                    continue
-
-                changed = False
-
-                with atomic():
-                    try:
-                        final_entity = model.objects.select_for_update().get(id=entity.id)
-                    except model.DoesNotExist:
+        with HistoryLineBuffer() as history_buffer:
+            for entities_page in paginator.pages():
+                for entity in entities_page.object_list:
+                    if entity.id in already_processed:
                         continue
 
-                    for action in actions:
-                        if action(final_entity):
-                            changed = True
+                    changed = False
 
-                    if changed:
+                    with history_buffer.savepoint(), atomic():
                         try:
-                            final_entity.full_clean()
-                        except ValidationError as e:
-                            create_result(
-                                entity=final_entity,
-                                messages=self._humanize_validation_error(final_entity, e)
-                            )
-                        else:
-                            final_entity.save()
-                            create_result(entity=final_entity)
+                            final_entity = model.objects.select_for_update().get(id=entity.id)
+                        except model.DoesNotExist:
+                            continue
+
+                        for action in actions:
+                            if action(final_entity):
+                                changed = True
+
+                        if changed:
+                            try:
+                                final_entity.full_clean()
+                            except ValidationError as e:
+                                create_result(
+                                    entity=final_entity,
+                                    messages=self._humanize_validation_error(final_entity, e)
+                                )
+                            else:
+                                final_entity.save()
+                                create_result(entity=final_entity)
+
+                history_buffer.flush()
 
     def progress(self, job):
         count = EntityJobResult.objects.filter(job=job).count()
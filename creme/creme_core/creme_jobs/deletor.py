@@ -20,40 +20,143 @@
 
 from collections import Counter
 
-from django.db.models import F, ProtectedError
+from django.db.models import F, Model, ProtectedError
 from django.db.transaction import atomic
+from django.utils.timezone import now
 from django.utils.translation import gettext
 from django.utils.translation import gettext_lazy as _
 from django.utils.translation import ngettext
 
-from ..models import DeletionCommand, FieldsConfig, JobResult
-from ..signals import pre_replace_and_delete
+from ..core.search_index import get_search_index_backend
+from ..models import (
+    CremeEntity,
+    CremeModel,
+    DeletionCommand,
+    FieldsConfig,
+    JobResult,
+)
+from ..models.entity import _SEARCH_FIELD_MAX_LENGTH
+from ..models.history import HistoryLineBuffer, _HLTEntityEdition
+from ..signals import post_replace_in_bulk, pre_replace_and_delete
 from ..utils.translation import get_model_verbose_name
 from .base import JobProgress, JobType
 
 
 # TODO: possibility to resume the job if it failed ?
 class _DeletorType(JobType):
-    """Job which updates ForeignKeys referencing an instance before deleting it."""
+    """Job which updates ForeignKeys referencing an instance before deleting it.
+
+    The ForeignKeys are updated by chunks (one UPDATE per chunk, HistoryLines
+    created in bulk) ; the instances are saved one by one only if their model
+    needs it (see needs_save()). As "post_save" is not sent for the chunks,
+    the signal "post_replace_in_bulk" is sent instead.
+    """
     id = JobType.generate_id('creme_core', 'deletor')
     verbose_name = _('Replace & delete')
 
-    def _execute(self, job):
+    # Number of instances updated in a transaction (bulk mode).
+    chunk_size = 256
+
+    @staticmethod
+    def needs_save(model) -> bool:
+        """Does the instances of a model need to be saved one by one (to run
+        their business logic) when one of their ForeignKeys is replaced ?
+        A model can declare it with the class attribute "replacement_needs_save" ;
+        by default, it's <True> if the model overrides the method save().
+        """
+        needs_save = getattr(model, 'replacement_needs_save', None)
+        if needs_save is not None:
+            return needs_save
+
+        return any(
+            'save' in vars(cls)
+            for cls in model.__mro__
+            if issubclass(cls, Model) and cls not in (Model, CremeModel, CremeEntity)
+        )
+
+    def _replace_one_by_one(self, dcom, model_field, instance_2_del, new_value):
+        rel_mngr   = model_field.model._default_manager
+        field_name = model_field.name
+        dcom_mngr  = DeletionCommand.objects
+
+        for pk in rel_mngr.filter(
+            **{field_name: instance_2_del.pk}
+        ).values_list('pk', flat=True):
+            # NB1: we perform a .save(), not an .update() in order to:
+            #       - let the model compute it's business logic (if there is one).
+            #       - get an HistoryLine for entities.
+            # NB2: as in edition view, we perform a select_for_update() to avoid
+            #      overriding other fields (if there are concurrent accesses)
+            with atomic():
+                related_instance = rel_mngr.select_for_update().filter(pk=pk).first()
+                if related_instance is not None:
+                    if model_field.many_to_many:
+                        getattr(related_instance, field_name).add(new_value)
+                    else:
+                        setattr(related_instance, field_name, new_value)
+                        related_instance.save()
+
+                dcom_mngr.filter(pk=dcom.pk).update(updated_count=F('updated_count') + 1)
+
+    def _replace_in_bulk(self, dcom, model_field, instance_2_del, new_value):
+        model = model_field.model
+        field_name = model_field.name
+        queryset = model._default_manager.filter(
+            **{field_name: instance_2_del.pk}
+        ).order_by('pk')
         dcom_mngr = DeletionCommand.objects
-        dcom = dcom_mngr.get(job=job)
+
+        is_entity = issubclass(model, CremeEntity)
+        updated_fields = [field_name]
+        if is_entity:
+            updated_fields.extend(('modified', 'header_filter_search_field'))
+
+        search_backend = get_search_index_backend() if is_entity else None
+
+        with HistoryLineBuffer() as history_buffer:
+            while True:
+                with history_buffer.savepoint(), atomic():
+                    instances = [*queryset.select_for_update()[:self.chunk_size]]
+                    if not instances:
+                        break
+
+                    now_value = now()
+
+                    for instance in instances:
+                        setattr(instance, field_name, new_value)
+
+                        if is_entity:
+                            instance.modified = now_value
+                            instance.header_filter_search_field = \
+                                instance._search_field_value()[:_SEARCH_FIELD_MAX_LENGTH]
+                            _HLTEntityEdition.create_lines(instance)
+
+                    model._default_manager.bulk_update(instances, updated_fields)
+
+                    if search_backend is not None:
+                        search_backend.index(instances)
+
+                    post_replace_in_bulk.send_robust(
+                        sender=model, instances=instances, model_field=model_field,
+                    )
+
+                    dcom_mngr.filter(pk=dcom.pk).update(
+                        updated_count=F('updated_count') + len(instances),
+                    )
+
+                history_buffer.flush()
+
+    def _execute(self, job):
+        dcom = DeletionCommand.objects.get(job=job)
         instance_2_del = dcom.content_type \
                              .model_class() \
                              ._default_manager \
                              .get(pk=dcom.pk_to_delete)
 
         # TODO: is_deleted field ?
-        # TODO: regroup by same CType & update several fields at once when its possible
         for replacer in dcom.replacers:
             new_value = replacer.get_value()
-
             model_field = replacer.model_field
-            rel_mngr   = model_field.model._default_manager
-            field_name = model_field.name
 
             pre_replace_and_delete.send_robust(
                 sender=instance_2_del,
@@ -61,24 +164,15 @@ class _DeletorType(JobType):
                 replacing_instance=new_value,
             )
 
-            for pk in rel_mngr.filter(
-                **{field_name: instance_2_del.pk}
-            ).values_list('pk', flat=True):
-                # NB1: we perform a .save(), not an .update() in order to:
-                #       - let the model compute it's business logic (if there is one).
-                #       - get an HistoryLine for entities.
-                # NB2: as in edition view, we perform a select_for_update() to avoid
-                #      overriding other fields (if there are concurrent accesses)
-                with atomic():
-                    related_instance = rel_mngr.select_for_update().filter(pk=pk).first()
-                    if related_instance is not None:
-                        if model_field.many_to_many:
-                            getattr(related_instance, field_name).add(new_value)
-                        else:
-                            setattr(related_instance, field_name, new_value)
-                            related_instance.save()
-
-                    dcom_mngr.filter(pk=dcom.pk).update(updated_count=F('updated_count') + 1)
+            replace = (
+                self._replace_one_by_one
+                if model_field.many_to_many or self.needs_save(model_field.model) else
+                self._replace_in_bulk
+            )
+            replace(
+                dcom=dcom, model_field=model_field,
+                instance_2_del=instance_2_del, new_value=new_value,
+            )
 
         try:
             instance_2_del.delete()
@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+
+################################################################################
+#    Creme is a free/open-source Customer Relationship Management software
+#    Copyright (C) 2021  Hybird
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU Affero General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU Affero General Public License for more details.
+#
+#    You should have received a copy of the GNU Affero General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+################################################################################
+
+import logging
+
+from django.utils.timezone import now
+from django.utils.translation import gettext as _
+from django.utils.translation import gettext_lazy
+
+from ..models import HistoryLine, JobResult
+from ..utils.date_period import date_period_registry
+from .base import JobType
+
+logger = logging.getLogger(__name__)
+
+
+class _HistoryArchiverType(JobType):
+    id           = JobType.generate_id('creme_core', 'history_archiver')
+    verbose_name = gettext_lazy('History archiver')
+    periodic     = JobType.PERIODIC
+
+    def _execute(self, job):
+        delay = self.get_delay(job)
+
+        if delay is None:
+            JobResult.objects.create(
+                job=job,
+                messages=[
+                    _("The configured delay is invalid. Edit the job's configuration to fix it."),
+                ],
+            )
+        else:
+            count = HistoryLine.archive_lines(
+                HistoryLine.objects.filter(date__lt=now() - delay.as_timedelta()),
+            )
+            logger.info('_HistoryArchiverType: %s line(s) of history archived.', count)
+
+    @staticmethod
+    def get_delay(job):
+        """Returns the delay (HistoryLines older than it will be archived).
+        @param job: Job instance. Its type must be _HistoryArchiverType.
+        @return: A creme_core.utils.date_period.DatePeriod instance, or None in an error occurred.
+        """
+        try:
+            return date_period_registry.deserialize(job.data['delay'])
+        except Exception:
+            logger.exception('Error in _HistoryArchiverType.get_delay()')
+
+    def get_description(self, job):
+        return [_('Move the old lines of history into the archive')]
+
+    def get_config_form_class(self, job):
+        from ..forms.history_archiver import HistoryArchiverJobForm
+
+        return HistoryArchiverJobForm
+
+
+history_archiver_type = _HistoryArchiverType()
@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+
+################################################################################
+#    Creme is a free/open-source Customer Relationship Management software
+#    Copyright (C) 2021  Hybird
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU Affero General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU Affero General Public License for more details.
+#
+#    You should have received a copy of the GNU Affero General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+################################################################################
+
+import logging
+
+from django.contrib.contenttypes.models import ContentType
+from django.http import HttpRequest, QueryDict
+from django.utils.translation import gettext
+from django.utils.translation import gettext_lazy as _
+from django.utils.translation import ngettext
+
+from ..models import FileRef
+from .base import JobProgress, JobType
+
+logger = logging.getLogger(__name__)
+
+
+class _MassExportType(JobType):
+    id           = JobType.generate_id('creme_core', 'mass_export')
+    verbose_name = _('Mass export')
+
+    def _build_request(self, job):
+        "The export is replayed with the GET arguments of the original request."
+        request = HttpRequest()
+        request.method = 'GET'
+        request.GET = QueryDict(job.data['GET'])
+        request.user = job.user
+
+        return request
+
+    def _build_view(self, job):
+        from ..views.mass_export import MassExport
+
+        view = MassExport()
+        view.setup(self._build_request(job))
+
+        return view
+
+    def _get_ctype(self, job_data):
+        return ContentType.objects.get_for_id(job_data['ctype'])
+
+    def get_fileref(self, job):
+        "@return: The FileRef of the generated file, or None."
+        fileref_id = (job.data or {}).get('fileref')
+
+        return None if fileref_id is None else FileRef.objects.filter(id=fileref_id).first()
+
+    def _execute(self, job):
+        def update_progress(count):
+            job.data['count'] = count
+            job.save(update_fields=('data',))
+
+        fileref = self._build_view(job).export_to_file(progress_callback=update_progress)
+
+        job.data['fileref'] = fileref.id
+        # NB: JobType.execute() saves the job at the end
+
+    def progress(self, job):
+        count = job.data.get('count', 0)
+
+        return JobProgress(
+            percentage=None,
+            label=ngettext(
+                '{count} entity has been exported.',
+                '{count} entities have been exported.',
+                count
+            ).format(count=count)
+        )
+
+    @property
+    def results_bricks(self):
+        from ..bricks import MassExportJobErrorsBrick
+        return [MassExportJobErrorsBrick()]
+
+    def get_description(self, job):
+        try:
+            desc = [
+                gettext('Export «{model}»').format(
+                    model=self._get_ctype(job.data).model_class()._meta.verbose_name_plural,
+                ),
+            ]
+        except Exception:
+            logger.exception('Error in _MassExportType.get_description')
+            desc = ['?']
+
+        return desc
+
+    def get_stats(self, job):
+        count = job.data.get('count', 0)
+
+        return [
+            ngettext(
+                '{count} entity has been exported.',
+                '{count} entities have been exported.',
+                count
+            ).format(count=count),
+        ]
+
+
+mass_export_type = _MassExportType()
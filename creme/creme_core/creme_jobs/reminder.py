@@ -18,12 +18,13 @@
 #    along with this program.  If not, see <http://www.gnu.org/licenses/>.
 ################################################################################
 
-from datetime import datetime
+from datetime import datetime, timedelta
 
 from django.utils.translation import gettext
 from django.utils.translation import gettext_lazy as _
 
 from ..core.reminder import reminder_registry
+from ..models import JobResult
 from .base import JobType
 
 
@@ -32,6 +33,9 @@ class _ReminderType(JobType):
     verbose_name = _('Reminders')
     periodic     = JobType.PSEUDO_PERIODIC
 
+    # Delay before the emails which could not be sent are retried.
+    retry_delay = timedelta(minutes=15)
+
     def _execute(self, job):
         for reminder in reminder_registry:
             reminder.execute(job)
@@ -49,6 +53,13 @@ class _ReminderType(JobType):
             if isinstance(wakeup, datetime):
                 total_wakeup = wakeup if total_wakeup is None else min(total_wakeup, wakeup)
 
+        # NB: the errors of the last run are stored in JobResults ; the related
+        #     instances are not marked as reminded, so we wait a little before
+        #     retrying (the job would run in a loop while the SMTP server is down).
+        if total_wakeup is not None and job.last_run and \
+           JobResult.objects.filter(job=job).exists():
+            total_wakeup = max(total_wakeup, job.last_run + self.retry_delay)
+
         return total_wakeup
 
 
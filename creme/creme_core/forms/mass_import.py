@@ -55,6 +55,7 @@ from ..models import (
     CustomFieldValue,
     EntityCredentials,
     FieldsConfig,
+    HistoryLineBuffer,
     Job,
     MassImportJobResult,
     Relation,
@@ -1175,6 +1176,9 @@ class ImportForm(CremeModelForm):
     ]  # Overloaded by factory
     header_dict: Dict[str, int] = {}  # Idem
 
+    # The HistoryLines are created by chunks of lines (see HistoryLineBuffer).
+    history_chunk_size = 256
+
     blocks = FieldBlockManager(
         {
             'id': 'general',
@@ -1291,7 +1295,7 @@ class ImportForm(CremeModelForm):
             raise self.Error(error_msg)
 
         # TODO: mode depends on the backend ?
-        with filedata.open(mode='r') as file_:
+        with filedata.open(mode='r') as file_, HistoryLineBuffer() as history_buffer:
             lines = backend_cls(file_)
             if get_cleaned('has_header'):
                 next(lines)
@@ -1306,11 +1310,13 @@ class ImportForm(CremeModelForm):
             def is_empty_value(s):
                 return s is None or isinstance(s, str) and not s.strip()
 
+            history_chunk_size = self.history_chunk_size
+
             for i, line in enumerate(filter(None, lines), start=1):
                 job_result = MassImportJobResult(job=job, line=line)
 
                 try:
-                    with atomic():
+                    with history_buffer.savepoint(), atomic():
                         instance = model_class()
 
                         # 'True' means: object has been updated, not created from scratch
@@ -1399,6 +1405,9 @@ class ImportForm(CremeModelForm):
 
                 self.import_errors.clear()
 
+                if not i % history_chunk_size:
+                    history_buffer.flush()
+
 
 class ImportForm4CremeEntity(ImportForm):
     user = forms.ModelChoiceField(
@@ -668,6 +668,11 @@ class BricksManager:
         self._bricks.extend(bricks)
         group.extend(bricks)
 
+    @property
+    def bricks(self) -> Iterator[Brick]:
+        "All the registered bricks (the displayed ones included)."
+        yield from self._bricks
+
     def brick_is_registered(self, brick: Brick) -> bool:
         brick_id = brick.id_
         return any(b.id_ == brick_id for b in self._bricks)
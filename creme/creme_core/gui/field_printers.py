@@ -315,7 +315,9 @@ class BaseM2MPrinter:
             fval: Manager,
             user,
             field: Field) -> Iterator[Model]:
-        return fval.filter(is_deleted=False)
+        # NB: we use all() (& not filter()) to benefit from the instances
+        #     which have been prefetched (see EntityCell.populate_entities()).
+        return (e for e in fval.all() if not e.is_deleted)
 
     def __init__(
             self,
@@ -662,7 +664,10 @@ class _FieldPrintersRegistry:
                     def sub_values(obj, user):
                         has_perm = user.has_perm_to_view
 
-                        for e in getattr(obj, base_name).filter(is_deleted=False):
+                        for e in getattr(obj, base_name).all():
+                            if e.is_deleted:
+                                continue
+
                             if not has_perm(e):
                                 yield HIDDEN_VALUE
                             else:
@@ -2,7 +2,7 @@
 
 ################################################################################
 #    Creme is a free/open-source Customer Relationship Management software
-#    Copyright (C) 2016-2020  Hybird
+#    Copyright (C) 2016-2021  Hybird
 #
 #    This program is free software: you can redistribute it and/or modify
 #    it under the terms of the GNU Affero General Public License as published by
@@ -25,8 +25,49 @@ class Command(BaseCommand):
     help = 'Run a pool of task workers (batch processing, CSV importing etc...).'
     args = ''
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--metrics',
+            action='store_true', dest='metrics', default=False,
+            help='Display the metrics of the running job manager & exit '
+                 '(the cache "default" of Django must be shared between '
+                 'the processes). [default: %(default)s]',
+        )
+
     def handle(self, *args, **options):
         verbosity = options.get('verbosity')
 
+        if options.get('metrics'):
+            self._display_metrics()
+            return
+
         from creme.creme_core.core.job import JobScheduler
         JobScheduler().start(verbose=bool(verbosity))
+
+    def _display_metrics(self):
+        from creme.creme_core.core.job.scheduler import get_metrics
+
+        metrics = get_metrics()
+        if metrics is None:
+            self.stderr.write('No metrics found (is the job manager running?).')
+            return
+
+        write = self.stdout.write
+        write(f'Last update: {metrics["date"]}')
+        write(f'Running jobs: {metrics["running_jobs"]}')
+        write(f'Waiting user jobs: {metrics["waiting_user_jobs"]}')
+
+        jobs_metrics = metrics['jobs']
+        if jobs_metrics:
+            write('Finished jobs (durations in seconds):')
+
+            for jtype_id, jmetrics in sorted(jobs_metrics.items()):
+                write(
+                    f' - {jtype_id}: count={jmetrics["count"]} '
+                    f'wait(mean={jmetrics["mean_wait_time"]:.2f}, '
+                    f'max={jmetrics["max_wait_time"]:.2f}) '
+                    f'run(mean={jmetrics["mean_run_time"]:.2f}, '
+                    f'max={jmetrics["max_run_time"]:.2f})'
+                )
+        else:
+            write('No finished job.')
@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+
+################################################################################
+#    Creme is a free/open-source Customer Relationship Management software
+#    Copyright (C) 2021  Hybird
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU Affero General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU Affero General Public License for more details.
+#
+#    You should have received a copy of the GNU Affero General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+################################################################################
+
+from django.core.management.base import BaseCommand, CommandError
+
+from creme.creme_core.core.search_index import get_search_index_backend
+from creme.creme_core.registry import creme_registry
+
+
+class Command(BaseCommand):
+    help = (
+        'Build the index used by the global search & the quick search '
+        '(see the setting SEARCH_INDEX_BACKEND). '
+        'The index should be re-built when the search configuration is modified.'
+    )
+
+    def add_arguments(self, parser):
+        add_argument = parser.add_argument
+        add_argument(
+            'models', nargs='*',
+            help='The types of entities to index, as "app_label.model_name" '
+                 '(eg: persons.contact). [default: all types]',
+        )
+        add_argument(
+            '-s', '--chunk-size',
+            action='store', dest='chunk_size', type=int, default=256,
+            help='How many entities are indexed at once. [default: %(default)s]',
+        )
+
+    def handle(self, *args, **options):
+        backend = get_search_index_backend()
+        if backend is None:
+            raise CommandError('No search index is used (see the setting SEARCH_INDEX_BACKEND).')
+
+        entity_models = {
+            model._meta.label_lower: model
+            for model in creme_registry.iter_entity_models()
+        }
+        names = options['models']
+
+        if names:
+            try:
+                models = [entity_models[name.lower()] for name in names]
+            except KeyError as e:
+                raise CommandError(f'Invalid type of entity: {e}') from e
+        else:
+            models = [*entity_models.values()]
+
+        verbosity = options.get('verbosity')
+        chunk_size = options['chunk_size']
+
+        for model in models:
+            count = backend.rebuild(model, chunk_size=chunk_size)
+
+            if verbosity:
+                self.stdout.write(f'{model._meta.label}: {count} index entries')
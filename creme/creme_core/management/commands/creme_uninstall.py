@@ -35,6 +35,7 @@ from creme.creme_core.core.setting_key import setting_key_registry
 from creme.creme_core.gui.bricks import Brick
 from creme.creme_core.gui.button_menu import Button
 from creme.creme_core.models import (
+    ArchivedHistoryLine,
     BrickDetailviewLocation,
     BrickHomeLocation,
     BrickMypageLocation,
@@ -219,7 +220,10 @@ def _uninstall_custom_forms(sender, **kwargs):
 @uninstall_handler('Deleting history lines...')
 def _uninstall_history_lines(sender, content_types, **kwargs):
     # NB: we delete HistoryLine manually, in order to delete related lines too.
-    HistoryLine.delete_lines(HistoryLine.objects.filter(entity_ctype__in=content_types))
+    HistoryLine.delete_lines(
+        HistoryLine.objects.filter(entity_ctype__in=content_types),
+        archived_line_qs=ArchivedHistoryLine.objects.filter(entity_ctype__in=content_types),
+    )
 
 
 @receiver(post_uninstall_flush)
@@ -0,0 +1,106 @@
+import logging
+
+from django.db import DatabaseError, migrations, models
+
+import creme.creme_core.models.fields as creme_fields
+
+logger = logging.getLogger(__name__)
+
+SQLITE_STATEMENTS = [
+    """CREATE VIRTUAL TABLE creme_core_searchindexentry_fts USING fts5(
+        content, content='creme_core_searchindexentry', content_rowid='id'
+    )""",
+    """CREATE TRIGGER creme_core_searchindexentry_ai
+    AFTER INSERT ON creme_core_searchindexentry BEGIN
+        INSERT INTO creme_core_searchindexentry_fts(rowid, content)
+        VALUES (new.id, new.content);
+    END""",
+    """CREATE TRIGGER creme_core_searchindexentry_ad
+    AFTER DELETE ON creme_core_searchindexentry BEGIN
+        INSERT INTO creme_core_searchindexentry_fts(creme_core_searchindexentry_fts, rowid, content)
+        VALUES ('delete', old.id, old.content);
+    END""",
+    """CREATE TRIGGER creme_core_searchindexentry_au
+    AFTER UPDATE ON creme_core_searchindexentry BEGIN
+        INSERT INTO creme_core_searchindexentry_fts(creme_core_searchindexentry_fts, rowid, content)
+        VALUES ('delete', old.id, old.content);
+        INSERT INTO creme_core_searchindexentry_fts(rowid, content)
+        VALUES (new.id, new.content);
+    END""",
+]
+SQLITE_REVERSE_STATEMENTS = [
+    'DROP TRIGGER IF EXISTS creme_core_searchindexentry_au',
+    'DROP TRIGGER IF EXISTS creme_core_searchindexentry_ad',
+    'DROP TRIGGER IF EXISTS creme_core_searchindexentry_ai',
+    'DROP TABLE IF EXISTS creme_core_searchindexentry_fts',
+]
+
+PGSQL_STATEMENTS = [
+    "CREATE INDEX creme_core_searchindexentry_fts "
+    "ON creme_core_searchindexentry USING gin (to_tsvector('simple', content))",
+]
+PGSQL_REVERSE_STATEMENTS = [
+    'DROP INDEX IF EXISTS creme_core_searchindexentry_fts',
+]
+
+
+def _execute(schema_editor, statements):
+    with schema_editor.connection.cursor() as cursor:
+        for statement in statements:
+            cursor.execute(statement)
+
+
+def create_fulltext_structures(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+
+    if vendor == 'sqlite':
+        try:
+            _execute(schema_editor, SQLITE_STATEMENTS)
+        except DatabaseError as e:
+            logger.warning(
+                'The full-text table for the search index cannot be created '
+                '(is the extension FTS5 of SQLite available?): %s', e,
+            )
+    elif vendor == 'postgresql':
+        _execute(schema_editor, PGSQL_STATEMENTS)
+
+
+def drop_fulltext_structures(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+
+    if vendor == 'sqlite':
+        _execute(schema_editor, SQLITE_REVERSE_STATEMENTS)
+    elif vendor == 'postgresql':
+        _execute(schema_editor, PGSQL_REVERSE_STATEMENTS)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('creme_core', '0089_v2_3__customforms_per_role03'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchIndexEntry',
+            fields=[
+                (
+                    'id',
+                    models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')
+                ),
+                ('entity_id', models.PositiveIntegerField(db_index=True, editable=False)),
+                (
+                    'entity_ctype',
+                    creme_fields.EntityCTypeForeignKey(
+                        editable=False, on_delete=models.CASCADE, to='contenttypes.contenttype',
+                    )
+                ),
+                ('cell_key', models.CharField(editable=False, max_length=200)),
+                ('content', models.TextField(editable=False)),
+            ],
+            options={
+                'index_together': {('entity_ctype', 'cell_key')},
+            },
+        ),
+        migrations.RunPython(create_fulltext_structures, drop_fulltext_structures),
+    ]
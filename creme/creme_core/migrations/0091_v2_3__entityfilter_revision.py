@@ -0,0 +1,17 @@
+import uuid
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('creme_core', '0090_v2_3__searchindexentry'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='entityfilter',
+            name='revision',
+            field=models.UUIDField(default=uuid.uuid4, editable=False),
+        ),
+    ]
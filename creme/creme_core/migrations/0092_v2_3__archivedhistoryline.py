@@ -0,0 +1,51 @@
+from django.conf import settings
+from django.db import migrations, models
+
+import creme.creme_core.models.fields as creme_fields
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('creme_core', '0091_v2_3__entityfilter_revision'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedHistoryLine',
+            fields=[
+                ('id', models.PositiveIntegerField(primary_key=True, serialize=False)),
+                (
+                    'entity',
+                    models.ForeignKey(
+                        null=True, on_delete=models.SET_NULL, to='creme_core.cremeentity',
+                    )
+                ),
+                (
+                    'entity_ctype',
+                    creme_fields.CTypeForeignKey(to='contenttypes.contenttype')
+                ),
+                (
+                    'entity_owner',
+                    creme_fields.CremeUserForeignKey(to=settings.AUTH_USER_MODEL)
+                ),
+                ('username', models.CharField(max_length=30)),
+                ('date', models.DateTimeField(verbose_name='Date')),
+                ('type', models.PositiveSmallIntegerField(verbose_name='Type')),
+                ('value', models.TextField(null=True)),
+            ],
+            options={
+                'verbose_name': 'Archived line of history',
+                'verbose_name_plural': 'Archived lines of history',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='archivedhistoryline',
+            index=models.Index(fields=['entity', 'date'], name='creme_core_ahline_entity_date'),
+        ),
+        migrations.AddIndex(
+            model_name='historyline',
+            index=models.Index(fields=['entity', 'date'], name='creme_core_hline_entity_date'),
+        ),
+    ]
@@ -28,7 +28,12 @@ from .entity_filter import EntityFilter, EntityFilterCondition  # NOQA
 from .fields_config import FieldsConfig  # NOQA
 from .file_ref import FileRef  # NOQA
 from .header_filter import HeaderFilter  # NOQA
-from .history import HistoryConfigItem, HistoryLine  # NOQA
+from .history import (  # NOQA
+    ArchivedHistoryLine,
+    HistoryConfigItem,
+    HistoryLine,
+    HistoryLineBuffer,
+)
 from .i18n import Language  # NOQA
 from .imprint import Imprint  # NOQA
 from .job import EntityJobResult, Job, JobResult, MassImportJobResult  # NOQA
@@ -36,7 +41,7 @@ from .lock import Mutex, MutexAutoLock  # NOQA
 from .menu import MenuConfigItem  # NOQA
 from .relation import Relation, RelationType, SemiFixedRelationType  # NOQA
 from .reminder import DateReminder  # NOQA
-from .search import SearchConfigItem  # NOQA
+from .search import SearchConfigItem, SearchIndexEntry  # NOQA
 from .setting_value import SettingValue  # NOQA
 from .vat import Vat  # NOQA
 from .version import Version  # NOQA
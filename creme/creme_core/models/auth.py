@@ -52,7 +52,8 @@ from django.contrib.contenttypes.models import ContentType
 from django.core.exceptions import PermissionDenied
 # from django.core.validators import RegexValidator
 from django.db import models
-from django.db.models import Q, QuerySet
+from django.db.models import Q, QuerySet, signals
+from django.dispatch import receiver
 from django.utils.timezone import now
 from django.utils.translation import gettext
 from django.utils.translation import gettext_lazy as _
@@ -234,7 +235,11 @@ class UserRole(models.Model):
 
         if setcredentials is None:
             logger.debug('UserRole.get_credentials(): Cache MISS for id=%s', self.id)
-            self._setcredentials = setcredentials = [*self.credentials.all()]
+            # NB: the filters are retrieved now, because their revisions are
+            #     needed to use the cache of compiled credentials.
+            self._setcredentials = setcredentials = [
+                *self.credentials.select_related('efilter'),
+            ]
         else:
             logger.debug('UserRole.get_credentials(): Cache HIT for id=%s', self.id)
 
@@ -251,6 +256,24 @@ class UserRole(models.Model):
 
         return perms
 
+    def get_perms_many(self, user, entities: Sequence['CremeEntity']) -> List[int]:
+        """Equivalent to calling get_perms() for each entity, but with grouped
+        queries (see SetCredentials.get_perms_many()).
+        @return: A list of integers (binary flags), in the order of the entities.
+        """
+        allowed_entities = [
+            entity for entity in entities
+            if self.is_app_allowed_or_administrable(
+                entity.entity_type.model_class()._meta.app_label
+            )
+        ]
+        perms = dict(zip(
+            (entity.id for entity in allowed_entities),
+            SetCredentials.get_perms_many(self._get_setcredentials(), user, allowed_entities),
+        ))
+
+        return [perms.get(entity.id, EntityCredentials.NONE) for entity in entities]
+
     # TODO: factorise
     def filter(self,
                user,
@@ -322,6 +345,70 @@ class UserRole(models.Model):
         )
 
 
+class _CompiledCredentialsCache(OrderedDict):
+    """Dictionary which keeps the <max_size> most recently used entries
+    (the least recently used ones are removed).
+    """
+    def __init__(self, max_size: int):
+        super().__init__()
+        self.max_size = max_size
+
+    def get(self, key, default=None):
+        try:
+            value = self[key]
+            self.move_to_end(key)
+        except KeyError:  # NB: the entry can be removed by another thread
+            return default
+
+        return value
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+
+        while len(self) > self.max_size:
+            try:
+                self.popitem(last=False)
+            except KeyError:
+                break
+
+
+# Cache of the compiled SetCredentials (see SetCredentials._aux_filter()) ;
+# it's shared by all the requests of a process.
+#   key: tuple built by SetCredentials._compilation_key().
+#   value: instance of _CompiledCredentials.
+# NB: the keys contain the IDs of the users when there are ESET_OWN credentials,
+#     so the cache is bounded.
+_COMPILED_CREDENTIALS: Dict[tuple, '_CompiledCredentials'] = _CompiledCredentialsCache(
+    max_size=1024,
+)
+
+
+class _CompiledCredentials:
+    """Queries used to filter a QuerySet with a sequence of SetCredentials
+    (which are related to the same model & permission).
+    """
+    __slots__ = ('allowed_q', 'forbidden_qs')
+
+    def __init__(self, allowed_q: Optional[Q], forbidden_qs: List[Q]):
+        # NB: <None> means that nothing is allowed
+        self.allowed_q = allowed_q
+        self.forbidden_qs = forbidden_qs
+
+    def filter(self, queryset: QuerySet) -> QuerySet:
+        allowed_q = self.allowed_q
+
+        if allowed_q is None:
+            return queryset.none()
+
+        if allowed_q:
+            queryset = queryset.filter(allowed_q)
+
+        for forbidden_q in self.forbidden_qs:
+            queryset = queryset.exclude(forbidden_q)
+
+        return queryset
+
+
 class SetCredentials(models.Model):
     # 'ESET' means 'Entities SET'
     ESET_ALL    = 1  # => all entities
@@ -425,8 +512,15 @@ class SetCredentials(models.Model):
 
         return format_str.format(**args)
 
-    def _get_perms(self, user, entity: 'CremeEntity') -> int:
-        """@return An integer with binary flags for permissions."""
+    def _get_perms(self,
+                   user,
+                   entity: 'CremeEntity',
+                   accepted: Optional[bool] = None,
+                   ) -> int:
+        """@param accepted: Result of the EntityFilter for this entity, if it's
+                  already known (None means it must be computed).
+        @return An integer with binary flags for permissions.
+        """
         ctype_id = self.ctype_id
 
         if not ctype_id or ctype_id == entity.entity_type_id:
@@ -439,7 +533,10 @@ class SetCredentials(models.Model):
                 if user.id == user_id or any(user_id == t.id for t in user.teams):
                     return self.value
             else:  # SetCredentials.ESET_FILTER
-                if self.efilter.accept(entity=entity.get_real_entity(), user=user):
+                if accepted is None:
+                    accepted = self.efilter.accept(entity=entity.get_real_entity(), user=user)
+
+                if accepted:
                     return self.value
 
         return EntityCredentials.NONE
@@ -450,15 +547,74 @@ class SetCredentials(models.Model):
                   entity: 'CremeEntity',
                   ) -> int:
         """@param sc_sequence: Sequence of SetCredentials instances."""
+        return SetCredentials._merge_perms(
+            sc_sequence, lambda sc: sc._get_perms(user, entity),
+        )
+
+    @classmethod
+    def get_perms_many(cls,
+                       sc_sequence: Sequence['SetCredentials'],
+                       user,
+                       entities: Sequence['CremeEntity'],
+                       ) -> List[int]:
+        """Equivalent to calling get_perms() for each entity, but the EntityFilters
+        check all the entities at once (see EntityFilter.accept_many()).
+        @param sc_sequence: Sequence of SetCredentials instances.
+        @param entities: Sequence of CremeEntity instances (the types can be different).
+        @return: A list of integers (binary flags), in the order of the entities.
+        """
+        # Key: id() of the SetCredentials ; values: {entity_id: accepted}
+        accepted_per_sc: Dict[int, Dict[int, bool]] = {}
+        filter_creds = [sc for sc in sc_sequence if sc.set_type == cls.ESET_FILTER]
+
+        if filter_creds and entities:
+            CremeEntity.populate_real_entities([
+                entity for entity in entities
+                if type(entity) is CremeEntity and entity._real_entity is None
+            ])
+
+            # Key: ContentType's ID ; values: real entities
+            entities_per_ctype: DefaultDict[int, list] = defaultdict(list)
+            for entity in entities:
+                entities_per_ctype[entity.entity_type_id].append(entity.get_real_entity())
+
+            for sc in filter_creds:
+                accepted_per_sc[id(sc)] = accepted = {}
+
+                for ctype_id, real_entities in entities_per_ctype.items():
+                    if not sc.ctype_id or sc.ctype_id == ctype_id:
+                        accepted.update(zip(
+                            (real_entity.id for real_entity in real_entities),
+                            sc.efilter.accept_many(real_entities, user=user),
+                        ))
+
+        perms = []
+
+        for entity in entities:
+            entity_id = entity.id
+            perms.append(cls._merge_perms(
+                sc_sequence,
+                lambda sc: sc._get_perms(
+                    user, entity, accepted_per_sc.get(id(sc), {}).get(entity_id),
+                ),
+            ))
+
+        return perms
+
+    @staticmethod
+    def _merge_perms(sc_sequence: Sequence['SetCredentials'], get_perms) -> int:
+        """@param get_perms: Function which takes a SetCredentials instance &
+                  returns its permissions (integer with binary flags).
+        """
         perms = reduce(
             or_op,
-            (sc._get_perms(user, entity) for sc in sc_sequence if not sc.forbidden),
+            (get_perms(sc) for sc in sc_sequence if not sc.forbidden),
             EntityCredentials.NONE
         )
 
         for sc in sc_sequence:
             if sc.forbidden:
-                perms &= ~sc._get_perms(user, entity)
+                perms &= ~get_perms(sc)
 
         return perms
 
@@ -497,65 +653,118 @@ class SetCredentials(models.Model):
 
         return allowed_found
 
+    @staticmethod
+    def _user_filtering_q(user) -> Q:
+        # NB: we use IDs to avoid keeping instances of user in the cache of
+        #     compiled credentials.
+        teams = user.teams
+        return Q(
+            **{'user__in': [user.id, *(team.id for team in teams)]}
+            if teams else
+            {'user': user.id}
+        )
+
     @classmethod
-    def _aux_filter(cls,
-                    model: Type['CremeEntity'],
-                    sc_sequence: Sequence['SetCredentials'],
-                    user,
-                    queryset: QuerySet,
-                    perm: int,
-                    ) -> QuerySet:
-        allowed_ctype_ids = {None, ContentType.objects.get_for_model(model).id}
+    def _compilation_key(cls,
+                         sc_sequence: Sequence['SetCredentials'],
+                         user,
+                         ) -> Optional[tuple]:
+        """Build the key of the cache of compiled credentials.
+        The key contains the data which are used to build the queries (so a
+        modification of the SetCredentials, of their EntityFilters or of the
+        teams of the user produces a new key).
+        @return: A tuple, or None if the queries cannot be cached (an
+                 EntityFilter depends on the context -- current user, date...).
+        """
+        ESET_OWN = cls.ESET_OWN
+        ESET_FILTER = cls.ESET_FILTER
+        user_ids = None
+        signatures = []
+
+        for sc in sc_sequence:
+            set_type = sc.set_type
+            revision = None
+
+            if set_type == ESET_OWN:
+                if user_ids is None:
+                    user_ids = (user.id, *(team.id for team in user.teams))
+            elif set_type == ESET_FILTER:
+                efilter = sc.efilter
+                if efilter.is_dynamic:
+                    return None
+
+                revision = efilter.revision
+
+            signatures.append((sc.id, set_type, sc.forbidden, sc.efilter_id, revision))
+
+        return (tuple(signatures), user_ids)
+
+    @classmethod
+    def _compile(cls,
+                 sc_sequence: Sequence['SetCredentials'],
+                 user,
+                 ) -> _CompiledCredentials:
         ESET_ALL = cls.ESET_ALL
         ESET_OWN = cls.ESET_OWN
 
         forbidden, allowed = split_filter(
             lambda sc: sc.forbidden,
-            sorted(
-                (
-                    sc
-                    for sc in sc_sequence
-                    if sc.ctype_id in allowed_ctype_ids and sc.value & perm
-                ),
-                # NB: we sort to get ESET_ALL creds before ESET_OWN ones, then ESET_FILTER ones.
-                key=lambda sc: sc.set_type,
-            )
+            # NB: we sort to get ESET_ALL creds before ESET_OWN ones, then ESET_FILTER ones.
+            sorted(sc_sequence, key=lambda sc: sc.set_type),
         )
 
-        if not allowed:
-            return queryset.none()
-
-        if any(f.set_type == ESET_ALL for f in forbidden):
-            return queryset.none()
-
-        def user_filtering_kwargs():  # TODO: cache/lazy
-            teams = user.teams
-            return {'user__in': [user, *teams]} if teams else {'user': user}
-
-        filtered_qs = queryset
+        if not allowed or any(f.set_type == ESET_ALL for f in forbidden):
+            return _CompiledCredentials(allowed_q=None, forbidden_qs=[])
 
-        q = Q()
+        allowed_q = Q()
         for cred in allowed:
             set_type = cred.set_type
 
             if set_type == ESET_ALL:
+                allowed_q = Q()
                 break
 
             if set_type == ESET_OWN:
-                q |= Q(**user_filtering_kwargs())
+                allowed_q |= cls._user_filtering_q(user)
             else:  # SetCredentials.ESET_FILTER
                 # TODO: distinct ? (see EntityFilter.filter())
-                q |= cred.efilter.get_q(user=user)
-        else:
-            filtered_qs = filtered_qs.filter(q)
+                allowed_q |= cred.efilter.get_q(user=user)
+
+        return _CompiledCredentials(
+            allowed_q=allowed_q,
+            forbidden_qs=[
+                cls._user_filtering_q(user)
+                if cred.set_type == ESET_OWN else
+                cred.efilter.get_q(user=user)  # SetCredentials.ESET_FILTER
+                for cred in forbidden
+            ],
+        )
 
-        for cred in forbidden:
-            if cred.set_type == ESET_OWN:
-                filtered_qs = filtered_qs.exclude(**user_filtering_kwargs())
-            else:  # SetCredentials.ESET_FILTER
-                filtered_qs = filtered_qs.exclude(cred.efilter.get_q(user=user))
+    @classmethod
+    def _aux_filter(cls,
+                    model: Type['CremeEntity'],
+                    sc_sequence: Sequence['SetCredentials'],
+                    user,
+                    queryset: QuerySet,
+                    perm: int,
+                    ) -> QuerySet:
+        allowed_ctype_ids = {None, ContentType.objects.get_for_model(model).id}
+        sc_sequence = [
+            sc
+            for sc in sc_sequence
+            if sc.ctype_id in allowed_ctype_ids and sc.value & perm
+        ]
+
+        key = cls._compilation_key(sc_sequence, user)
+        compiled = None if key is None else _COMPILED_CREDENTIALS.get(key)
+
+        if compiled is None:
+            compiled = cls._compile(sc_sequence, user)
 
-        return filtered_qs
+            if key is not None:
+                _COMPILED_CREDENTIALS[key] = compiled
+
+        return compiled.filter(queryset)
 
     @classmethod
     def filter(cls,
@@ -710,10 +919,6 @@ class SetCredentials(models.Model):
         if not ctypes_filtering:
             queryset = queryset.none()
         else:
-            def _user_filtering_q():  # TODO: cached/lazy ?
-                teams = user.teams
-                return Q(**{'user__in': [user, *teams]} if teams else {'user': user})
-
             def _efilter_ids_to_Q(efilter_ids):
                 filters_q = Q()
 
@@ -721,7 +926,7 @@ class SetCredentials(models.Model):
                     # TODO: condexpr
                     if filter_id is not None:  # None == ESET_ALL
                         if filter_id == OWN_FILTER_ID:
-                            filter_q = _user_filtering_q()
+                            filter_q = cls._user_filtering_q(user)
                         else:
                             # TODO: distinct ??
                             filter_q = efilters_per_id[filter_id].get_q(user=user)
@@ -1079,6 +1284,25 @@ class CremeUser(AbstractBaseUser):
 
         return creds
 
+    def populate_credentials(self, entities: Sequence['CremeEntity']) -> None:
+        """Compute the credentials of the user for several entities with grouped
+        queries, & fill the caches used by has_perm_to_view() & co.
+        @param entities: Sequence of CremeEntity instances.
+        """
+        user_id = self.id
+        entities = [
+            entity for entity in entities
+            if user_id not in (getattr(entity, '_credentials_map', None) or ())
+        ]
+
+        for entity, creds in zip(entities, EntityCredentials.build_many(self, entities)):
+            creds_map = getattr(entity, '_credentials_map', None)
+
+            if creds_map is None:
+                entity._credentials_map = creds_map = {}
+
+            creds_map[user_id] = creds
+
     # Copied from auth.models.PermissionsMixin.has_perm
     def has_perm(self, perm: str, obj=None) -> bool:
         """
@@ -1305,3 +1529,12 @@ class Sandbox(models.Model):
         from ..core.sandbox import sandbox_type_registry
 
         return sandbox_type_registry.get(self)
+
+
+@receiver((signals.post_save, signals.post_delete), sender=SetCredentials)
+@receiver(signals.post_delete, sender=UserRole)
+@receiver(signals.m2m_changed, sender=CremeUser.teammates_set.through)
+def _clear_compiled_credentials(sender, **kwargs):
+    # NB: the keys of the cache change when the credentials/teams are modified ;
+    #     we just avoid to keep useless entries.
+    _COMPILED_CREDENTIALS.clear()
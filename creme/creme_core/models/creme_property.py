@@ -22,6 +22,7 @@ import logging
 import warnings
 from typing import Iterable, Type, Union
 
+from django.conf import settings
 from django.contrib.contenttypes.models import ContentType
 from django.db import IntegrityError, models
 from django.db.models.query_utils import Q
@@ -330,3 +331,16 @@ def _handle_replacement(sender, old_instance, new_instance, **kwargs):
     for prop in CremeProperty.objects.filter(creme_entity__in=e_ids, type=old_instance):
         HistoryLine.disable(prop)  # See _handle_merge()
         prop.delete()
+
+
+@receiver((models.signals.post_save, models.signals.post_delete), sender=CremeProperty)
+def _invalidate_entities_count(sender, instance, **kwargs):
+    if settings.LISTVIEW_COUNT_CACHE_TIMEOUT:
+        from ..core.entity_count import invalidate_entities_count
+
+        try:
+            entity = instance.creme_entity
+        except CremeEntity.DoesNotExist:
+            pass
+        else:
+            invalidate_entities_count(entity)
@@ -514,9 +514,10 @@ class CustomFieldMultiEnum(CustomFieldValue):
 
     @classmethod
     def _get_4_entities(cls, entities, cfields):
-        # TODO: for a m2m select_related() doesn't work
-        #       -> can fill the enumvalues cache easily (must use BaseQuery.join in query.py ....)
-        return cls.objects.filter(custom_field__in=cfields, entity__in=entities)
+        # NB: the prefetched values are used by get_enumvalues()
+        return cls.objects.filter(
+            custom_field__in=cfields, entity__in=entities,
+        ).prefetch_related('value')
 
     @staticmethod
     def _build_formfield(custom_field, formfield, user=None):
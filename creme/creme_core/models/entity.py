@@ -23,16 +23,19 @@ import uuid
 from collections import defaultdict
 from typing import TYPE_CHECKING, Any, DefaultDict, Dict, List, Sequence, Tuple
 
+from django.conf import settings
 from django.contrib.contenttypes.models import ContentType
 from django.db import models
 from django.db.models.query_utils import Q
 from django.db.transaction import atomic
+from django.dispatch import receiver
 from django.urls import reverse
 from django.utils.html import escape
 from django.utils.translation import gettext
 from django.utils.translation import gettext_lazy as _
 
 from ..core.field_tags import FieldTag
+from ..signals import post_replace_in_bulk
 from .base import CremeModel
 from .fields import (
     CreationDateTimeField,
@@ -514,3 +517,19 @@ class CremeEntity(CremeModel):
     def trash(self) -> None:
         self.is_deleted = True
         self.save()
+
+
+@receiver((models.signals.post_save, models.signals.post_delete))
+def _invalidate_entities_count(sender, instance, **kwargs):
+    if settings.LISTVIEW_COUNT_CACHE_TIMEOUT and isinstance(instance, CremeEntity):
+        from ..core.entity_count import invalidate_entities_count
+
+        invalidate_entities_count(instance)
+
+
+@receiver(post_replace_in_bulk)
+def _invalidate_entities_count_4_bulk(sender, instances, **kwargs):
+    if settings.LISTVIEW_COUNT_CACHE_TIMEOUT and issubclass(sender, CremeEntity) and instances:
+        from ..core.entity_count import invalidate_entities_count
+
+        invalidate_entities_count(instances[0])
@@ -19,12 +19,14 @@
 ################################################################################
 
 import logging
+import uuid
 # import warnings
 from itertools import zip_longest
 from json import loads as json_load
 from re import compile as compile_re
 from typing import (
     TYPE_CHECKING,
+    Dict,
     Iterable,
     Iterator,
     List,
@@ -32,6 +34,7 @@ from typing import (
     Set,
     Tuple,
     Type,
+    Union,
 )
 
 from django.contrib.auth import get_user_model
@@ -47,6 +50,7 @@ from django.utils.translation import ngettext, pgettext_lazy
 
 from ..core.entity_filter import (
     EF_USER,
+    ConditionsPrefetcher,
     _EntityFilterRegistry,
     entity_filter_registries,
 )
@@ -63,6 +67,10 @@ if TYPE_CHECKING:
 
 logger = logging.getLogger(__name__)
 
+# Process-level cache of the compiled EntityFilters (see EntityFilter.get_q()).
+# Key: ID of the filter ; value: instance of _CompiledEntityFilter.
+_COMPILED_FILTERS: Dict[str, '_CompiledEntityFilter'] = {}
+
 
 # TODO: move to core.entity_filter ? (what about HeaderFilterList ?)
 class EntityFilterList(list):
@@ -344,6 +352,11 @@ class EntityFilter(models.Model):  # CremeModel ???
         default=False,
     ).set_tags(viewable=False)
 
+    # Identifier of the current state of the filter, its conditions & its
+    # sub-filters ; it's modified each time one of them is modified, & it's
+    # used to invalidate the cache of compiled queries.
+    revision = models.UUIDField(default=uuid.uuid4, editable=False).set_tags(viewable=False)
+
     objects = EntityFilterManager()
 
     creation_label = _('Create a filter')
@@ -390,6 +403,30 @@ class EntityFilter(models.Model):  # CremeModel ???
 
         return any(accepted) if self.use_or else all(accepted)
 
+    def accept_many(self, entities: Iterable[CremeEntity], user) -> List[bool]:
+        """Check if several CremeEntity instances are accepted or refused by
+        the filter.
+        It's equivalent to calling accept() on each entity, but the data needed
+        by the conditions (Relations, CremeProperties, custom values...) are
+        retrieved with grouped queries.
+
+        @param entities: Instances of <CremeEntity> ; they should be real
+               entities, with the same type.
+        @param user: see accept().
+        @return: A list of booleans, in the order of the entities.
+        """
+        entities = [*entities]
+
+        if entities:
+            prefetcher = ConditionsPrefetcher()
+
+            for condition in self.get_conditions():
+                condition.handler.declare_prefetch(prefetcher)
+
+            prefetcher.populate(entities)
+
+        return [self.accept(entity=entity, user=user) for entity in entities]
+
     @property
     def applicable_on_entity_base(self) -> bool:
         """Can this filter be applied on CremeEntity (QuerySet or simple instance)?
@@ -638,16 +675,27 @@ class EntityFilter(models.Model):  # CremeModel ???
                         'because it is used as sub-filter by: {}'
                     ).format(', '.join(parents))
                 )
+        else:
+            # The parent filters must not use their compiled queries anymore.
+            self._update_revision()
 
+        _COMPILED_FILTERS.pop(self.id, None)
         super().delete(*args, **kwargs)
 
     @property
     def entities_are_distinct(self) -> bool:
-        return all(cond.entities_are_distinct() for cond in self.get_conditions())
+        return self._get_compiled().entities_are_distinct
         # TODO ?
         # conds = self.get_conditions()
         # return all(cond.entities_are_distinct(conds) for cond in conds)
 
+    @property
+    def is_dynamic(self) -> bool:
+        """Does the query of the filter depend on the context (current user,
+        current date...) ? See FilterConditionHandler.is_dynamic.
+        """
+        return self._get_compiled().is_dynamic
+
     @property
     def registry(self) -> _EntityFilterRegistry:
         return entity_filter_registries[self.filter_type]
@@ -747,20 +795,32 @@ class EntityFilter(models.Model):  # CremeModel ???
     #         )
     #     )
 
+    def _get_compiled(self) -> '_CompiledEntityFilter':
+        if self._state.adding:
+            # NB: the conditions of a filter which is not saved are not cached
+            return _CompiledEntityFilter(self)
+
+        compiled = _COMPILED_FILTERS.get(self.id)
+
+        if compiled is None or compiled.revision != self.revision:
+            _COMPILED_FILTERS[self.id] = compiled = _CompiledEntityFilter(self)
+
+        return compiled
+
     def get_q(self, user=None) -> Q:
-        query = Q()
+        """Get the query which filters the entities accepted by the filter.
+        The queries of the conditions are cached (at the process level) ; only
+        the queries of the dynamic conditions (see 'is_dynamic') are re-built.
 
+        @param user: Instance of <django.contrib.auth.get_user_model()> ; it's
+               the current user (used by the dynamic conditions).
+               <None> means the user stored in the global information.
+        @return: An instance of <django.models.Q>.
+        """
         if user is None:
             user = get_global_info('user')
 
-        if self.use_or:
-            for condition in self.get_conditions():
-                query |= condition.get_q(user)
-        else:
-            for condition in self.get_conditions():
-                query &= condition.get_q(user)
-
-        return query
+        return self._get_compiled().get_q(user)
 
     def _build_conditions_cache(self, conditions) -> None:
         checked_conds: List[EntityFilterCondition] = []
@@ -824,6 +884,7 @@ class EntityFilter(models.Model):  # CremeModel ???
             EntityFilterCondition.objects.filter(pk__in=conds2del).delete()
 
         self._build_conditions_cache(conditions)
+        self._update_revision()
 
     # @classmethod
     # def get_latest_version(cls, base_pk):
@@ -842,6 +903,54 @@ class EntityFilter(models.Model):  # CremeModel ???
         for cond in self.get_conditions():
             yield cond.description(user)
 
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        self._update_revision()
+
+    def _update_revision(self) -> None:
+        "Change the revision of the filter & of the filters which use it as sub-filter."
+        self.revision = revision = uuid.uuid4()
+        EntityFilter.objects.filter(
+            id__in=self.get_connected_filter_ids(),
+        ).update(revision=revision)
+
+
+class _CompiledEntityFilter:
+    """Queries of the conditions of an EntityFilter, built once.
+
+    The queries of the static conditions are stored ; the handlers of the
+    dynamic conditions (see FilterConditionHandler.is_dynamic) are stored
+    instead, & their queries are built each time (with the current user).
+    """
+    __slots__ = ('revision', 'use_or', 'parts', 'is_dynamic', 'entities_are_distinct')
+
+    def __init__(self, efilter: EntityFilter):
+        self.revision = efilter.revision
+        self.use_or = efilter.use_or
+
+        conditions = efilter.get_conditions()
+        parts: List[Union[Q, 'FilterConditionHandler']] = []
+
+        for condition in conditions:
+            handler = condition.handler
+            parts.append(handler if handler.is_dynamic else handler.get_q(user=None))
+
+        self.parts = parts
+        self.is_dynamic = any(not isinstance(part, Q) for part in parts)
+        self.entities_are_distinct = all(cond.entities_are_distinct() for cond in conditions)
+
+    def get_q(self, user) -> Q:
+        query = Q()
+
+        if self.use_or:
+            for part in self.parts:
+                query |= part if isinstance(part, Q) else part.get_q(user)
+        else:
+            for part in self.parts:
+                query &= part if isinstance(part, Q) else part.get_q(user)
+
+        return query
+
 
 class EntityFilterCondition(models.Model):
     """Component of EntityFilter containing of data for conditions.
@@ -1022,4 +1131,11 @@ def _delete_related_efc(sender, instance, **kwargs):
         q |= handler_cls.query_for_related_conditions(instance)
 
     if q:
-        EntityFilterCondition.objects.filter(q).delete()
+        conditions = EntityFilterCondition.objects.filter(q)
+        filter_ids = {*conditions.values_list('filter_id', flat=True)}
+
+        if filter_ids:
+            conditions.delete()
+
+            for efilter in EntityFilter.objects.filter(id__in=filter_ids):
+                efilter._update_revision()
@@ -21,6 +21,7 @@
 import logging
 import warnings
 from builtins import getattr
+from contextlib import contextmanager
 from datetime import date, datetime, time
 from decimal import Decimal
 from functools import partial
@@ -44,7 +45,7 @@ from django.contrib.auth import get_user_model
 from django.contrib.contenttypes.models import ContentType
 from django.core.exceptions import FieldDoesNotExist, ValidationError
 from django.db import models
-from django.db.models import Field, ForeignKey, Model, signals
+from django.db.models import Field, ForeignKey, Model, Q, QuerySet, signals
 from django.db.models.base import ModelState
 from django.db.transaction import atomic
 from django.dispatch import receiver
@@ -463,7 +464,8 @@ class _HLTCacheMixin:
 class _HLTInstanceCacheMixin(_HLTCacheMixin):
     @classmethod
     def _get_cached_line(cls, instance):
-        return getattr(instance, cls._get_cache_key(instance), None)
+        hline = getattr(instance, cls._get_cache_key(instance), None)
+        return hline if hline is not None and hline._is_updatable() else None
 
     @classmethod
     def _set_cached_line(cls, instance, hline):
@@ -475,7 +477,8 @@ class _HLTRequestCacheMixin(_HLTCacheMixin):
     def _get_cached_line(cls, instance):
         cache = get_per_request_cache()
         cache_key = cls._get_cache_key(instance)
-        return cache.get(cache_key)
+        hline = cache.get(cache_key)
+        return hline if hline is not None and hline._is_updatable() else None
 
     @classmethod
     def _set_cached_line(cls, instance, hline):
@@ -753,12 +756,12 @@ class _HLTEntityDeletion(_HistoryLineType):
 
     @classmethod
     def create_line(cls, entity: CremeEntity) -> None:
-        HistoryLine.objects.create(
+        HistoryLine(
             entity_ctype=entity.entity_type,
             entity_owner=entity.user,
             type=cls.type_id,
             value=HistoryLine._encode_attrs(entity),
-        )
+        ).save()
 
 
 @TYPES_MAP(TYPE_TRASH)
@@ -770,7 +773,7 @@ class _HLTEntityTrash(_HistoryLineType):
         backup = getattr(entity, '_instance_backup', None)
 
         if backup and backup['is_deleted'] != entity.is_deleted:
-            HistoryLine.objects.create(
+            HistoryLine(
                 entity=entity,
                 entity_ctype=entity.entity_type,
                 entity_owner=entity.user,
@@ -778,7 +781,7 @@ class _HLTEntityTrash(_HistoryLineType):
                 value=HistoryLine._encode_attrs(
                     entity, modifs=[entity.is_deleted],
                 ),
-            )
+            ).save()
 
     def verbose_modifications(self, modifications, entity_ctype, user):
         warnings.warn(
@@ -808,6 +811,7 @@ class _HLTRelatedEntity(_HistoryLineType):
         ).select_related('object_entity')
 
         if relations:
+            related_line._ensure_id()
             object_entities = [r.object_entity for r in relations]
             create_line = partial(
                 HistoryLine._create_line_4_instance,
@@ -874,11 +878,13 @@ class _HLTRelation(_HistoryLineType):
                       date=None) -> None:
         create_line = partial(HistoryLine._create_line_4_instance, date=date)
         hline     = create_line(relation.subject_entity, cls.type_id)
+        hline._ensure_id()
         hline_sym = create_line(
             relation.object_entity, sym_cls.type_id,
             modifs=[relation.type.symmetric_type_id],
             related_line_id=hline.id,
         )
+        hline_sym._ensure_id()
         hline.value = HistoryLine._encode_attrs(
             hline.entity,
             modifs=[relation.type_id], related_line_id=hline_sym.id,
@@ -1162,11 +1168,15 @@ class HistoryLine(Model):
     _modifications: Optional[list] = None
     _related_line_id: Optional[int] = None
     _related_line: Union['HistoryLine', bool, None] = False
+    _buffered: bool = False  # See HistoryLineBuffer
 
     class Meta:
         app_label = 'creme_core'
         verbose_name = _('Line of history')
         verbose_name_plural = _('Lines of history')
+        indexes = [
+            models.Index(fields=['entity', 'date'], name='creme_core_hline_entity_date'),
+        ]
 
     def __repr__(self):
         return (
@@ -1185,9 +1195,12 @@ class HistoryLine(Model):
 
     @staticmethod
     @atomic
-    def delete_lines(line_qs) -> None:
-        """Delete the given HistoryLines & the lines related to them.
+    def delete_lines(line_qs, archived_line_qs=None) -> None:
+        """Delete the given HistoryLines & the lines related to them (current
+        & archived ones).
         @param line_qs: QuerySet on HistoryLine.
+        @param archived_line_qs: QuerySet on ArchivedHistoryLine, or None ;
+               these archived lines are deleted too.
         """
         from ..core.paginator import FlowPaginator
 
@@ -1201,6 +1214,10 @@ class HistoryLine(Model):
                 deleted_ids.add(hline.id)
                 hline.delete()
 
+        if archived_line_qs is not None:
+            deleted_ids.update(archived_line_qs.values_list('id', flat=True))
+            archived_line_qs.delete()
+
         related_types = [
             type_cls.type_id for type_cls in TYPES_MAP if type_cls.has_related_line
         ]
@@ -1221,9 +1238,82 @@ class HistoryLine(Model):
                         hline.delete()
                         progress = True
 
+            paginator = FlowPaginator(
+                queryset=ArchivedHistoryLine.objects.filter(
+                    type__in=related_types,
+                ).order_by('id'),
+                key='id', per_page=1024,
+            )
+
+            for alines_page in paginator.pages():
+                archived_ids = []
+
+                for aline in alines_page.object_list:
+                    related_line_id = aline.as_history_line()._get_related_line_id()
+
+                    if related_line_id is not None and related_line_id in deleted_ids:
+                        archived_ids.append(aline.id)
+
+                if archived_ids:
+                    deleted_ids.update(archived_ids)
+                    ArchivedHistoryLine.objects.filter(id__in=archived_ids).delete()
+                    progress = True
+
             if not progress:
                 break
 
+    @staticmethod
+    def archive_lines(line_qs, chunk_size: int = 1024) -> int:
+        """Move some HistoryLines into the archive (see ArchivedHistoryLine) ;
+        the lines keep their ID, so the relations between lines are kept.
+        @param line_qs: QuerySet on HistoryLine.
+        @param chunk_size: Number of lines moved in a transaction.
+        @return: The number of archived lines.
+        """
+        line_qs = line_qs.order_by('id')
+        field_names = [f.attname for f in HistoryLine._meta.concrete_fields]
+        count = 0
+
+        while True:
+            with atomic():
+                hlines = [*line_qs.select_for_update()[:chunk_size]]
+                if not hlines:
+                    break
+
+                ArchivedHistoryLine.objects.bulk_create(
+                    ArchivedHistoryLine(**{
+                        fname: getattr(hline, fname) for fname in field_names
+                    }) for hline in hlines
+                )
+                HistoryLine.objects.filter(id__in=[hline.id for hline in hlines]).delete()
+
+            count += len(hlines)
+
+        return count
+
+    @staticmethod
+    def with_archives(q: Q = Q()) -> QuerySet:
+        """Get the lines (current & archived ones) matching a Q instance.
+        The returned QuerySet is a union, so it can only be ordered (on the
+        fields of the lines), counted & sliced ; archived lines are retrieved
+        as HistoryLine instances.
+        """
+        return HistoryLine.objects.filter(q).union(
+            ArchivedHistoryLine.objects.filter(q), all=True,
+        )
+
+    @classmethod
+    def _get_lines(cls, line_ids: Iterable[int]) -> Dict[int, 'HistoryLine']:
+        "Get some lines by their ID, in the current lines & in the archived ones."
+        lines = cls._default_manager.in_bulk(line_ids)
+        missing_ids = [line_id for line_id in line_ids if line_id not in lines]
+
+        if missing_ids:
+            for aline in ArchivedHistoryLine.objects.filter(id__in=missing_ids):
+                lines[aline.id] = aline.as_history_line()
+
+        return lines
+
     @staticmethod
     def disable(instance) -> None:
         """Disable history for this instance.
@@ -1360,7 +1450,7 @@ class HistoryLine(Model):
                 missing_line_ids.append(related_id)
 
         # NB: in_bulk() avoid query if missing_line_ids is empty
-        pool.update(cls._default_manager.in_bulk(missing_line_ids))
+        pool.update(cls._get_lines(missing_line_ids))
 
         for hline in unpopulated:
             hline._related_line = pool.get(hline._get_related_line_id())
@@ -1372,10 +1462,7 @@ class HistoryLine(Model):
             line_id = self._get_related_line_id()
 
             if line_id:
-                try:
-                    self._related_line = HistoryLine.objects.get(pk=line_id)
-                except HistoryLine.DoesNotExist:
-                    pass
+                self._related_line = HistoryLine._get_lines([line_id]).get(line_id)
 
         return self._related_line
 
@@ -1408,7 +1495,23 @@ class HistoryLine(Model):
         if date:
             kwargs['date'] = date
 
-        return cls.objects.create(**kwargs)
+        hline = cls(**kwargs)
+        hline.save()
+
+        return hline
+
+    def _ensure_id(self) -> None:
+        "Create immediately a buffered line, because its ID is needed."
+        if self._buffered:
+            self._buffered = False
+            super().save()
+
+    def _is_updatable(self) -> bool:
+        """Can the line still be modified & saved again ?
+        It's not the case of a line which has been created by a
+        HistoryLineBuffer without retrieving its ID (or discarded by it).
+        """
+        return self._buffered or self.pk is not None
 
     def save(self, *args, **kwargs):
         if self.ENABLED:
@@ -1416,6 +1519,13 @@ class HistoryLine(Model):
             user = get_global_info('user')
             self.username = user.username if user else ''
 
+            if self.pk is None:
+                hbuffer = HistoryLineBuffer.get_current()
+
+                if hbuffer is not None:
+                    hbuffer.add(self)
+                    return
+
             super().save(*args, **kwargs)
 
     @property
@@ -1436,6 +1546,147 @@ class HistoryLine(Model):
         self.username = user.username if user else ''
 
 
+class ArchivedHistoryLine(Model):
+    """Archived version of HistoryLine (see HistoryLine.archive_lines()) ;
+    the old lines are moved in this table to keep the table of HistoryLine
+    small & fast.
+    The fields are the same as HistoryLine (in the same order, see
+    HistoryLine.with_archives()).
+    """
+    id = models.PositiveIntegerField(primary_key=True)
+    entity = models.ForeignKey(CremeEntity, null=True, on_delete=models.SET_NULL)
+    entity_ctype = CTypeForeignKey()
+    entity_owner = CremeUserForeignKey()
+    username = models.CharField(max_length=30)
+    date = models.DateTimeField(_('Date'))
+    type = models.PositiveSmallIntegerField(_('Type'))
+    value = models.TextField(null=True)
+
+    class Meta:
+        app_label = 'creme_core'
+        verbose_name = _('Archived line of history')
+        verbose_name_plural = _('Archived lines of history')
+        indexes = [
+            models.Index(fields=['entity', 'date'], name='creme_core_ahline_entity_date'),
+        ]
+
+    def __str__(self):
+        return f'ArchivedHistoryLine(id={self.id}, type={self.type}, date={self.date})'
+
+    def as_history_line(self) -> HistoryLine:
+        field_names = [f.attname for f in HistoryLine._meta.concrete_fields]
+
+        return HistoryLine.from_db(
+            self._state.db, field_names,
+            [getattr(self, fname) for fname in field_names],
+        )
+
+
+class HistoryLineBuffer:
+    """Context manager which buffers the HistoryLines created by the code it
+    wraps, in order to create them with few queries (bulk_create()) instead of
+    one query per line. It's useful for the mass operations (mass import,
+    batch process, merge...).
+
+    The lines are created when the method flush() is called (typically at the
+    end of each chunk of entities) & when the context is exited.
+    The lines of edition (see _HLTRequestCacheMixin/_HLTInstanceCacheMixin)
+    are still merged while they are in the buffer ; the lines whose ID is
+    needed by another line (relationships...) are created immediately.
+
+    Usage:
+        with HistoryLineBuffer() as history_buffer:
+            for entities_page in paginator.pages():
+                for entity in entities_page.object_list:
+                    with history_buffer.savepoint(), atomic():
+                        [...]
+
+                history_buffer.flush()
+    """
+    _GLOBAL_KEY = 'creme_core-history_line_buffer'
+
+    def __init__(self, batch_size: Optional[int] = None):
+        """Constructor.
+        @param batch_size: see QuerySet.bulk_create().
+        """
+        self.batch_size = batch_size
+        self._lines: List[HistoryLine] = []
+        self._previous: Optional[HistoryLineBuffer] = None
+
+    def __enter__(self):
+        self._previous = get_global_info(self._GLOBAL_KEY)
+        set_global_info(**{self._GLOBAL_KEY: self})
+
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        set_global_info(**{self._GLOBAL_KEY: self._previous})
+        self._previous = None
+
+        if exc_type is None:
+            self.flush()
+        else:
+            # NB: the DB is maybe in a broken state (transaction to roll back)
+            #     so we do not want to hide the original exception.
+            try:
+                self.flush()
+            except Exception:
+                logger.exception(
+                    'HistoryLineBuffer: the buffered lines cannot be created.'
+                )
+
+    @classmethod
+    def get_current(cls) -> Optional['HistoryLineBuffer']:
+        "Get the buffer currently used by the current thread (None if there is none)."
+        return get_global_info(cls._GLOBAL_KEY)
+
+    def add(self, hline: HistoryLine) -> None:
+        "Add a (not saved) line to the buffer ; adding twice the same line is OK."
+        if not hline._buffered:
+            hline._buffered = True
+            self._lines.append(hline)
+
+    def detach_entity(self, entity_id: int) -> None:
+        """Remove the reference to an entity in the buffered lines (to be called
+        when the entity is deleted), like the "SET_NULL" of the related field.
+        """
+        for hline in self._lines:
+            if hline._buffered and hline.entity_id == entity_id:
+                hline.entity = None
+
+    def flush(self) -> None:
+        "Create the buffered lines."
+        hlines = [hline for hline in self._lines if hline._buffered]
+        self._lines.clear()
+
+        if hlines:
+            for hline in hlines:
+                hline._buffered = False
+
+            HistoryLine.objects.bulk_create(hlines, batch_size=self.batch_size)
+
+    @contextmanager
+    def savepoint(self):
+        """Context manager which discards the lines buffered in the wrapped
+        code if it raises an exception. It should be used with atomic(), in
+        order to discard the lines of the operations which are rolled back:
+
+            with history_buffer.savepoint(), atomic():
+                [...]
+        """
+        lines = self._lines
+        mark = len(lines)
+
+        try:
+            yield
+        except Exception:
+            for hline in lines[mark:]:
+                hline._buffered = False
+
+            del lines[mark:]
+            raise
+
+
 # TODO: method of CremeEntity ??
 def _final_entity(entity) -> bool:
     "Is the instance an instance of a 'leaf' class."
@@ -1578,6 +1829,10 @@ def _log_deletion(sender, instance, **kwargs):
         elif isinstance(instance, CremeEntity) and _final_entity(instance):
             _get_deleted_entity_ids().add(instance.id)
             _HLTEntityDeletion.create_line(instance)
+
+            hbuffer = HistoryLineBuffer.get_current()
+            if hbuffer is not None:
+                hbuffer.detach_entity(instance.id)
         elif isinstance(instance, CustomFieldValue):
             _HLTCustomFieldsEdition.create_lines(instance, emptied=True)
     except Exception:
@@ -1604,3 +1859,8 @@ def _handle_merge(sender, other_entity, **kwargs):
     # We do not want these lines to be re-assigned to the remaining entity.
     # TODO: should we clone/copy for TYPE_RELATED
     HistoryLine.objects.filter(entity=other_entity.id).update(entity=None)
+    ArchivedHistoryLine.objects.filter(entity=other_entity.id).update(entity=None)
+
+    hbuffer = HistoryLineBuffer.get_current()
+    if hbuffer is not None:
+        hbuffer.detach_entity(other_entity.id)
@@ -23,6 +23,7 @@ import warnings
 from collections import defaultdict
 from typing import Iterable, Tuple, Type, Union
 
+from django.conf import settings
 from django.contrib.contenttypes.models import ContentType
 from django.db import IntegrityError, models
 from django.db.models.query_utils import Q
@@ -623,3 +624,16 @@ def _handle_merge(sender, other_entity, **kwargs):
 
     other_entity.relations.update(subject_entity=sender)
     other_entity.relations_where_is_object.update(object_entity=sender)
+
+
+@receiver((models.signals.post_save, models.signals.post_delete), sender=Relation)
+def _invalidate_entities_count(sender, instance, **kwargs):
+    if settings.LISTVIEW_COUNT_CACHE_TIMEOUT:
+        from ..core.entity_count import invalidate_entities_count
+
+        try:
+            entity = instance.subject_entity
+        except CremeEntity.DoesNotExist:
+            pass
+        else:
+            invalidate_entities_count(entity)
@@ -36,7 +36,9 @@ from typing import (
 from django.contrib.contenttypes.models import ContentType
 # from django.core.exceptions import FieldDoesNotExist
 from django.db import models
+from django.db.models import signals
 from django.db.models.query_utils import Q
+from django.dispatch import receiver
 from django.utils.translation import gettext
 from django.utils.translation import gettext_lazy as _
 from django.utils.translation import pgettext_lazy
@@ -46,6 +48,7 @@ from ..utils import find_first
 from ..utils.meta import ModelFieldEnumerator
 from .auth import UserRole
 from .base import CremeModel
+from .custom_field import CustomFieldValue
 from .entity import CremeEntity
 from .fields import DatePeriodField, EntityCTypeForeignKey
 
@@ -399,3 +402,66 @@ class SearchConfigItem(CremeModel):
             raise ValueError('"role" must be NULL if "superuser" is True')
 
         super().save(*args, **kwargs)
+
+
+class SearchIndexEntry(models.Model):
+    """Pre-computed searchable content of an entity, for a search cell.
+
+    These instances are used by the search-index backends
+    (see 'creme_core.core.search_index') to avoid the costly "LIKE" queries
+    on all the configured fields.
+    There is one instance per couple (entity, cell) ; the content is normalized
+    (lower case) to perform case-insensitive searches.
+
+    Notice that the entity is not referenced by a ForeignKey, in order to keep
+    the deletion of entities (& the related checking) as simple as possible.
+    """
+    entity_id = models.PositiveIntegerField(db_index=True, editable=False)
+    entity_ctype = EntityCTypeForeignKey(editable=False)
+    cell_key = models.CharField(max_length=200, editable=False)
+    content = models.TextField(editable=False)
+
+    class Meta:
+        app_label = 'creme_core'
+        index_together = ('entity_ctype', 'cell_key')
+
+    def __str__(self):
+        return f'SearchIndexEntry(entity_id={self.entity_id}, cell_key="{self.cell_key}")'
+
+
+@receiver(signals.post_save)
+def _index_entity(sender, instance, raw=False, **kwargs):
+    if raw:  # Fixtures (loaddata) => see the command "creme_search_index"
+        return
+
+    if isinstance(instance, CremeEntity):
+        from ..core.search_index import get_search_index_backend
+
+        backend = get_search_index_backend()
+        if backend is not None:
+            backend.index([instance])
+    elif isinstance(instance, CustomFieldValue):
+        _reindex_entity(instance.entity_id)
+
+
+@receiver(signals.post_delete)
+def _unindex_entity(sender, instance, **kwargs):
+    if isinstance(instance, CremeEntity):
+        from ..core.search_index import get_search_index_backend
+
+        backend = get_search_index_backend()
+        if backend is not None:
+            backend.unindex([instance.id])
+    elif isinstance(instance, CustomFieldValue):
+        _reindex_entity(instance.entity_id)
+
+
+def _reindex_entity(entity_id):
+    from ..core.search_index import get_search_index_backend
+
+    backend = get_search_index_backend()
+    if backend is not None:
+        entity = CremeEntity.objects.filter(id=entity_id).first()
+
+        if entity is not None:
+            backend.index([entity.get_real_entity()])
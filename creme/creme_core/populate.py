@@ -85,6 +85,17 @@ class Populator(BasePopulator):
                 },
             },
         )
+        create_job(
+            type_id=creme_jobs.history_archiver_type.id,
+            defaults={
+                'language': settings.LANGUAGE_CODE,
+                'periodicity': date_period_registry.get_period('weeks', 1),
+                'status': Job.STATUS_OK,
+                'data': {
+                    'delay': date_period_registry.get_period('years', 1).as_dict()
+                },
+            },
+        )
         create_job(
             type_id=creme_jobs.reminder_type.id,
             defaults={
@@ -34,6 +34,12 @@ pre_replace_related = Signal()
 # <sender> is the instance to delete.
 # Providing arguments: model_field, replacing_instance
 pre_replace_and_delete = Signal()
+# Signal sent by the job "Deletor" when some instances have been updated in
+# bulk (so "post_save" has not been sent for them) ; it's useful to invalidate
+# the caches related to these instances.
+# <sender> is the model of the updated instances.
+# Providing arguments: instances, model_field
+post_replace_in_bulk = Signal()
 
 # Providing arguments: content_types, verbosity, stdout_write, stderr_write, style
 pre_uninstall_flush = Signal()
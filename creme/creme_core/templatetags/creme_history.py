@@ -22,6 +22,7 @@ import warnings
 from datetime import timedelta
 
 from django import template
+from django.db.models import Q
 
 from ..models.history import TYPE_CREATION, TYPE_EDITION, HistoryLine
 
@@ -30,10 +31,13 @@ register = template.Library()
 
 @register.simple_tag
 def history_summary(*, entity, user):
-    lines = HistoryLine.objects.filter(entity=entity.id)
+    def lines(ltype):
+        # NB: lines can be archived
+        return HistoryLine.with_archives(Q(entity=entity.id, type=ltype))
+
     stored_hlines = []
 
-    creation = lines.filter(type=TYPE_CREATION).first()
+    creation = lines(TYPE_CREATION).order_by('id').first()
     if creation is not None:
         stored_hlines.append(creation)
     else:
@@ -43,7 +47,7 @@ def history_summary(*, entity, user):
             username='',
         )
 
-    last_edition = lines.filter(type=TYPE_EDITION).order_by('-date').first()
+    last_edition = lines(TYPE_EDITION).order_by('-date').first()
     # NB: even at creation, entity.created & entity.modified are never exactly
     #     equal (is it a problem ?).
     if last_edition is not None:
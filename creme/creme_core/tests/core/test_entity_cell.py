@@ -7,6 +7,8 @@ from functools import partial
 
 from django.conf import settings
 from django.contrib.contenttypes.models import ContentType
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.utils.formats import date_format, number_format
 from django.utils.timezone import localtime
 from django.utils.translation import gettext as _
@@ -32,7 +34,9 @@ from creme.creme_core.models import (
     FakeCivility,
     FakeContact,
     FakeDocument,
+    FakeEmailCampaign,
     FakeFolder,
+    FakeMailingList,
     FakePosition,
     FieldsConfig,
     Relation,
@@ -777,3 +781,167 @@ class EntityCellTestCase(CremeTestCase):
 
         with self.assertNumQueries(0):
             contacts[0].get_relations(loved.id,  real_obj_entities=True)
+
+    def test_render_rows(self):
+        "The number of queries does not depend on the number of entities."
+        user = self.create_user()
+
+        loved = RelationType.objects.smart_update_or_create(
+            ('test-subject_love', 'Is loving'),
+            ('test-object_love', 'Is loved by'),
+        )[0]
+        cfield = CustomField.objects.create(
+            name='Type',
+            field_type=CustomField.MULTI_ENUM,
+            content_type=FakeEmailCampaign,
+        )
+        create_evalue = partial(CustomFieldEnumValue.objects.create, custom_field=cfield)
+        evalue1 = create_evalue(value='Important')
+        evalue2 = create_evalue(value='Public')
+
+        create_ml = partial(FakeMailingList.objects.create, user=user)
+        ml1 = create_ml(name='Pilots')
+        ml2 = create_ml(name='Scientists')
+
+        camps = []
+        for i in range(1, 7):
+            camp = FakeEmailCampaign.objects.create(user=user, name=f'Camp #{i}')
+            camp.mailing_lists.set([ml1, ml2])
+            Relation.objects.create(
+                user=user, subject_entity=camp, type=loved, object_entity=ml1,
+            )
+            cfield.value_class(
+                entity=camp, custom_field=cfield,
+            ).set_value_n_save([evalue1.id, evalue2.id])
+            camps.append(camp)
+
+        build_rfield = partial(EntityCellRegularField.build, model=FakeEmailCampaign)
+        cells = [
+            build_rfield(name='name'),
+            build_rfield(name='mailing_lists'),
+            build_rfield(name='mailing_lists__name'),
+            EntityCellCustomField(cfield),
+            EntityCellRelation(model=FakeEmailCampaign, rtype=loved),
+        ]
+
+        # NB: see test_mixed_populate_entities03()
+        ContentType.objects.get_for_model(CremeEntity)
+
+        def render(entities):
+            entities = [self.refresh(e) for e in entities]  # Drop caches
+
+            with CaptureQueriesContext(connection) as ctxt:
+                rows = EntityCell.render_rows(cells, entities, user, output='csv')
+
+            return rows, len(ctxt)
+
+        rows2, queries2 = render(camps[:2])
+        rows6, queries6 = render(camps)
+        self.assertEqual(queries2, queries6)
+
+        self.assertEqual(6, len(rows6))
+        self.assertListEqual(
+            [
+                'Camp #1',
+                f'{ml1}/{ml2}',
+                f'{ml1.name}/{ml2.name}',
+                f'{evalue1.value} / {evalue2.value}',
+                str(ml1),
+            ],
+            rows6[0],
+        )
+        self.assertListEqual(rows6[:2], rows2)
+
+        # HTML
+        html_rows = EntityCell.render_rows(
+            cells, [self.refresh(camps[0])], user, output='html',
+        )
+        self.assertEqual(1, len(html_rows))
+        self.assertEqual(5, len(html_rows[0]))
+        self.assertHTMLEqual(
+            f'<ul><li>{evalue1.value}</li><li>{evalue2.value}</li></ul>',
+            html_rows[0][3],
+        )
+
+    def test_render_rows_empty(self):
+        user = self.create_user()
+        cells = [EntityCellRegularField.build(model=FakeContact, name='last_name')]
+
+        with self.assertNumQueries(0):
+            self.assertListEqual([], EntityCell.render_rows(cells, [], user))
+
+    def bench_render_rows(self):
+        """Little benchmark of EntityCell.render_rows() (rendering column by
+        column) compared to the rendering cell by cell (with filled caches, like
+        the list-view did) ; the number of rows grows from 1k to 100k.
+        """
+        import time
+
+        user = self.create_user()
+
+        loved = RelationType.objects.smart_update_or_create(
+            ('test-subject_love', 'Is loving'),
+            ('test-object_love', 'Is loved by'),
+        )[0]
+        cfield = CustomField.objects.create(
+            name='Hobby', field_type=CustomField.STR, content_type=FakeContact,
+        )
+        civilities = [*FakeCivility.objects.all()]
+        position = FakePosition.objects.first()
+        beloved = FakeContact.objects.create(user=user, first_name='Faye', last_name='Valentine')
+
+        build_rfield = partial(EntityCellRegularField.build, model=FakeContact)
+        cells = [
+            build_rfield(name='last_name'),
+            build_rfield(name='first_name'),
+            build_rfield(name='civility'),
+            build_rfield(name='position__title'),
+            build_rfield(name='birthday'),
+            EntityCellCustomField(cfield),
+            EntityCellRelation(model=FakeContact, rtype=loved),
+        ]
+
+        create_contact = partial(FakeContact.objects.create, user=user, position=position)
+        contacts = []
+
+        for rows_count in (1000, 10000, 100000):
+            for i in range(len(contacts), rows_count):
+                contact = create_contact(
+                    first_name=f'Spike #{i}', last_name='Spiegel',
+                    civility=civilities[i % len(civilities)],
+                    birthday=date(year=1970 + i % 30, month=6, day=1 + i % 28),
+                )
+                cfield.value_class(entity=contact, custom_field=cfield).set_value_n_save(
+                    f'Hobby #{i % 10}'
+                )
+                Relation.objects.create(
+                    user=user, subject_entity=contact, type=loved, object_entity=beloved,
+                )
+                contacts.append(contact)
+
+            ids = [contact.id for contact in contacts]
+
+            # Cell by cell
+            entities = [*FakeContact.objects.filter(id__in=ids)]
+            start = time.perf_counter()
+
+            EntityCell.mixed_populate_entities(cells=cells, entities=entities, user=user)
+            by_cell = [[cell.render_html(entity, user) for cell in cells] for entity in entities]
+
+            print(
+                f'Rendering cell by cell ({rows_count} rows) took',
+                1000 * (time.perf_counter() - start), 'ms',
+            )
+
+            # Column by column
+            entities = [*FakeContact.objects.filter(id__in=ids)]
+            start = time.perf_counter()
+
+            by_column = EntityCell.render_rows(cells, entities, user)
+
+            print(
+                f'EntityCell.render_rows() ({rows_count} rows) took',
+                1000 * (time.perf_counter() - start), 'ms',
+            )
+
+            self.assertListEqual(by_cell, by_column)
@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+
+from django.db import connection
+from django.db.models import Q
+from django.test.utils import override_settings
+
+from creme.creme_core.core.entity_count import (
+    EntitiesCountCache,
+    estimate_count,
+)
+from creme.creme_core.core.entity_filter import condition_handler, operators
+from creme.creme_core.models import EntityFilter, FakeOrganisation
+
+from ..base import CremeTestCase
+
+
+@override_settings(LISTVIEW_COUNT_CACHE_TIMEOUT=60)
+class EntitiesCountCacheTestCase(CremeTestCase):
+    def setUp(self):
+        super().setUp()
+        self.user = self.create_user()
+
+    def test_build_key(self):
+        user = self.user
+        count_cache = EntitiesCountCache()
+        build_key = count_cache.build_key
+
+        key1 = build_key(model=FakeOrganisation, user=user)
+        self.assertIsInstance(key1, str)
+        self.assertEqual(key1, build_key(model=FakeOrganisation, user=user))
+
+        key2 = build_key(model=FakeOrganisation, user=user, extra_q=Q(name='Bebop'))
+        self.assertNotEqual(key1, key2)
+
+        efilter = EntityFilter.objects.smart_update_or_create(
+            'test-filter01', 'Red', FakeOrganisation, is_custom=True,
+            conditions=[
+                condition_handler.RegularFieldConditionHandler.build_condition(
+                    model=FakeOrganisation, field_name='name',
+                    operator=operators.ISTARTSWITH, values=['Red'],
+                ),
+            ],
+        )
+        key3 = build_key(model=FakeOrganisation, user=user, entity_filter=efilter)
+        self.assertNotIn(key3, [key1, key2])
+
+        count_cache.set(key1, 12)
+        self.assertEqual(12, count_cache.get(key1))
+
+        # Invalidation
+        FakeOrganisation.objects.create(user=user, name='Bebop')
+        key4 = build_key(model=FakeOrganisation, user=user)
+        self.assertNotEqual(key1, key4)
+        self.assertIsNone(count_cache.get(key4))
+
+    def test_build_key_dynamic_filter(self):
+        efilter = EntityFilter.objects.smart_update_or_create(
+            'test-filter01', 'Mine', FakeOrganisation, is_custom=True,
+            conditions=[
+                condition_handler.RegularFieldConditionHandler.build_condition(
+                    model=FakeOrganisation, field_name='user',
+                    operator=operators.EQUALS, values=['__currentuser__'],
+                ),
+            ],
+        )
+        self.assertIsNone(EntitiesCountCache().build_key(
+            model=FakeOrganisation, user=self.user, entity_filter=efilter,
+        ))
+
+    @override_settings(LISTVIEW_COUNT_CACHE_TIMEOUT=0)
+    def test_disabled(self):
+        self.assertIsNone(EntitiesCountCache().build_key(
+            model=FakeOrganisation, user=self.user,
+        ))
+
+    def test_estimate_count(self):
+        estimation = estimate_count(FakeOrganisation)
+
+        if connection.vendor in ('postgresql', 'mysql'):
+            # NB: None if the table has never been analyzed
+            if estimation is not None:
+                self.assertIsInstance(estimation, int)
+        else:
+            self.assertIsNone(estimation)
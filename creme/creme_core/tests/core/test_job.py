@@ -1,19 +1,39 @@
 # -*- coding: utf-8 -*-
 
 import os
+from concurrent.futures import Future
+from io import StringIO
+from concurrent.futures.process import BrokenProcessPool
 from datetime import timedelta
 from shutil import rmtree
 from tempfile import mkdtemp
 from unittest import skipIf
+from unittest.mock import patch
 
+from django.core.cache import cache
 from django.core.exceptions import ImproperlyConfigured
+from django.core.management import call_command
 from django.test.utils import override_settings
 from django.utils.timezone import now
 
-from creme.creme_core.core.job import JobScheduler, _JobTypeRegistry
+from creme.creme_core.core.job import (
+    JobScheduler,
+    _JobTypeRegistry,
+    get_queue,
+)
 from creme.creme_core.core.job.queue.unix_socket import UnixSocketQueue
+from creme.creme_core.core.job.scheduler import (
+    METRICS_CACHE_KEY,
+    PoolJobLauncher,
+    SubprocessJobLauncher,
+    get_metrics,
+)
 from creme.creme_core.core.reminder import Reminder, reminder_registry
-from creme.creme_core.creme_jobs import reminder_type
+from creme.creme_core.creme_jobs import (
+    batch_process_type,
+    mass_import_type,
+    reminder_type,
+)
 from creme.creme_core.creme_jobs.base import JobType
 from creme.creme_core.models import Job
 from creme.creme_core.utils.date_period import HoursPeriod
@@ -209,3 +229,187 @@ class JobSchedulerTestCase(CremeTestCase):
             rounded_hour + timedelta(hours=1),
             JobScheduler()._next_wakeup(job),
         )
+
+    def _create_user_job(self, job_type):
+        return Job.objects.create(
+            user=self.user, type_id=job_type.id, language='en', data={},
+        )
+
+    def _set_job_type_attribute(self, job_type, **kwargs):
+        for attr_name, value in kwargs.items():
+            setattr(job_type, attr_name, value)
+            self.addCleanup(delattr, job_type, attr_name)
+
+    def test_launcher(self):
+        self.assertIsInstance(JobScheduler()._launcher, SubprocessJobLauncher)
+
+        with override_settings(JOB_WORKERS_POOL_SIZE=2):
+            scheduler = JobScheduler()
+
+        launcher = scheduler._launcher
+        self.assertIsInstance(launcher, PoolJobLauncher)
+        self.assertEqual(0, len(launcher))
+        launcher.shutdown()
+
+    def test_launcher_broken_pool(self):
+        self.user = self.create_user()
+        job = self._create_user_job(batch_process_type)
+
+        class BrokenExecutor:
+            def submit(self, *args, **kwargs):
+                raise BrokenProcessPool('A process in the process pool was terminated')
+
+            def shutdown(self, wait=True):
+                pass
+
+        class FakeExecutor(BrokenExecutor):
+            def __init__(self):
+                self.submitted = []
+
+            def submit(self, fn, *args, **kwargs):
+                self.submitted.append(args)
+                return Future()
+
+        new_executor = FakeExecutor()
+
+        with override_settings(JOB_WORKERS_POOL_SIZE=1):
+            launcher = JobScheduler()._launcher
+
+        launcher.shutdown()
+        launcher._executor = BrokenExecutor()
+
+        # The pool is re-created
+        with patch.object(launcher, '_create_executor', return_value=new_executor):
+            launcher.start(job)
+
+        self.assertIs(new_executor, launcher._executor)
+        self.assertListEqual([(job.id,)], new_executor.submitted)
+        self.assertEqual(1, len(launcher))
+
+        # The worker of the job died => the job is marked as failed & ended
+        future = launcher._futures[job.id]
+
+        with patch.object(get_queue(), 'end_job') as end_job:
+            with self.assertLogs(level='CRITICAL'):
+                future.set_exception(BrokenProcessPool('A process was terminated'))
+
+        job = self.refresh(job)
+        self.assertEqual(Job.STATUS_ERROR, job.status)
+        self.assertIn('A process was terminated', job.error)
+        end_job.assert_called_once()
+        self.assertEqual(job.id, end_job.call_args[0][0].id)
+
+    def test_pop_user_job(self):
+        self.user = self.create_user()
+        self._set_job_type_attribute(mass_import_type, priority=10, max_concurrency=1)
+
+        create_job = self._create_user_job
+        job1 = create_job(batch_process_type)
+        job2 = create_job(mass_import_type)
+        job3 = create_job(mass_import_type)
+        job4 = create_job(batch_process_type)
+
+        scheduler = JobScheduler()
+        scheduler._retrieve_jobs()
+        self.assertListEqual(
+            [job4.id, job3.id, job2.id, job1.id],
+            [job.id for job in scheduler._users_jobs],
+        )
+
+        # Greatest priority first
+        self.assertEqual(job2, scheduler._pop_user_job())
+        scheduler._running_userjobs_per_type[mass_import_type.id] += 1
+
+        # Limit of mass imports reached => oldest job
+        self.assertEqual(job1, scheduler._pop_user_job())
+        self.assertEqual(job4, scheduler._pop_user_job())
+        self.assertIsNone(scheduler._pop_user_job())
+        self.assertListEqual([job3.id], [job.id for job in scheduler._users_jobs])
+
+    def test_metrics(self):
+        self.user = self.create_user()
+        cache.delete(METRICS_CACHE_KEY)
+
+        class FakeLauncher:
+            def __init__(self):
+                self.job_ids = set()
+
+            def __len__(self):
+                return len(self.job_ids)
+
+            def start(self, job):
+                self.job_ids.add(job.id)
+
+            def end(self, job):
+                self.job_ids.discard(job.id)
+
+        job1 = self._create_user_job(batch_process_type)
+        job2 = self._create_user_job(batch_process_type)
+
+        scheduler = JobScheduler()
+        scheduler._launcher = FakeLauncher()
+        scheduler._retrieve_jobs()
+        self.assertDictEqual(
+            {'waiting_user_jobs': 2, 'running_jobs': 0, 'jobs': {}},
+            scheduler.metrics(),
+        )
+
+        job = scheduler._pop_user_job()
+        self.assertEqual(job1, job)
+        scheduler._start_job(job)
+        self.assertDictEqual(
+            {'waiting_user_jobs': 1, 'running_jobs': 1, 'jobs': {}},
+            scheduler.metrics(),
+        )
+
+        with self.assertLogs(level='INFO'):
+            scheduler._end_job(job)
+
+        metrics = scheduler.metrics()
+        stored_metrics = get_metrics()
+        self.assertIsInstance(stored_metrics, dict)
+        self.assertIsInstance(stored_metrics.pop('date', None), str)
+        self.assertDictEqual(metrics, stored_metrics)
+        self.assertEqual(1, metrics['waiting_user_jobs'])
+        self.assertEqual(0, metrics['running_jobs'])
+
+        job_metrics = metrics['jobs'].get(batch_process_type.id)
+        self.assertIsInstance(job_metrics, dict)
+        self.assertEqual(1, job_metrics['count'])
+        self.assertGreaterEqual(job_metrics['mean_wait_time'], 0)
+        self.assertGreaterEqual(job_metrics['max_run_time'], job_metrics['mean_run_time'])
+        self.assertIn(job2, scheduler._users_jobs)
+
+        # The job waits for a worker => the start of its execution is used
+        job = scheduler._pop_user_job()
+        self.assertEqual(job2, job)
+        scheduler._start_job(job)
+
+        now_value = now()
+        scheduler._queued_times[job.id] = now_value - timedelta(seconds=120)
+        scheduler._start_times[job.id] = now_value - timedelta(seconds=90)
+        job.last_run = now_value - timedelta(seconds=30)
+
+        with self.assertLogs(level='INFO'):
+            scheduler._end_job(job)
+
+        job_metrics = scheduler.metrics()['jobs'][batch_process_type.id]
+        self.assertEqual(2, job_metrics['count'])
+        self.assertGreaterEqual(job_metrics['max_wait_time'], 90)
+
+        # Command
+        stdout = StringIO()
+        call_command('creme_job_manager', metrics=True, stdout=stdout)
+        output = stdout.getvalue()
+        self.assertIn('Waiting user jobs: 0', output)
+        self.assertIn(f' - {batch_process_type.id}: count=2 ', output)
+
+    def test_metrics_command_no_metrics(self):
+        cache.delete(METRICS_CACHE_KEY)
+        self.assertIsNone(get_metrics())
+
+        stdout = StringIO()
+        stderr = StringIO()
+        call_command('creme_job_manager', metrics=True, stdout=stdout, stderr=stderr)
+        self.assertFalse(stdout.getvalue())
+        self.assertIn('No metrics found', stderr.getvalue())
@@ -0,0 +1,355 @@
+# -*- coding: utf-8 -*-
+
+from functools import partial
+from unittest import skipUnless
+
+from django.contrib.contenttypes.models import ContentType
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection
+from django.db.models import signals
+from django.test.utils import override_settings
+
+from creme.creme_core.core.entity_cell import (
+    EntityCellCustomField,
+    EntityCellFunctionField,
+    EntityCellRegularField,
+)
+from creme.creme_core.core.search import Searcher
+from creme.creme_core.core.search_index import (
+    PythonSearchIndexBackend,
+    SQLiteFTS5SearchIndexBackend,
+    get_search_index_backend,
+    normalize_content,
+)
+from creme.creme_core.management.commands.creme_search_index import (
+    Command as SearchIndexCommand,
+)
+from creme.creme_core.models import (
+    CustomField,
+    FakeContact,
+    FakeOrganisation,
+    FakeSector,
+    SearchConfigItem,
+    SearchIndexEntry,
+    UserRole,
+)
+
+from ..base import CremeTestCase
+
+PYTHON_BACKEND = 'creme.creme_core.core.search_index.PythonSearchIndexBackend'
+
+
+class SearchIndexTestCase(CremeTestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+
+        cls.contact_ct = ContentType.objects.get_for_model(FakeContact)
+        cls.orga_ct = ContentType.objects.get_for_model(FakeOrganisation)
+
+    def setUp(self):
+        super().setUp()
+        self.user = self.create_user()
+
+        SearchConfigItem.objects.filter(
+            content_type__in=[self.contact_ct, self.orga_ct],
+        ).delete()
+
+    def _setup_contact_config(self):
+        SearchConfigItem.objects.create_if_needed(
+            FakeContact, ['first_name', 'last_name', 'sector__title'],
+        )
+
+    def _get_contents(self, entity):
+        return {
+            entry.cell_key: entry.content
+            for entry in SearchIndexEntry.objects.filter(entity_id=entity.id)
+        }
+
+    def test_get_backend(self):
+        with override_settings(SEARCH_INDEX_BACKEND=None):
+            self.assertIsNone(get_search_index_backend())
+
+        with override_settings(SEARCH_INDEX_BACKEND=PYTHON_BACKEND):
+            backend = get_search_index_backend()
+
+        self.assertIsInstance(backend, PythonSearchIndexBackend)
+
+    def test_normalize_content(self):
+        self.assertEqual('foobar', normalize_content('FooBar'))
+        self.assertEqual('strasse', normalize_content('Straße'))
+
+    def test_get_cells(self):
+        self._setup_contact_config()
+        SearchConfigItem.objects.create(
+            content_type=self.contact_ct, role=UserRole.objects.create(name='Basic'), cells=[
+                EntityCellRegularField.build(FakeContact, 'last_name'),
+                EntityCellRegularField.build(FakeContact, 'description'),
+                EntityCellFunctionField.build(FakeContact, 'get_pretty_properties'),
+            ],
+        )
+
+        cells = PythonSearchIndexBackend().get_cells(self.contact_ct)
+        self.assertListEqual(
+            [
+                'regular_field-first_name',
+                'regular_field-last_name',
+                'regular_field-description',
+            ],
+            [cell.key for cell in cells],
+        )
+
+    def test_is_indexable(self):
+        is_indexable = PythonSearchIndexBackend().is_indexable
+        build_cell = partial(EntityCellRegularField.build, FakeContact)
+        self.assertTrue(is_indexable(build_cell('last_name')))
+        self.assertFalse(is_indexable(build_cell('sector')))
+        self.assertFalse(is_indexable(build_cell('sector__title')))
+        self.assertFalse(is_indexable(build_cell('image__categories__name')))
+        self.assertFalse(is_indexable(EntityCellFunctionField.build(
+            FakeContact, 'get_pretty_properties',
+        )))
+
+        create_cfield = partial(CustomField.objects.create, content_type=self.contact_ct)
+        self.assertTrue(is_indexable(EntityCellCustomField(
+            create_cfield(name='ID number', field_type=CustomField.STR),
+        )))
+        self.assertFalse(is_indexable(EntityCellCustomField(
+            create_cfield(name='Level', field_type=CustomField.ENUM),
+        )))
+        self.assertFalse(is_indexable(EntityCellCustomField(
+            create_cfield(name='Hobbies', field_type=CustomField.MULTI_ENUM),
+        )))
+
+    def test_get_cells_default(self):
+        "No configuration => all fields are used."
+        cells = PythonSearchIndexBackend().get_cells(self.orga_ct)
+        keys = {cell.key for cell in cells}
+        self.assertIn('regular_field-name', keys)
+        self.assertIn('regular_field-description', keys)
+
+    def test_get_cells_disabled(self):
+        SearchConfigItem.objects.create_if_needed(FakeContact, ['first_name'], disabled=True)
+        self.assertFalse(PythonSearchIndexBackend().get_cells(self.contact_ct))
+
+    def test_index(self):
+        self._setup_contact_config()
+
+        sector = FakeSector.objects.create(title='Linux dev')
+        linus = FakeContact.objects.create(
+            user=self.user, first_name='Linus', last_name='Torvalds',
+            sector=sector,
+        )
+        alan = FakeContact.objects.create(user=self.user, first_name='Alan', last_name='Cox')
+        self.assertFalse(SearchIndexEntry.objects.all())
+
+        backend = PythonSearchIndexBackend()
+        self.assertEqual(4, backend.index([linus, alan]))
+
+        entry = self.get_object_or_fail(
+            SearchIndexEntry, entity_id=linus.id, cell_key='regular_field-last_name',
+        )
+        self.assertEqual(self.contact_ct, entry.entity_ctype)
+        self.assertEqual('torvalds', entry.content)
+
+        # Not indexed (it depends on another instance)
+        self.assertFalse(SearchIndexEntry.objects.filter(
+            entity_id=linus.id, cell_key='regular_field-sector__title',
+        ))
+
+        self.assertDictEqual(
+            {
+                'regular_field-first_name': 'alan',
+                'regular_field-last_name': 'cox',
+            },
+            self._get_contents(alan),
+        )
+
+        # Re-index
+        alan.last_name = 'Smithee'
+        backend.index([alan])
+        self.assertEqual('smithee', self._get_contents(alan)['regular_field-last_name'])
+
+        backend.unindex([alan.id])
+        self.assertFalse(self._get_contents(alan))
+        self.assertEqual(2, len(self._get_contents(linus)))
+
+    def test_index_custom_field(self):
+        cfield = CustomField.objects.create(
+            name='ID number', content_type=self.orga_ct, field_type=CustomField.STR,
+        )
+        SearchConfigItem.objects.create(
+            content_type=self.orga_ct,
+            cells=[
+                EntityCellRegularField.build(FakeOrganisation, 'name'),
+                EntityCellCustomField(cfield),
+            ],
+        )
+
+        orga = FakeOrganisation.objects.create(user=self.user, name='Foobar')
+        cfield.value_class(custom_field=cfield, entity=orga).set_value_n_save('ABCD123')
+
+        PythonSearchIndexBackend().index([orga])
+        self.assertDictEqual(
+            {
+                'regular_field-name': 'foobar',
+                f'custom_field-{cfield.id}': 'abcd123',
+            },
+            self._get_contents(orga),
+        )
+
+    @override_settings(SEARCH_INDEX_BACKEND=PYTHON_BACKEND)
+    def test_signals(self):
+        self._setup_contact_config()
+
+        contact = FakeContact.objects.create(
+            user=self.user, first_name='Linus', last_name='Torvalds',
+        )
+        self.assertDictEqual(
+            {
+                'regular_field-first_name': 'linus',
+                'regular_field-last_name': 'torvalds',
+            },
+            self._get_contents(contact),
+        )
+
+        contact.last_name = 'Impostor'
+        contact.save()
+        self.assertEqual('impostor', self._get_contents(contact)['regular_field-last_name'])
+
+        contact_id = contact.id
+        contact.delete()
+        self.assertFalse(SearchIndexEntry.objects.filter(entity_id=contact_id))
+
+    @override_settings(SEARCH_INDEX_BACKEND=PYTHON_BACKEND)
+    def test_signals_custom_field(self):
+        cfield = CustomField.objects.create(
+            name='ID number', content_type=self.orga_ct, field_type=CustomField.STR,
+        )
+        SearchConfigItem.objects.create(
+            content_type=self.orga_ct, cells=[EntityCellCustomField(cfield)],
+        )
+
+        orga = FakeOrganisation.objects.create(user=self.user, name='Foobar')
+        self.assertFalse(self._get_contents(orga))
+
+        cvalue = cfield.value_class(custom_field=cfield, entity=orga)
+        cvalue.set_value_n_save('ABCD123')
+        self.assertDictEqual({f'custom_field-{cfield.id}': 'abcd123'}, self._get_contents(orga))
+
+        cvalue.delete()
+        self.assertFalse(self._get_contents(orga))
+
+    def test_signals_raw(self):
+        "Fixtures (loaddata) are not indexed."
+        self._setup_contact_config()
+        contact = FakeContact.objects.create(
+            user=self.user, first_name='Linus', last_name='Torvalds',
+        )
+
+        with override_settings(SEARCH_INDEX_BACKEND=PYTHON_BACKEND):
+            signals.post_save.send(
+                sender=FakeContact, instance=contact, created=True, raw=True,
+            )
+
+        self.assertFalse(self._get_contents(contact))
+
+    def test_signals_no_backend(self):
+        self._setup_contact_config()
+        FakeContact.objects.create(user=self.user, first_name='Linus', last_name='Torvalds')
+        self.assertFalse(SearchIndexEntry.objects.all())
+
+    @override_settings(SEARCH_INDEX_BACKEND=PYTHON_BACKEND)
+    def test_searcher(self):
+        self._setup_contact_config()
+
+        sector = FakeSector.objects.create(title='Linux dev')
+        create_contact = partial(FakeContact.objects.create, user=self.user)
+        linus = create_contact(first_name='Linus', last_name='Torvalds')
+        alan = create_contact(first_name='Alan', last_name='Cox', description='Cool beard')
+        andrew = create_contact(first_name='Andrew', last_name='Morton', sector=sector)
+
+        searcher = Searcher([FakeContact], self.user)
+
+        self.assertListEqual([linus], [*searcher.search(FakeContact, 'TORVA')])
+        self.assertListEqual([andrew], [*searcher.search(FakeContact, 'linux')])
+
+        # The not indexed cells are up-to-date
+        sector.title = 'Kernel dev'
+        sector.save()
+        self.assertListEqual([andrew], [*searcher.search(FakeContact, 'kernel')])
+        self.assertFalse(searcher.search(FakeContact, 'linux'))
+        self.assertListEqual([alan], [*searcher.search(FakeContact, 'alan cox')])
+        self.assertFalse(searcher.search(FakeContact, 'alan torvalds'))
+        self.assertFalse(searcher.search(FakeContact, 'beard'))  # Not configured
+
+        # Not indexed cells are searched too
+        SearchConfigItem.objects.filter(content_type=self.contact_ct).update(
+            json_cells=[
+                {'type': 'regular_field', 'value': 'last_name'},
+                {'type': 'function_field', 'value': 'get_pretty_properties'},
+            ],
+        )
+        self.assertListEqual(
+            [linus],
+            [*Searcher([FakeContact], self.user).search(FakeContact, 'torvalds')],
+        )
+
+    @skipUnless(connection.vendor == 'sqlite', 'SQLite specific test')
+    def test_sqlite_backend(self):
+        self._setup_contact_config()
+
+        create_contact = partial(FakeContact.objects.create, user=self.user)
+        linus = create_contact(first_name='Linus', last_name='Torvalds')
+        alan = create_contact(first_name='Alan', last_name='Cox')
+        linus2 = create_contact(first_name='Linus', last_name='Impostor')
+
+        backend = SQLiteFTS5SearchIndexBackend()
+        backend.index([linus, alan, linus2])
+
+        def search(word):
+            return {
+                *FakeContact.objects.filter(
+                    backend.search_q(FakeContact, backend.get_cells(self.contact_ct), word),
+                )
+            }
+
+        self.assertSetEqual({linus, linus2}, search('linus'))
+        self.assertSetEqual({linus}, search('Torv'))
+        self.assertSetEqual(set(), search('orvalds'))  # Prefixes only
+        self.assertSetEqual(set(), search('"'))
+
+        # Triggers synchronize the full-text table
+        alan.last_name = 'Smithee'
+        backend.index([alan])
+        self.assertSetEqual(set(), search('cox'))
+        self.assertSetEqual({alan}, search('smit'))
+
+        backend.unindex([linus.id])
+        self.assertSetEqual({linus2}, search('linus'))
+
+    @override_settings(SEARCH_INDEX_BACKEND=PYTHON_BACKEND)
+    def test_command(self):
+        self._setup_contact_config()
+
+        contact = FakeContact.objects.create(
+            user=self.user, first_name='Linus', last_name='Torvalds',
+        )
+        SearchIndexEntry.objects.all().delete()
+
+        call_command(SearchIndexCommand(), 'creme_core.fakecontact', verbosity=0)
+        self.assertDictEqual(
+            {
+                'regular_field-first_name': 'linus',
+                'regular_field-last_name': 'torvalds',
+            },
+            self._get_contents(contact),
+        )
+
+        with self.assertRaises(CommandError):
+            call_command(SearchIndexCommand(), 'creme_core.invalid', verbosity=0)
+
+    def test_command_no_backend(self):
+        with self.assertRaises(CommandError):
+            call_command(SearchIndexCommand(), verbosity=0)
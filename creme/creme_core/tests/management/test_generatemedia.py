@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+
+import os
+from os.path import exists, join
+from shutil import rmtree
+from tempfile import mkdtemp
+from unittest.mock import patch
+
+from django.core.management import call_command
+
+from mediagenerator import api, utils
+
+from .. import base
+
+
+class GenerateMediaTestCase(base.CremeTestCase):
+    def setUp(self):
+        super().setUp()
+        self.root_dir = root_dir = mkdtemp(prefix='creme_test_generatemedia')
+        self.addCleanup(rmtree, root_dir, ignore_errors=True)
+
+        self.media_dir = join(root_dir, 'static')
+        self.names_file = join(root_dir, '_generated_media_names.py')
+        self.build_file = join(root_dir, '.mediagenerator-build.json')
+
+        for name, value in [
+            ('GENERATED_MEDIA_DIR', self.media_dir),
+            ('GENERATED_MEDIA_NAMES_FILE', self.names_file),
+            ('GENERATED_MEDIA_BUILD_FILE', self.build_file),
+        ]:
+            patcher = patch.object(api, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+        # NB: the command replaces the global mapping of the names.
+        names_patcher = patch.object(utils, 'NAMES', utils.NAMES)
+        names_patcher.start()
+        self.addCleanup(names_patcher.stop)
+
+    def test_full(self):
+        "Default options (not incremental, no worker)."
+        with patch('sys.stdout'):
+            call_command('generatemedia', verbosity=0)
+
+        self.assertTrue(exists(self.names_file))
+        self.assertIn('main.js', utils.NAMES)
+        self.assertTrue(  # Filter "I18N"
+            any(key.startswith('l10n.js?language=') for key in utils.NAMES)
+        )
+        self.assertTrue(exists(join(self.media_dir, utils.NAMES['main.js'])))
+
+        self.assertFalse(exists(self.build_file))
+        self.assertListEqual(
+            [],
+            [name for name in os.listdir(self.root_dir) if '.tmp' in name or '.old' in name],
+        )
+
+    def test_incremental(self):
+        with patch('sys.stdout'):
+            call_command('generatemedia', verbosity=0, incremental=True, workers=2)
+
+        self.assertTrue(exists(self.build_file))
+        self.assertFalse(exists(join(self.media_dir, '.mediagenerator-build.json')))
+
+        names = {**utils.NAMES}
+        self.assertIn('main.js', names)
+
+        with patch('sys.stdout'):
+            call_command('generatemedia', verbosity=0, incremental=True)
+
+        self.assertDictEqual(names, utils.NAMES)
+        self.assertTrue(exists(join(self.media_dir, utils.NAMES['main.js'])))
+
+        # The fingerprints do not correspond to the files of a full generation
+        with patch('sys.stdout'):
+            call_command('generatemedia', verbosity=0)
+
+        self.assertFalse(exists(self.build_file))
@@ -37,6 +37,7 @@ from creme.creme_core.models import (
     UserRole,
 )
 from creme.creme_core.sandboxes import OnlySuperusersType
+from creme.creme_core.utils.profiling import CaptureQueriesContext
 from creme.documents.models import Document, Folder
 from creme.documents.tests.base import skipIfCustomDocument, skipIfCustomFolder
 
@@ -1471,6 +1472,87 @@ class CredentialsTestCase(CremeTestCase):
             ec_filter(self._build_contact_qs(contact3, contact4, contact5), perm=VIEW)
         )
 
+    def test_populate_credentials(self):
+        "ESET_FILTER with properties (prefetched) + ESET_OWN + different types."
+        user = self.user
+        other_user = self.other_user
+        VIEW = EntityCredentials.VIEW
+        CHANGE = EntityCredentials.CHANGE
+
+        ptype = CremePropertyType.objects.smart_update_or_create(
+            str_pk='test-prop_samurai', text='Samurai',
+        )
+        create_contact = partial(FakeContact.objects.create, user=other_user)
+        contacts = [
+            self.contact1, self.contact2,
+            *(create_contact(first_name=f'Ronin #{i}', last_name='Ronin') for i in range(4)),
+        ]
+        for contact in contacts[1::2]:
+            CremeProperty.objects.create(type=ptype, creme_entity=contact)
+
+        orga = FakeOrganisation.objects.create(user=other_user, name='Century')
+        CremeProperty.objects.create(type=ptype, creme_entity=orga)
+
+        efilter = EntityFilter.objects.create(
+            id='creme_core-test_auth', entity_type=FakeContact, filter_type=EF_CREDENTIALS,
+        )
+        efilter.set_conditions(
+            [
+                condition_handler.PropertyConditionHandler.build_condition(
+                    model=FakeContact, ptype=ptype, has=True, filter_type=EF_CREDENTIALS,
+                ),
+            ],
+            check_cycles=False, check_privacy=False,
+        )
+
+        self._create_role(
+            'Coder', ['creme_core'], users=[user],
+            set_creds=[
+                SetCredentials(value=CHANGE, set_type=SetCredentials.ESET_OWN),
+                SetCredentials(
+                    value=VIEW, set_type=SetCredentials.ESET_FILTER,
+                    ctype=FakeContact, efilter=efilter,
+                ),
+            ],
+        )
+
+        def populate(entities):
+            user_refreshed = self.refresh(user)
+            entities = [*CremeEntity.objects.filter(id__in=[e.id for e in entities])]
+            user_refreshed.populate_credentials(entities)  # Fill the caches (ContentTypes...)
+
+            entities = [*CremeEntity.objects.filter(id__in=[e.id for e in entities])]
+            with CaptureQueriesContext() as ctxt:
+                user_refreshed.populate_credentials(entities)
+
+            with self.assertNumQueries(0):
+                perms = {
+                    entity.id: (
+                        user_refreshed.has_perm_to_view(entity),
+                        user_refreshed.has_perm_to_change(entity),
+                    ) for entity in entities
+                }
+
+            return perms, len(ctxt.captured_queries)
+
+        perms2, queries2 = populate([*contacts[:2], orga])
+        perms7, queries7 = populate([*contacts, orga])
+        self.assertEqual(queries2, queries7)
+
+        # Same results than the credentials computed one by one
+        self.assertDictEqual(
+            {
+                entity.id: (
+                    user.has_perm_to_view(entity), user.has_perm_to_change(entity),
+                ) for entity in CremeEntity.objects.filter(id__in=[*perms7.keys()])
+            },
+            perms7,
+        )
+        self.assertTupleEqual((False, True), perms7[contacts[0].id])
+        self.assertTupleEqual((True, False), perms7[contacts[1].id])
+        self.assertTupleEqual((False, False), perms7[contacts[2].id])
+        self.assertTupleEqual((False, False), perms7[orga.id])
+
     def test_credentials_with_filter09(self):
         "ESET_FILTER (forbidden) x 2."
         user = self.user
@@ -1789,6 +1871,189 @@ class CredentialsTestCase(CremeTestCase):
 
         self.assertListEqual([contact1.id, contact4.id], ids_list)
 
+    def test_compiled_credentials(self):
+        "Cache of compiled credentials."
+        from creme.creme_core.models.auth import _COMPILED_CREDENTIALS
+
+        user = self.user
+        other = self.other_user
+        VIEW = EntityCredentials.VIEW
+
+        contact1 = self.contact1
+        contact2 = self.contact2
+        contact3 = FakeContact.objects.create(
+            user=other, first_name='Ryu', last_name='Hayabusa',
+        )
+
+        efilter = EntityFilter.objects.create(
+            id='creme_core-test_auth',
+            entity_type=FakeContact,
+            filter_type=EF_CREDENTIALS,
+        )
+        build_cond = partial(
+            condition_handler.RegularFieldConditionHandler.build_condition,
+            model=FakeContact, operator=operators.EQUALS, field_name='last_name',
+            filter_type=EF_CREDENTIALS,
+        )
+        set_conditions = partial(
+            efilter.set_conditions, check_cycles=False, check_privacy=False,
+        )
+        set_conditions([build_cond(values=[contact2.last_name])])
+
+        build_cred = partial(SetCredentials, value=VIEW, ctype=FakeContact)
+        self._create_role(
+            'Coder', ['creme_core'],
+            users=[user],
+            set_creds=[
+                build_cred(set_type=SetCredentials.ESET_OWN),
+                build_cred(set_type=SetCredentials.ESET_FILTER, efilter=efilter),
+            ],
+        )
+        self.assertFalse(_COMPILED_CREDENTIALS)
+
+        def filter_ids():
+            return {
+                *EntityCredentials.filter(
+                    self.refresh(user), self._build_contact_qs(contact3), perm=VIEW,
+                ).values_list('id', flat=True),
+            }
+
+        self.assertSetEqual({contact1.id, contact2.id}, filter_ids())
+        self.assertEqual(1, len(_COMPILED_CREDENTIALS))
+        compiled = [*_COMPILED_CREDENTIALS.values()]
+
+        self.assertSetEqual({contact1.id, contact2.id}, filter_ids())
+        self.assertListEqual(compiled, [*_COMPILED_CREDENTIALS.values()])
+
+        # The filter is modified => new key
+        set_conditions([build_cond(values=[contact3.last_name])])
+        self.assertSetEqual({contact1.id, contact3.id}, filter_ids())
+        self.assertEqual(2, len(_COMPILED_CREDENTIALS))
+
+        # The teams are modified => the cache is cleared
+        team = self._create_team('Teamee', [user])
+        self.assertFalse(_COMPILED_CREDENTIALS)
+
+        contact4 = FakeContact.objects.create(user=team, first_name='Ito', last_name='Ittosai')
+        self.assertSetEqual(
+            {contact1.id, contact3.id, contact4.id},
+            {
+                *EntityCredentials.filter(
+                    self.refresh(user),
+                    self._build_contact_qs(contact3, contact4),
+                    perm=VIEW,
+                ).values_list('id', flat=True),
+            },
+        )
+        self.assertEqual(1, len(_COMPILED_CREDENTIALS))
+
+        # Dynamic filter => no cache
+        set_conditions([
+            build_cond(
+                operator=operators.EQUALS_NOT, field_name='user',
+                values=[operands.CurrentUserOperand.type_id],
+            ),
+        ])
+        self.assertSetEqual({contact1.id, contact2.id, contact3.id}, filter_ids())
+        self.assertEqual(1, len(_COMPILED_CREDENTIALS))
+
+        # The credentials are modified => the cache is cleared
+        SetCredentials.objects.create(
+            role=user.role, value=VIEW, set_type=SetCredentials.ESET_ALL,
+            ctype=FakeOrganisation,
+        )
+        self.assertFalse(_COMPILED_CREDENTIALS)
+
+    def test_compiled_credentials_max_size(self):
+        from creme.creme_core.models.auth import _CompiledCredentialsCache
+
+        cache = _CompiledCredentialsCache(max_size=2)
+        cache['a'] = 1
+        cache['b'] = 2
+        self.assertEqual(1, cache.get('a'))  # 'a' is now the most recent entry
+
+        cache['c'] = 3
+        self.assertListEqual(['a', 'c'], [*cache.keys()])
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(3, cache.get('c'))
+
+    def bench_filter_many_credentials(self):
+        """Little benchmark of EntityCredentials.filter() with a role which
+        contains many SetCredentials (with EntityFilters) ; the compiled
+        credentials are cached or not.
+        """
+        import time
+
+        from creme.creme_core.models.auth import _COMPILED_CREDENTIALS
+
+        user = self.user
+        VIEW = EntityCredentials.VIEW
+
+        ptype = CremePropertyType.objects.smart_update_or_create(
+            str_pk='test-prop_samurai', text='Samurai',
+        )
+        create_contact = partial(FakeContact.objects.create, user=self.other_user)
+        for i in range(200):
+            contact = create_contact(first_name=f'Name #{i}', last_name=f'Last name #{i % 7}')
+
+            if i % 3:
+                CremeProperty.objects.create(type=ptype, creme_entity=contact)
+
+        build_cred = partial(SetCredentials, value=VIEW, ctype=FakeContact)
+        creds = [
+            build_cred(set_type=SetCredentials.ESET_OWN),
+            SetCredentials(value=VIEW, set_type=SetCredentials.ESET_ALL, ctype=FakeOrganisation),
+        ]
+
+        for i in range(10):
+            efilter = EntityFilter.objects.create(
+                id=f'creme_core-test_auth{i}',
+                entity_type=FakeContact,
+                filter_type=EF_CREDENTIALS,
+            )
+            efilter.set_conditions(
+                [
+                    condition_handler.RegularFieldConditionHandler.build_condition(
+                        model=FakeContact, operator=operators.STARTSWITH,
+                        field_name='last_name', values=[f'Last name #{i}'],
+                        filter_type=EF_CREDENTIALS,
+                    ),
+                    condition_handler.PropertyConditionHandler.build_condition(
+                        model=FakeContact, ptype=ptype, has=bool(i % 2),
+                        filter_type=EF_CREDENTIALS,
+                    ),
+                ],
+                check_cycles=False, check_privacy=False,
+            )
+            creds.append(build_cred(
+                set_type=SetCredentials.ESET_FILTER, efilter=efilter, forbidden=(i == 9),
+            ))
+
+        self._create_role('Coder', ['creme_core'], users=[user], set_creds=creds)
+
+        qs = FakeContact.objects.all()
+        count = EntityCredentials.filter(self.refresh(user), qs, perm=VIEW).count()
+        loops = 200
+
+        for cached in (False, True):
+            start = time.perf_counter()
+
+            for _i in range(loops):
+                if not cached:
+                    _COMPILED_CREDENTIALS.clear()
+
+                filtered = EntityCredentials.filter(self.refresh(user), qs, perm=VIEW)
+                str(filtered.query)
+
+            print(
+                f'EntityCredentials.filter() (cached={cached}, {len(creds)} credentials) took',
+                1000 * (time.perf_counter() - start) / loops, 'ms',
+            )
+
+        self.assertEqual(
+            count, EntityCredentials.filter(self.refresh(user), qs, perm=VIEW).count(),
+        )
+
     def test_creation_creds01(self):
         user = self.user
         role = self._create_role('Coder', users=[user])
@@ -4,10 +4,12 @@ from functools import partial
 
 from django.contrib.contenttypes.models import ContentType
 from django.db.models.deletion import ProtectedError
+from django.test.utils import override_settings
 from django.utils.translation import gettext as _
 from django.utils.translation import ngettext
 
 from creme.creme_core.core.deletion import FixedValueReplacer, SETReplacer
+from creme.creme_core.core.entity_count import EntitiesCountCache
 from creme.creme_core.creme_jobs import deletor_type
 from creme.creme_core.models import (
     DeletionCommand,
@@ -17,9 +19,11 @@ from creme.creme_core.models import (
     FakeSector,
     FakeTicket,
     FakeTicketPriority,
+    HistoryLine,
     Job,
     JobResult,
 )
+from creme.creme_core.models.history import TYPE_EDITION
 from creme.creme_core.utils.translation import get_model_verbose_name
 
 from ..base import CremeTestCase
@@ -362,3 +366,96 @@ class DeletionCommandTestCase(CremeTestCase):
             ],
             jresult.messages,
         )
+
+    def test_deletor_job05(self):
+        "Replacement in bulk (several chunks) + history."
+        user = self.create_user()
+
+        civ = FakeCivility.objects.first()
+        civ2del = FakeCivility.objects.create(title='Kun')
+
+        create_contact = partial(FakeContact.objects.create, user=user, civility=civ2del)
+        contacts = [
+            create_contact(last_name='Hattori', first_name=first_name)
+            for first_name in ('Genzo', 'Hanzo', 'Kotaro')
+        ]
+        last_hline_id = HistoryLine.objects.order_by('-id').values_list('id', flat=True)[0]
+
+        job = Job.objects.create(type_id=deletor_type.id, user=user)
+        DeletionCommand.objects.create(
+            job=job,
+            instance_to_delete=civ2del,
+            replacers=[
+                FixedValueReplacer(
+                    model_field=FakeContact._meta.get_field('civility'),
+                    value=civ,
+                ),
+            ],
+            total_count=3,
+        )
+
+        self.assertFalse(deletor_type.needs_save(FakeContact))
+        self.assertFalse(deletor_type.needs_save(FakeCivility))
+
+        deletor_type.chunk_size = 2
+        try:
+            deletor_type.execute(job)
+        finally:
+            del deletor_type.chunk_size
+
+        self.assertDoesNotExist(civ2del)
+
+        for contact in contacts:
+            refreshed_contact = self.refresh(contact)
+            self.assertEqual(civ, refreshed_contact.civility)
+            self.assertGreaterEqual(refreshed_contact.modified, contact.modified)
+
+        self.assertEqual(3, DeletionCommand.objects.get(job=job).updated_count)
+
+        hlines = [*HistoryLine.objects.filter(id__gt=last_hline_id)]
+        self.assertSetEqual(
+            {contact.id for contact in contacts},
+            {hline.entity_id for hline in hlines},
+        )
+
+        for hline in hlines:
+            self.assertEqual(TYPE_EDITION, hline.type)
+            self.assertListEqual(
+                [['civility', civ2del.id, civ.id]], hline.modifications,
+            )
+
+    @override_settings(LISTVIEW_COUNT_CACHE_TIMEOUT=60)
+    def test_deletor_job06(self):
+        "Replacement in bulk => the counts of the list-view are invalidated."
+        user = self.create_user()
+
+        civ = FakeCivility.objects.first()
+        civ2del = FakeCivility.objects.create(title='Kun')
+        FakeContact.objects.create(
+            user=user, last_name='Hattori', first_name='Genzo', civility=civ2del,
+        )
+
+        count_cache = EntitiesCountCache()
+        key1 = count_cache.build_key(model=FakeContact, user=user)
+        count_cache.set(key1, 1)
+
+        job = Job.objects.create(type_id=deletor_type.id, user=user)
+        DeletionCommand.objects.create(
+            job=job,
+            instance_to_delete=civ2del,
+            replacers=[
+                FixedValueReplacer(
+                    model_field=FakeContact._meta.get_field('civility'),
+                    value=civ,
+                ),
+            ],
+            total_count=1,
+        )
+        self.assertFalse(deletor_type.needs_save(FakeContact))
+
+        deletor_type.execute(job)
+        self.assertDoesNotExist(civ2del)
+
+        key2 = count_cache.build_key(model=FakeContact, user=user)
+        self.assertNotEqual(key1, key2)
+        self.assertIsNone(count_cache.get(key2))
@@ -3857,6 +3857,267 @@ class EntityFiltersTestCase(CremeTestCase):
         )
         self.assertIs(efilter4.applicable_on_entity_base, False)
 
+    def test_compiled_cache(self):
+        build_cond = partial(
+            RegularFieldConditionHandler.build_condition,
+            model=FakeContact, field_name='last_name',
+        )
+        efilter = EntityFilter.objects.smart_update_or_create(
+            'test-filter01', 'Ikari', FakeContact, is_custom=True,
+            conditions=[build_cond(operator=operators.IEQUALS, values=['Ikari'])],
+        )
+        self.assertIs(efilter.is_dynamic, False)
+        self.assertExpectedFiltered(
+            efilter, FakeContact, self._list_contact_ids('shinji', 'yui', 'gendou'),
+        )
+
+        # The conditions are not retrieved again
+        efilter = self.refresh(efilter)
+        with self.assertNumQueries(0):
+            efilter.get_q()
+
+        # Modification of the conditions
+        old_revision = efilter.revision
+        efilter.set_conditions([build_cond(operator=operators.EQUALS, values=['Wong'])])
+        self.assertNotEqual(old_revision, efilter.revision)
+        self.assertEqual(efilter.revision, self.refresh(efilter).revision)
+        self.assertExpectedFiltered(efilter, FakeContact, self._list_contact_ids('ed'))
+        self.assertExpectedFiltered(
+            self.refresh(efilter), FakeContact, self._list_contact_ids('ed'),
+        )
+
+        # Modification of the filter itself
+        efilter.set_conditions([
+            build_cond(operator=operators.EQUALS, values=['Wong']),
+            build_cond(operator=operators.EQUALS, values=['Black']),
+        ])
+        efilter.use_or = True
+        efilter.save()
+        self.assertExpectedFiltered(
+            self.refresh(efilter), FakeContact, self._list_contact_ids('ed', 'jet'),
+        )
+
+    def test_compiled_cache_subfilter(self):
+        build_cond = partial(
+            RegularFieldConditionHandler.build_condition,
+            model=FakeContact, operator=operators.EQUALS, field_name='last_name',
+        )
+        sub_efilter = EntityFilter.objects.smart_update_or_create(
+            pk='test-filter01', name='Filter01', model=FakeContact, is_custom=True,
+            conditions=[build_cond(values=['Spiegel'])],
+        )
+        efilter = EntityFilter.objects.smart_update_or_create(
+            pk='test-filter02', name='Filter02', model=FakeContact, is_custom=True,
+            conditions=[SubFilterConditionHandler.build_condition(sub_efilter)],
+        )
+        rel_efilter = EntityFilter.objects.smart_update_or_create(
+            pk='test-filter03', name='Filter03', model=FakeOrganisation, is_custom=True,
+            conditions=[
+                RelationSubFilterConditionHandler.build_condition(
+                    model=FakeOrganisation, rtype=RelationType.objects.smart_update_or_create(
+                        ('test-subject_love', 'Is loving'),
+                        ('test-object_love',  'Is loved by'),
+                    )[0],
+                    subfilter=efilter,
+                ),
+            ],
+        )
+        self.assertExpectedFiltered(efilter, FakeContact, self._list_contact_ids('spike'))
+        old_revision = self.refresh(efilter).revision
+        old_rel_revision = self.refresh(rel_efilter).revision
+
+        # Modification of the sub-filter => the parents are invalidated
+        sub_efilter = self.refresh(sub_efilter)
+        sub_efilter.set_conditions([build_cond(values=['Black'])])
+
+        efilter = self.refresh(efilter)
+        self.assertNotEqual(old_revision, efilter.revision)
+        self.assertNotEqual(old_rel_revision, self.refresh(rel_efilter).revision)
+        self.assertExpectedFiltered(efilter, FakeContact, self._list_contact_ids('jet'))
+
+    def test_compiled_cache_dynamic(self):
+        "Operands like CurrentUserOperand are resolved each time."
+        user = self.user
+        other_user = self.other_user
+
+        contact = self.contacts['rei']
+        contact.user = other_user
+        contact.save()
+
+        efilter = EntityFilter.objects.smart_update_or_create(
+            'test-filter_mycontacts', 'My contacts', FakeContact, is_custom=True,
+            conditions=[
+                RegularFieldConditionHandler.build_condition(
+                    model=FakeContact,
+                    operator=operators.EQUALS,
+                    field_name='user',
+                    values=[operands.CurrentUserOperand.type_id],
+                ),
+            ],
+        )
+        self.assertIs(efilter.is_dynamic, True)
+
+        qs = FakeContact.objects.exclude(id__in=self._excluded_ids)
+        self.assertNotIn(contact, qs.filter(efilter.get_q(user)))
+        self.assertListEqual([contact], [*qs.filter(efilter.get_q(other_user))])
+
+        # Parent filter is dynamic too
+        parent_efilter = EntityFilter.objects.smart_update_or_create(
+            pk='test-filter_parent', name='Parent', model=FakeContact, is_custom=True,
+            conditions=[SubFilterConditionHandler.build_condition(efilter)],
+        )
+        self.assertIs(parent_efilter.is_dynamic, True)
+        self.assertListEqual([contact], [*qs.filter(parent_efilter.get_q(other_user))])
+
+        # Named date range depends on the current date
+        date_efilter = EntityFilter.objects.smart_update_or_create(
+            'test-filter_date', 'Current year', FakeContact, is_custom=True,
+            conditions=[
+                DateRegularFieldConditionHandler.build_condition(
+                    model=FakeContact, field_name='birthday', date_range='current_year',
+                ),
+            ],
+        )
+        self.assertIs(date_efilter.is_dynamic, True)
+
+    def test_accept_many(self):
+        user = self.user
+        c = self.contacts
+        spike = c['spike']
+
+        loves = RelationType.objects.smart_update_or_create(
+            ('test-subject_love', 'Is loving'),
+            ('test-object_love',  'Is loved by'),
+        )[0]
+        ptype = CremePropertyType.objects.smart_update_or_create(
+            str_pk='test-prop_kawaii', text='Kawaii',
+        )
+        custom_field = CustomField.objects.create(
+            name='size (cm)', content_type=self.contact_ct, field_type=CustomField.INT,
+        )
+
+        create_rel = partial(Relation.objects.create, user=user, type=loves)
+        create_rel(subject_entity=c['jet'],    object_entity=spike)
+        create_rel(subject_entity=c['faye'],   object_entity=spike)
+        create_rel(subject_entity=c['shinji'], object_entity=c['rei'])
+
+        set_size = partial(custom_field.value_class, custom_field=custom_field)
+        for fn, size in [('jet', 150), ('faye', 150), ('shinji', 170)]:
+            CremeProperty.objects.create(type=ptype, creme_entity=c[fn])
+            set_size(entity=c[fn]).set_value_n_save(size)
+
+        efilter = EntityFilter.objects.smart_update_or_create(
+            'test-filter01', 'Small kawaii lover men', FakeContact, is_custom=True,
+            conditions=[
+                RelationConditionHandler.build_condition(
+                    model=FakeContact, rtype=loves, ct=self.contact_ct,
+                ),
+                PropertyConditionHandler.build_condition(model=FakeContact, ptype=ptype),
+                CustomFieldConditionHandler.build_condition(
+                    custom_field=custom_field, operator=operators.LTE, values=[160],
+                ),
+                RegularFieldConditionHandler.build_condition(
+                    model=FakeContact, field_name='civility__title',
+                    operator=operators.EQUALS, values=['Mister'],
+                ),
+            ],
+        )
+
+        from creme.creme_core.utils.profiling import CaptureQueriesContext
+
+        def accept_many(*names):
+            contacts = FakeContact.objects.filter(
+                id__in=[c[name].id for name in names],
+            ).order_by('id')
+            context = CaptureQueriesContext()
+
+            with context:
+                accepted = self.refresh(efilter).accept_many(contacts, user=user)
+
+            return {
+                contact.first_name: is_accepted
+                for contact, is_accepted in zip(contacts, accepted)
+            }, len(context.captured_queries)
+
+        result1 = accept_many('spike', 'jet')[0]
+        self.assertDictEqual({'Spike': False, 'Jet': True}, result1)
+
+        # NB: the caches (ContentTypes...) are now filled
+        queries1 = accept_many('spike', 'jet')[1]
+
+        result2, queries2 = accept_many('spike', 'jet', 'faye', 'shinji', 'ed')
+        self.assertDictEqual(
+            {'Spike': False, 'Jet': True, 'Faye': False, 'Shinji': False, 'Ed': False},
+            result2,
+        )
+        self.assertEqual(queries1, queries2)
+
+        # Same results than accept()
+        for contact in FakeContact.objects.filter(id__in=[e.id for e in c.values()]):
+            self.assertIs(
+                efilter.accept(entity=contact, user=user),
+                result2.get(contact.first_name, False),
+            )
+
+        self.assertListEqual([], efilter.accept_many([], user=user))
+
+    def test_accept_many_dates(self):
+        user = self.user
+        c = self.contacts
+        custom_field = self._aux_test_datecf()
+
+        create_image = partial(FakeImage.objects.create, user=user)
+        for name in ('asuka', 'rei'):
+            contact = c[name]
+            contact.image = create_image(name=f"{contact.first_name}'s face")
+            contact.save()
+
+        efilter = EntityFilter.objects.smart_update_or_create(
+            'test-filter01', 'Young fighters with a face', FakeContact, is_custom=True,
+            conditions=[
+                DateRegularFieldConditionHandler.build_condition(
+                    model=FakeContact, field_name='birthday',
+                    start=date(year=2000, month=1, day=1),
+                ),
+                DateCustomFieldConditionHandler.build_condition(
+                    custom_field=custom_field, start=date(year=2015, month=4, day=1),
+                ),
+                DateRegularFieldConditionHandler.build_condition(
+                    model=FakeContact, field_name='image__created', date_range='not_empty',
+                ),
+            ],
+        )
+        self.assertExpectedFiltered(efilter, FakeContact, [c['asuka'].id])
+
+        def accept_many(*names):
+            contacts = [
+                *FakeContact.objects.filter(id__in=[c[name].id for name in names]).order_by('id')
+            ]
+            efilter_refreshed = self.refresh(efilter)
+            efilter_refreshed.get_conditions()
+
+            with self.assertNumQueries(2):  # Custom values & images
+                accepted = efilter_refreshed.accept_many(contacts, user=user)
+
+            return {
+                contact.first_name: is_accepted
+                for contact, is_accepted in zip(contacts, accepted)
+            }
+
+        # NB: fill the caches (ContentTypes, CustomFields...)
+        self.refresh(efilter).accept_many(
+            [self.refresh(c['asuka'])], user=user,
+        )
+
+        self.assertDictEqual(
+            {'Asuka': True, 'Shinji': False},
+            accept_many('asuka', 'shinji'),
+        )
+        self.assertDictEqual(
+            {'Asuka': True, 'Shinji': False, 'Rei': False, 'Misato': False, 'Spike': False},
+            accept_many('asuka', 'shinji', 'rei', 'misato', 'spike'),
+        )
+
     def test_filterlist01(self):
         user = self.user
         create_ef = partial(
@@ -6,13 +6,18 @@ from functools import partial
 
 from django.contrib.auth import get_user_model
 from django.contrib.contenttypes.models import ContentType
+from django.db import connection
+from django.db.models import Q
+from django.db.transaction import atomic
 from django.urls import reverse
 from django.utils.formats import date_format, number_format
 from django.utils.timezone import now
 from django.utils.translation import gettext as _
 
+from creme.creme_core.creme_jobs import history_archiver_type
 from creme.creme_core.global_info import clear_global_info
 from creme.creme_core.models import (
+    ArchivedHistoryLine,
     CremeProperty,
     CremePropertyType,
     CustomField,
@@ -33,6 +38,9 @@ from creme.creme_core.models import (
     FakeTodoCategory,
     HistoryConfigItem,
     HistoryLine,
+    HistoryLineBuffer,
+    Job,
+    JobResult,
     Relation,
     RelationType,
 )
@@ -53,6 +61,7 @@ from creme.creme_core.models.history import (
     TYPE_SYM_RELATION,
     TYPE_TRASH,
 )
+from creme.creme_core.utils.date_period import date_period_registry
 from creme.creme_core.utils.dates import dt_to_ISO8601
 
 # from ..fake_constants import FAKE_AMOUNT_UNIT, FAKE_PERCENT_UNIT
@@ -2044,6 +2053,165 @@ about this fantastic animation studio."""
         FakeAddress.objects.create(entity=nerv, city='Tokyo')
         self.assertEqual(old_count, HistoryLine.objects.count())
 
+    def test_buffer01(self):
+        "Creation & edition lines are created by the buffer."
+        user = self.user
+        old_count = HistoryLine.objects.count()
+
+        with HistoryLineBuffer() as history_buffer:
+            self.assertIs(history_buffer, HistoryLineBuffer.get_current())
+
+            create_orga = partial(FakeOrganisation.objects.create, user=user)
+            nerv = create_orga(name='nerv')
+            seele = create_orga(name='Seele')
+            self.assertEqual(old_count, HistoryLine.objects.count())
+
+            nerv = self.refresh(nerv)
+            nerv.name = nerv.name.title()
+            nerv.save()
+
+            # Merged in the same line
+            nerv.phone = '123456'
+            nerv.save()
+
+            history_buffer.flush()
+            self.assertEqual(old_count + 3, HistoryLine.objects.count())
+
+            seele = self.refresh(seele)
+            seele.phone = '987654'
+            seele.save()
+            self.assertEqual(old_count + 3, HistoryLine.objects.count())
+
+        self.assertIsNone(HistoryLineBuffer.get_current())
+
+        hlines = self._get_hlines()
+        self.assertEqual(old_count + 4, len(hlines))
+
+        nerv_creation_line = hlines[-4]
+        self.assertEqual(nerv.id,       nerv_creation_line.entity_id)
+        self.assertEqual(TYPE_CREATION, nerv_creation_line.type)
+
+        self.assertEqual(TYPE_CREATION, hlines[-3].type)
+
+        nerv_edition_line = hlines[-2]
+        self.assertEqual(nerv.id,      nerv_edition_line.entity_id)
+        self.assertEqual(TYPE_EDITION, nerv_edition_line.type)
+        self.assertListEqual(
+            [['name', 'nerv', 'Nerv'], ['phone', '123456']],
+            nerv_edition_line.modifications,
+        )
+
+        seele_edition_line = hlines[-1]
+        self.assertEqual(seele.id,     seele_edition_line.entity_id)
+        self.assertEqual(TYPE_EDITION, seele_edition_line.type)
+
+    def test_buffer02(self):
+        "Flushed line are merged only if their ID has been retrieved."
+        nerv = FakeOrganisation.objects.create(user=self.user, name='nerv')
+        nerv = self.refresh(nerv)
+        old_count = HistoryLine.objects.count()
+
+        with HistoryLineBuffer() as history_buffer:
+            nerv.name = nerv.name.title()
+            nerv.save()
+
+            history_buffer.flush()
+            nerv.phone = '123456'
+            nerv.save()
+
+        hlines = self._get_hlines()
+
+        if connection.features.can_return_rows_from_bulk_insert:
+            self.assertEqual(old_count + 1, len(hlines))
+            self.assertListEqual(
+                [['name', 'nerv', 'Nerv'], ['phone', '123456']],
+                hlines[-1].modifications,
+            )
+        else:
+            self.assertEqual(old_count + 2, len(hlines))
+            self.assertListEqual([['name', 'nerv', 'Nerv']], hlines[-2].modifications)
+            self.assertListEqual([['phone', '123456']], hlines[-1].modifications)
+
+    def test_buffer_relation(self):
+        "Lines which need an ID are created immediately."
+        user = self.user
+        nerv = FakeOrganisation.objects.create(user=user, name='Nerv')
+        rei = FakeContact.objects.create(user=user, first_name='Rei', last_name='Ayanami')
+        old_count = HistoryLine.objects.count()
+
+        rtype, srtype = RelationType.objects.smart_update_or_create(
+            ('test-subject_buffer_works', 'is employed'),
+            ('test-object_buffer_works',  'employs'),
+        )
+
+        with HistoryLineBuffer():
+            Relation.objects.create(
+                user=user, subject_entity=rei, object_entity=nerv, type=rtype,
+            )
+
+            hlines = self._get_hlines()
+            self.assertEqual(old_count + 2, len(hlines))
+
+        hline = hlines[-2]
+        self.assertEqual(rei.id,        hline.entity_id)
+        self.assertEqual(TYPE_RELATION, hline.type)
+
+        hline_sym = hlines[-1]
+        self.assertEqual(nerv.id,           hline_sym.entity_id)
+        self.assertEqual(TYPE_SYM_RELATION, hline_sym.type)
+
+        self.assertEqual(hline_sym.id, hline.related_line.id)
+        self.assertEqual(hline.id,     hline_sym.related_line.id)
+
+    def test_buffer_savepoint(self):
+        user = self.user
+        old_count = HistoryLine.objects.count()
+
+        with HistoryLineBuffer() as history_buffer:
+            with history_buffer.savepoint(), atomic():
+                FakeOrganisation.objects.create(user=user, name='Nerv')
+
+            with self.assertRaises(ValueError):
+                with history_buffer.savepoint(), atomic():
+                    FakeOrganisation.objects.create(user=user, name='Seele')
+                    raise ValueError('Rolled back')
+
+        self.assertFalse(FakeOrganisation.objects.filter(name='Seele'))
+
+        hlines = self._get_hlines()
+        self.assertEqual(old_count + 1, len(hlines))
+        self.assertEqual(TYPE_CREATION, hlines[-1].type)
+        self.assertEqual('Nerv', hlines[-1].entity.get_real_entity().name)
+
+    def test_buffer_deletion(self):
+        "The buffered lines of a deleted entity are detached."
+        user = self.user
+        old_count = HistoryLine.objects.count()
+
+        with HistoryLineBuffer():
+            nerv = FakeOrganisation.objects.create(user=user, name='Nerv')
+            nerv.delete()
+
+        hlines = self._get_hlines()
+        self.assertEqual(old_count + 2, len(hlines))
+
+        creation_line = hlines[-2]
+        self.assertEqual(TYPE_CREATION, creation_line.type)
+        self.assertIsNone(creation_line.entity)
+
+        deletion_line = hlines[-1]
+        self.assertEqual(TYPE_DELETION, deletion_line.type)
+        self.assertIsNone(deletion_line.entity)
+
+    def test_buffer_disabled(self):
+        old_count = HistoryLine.objects.count()
+        HistoryLine.ENABLED = False
+
+        with HistoryLineBuffer():
+            FakeOrganisation.objects.create(user=self.user, name='Nerv')
+
+        self.assertEqual(old_count, HistoryLine.objects.count())
+
     def test_delete_lines(self):
         user = self.user
         hayao = FakeContact.objects.create(
@@ -2076,6 +2244,134 @@ about this fantastic animation studio."""
         self.assertEqual(1, len(ghibli_lines))
         self.assertEqual(TYPE_CREATION, ghibli_lines[0].type)
 
+    def test_delete_lines_archived(self):
+        user = self.user
+        hayao = FakeContact.objects.create(
+            user=user, first_name='Hayao', last_name='Miyazaki',
+        )
+        ghibli = FakeOrganisation.objects.create(user=user, name='Ghibli')
+
+        rtype = RelationType.objects.smart_update_or_create(
+            ('test-subject_delline_archived', 'is employed'),
+            ('test-object_delline_archived',  'employs'),
+        )[0]
+        Relation.objects.create(
+            user=user, subject_entity=hayao, object_entity=ghibli, type=rtype,
+        )
+
+        HistoryLine.archive_lines(HistoryLine.objects.filter(entity=hayao, type=TYPE_CREATION))
+        HistoryLine.archive_lines(
+            HistoryLine.objects.filter(entity=ghibli, type=TYPE_SYM_RELATION)
+        )
+        self.assertEqual(2, ArchivedHistoryLine.objects.count())
+
+        HistoryLine.delete_lines(
+            HistoryLine.objects.filter(entity=hayao),
+            archived_line_qs=ArchivedHistoryLine.objects.filter(entity=hayao),
+        )
+        self.assertFalse(HistoryLine.objects.filter(entity=hayao))
+        self.assertFalse(ArchivedHistoryLine.objects.all())
+
+        ghibli_lines = [*HistoryLine.objects.filter(entity=ghibli)]
+        self.assertEqual(1, len(ghibli_lines))
+        self.assertEqual(TYPE_CREATION, ghibli_lines[0].type)
+
+    def test_archive_lines(self):
+        user = self.user
+        nerv = FakeOrganisation.objects.create(user=user, name='Nerv')
+        rei = FakeContact.objects.create(user=user, first_name='Rei', last_name='Ayanami')
+        rtype = RelationType.objects.smart_update_or_create(
+            ('test-subject_archive_works', 'is employed'),
+            ('test-object_archive_works',  'employs'),
+        )[0]
+        Relation.objects.create(user=user, subject_entity=rei, object_entity=nerv, type=rtype)
+
+        rei_lines = [*HistoryLine.objects.filter(entity=rei).order_by('id')]
+        self.assertEqual(2, len(rei_lines))
+
+        nerv_lines = [*HistoryLine.objects.filter(entity=nerv).order_by('id')]
+        self.assertEqual(2, len(nerv_lines))
+
+        self.assertEqual(2, HistoryLine.archive_lines(HistoryLine.objects.filter(entity=rei)))
+        self.assertFalse(HistoryLine.objects.filter(entity=rei))
+        self.assertListEqual(
+            [hline.id for hline in rei_lines],
+            [*ArchivedHistoryLine.objects.filter(entity=rei)
+                                         .order_by('id')
+                                         .values_list('id', flat=True)],
+        )
+
+        archived_line = ArchivedHistoryLine.objects.get(id=rei_lines[0].id)
+        self.assertEqual(rei_lines[0].date,     archived_line.date)
+        self.assertEqual(rei_lines[0].type,     archived_line.type)
+        self.assertEqual(rei_lines[0].value,    archived_line.value)
+        self.assertEqual(rei_lines[0].username, archived_line.username)
+        self.assertEqual(user.id,               archived_line.entity_owner_id)
+
+        # Current & archived lines ---
+        qs = HistoryLine.with_archives(Q(entity__in=[rei.id, nerv.id])).order_by('-id')
+        self.assertEqual(4, qs.count())
+
+        hlines = [*qs[:3]]
+        self.assertListEqual(
+            [nerv_lines[1].id, rei_lines[1].id, rei_lines[0].id],
+            [hline.id for hline in hlines],
+        )
+        self.assertIsInstance(hlines[1], HistoryLine)
+        self.assertEqual(rei.id,        hlines[1].entity_id)
+        self.assertEqual(TYPE_RELATION, hlines[1].type)
+
+        # Related lines can be archived
+        self.assertEqual(rei_lines[1].id, self.refresh(nerv_lines[1]).related_line.id)
+
+        sym_line = self.refresh(nerv_lines[1])
+        HistoryLine.populate_related_lines([sym_line])
+        related_line = sym_line.related_line
+        self.assertIsInstance(related_line, HistoryLine)
+        self.assertEqual(rei_lines[1].id, related_line.id)
+        self.assertEqual(nerv_lines[1].id, related_line.related_line.id)
+
+        # Detail-view
+        response = self.assertGET200(rei.get_absolute_url())
+        self.assertContains(response, 'history-line-relationship')
+
+        # Deletion of the entity
+        rei.delete()
+        self.assertIsNone(self.refresh(archived_line).entity)
+
+    def test_archive_job(self):
+        user = self.user
+        nerv = FakeOrganisation.objects.create(user=user, name='Nerv')
+        seele = FakeOrganisation.objects.create(user=user, name='Seele')
+
+        old_line = HistoryLine.objects.get(entity=nerv)
+        HistoryLine.objects.filter(id=old_line.id).update(date=now() - timedelta(days=400))
+
+        job = self.get_object_or_fail(Job, type_id=history_archiver_type.id)
+        self.assertEqual(
+            date_period_registry.get_period('years', 1).as_dict(), job.data['delay'],
+        )
+        self.assertTrue(job.enabled)
+        self.assertEqual(
+            [_('Move the old lines of history into the archive')],
+            history_archiver_type.get_description(job),
+        )
+
+        history_archiver_type.execute(job)
+        self.assertDoesNotExist(old_line)
+        self.assertTrue(ArchivedHistoryLine.objects.filter(id=old_line.id).exists())
+        self.assertTrue(HistoryLine.objects.filter(entity=seele).exists())
+        self.assertFalse(JobResult.objects.filter(job=job))
+
+        # Invalid delay
+        job.data = {'delay': 'invalid'}
+        job.save()
+        history_archiver_type.execute(job)
+        self.assertListEqual(
+            [_("The configured delay is invalid. Edit the job's configuration to fix it.")],
+            JobResult.objects.get(job=job).messages,
+        )
+
     def test_populate_users01(self):
         user = self.user
 
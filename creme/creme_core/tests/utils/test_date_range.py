@@ -1,6 +1,7 @@
 # -*- coding: utf-8 -*-
 
 from datetime import date, datetime
+from functools import partial
 
 from django.utils.timezone import now
 from django.utils.translation import gettext as _
@@ -535,3 +536,51 @@ class DateRangeTestCase(CremeTestCase):
             {'created__isnull': False},
             date_range.get_q_dict(field='created', now=now()),
         )
+
+    def test_accept_custom(self):
+        dt = self.create_datetime
+        date_range = self.registry.get_range(
+            start=date(year=2011, month=6, day=1), end=date(year=2011, month=6, day=30),
+        )
+        accept = partial(date_range.accept, now=now())
+
+        self.assertTrue(accept(dt(year=2011, month=6, day=1, hour=0, minute=0)))
+        self.assertTrue(accept(dt(year=2011, month=6, day=30, hour=23, minute=59)))
+        self.assertFalse(accept(dt(year=2011, month=5, day=31, hour=23, minute=59)))
+        self.assertFalse(accept(dt(year=2011, month=7, day=1, hour=0, minute=0)))
+        self.assertFalse(accept(None))
+
+        # Dates
+        self.assertTrue(accept(date(year=2011, month=6, day=1)))
+        self.assertTrue(accept(date(year=2011, month=6, day=30)))
+        self.assertFalse(accept(date(year=2011, month=5, day=31)))
+        self.assertFalse(accept(date(year=2011, month=7, day=1)))
+
+        # Only start
+        accept_start = partial(
+            self.registry.get_range(start=date(year=2011, month=6, day=1)).accept,
+            now=now(),
+        )
+        self.assertTrue(accept_start(date(year=2031, month=1, day=1)))
+        self.assertFalse(accept_start(date(year=2011, month=5, day=31)))
+
+    def test_accept_named(self):
+        today = datetime(year=2011, month=6, day=1, hour=14, minute=14, second=37)
+        accept = partial(self.registry.get_range(name='current_month').accept, now=today)
+
+        self.assertTrue(accept(datetime(year=2011, month=6, day=12, hour=8, minute=0)))
+        self.assertTrue(accept(date(year=2011, month=6, day=30)))
+        self.assertFalse(accept(date(year=2011, month=7, day=1)))
+
+        in_past = partial(self.registry.get_range(name='in_past').accept, now=today)
+        self.assertTrue(in_past(date(year=2011, month=5, day=31)))
+        self.assertFalse(in_past(datetime(year=2011, month=6, day=1, hour=15, minute=0)))
+
+    def test_accept_empty(self):
+        empty = partial(self.registry.get_range(name='empty').accept, now=now())
+        self.assertTrue(empty(None))
+        self.assertFalse(empty(date(year=2011, month=6, day=1)))
+
+        not_empty = partial(self.registry.get_range(name='not_empty').accept, now=now())
+        self.assertFalse(not_empty(None))
+        self.assertTrue(not_empty(date(year=2011, month=6, day=1)))
@@ -26,6 +26,7 @@ from creme.creme_core.core.entity_cell import (
     EntityCellRegularField,
     EntityCellRelation,
 )
+from creme.creme_core.core.entity_count import estimate_count
 from creme.creme_core.core.entity_filter import (
     EF_CREDENTIALS,
     condition_handler,
@@ -291,6 +292,7 @@ class ListViewTestCase(ViewsTestCase):
             hfilters = ctxt['header_filters']
             efilters = ctxt['entity_filters']
             orgas_page = ctxt['page_obj']
+            rendered_cells = ctxt['rendered_cells']
 
         self.assertIsInstance(hfilters, HeaderFilterList)
         self.assertIn(hf, hfilters)
@@ -325,6 +327,14 @@ class ListViewTestCase(ViewsTestCase):
 
         self.assertNotIn(faye.last_name, content)
 
+        # Cells are rendered column by column by the view
+        self.assertIsInstance(rendered_cells, dict)
+        self.assertSetEqual({bebop.id, swordfish.id}, {*rendered_cells.keys()})
+        self.assertIn(bebop.name, rendered_cells[bebop.id]['regular_field-name'])
+        self.assertIn(
+            str(spike), rendered_cells[swordfish.id][f'relation-{rtype.id}'],
+        )
+
         ptype_cell_content = content[6]
         self.assertIsList(ptype_cell_content, length=1)
         self.assertEqual(
@@ -1056,6 +1066,64 @@ class ListViewTestCase(ViewsTestCase):
         self.assertCountOccurrences(redtail.name, content, count=1)
         self.assertCountOccurrences(dragons.name, content, count=1)
 
+    @override_settings(LISTVIEW_COUNT_CACHE_TIMEOUT=60)
+    def test_count_cache(self):
+        user = self.login()
+
+        create_orga = partial(FakeOrganisation.objects.create, user=user)
+        create_orga(name='Bebop')
+        create_orga(name='Redtail')
+
+        self._build_hf()
+
+        def get_count():
+            with CaptureQueriesContext() as context:
+                response = self.assertPOST200(self.url)
+
+            return (
+                response.context['page_obj'].paginator.count,
+                [
+                    sql
+                    for sql in context.captured_sql
+                    if 'COUNT(' in sql and 'entity_type_id' in sql
+                ],
+            )
+
+        count, count_sql = get_count()
+        self.assertEqual(2, count)
+        self.assertTrue(count_sql)
+
+        count, count_sql = get_count()
+        self.assertEqual(2, count)
+        self.assertFalse(count_sql)
+
+        # Invalidation
+        create_orga(name='Red Dragons')
+        count, count_sql = get_count()
+        self.assertEqual(3, count)
+        self.assertTrue(count_sql)
+
+    def test_count_estimated(self):
+        user = self.login()
+        FakeOrganisation.objects.create(user=user, name='Bebop')
+        self._build_hf()
+
+        with override_settings(
+            LISTVIEW_ESTIMATED_COUNT_THRESHOLD=0, FAST_QUERY_MODE_THRESHOLD=0,
+        ):
+            response = self.assertPOST200(self.url)
+
+        # NB: the estimation is only available with PostgreSQL & MySQL
+        estimated = response.context['is_count_estimated']
+        self.assertIs(estimate_count(FakeOrganisation) is not None, estimated)
+        if not estimated:
+            self.assertEqual(1, response.context['page_obj'].paginator.count)
+
+        # Not estimated by default
+        response = self.assertPOST200(self.url)
+        self.assertIs(False, response.context['is_count_estimated'])
+        self.assertEqual(1, response.context['page_obj'].paginator.count)
+
     def test_qfilter_GET01(self):
         user = self.login()
 
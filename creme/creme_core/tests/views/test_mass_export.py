@@ -12,11 +12,12 @@ from django.test.utils import override_settings
 from django.urls import reverse
 from django.utils.encoding import force_str
 from django.utils.formats import date_format
-from django.utils.html import format_html
+from django.utils.html import escape, format_html
 from django.utils.timezone import localtime
 from django.utils.translation import gettext as _
 from django.utils.translation import pgettext
 
+from creme.creme_core.bricks import MassExportJobErrorsBrick
 from creme.creme_core.core.entity_cell import (
     EntityCellFunctionField,
     EntityCellRegularField,
@@ -26,6 +27,7 @@ from creme.creme_core.core.entity_filter.condition_handler import (
     RegularFieldConditionHandler,
 )
 from creme.creme_core.core.entity_filter.operators import ISTARTSWITH
+from creme.creme_core.creme_jobs import mass_export_type
 from creme.creme_core.gui.history import html_history_registry
 from creme.creme_core.models import (
     CremeProperty,
@@ -41,6 +43,7 @@ from creme.creme_core.models import (
     FieldsConfig,
     FileRef,
     HeaderFilter,
+    Job,
     Relation,
     RelationType,
 )
@@ -233,7 +236,7 @@ class MassExportViewsTestCase(ViewsTestCase):
         response = self.assertGET200(self._build_contact_dl_url())
 
         # TODO: sort the relations by their verbose_name ??
-        result = response.content.splitlines()
+        result = b''.join(response.streaming_content).splitlines()
         it = (force_str(line) for line in result)
         self.assertEqual(next(it), ','.join(f'"{hfi.title}"' for hfi in hf.cells))
         self.assertEqual(next(it), '"","Black","Jet","Bebop",""')
@@ -292,7 +295,7 @@ class MassExportViewsTestCase(ViewsTestCase):
         response = self.assertGET200(self._build_contact_dl_url(doc_type='scsv'))
 
         # TODO: sort the relations by their verbose_name ??
-        it = (force_str(line) for line in response.content.splitlines())
+        it = (force_str(line) for line in b''.join(response.streaming_content).splitlines())
         self.assertEqual(next(it), ';'.join(f'"{hfi.title}"' for hfi in cells))
         self.assertEqual(next(it), '"";"Black";"Jet";"Bebop";""')
         self.assertEqual(next(it), '"";"Spiegel";"Spike";"Bebop/Swordfish";""')
@@ -334,7 +337,7 @@ class MassExportViewsTestCase(ViewsTestCase):
         self.assertTrue(user.has_perm_to_view(organisations['Swordfish']))
 
         response = self.assertGET200(self._build_contact_dl_url())
-        result = [*map(force_str, response.content.splitlines())]
+        result = [*map(force_str, b''.join(response.streaming_content).splitlines())]
         self.assertEqual(result[1], '"","Black","Jet","",""')
         self.assertEqual(result[2], '"","Spiegel","Spike","Swordfish",""')
         self.assertEqual(result[3], '"","Wong","Edward","","is a girl"')
@@ -355,7 +358,7 @@ class MassExportViewsTestCase(ViewsTestCase):
 
         response = self.assertGET200(self._build_contact_dl_url(hfilter_id=hf.id))
 
-        result = [force_str(line) for line in response.content.splitlines()]
+        result = [force_str(line) for line in b''.join(response.streaming_content).splitlines()]
         self.assertEqual(2, len(result))
         self.assertEqual(
             result[1],
@@ -396,7 +399,7 @@ class MassExportViewsTestCase(ViewsTestCase):
 
         response = self.assertGET200(self._build_contact_dl_url(hfilter_id=hf.id))
 
-        it = (force_str(line) for line in response.content.splitlines())
+        it = (force_str(line) for line in b''.join(response.streaming_content).splitlines())
         next(it)
 
         self.assertEqual(next(it), '"Black","Jet face","Jet\'s selfie"')
@@ -431,7 +434,7 @@ class MassExportViewsTestCase(ViewsTestCase):
             list_url=FakeEmailCampaign.get_lv_absolute_url(),
             hfilter_id=hf.id,
         ))
-        result = [force_str(line) for line in response.content.splitlines()]
+        result = [force_str(line) for line in b''.join(response.streaming_content).splitlines()]
         self.assertEqual(4, len(result))
 
         self.assertEqual(result[1], '"Camp#1","ML#1/ML#2"')
@@ -450,7 +453,7 @@ class MassExportViewsTestCase(ViewsTestCase):
 
         response = self.assertGET200(self._build_contact_dl_url())
 
-        it = (force_str(line) for line in response.content.splitlines())
+        it = (force_str(line) for line in b''.join(response.streaming_content).splitlines())
         self.assertEqual(
             next(it),
             ','.join(
@@ -468,7 +471,7 @@ class MassExportViewsTestCase(ViewsTestCase):
             self._build_contact_dl_url(extra_q=QSerializer().dumps(Q(last_name='Wong'))),
         )
 
-        result = [force_str(line) for line in response.content.splitlines()]
+        result = [force_str(line) for line in b''.join(response.streaming_content).splitlines()]
         self.assertEqual(2, len(result))
         self.assertEqual('"","Wong","Edward","","is a girl"', result[1])
 
@@ -492,7 +495,7 @@ class MassExportViewsTestCase(ViewsTestCase):
             list_url=FakeContact.get_lv_absolute_url(),
             efilter_id=efilter.id
         ))
-        result = [force_str(line) for line in response.content.splitlines()]
+        result = [force_str(line) for line in b''.join(response.streaming_content).splitlines()]
         self.assertEqual(2, len(result))
 
         self.assertEqual('"","Wong","Edward","","is a girl"', result[1])
@@ -626,7 +629,7 @@ class MassExportViewsTestCase(ViewsTestCase):
             follow=True,
         )
 
-        lines = {force_str(line) for line in response.content.splitlines()}
+        lines = {force_str(line) for line in b''.join(response.streaming_content).splitlines()}
         self.assertIn('"Bebop","1000"', lines)
         self.assertIn('"Swordfish","20000"', lines)
         self.assertIn('"Redtail",""', lines)
@@ -661,7 +664,7 @@ class MassExportViewsTestCase(ViewsTestCase):
             follow=True,
         )
 
-        lines = {force_str(line) for line in response.content.splitlines()}
+        lines = {force_str(line) for line in b''.join(response.streaming_content).splitlines()}
         self.assertIn(f'''"Bebop","{_('Percent')}"''',    lines)
         self.assertIn(f'''"Swordfish","{_('Amount')}"''', lines)
 
@@ -721,7 +724,7 @@ class MassExportViewsTestCase(ViewsTestCase):
                 '"123233","Spiegel","Spike"',
             ],
             # NB: slice to remove the header
-            [force_str(line) for line in response.content.splitlines()[1:]],
+            [force_str(line) for line in b''.join(response.streaming_content).splitlines()[1:]],
         )
 
     @override_settings(PAGE_SIZES=[10], DEFAULT_PAGE_SIZE_IDX=0)
@@ -756,7 +759,7 @@ class MassExportViewsTestCase(ViewsTestCase):
                 '"123455","Black","Jet"',
             ],
             # NB: slice to remove the header
-            [force_str(line) for line in response.content.splitlines()[1:]],
+            [force_str(line) for line in b''.join(response.streaming_content).splitlines()[1:]],
         )
 
     def test_distinct(self):
@@ -794,3 +797,98 @@ class MassExportViewsTestCase(ViewsTestCase):
         self.assertCountOccurrences(camp1.name, content, count=1)  # Not 2
         self.assertCountOccurrences(camp2.name, content, count=1)
         self.assertNotIn(camp3.name, content)
+
+    @override_settings(MASS_EXPORT_JOB_THRESHOLD=3)
+    def test_export_job(self):
+        "Too many entities => a job is created."
+        user = self.login()
+        cells = self._build_hf_n_contacts().cells
+        existing_hline_ids = [*HistoryLine.objects.values_list('id', flat=True)]
+
+        response = self.assertGET200(self._build_contact_dl_url(), follow=True)
+
+        jobs = Job.objects.filter(type_id=mass_export_type.id)
+        self.assertEqual(1, len(jobs))
+
+        job = jobs[0]
+        self.assertEqual(user, job.user)
+        self.assertEqual(Job.STATUS_WAIT, job.status)
+        self.assertRedirects(response, job.get_absolute_url())
+        self.assertListEqual(
+            [_('Export «{model}»').format(model='Test Contacts')],
+            job.description,
+        )
+
+        mass_export_type.execute(job)
+        job = self.refresh(job)
+        self.assertEqual(Job.STATUS_OK, job.status)
+        self.assertEqual(4, job.data['count'])
+
+        fileref = mass_export_type.get_fileref(job)
+        self.assertIsInstance(fileref, FileRef)
+        self.assertTrue(fileref.temporary)
+        self.assertEqual(user, fileref.user)
+        self.assertEqual('test-contacts.csv', fileref.basename)
+
+        fullpath = fileref.filedata.path
+        self.assertEqual(join(settings.MEDIA_ROOT, 'upload', 'mass_export'), dirname(fullpath))
+
+        with open(fullpath, 'rb') as f:
+            lines = [force_str(line) for line in f.read().splitlines()]
+
+        self.assertListEqual(
+            [
+                ','.join(f'"{hfi.title}"' for hfi in cells),
+                '"","Black","Jet","Bebop",""',
+                '"","Spiegel","Spike","Bebop/Swordfish",""',
+                '"","Valentine","Faye","","is a girl/is beautiful"',
+                '"","Wong","Edward","","is a girl"',
+            ],
+            lines,
+        )
+
+        hlines = HistoryLine.objects.exclude(id__in=existing_hline_ids)
+        self.assertEqual(1, len(hlines))
+
+        hline = hlines[0]
+        self.assertEqual(TYPE_EXPORT, hline.type)
+        self.assertEqual(4, hline.modifications[0])
+
+        # Download
+        response = self.assertGET200(job.get_absolute_url())
+        self.assertContains(response, MassExportJobErrorsBrick.id_)
+        self.assertContains(response, fileref.get_download_absolute_url())
+
+    @override_settings(MASS_EXPORT_JOB_THRESHOLD=3, MAX_JOBS_PER_USER=1)
+    def test_export_job_quota(self):
+        "Too many jobs => error message."
+        user = self.login()
+        self._build_hf_n_contacts()
+
+        Job.objects.create(
+            user=user,
+            type=mass_export_type,
+            data={'ctype': self.ct.id, 'GET': ''},
+        )
+
+        response = self.assertGET409(self._build_contact_dl_url())
+        self.assertContains(
+            response,
+            escape(_(
+                'There are too many entities to export them directly ; '
+                'you must wait that one of your jobs is finished in order '
+                'to create a new one.'
+            )),
+            status_code=409,
+        )
+        self.assertEqual(1, Job.objects.filter(type_id=mass_export_type.id).count())
+
+    @override_settings(MASS_EXPORT_JOB_THRESHOLD=3)
+    def test_export_job_header_only(self):
+        "No job when only the header is exported."
+        self.login()
+        self._build_hf_n_contacts()
+
+        response = self.assertGET200(self._build_contact_dl_url(header=True))
+        self.assertFalse(Job.objects.filter(type_id=mass_export_type.id))
+        self.assertEqual(1, len(response.content.splitlines()))
@@ -3,6 +3,7 @@
 from functools import partial
 
 from django.contrib.contenttypes.models import ContentType
+from django.test.utils import override_settings
 from django.urls import reverse
 from django.utils.translation import gettext as _
 
@@ -612,6 +613,59 @@ class SearchViewTestCase(ViewsTestCase, BrickTestCaseMixin):
             response.json(),
         )
 
+    @override_settings(
+        SEARCH_INDEX_BACKEND='creme.creme_core.core.search_index.PythonSearchIndexBackend',
+    )
+    def test_light_search_index(self):
+        "The search index is used."
+        self.login()
+        self._setup_contacts()
+        self._setup_orgas()
+
+        response = self.assertGET200(self.LIGHT_URL, data={'value': 'linus'})
+        results = response.json()
+
+        linus = self.linus
+        linus2 = self.linus2
+        linusfo = self.linusfo
+
+        self.maxDiff = None
+        self.assertDictEqual(
+            {
+                'best': {
+                    'label': str(linusfo),
+                    'url':   linusfo.get_absolute_url(),
+                },
+                'results': [
+                    {
+                        'count':   2,
+                        'id':      linus.entity_type_id,
+                        'label':   'Test Contact',
+                        'results': [
+                            {
+                                'label': str(linus2),
+                                'url':   linus2.get_absolute_url(),
+                            }, {
+                                'label': str(linus),
+                                'url':   linus.get_absolute_url(),
+                            },
+                        ],
+                    }, {
+                        'count':   1,
+                        'id':      linusfo.entity_type_id,
+                        'label':   'Test Organisation',
+                        'results': [
+                            {
+                                'label': str(linusfo),
+                                'url':   linusfo.get_absolute_url(),
+                            },
+                        ],
+                    },
+                ],
+            },
+            results,
+        )
+
     def test_light_search03(self):
         "Errors"
         self.login()
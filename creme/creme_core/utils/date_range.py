@@ -24,6 +24,7 @@ from collections import OrderedDict
 from datetime import date, datetime, timedelta
 from typing import Dict, Optional
 
+from django.utils.timezone import get_default_timezone, is_aware, make_naive
 from django.utils.translation import gettext_lazy as _
 
 from .dates import make_aware_dt
@@ -78,6 +79,26 @@ class DateRange:
 
         return {f'{field}__lte': end}
 
+    def accept(self, value, now) -> bool:
+        """Is a value in the range ? It's the in-memory equivalent of get_q_dict().
+        @param value: Instance of <datetime.date> (or <datetime.datetime>), or None.
+        @param now: Instance of <datetime.datetime>.
+        """
+        if value is None:
+            return False
+
+        start, end = self.get_dates(now)
+
+        if not isinstance(value, datetime):
+            # NB: the bounds are converted like a DateField converts datetimes in queries.
+            def to_date(dt):
+                return make_naive(dt, get_default_timezone()).date() if is_aware(dt) else dt.date()
+
+            start = start and to_date(start)
+            end = end and to_date(end)
+
+        return (start is None or start <= value) and (end is None or value <= end)
+
 
 class CustomRange(DateRange):
     name = ''
@@ -295,6 +316,9 @@ class EmptyRange(DateRange):
     def get_q_dict(self, field, now):
         return {f'{field}__isnull': True}
 
+    def accept(self, value, now):
+        return value is None
+
 
 class NotEmptyRange(DateRange):
     name = 'not_empty'
@@ -303,6 +327,9 @@ class NotEmptyRange(DateRange):
     def get_q_dict(self, field, now):
         return {f'{field}__isnull': False}
 
+    def accept(self, value, now):
+        return value is not None
+
 
 class DateRangeRegistry:
     class RegistrationError(Exception):
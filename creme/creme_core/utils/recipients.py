@@ -0,0 +1,148 @@
+# -*- coding: utf-8 -*-
+
+################################################################################
+#
+# Copyright (c) 2021 Hybird
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+################################################################################
+
+"""Set-based resolution of the recipients of some lists of persons.
+
+The campaigns (e-mails, SMS...) are related to lists (mailing lists...), which
+are related to persons (Contacts, Organisations) with ManyToManyFields, & which
+can contain sub-lists. Resolving the recipients list by list, & sub-list by
+sub-list, produces lots of queries with big campaigns ; the class
+RecipientsResolver uses few queries, & streams the persons.
+"""
+
+from typing import Iterable, Iterator, Optional, Set, Tuple, Type
+
+from django.db.models import Model, QuerySet
+
+
+class RecipientsResolver:
+    """Resolve the recipients of some lists with set-based queries:
+     - the sub-lists are retrieved level by level (one query per level,
+       whatever the number of lists).
+     - the persons are retrieved with one query per type of person (without
+       duplicates, even if a person belongs to several lists) ; they are
+       streamed (see QuerySet.iterator()).
+
+    Usage:
+        resolver = RecipientsResolver(MailingList, children_field='children')
+        list_ids = resolver.expand([mlist1.id, mlist2.id])
+
+        for address, contact in resolver.iter_persons(list_ids, 'contacts', 'email'):
+            [...]
+    """
+    def __init__(self,
+                 list_model: Type[Model],
+                 children_field: Optional[str] = None,
+                 chunk_size: int = 256):
+        """Constructor.
+        @param list_model: Model of list (e.g. MailingList) ; it must inherit CremeEntity.
+        @param children_field: Name of the (not symmetrical) ManyToManyField
+               which references the sub-lists ; <None> means "no sub-list".
+        @param chunk_size: Number of persons retrieved at once.
+        """
+        self.list_model = list_model
+        self.children_field = children_field
+        self.chunk_size = chunk_size
+
+    def expand(self, list_ids: Iterable[int]) -> Set[int]:
+        """Get the IDs of some lists & of all their (not deleted) sub-lists,
+        sub-sub-lists etc...
+        """
+        all_ids = {*list_ids}
+        children_field = self.children_field
+
+        if children_field:
+            filter_lists = self.list_model.objects.filter
+            parents_key = '{}__in'.format(
+                self.list_model._meta.get_field(children_field).related_query_name()
+            )
+            level_ids = all_ids
+
+            # NB: cycles are managed (only new IDs are expanded).
+            while level_ids:
+                level_ids = {
+                    *filter_lists(
+                        is_deleted=False, **{parents_key: level_ids},
+                    ).values_list('id', flat=True),
+                } - all_ids
+                all_ids |= level_ids
+
+        return all_ids
+
+    def persons_queryset(self, list_ids: Iterable[int], persons_field: str) -> QuerySet:
+        """Get the (not deleted) persons related to some lists.
+        @param list_ids: IDs of lists (see expand()).
+        @param persons_field: Name of the ManyToManyField of the lists which
+               references the persons (e.g. "contacts").
+        @return: A QuerySet on the model of persons, without duplicate.
+        """
+        field = self.list_model._meta.get_field(persons_field)
+
+        # NB: we use a sub-query on the intermediary table, & not a JOIN, to
+        #     avoid the duplicates (& so a costly DISTINCT).
+        return field.related_model.objects.filter(
+            is_deleted=False,
+            pk__in=field.remote_field.through.objects.filter(
+                **{f'{field.m2m_field_name()}__in': list_ids}
+            ).values(field.m2m_reverse_field_name()),
+        ).order_by()
+
+    def iter_persons(self,
+                     list_ids: Iterable[int],
+                     persons_field: str,
+                     address_field: str,
+                     ) -> Iterator[Tuple[str, Model]]:
+        """Stream the persons related to some lists, which have an address.
+        @param list_ids: IDs of lists (see expand()).
+        @param persons_field: See persons_queryset().
+        @param address_field: Name of the field of the persons which contains
+               the address (e.g. "email").
+        @return: Iterator on tuples (address, person).
+        """
+        persons = self.persons_queryset(
+            list_ids, persons_field,
+        ).exclude(
+            **{f'{address_field}__isnull': True},
+        ).exclude(**{address_field: ''})
+
+        for person in persons.iterator(chunk_size=self.chunk_size):
+            yield getattr(person, address_field), person
+
+    def iter_addresses(self,
+                       list_ids: Iterable[int],
+                       persons_field: str,
+                       address_field: str,
+                       ) -> Iterator[str]:
+        """Stream the distinct addresses of the persons related to some lists
+        (no instance of person is built).
+        See iter_persons() for the parameters.
+        """
+        return self.persons_queryset(
+            list_ids, persons_field,
+        ).exclude(
+            **{f'{address_field}__isnull': True},
+        ).exclude(
+            **{address_field: ''},
+        ).values_list(address_field, flat=True).distinct().iterator(chunk_size=self.chunk_size)
@@ -50,5 +50,10 @@ class XlwtWriter:
 
         self.nline += 1
 
+    def flush(self):
+        "Compact the data of the written rows (to reduce the memory usage)."
+        self.ws.flush_row_data()
+
     def save(self, filepath):
+        "@param filepath: Path of the file, or binary file-like object."
         self.wb.save(filepath)
@@ -37,6 +37,10 @@ from django.views.generic.list import ListView
 from creme.creme_core.auth.entity_credentials import EntityCredentials
 from creme.creme_core.core import sorter
 from creme.creme_core.core.entity_cell import EntityCell, EntityCellActions
+from creme.creme_core.core.entity_count import (
+    entities_count_cache,
+    estimate_count,
+)
 from creme.creme_core.core.paginator import FlowPaginator
 from creme.creme_core.forms.listview import ListViewSearchForm
 from creme.creme_core.gui import listview as lv_gui
@@ -152,12 +156,14 @@ class EntitiesList(base.PermissionsMixin, base.TitleMixin, ListView):
         self.transient = True
 
         self.cells = None
+        self.rendered_cells = None
 
         self.extra_q = None
         self.search_form = None
 
         self.queryset = None  # We hide voluntarily the class attribute which SHOULD not be used.
         self.count = None
+        self.count_is_estimated = False
         self.fast_mode = None
         self.ordering = None  # Idem
 
@@ -290,6 +296,7 @@ class EntitiesList(base.PermissionsMixin, base.TitleMixin, ListView):
 
         context['extra_q'] = self.extra_q
         context['search_form'] = self.search_form
+        context['is_count_estimated'] = self.count_is_estimated
 
         # NB: cannot set it within the template because the reloading case needs it too
         context['is_popup_view'] = self.is_popup_view
@@ -304,6 +311,7 @@ class EntitiesList(base.PermissionsMixin, base.TitleMixin, ListView):
         #  (see listview_td_action_for_cell)
         # TODO: regroup registries ??
         context['cell_sorter_registry'] = self.get_cell_sorter_registry()
+        context['rendered_cells'] = self.rendered_cells
 
         return context
 
@@ -494,12 +502,36 @@ class EntitiesList(base.PermissionsMixin, base.TitleMixin, ListView):
             qs = qs.distinct()
 
         # ----
+        self.count_is_estimated = False
+        model = self.model
+
+        if not filtered and user.is_superuser:
+            threshold = settings.LISTVIEW_ESTIMATED_COUNT_THRESHOLD
+
+            if threshold is not None:
+                estimation = estimate_count(model)
+
+                if estimation is not None and estimation >= max(
+                    threshold, settings.FAST_QUERY_MODE_THRESHOLD,
+                ):
+                    self.count_is_estimated = True
+                    return qs, estimation
+
+        count_key = entities_count_cache.build_key(
+            model=model, user=user,
+            entity_filter=entity_filter, extra_q=extra_q, search_q=search_q,
+        )
+        if count_key is not None:
+            count = entities_count_cache.get(count_key)
+
+            if count is not None:
+                return qs, count
+
         # If the query does not use the real entities' specific fields to filter,
         # we perform a query on CremeEntity & so we avoid a JOIN.
         if filtered:
             count = qs.count()
         else:
-            model = self.model
             try:
                 count = EntityCredentials.filter_entities(
                     user,
@@ -516,6 +548,9 @@ class EntitiesList(base.PermissionsMixin, base.TitleMixin, ListView):
                 )
                 count = qs.count()
 
+        if count_key is not None:
+            entities_count_cache.set(count_key, count)
+
         return qs, count
 
     def get_search_field_registry(self) -> lv_gui.ListViewSearchFieldRegistry:
@@ -616,6 +651,32 @@ class EntitiesList(base.PermissionsMixin, base.TitleMixin, ListView):
         FlowPaginator: page_builder_for_flowpaginator,
     }
 
+    def render_cells(self, entities) -> dict:
+        """Render the cells of the displayed entities, column by column
+        (see EntityCell.render_rows()).
+        @param entities: Sequence of entities (the ones of the current page).
+        @return: A dictionary {entity_id: {cell_key: rendered_cell}}.
+        """
+        user = self.request.user
+
+        # NB: the credentials are used by the actions, so we compute them with
+        #     grouped queries (EntityFilters of the role's credentials...).
+        user.populate_credentials(entities)
+
+        cells = [
+            cell for cell in self.header_filter.filtered_cells
+            if not isinstance(cell, EntityCellActions)
+        ]
+        keys = [cell.key for cell in cells]
+
+        return {
+            entity.id: dict(zip(keys, row))
+            for entity, row in zip(
+                entities,
+                EntityCell.render_rows(cells, entities, user),
+            )
+        }
+
     def paginate_queryset(self, queryset, page_size):
         paginator = self.get_paginator(
             queryset, per_page=page_size,
@@ -625,7 +686,7 @@ class EntitiesList(base.PermissionsMixin, base.TitleMixin, ListView):
         page = self.PAGE_BUILDERS[type(paginator)](self, paginator=paginator)
 
         # Optimisation time !!
-        self.header_filter.populate_entities(page.object_list, self.request.user)
+        self.rendered_cells = self.render_cells(page.object_list)
 
         is_paginated = page.has_other_pages()
 
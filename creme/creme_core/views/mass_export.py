@@ -19,19 +19,33 @@
 ################################################################################
 
 import logging
+from os.path import basename, join
+from typing import Optional
 
+from django.conf import settings
 from django.http import Http404
-from django.shortcuts import get_object_or_404
+from django.shortcuts import get_object_or_404, redirect
 from django.utils.encoding import smart_str
+from django.utils.translation import gettext
 
 from ..backends import export_backend_registry
 from ..core import sorter
+from ..core.entity_cell import EntityCell
+from ..core.exceptions import ConflictError
 from ..core.paginator import FlowPaginator
+from ..creme_jobs import mass_export_type
 from ..forms.listview import ListViewSearchForm
 from ..gui.listview import search_field_registry
-from ..models import EntityCredentials, EntityFilter, HeaderFilter
+from ..models import (
+    EntityCredentials,
+    EntityFilter,
+    FileRef,
+    HeaderFilter,
+    Job,
+)
 from ..models.history import _HLTEntityExport
 from ..utils import bool_from_str_extended, get_from_GET_or_404
+from ..utils.file_handling import FileCreator
 from ..utils.meta import Order
 from ..utils.queries import QSerializer
 from .generic import base
@@ -39,7 +53,6 @@ from .generic import base
 logger = logging.getLogger(__name__)
 
 
-# TODO: stream response ??
 # TODO: factorise with generic.listview.EntitiesList ?
 class MassExport(base.EntityCTypeRelatedMixin, base.CheckedView):
     ct_id_arg = 'ct_id'
@@ -52,6 +65,7 @@ class MassExport(base.EntityCTypeRelatedMixin, base.CheckedView):
     extra_q_arg = 'extra_q'
 
     page_size = 1024
+    dir_parts = ('mass_export',)  # Sub-directory under {settings.MEDIA_ROOT}/upload (jobs)
 
     cell_sorter_registry = sorter.cell_sorter_registry
     query_sorter_class   = sorter.QuerySorter
@@ -155,87 +169,176 @@ class MassExport(base.EntityCTypeRelatedMixin, base.CheckedView):
 
         return sort_info.field_names
 
-    def get(self, request, *args, **kwargs):
-        user = request.user
+    def get_job_threshold(self) -> Optional[int]:
+        "Number of entities above which the export is performed by a job."
+        return settings.MASS_EXPORT_JOB_THRESHOLD
 
-        header_only = self.get_header_only()
-        backend_cls = self.get_backend_class()
-        ct = self.get_ctype()
-        model = ct.model_class()
-        hf = self.get_header_filter()
-
-        cells = self.get_cells(header_filter=hf)
+    def get_entities_queryset(self, *, model, cells, efilter):
+        request = self.request
+        entities_qs = model.objects.filter(is_deleted=False)
+        use_distinct = False
+
+        # ----
+        if efilter is not None:
+            entities_qs = efilter.filter(entities_qs)
+
+        # ----
+        extra_q = request.GET.get(self.extra_q_arg)
+        if extra_q is not None:
+            entities_qs = entities_qs.filter(QSerializer().loads(extra_q))
+            use_distinct = True  # TODO: test + only if needed
+
+        # ----
+        search_form = self.get_search_form(cells=cells)
+        search_q = search_form.search_q
+        if search_q:
+            try:
+                entities_qs = entities_qs.filter(search_q)
+            except Exception as e:
+                logger.exception(
+                    'Error when building the search queryset with Q=%s (%s).',
+                    search_q, e,
+                )
+            else:
+                use_distinct = True  # TODO: test + only if needed
 
-        writer = backend_cls()
-        writerow = writer.writerow
-        # Doesn't accept generator expression... ;(
-        writerow([smart_str(cell.title) for cell in cells])
+        # ----
+        entities_qs = EntityCredentials.filter(request.user, entities_qs)
 
-        if not header_only:
-            ordering = self.get_ordering(model=model, cells=cells)
+        if use_distinct:
+            entities_qs = entities_qs.distinct()
 
-            entities_qs = model.objects.filter(is_deleted=False)
-            use_distinct = False
+        return entities_qs
 
-            # ----
-            efilter = self.get_entity_filter()
-            if efilter is not None:
-                entities_qs = efilter.filter(entities_qs)
+    def iter_rows(self, *, header_filter, cells, queryset, ordering, efilter,
+                  progress_callback=None):
+        """Generate the rows of the exported file (the header is included),
+        page by page ; so the whole file does not have to be kept in memory.
+        The history line is created when all the rows have been generated.
+        @param progress_callback: Callable which takes the number of exported
+               entities ; it's called after each page (useful for jobs).
+        """
+        user = self.request.user
+        ct = self.get_ctype()
 
-            # ----
-            extra_q = request.GET.get(self.extra_q_arg)
-            if extra_q is not None:
-                entities_qs = entities_qs.filter(QSerializer().loads(extra_q))
-                use_distinct = True  # TODO: test + only if needed
+        yield [smart_str(cell.title) for cell in cells]
 
-            # ----
-            search_form = self.get_search_form(cells=cells)
-            search_q = search_form.search_q
-            if search_q:
-                try:
-                    entities_qs = entities_qs.filter(search_q)
-                except Exception as e:
-                    logger.exception(
-                        'Error when building the search queryset with Q=%s (%s).',
-                        search_q, e,
-                    )
-                else:
-                    use_distinct = True  # TODO: test + only if needed
+        paginator = self.get_paginator(queryset=queryset, ordering=ordering)
+        total_count = 0
 
-            # ----
-            entities_qs = EntityCredentials.filter(user, entities_qs)
+        for entities_page in paginator.pages():
+            # NB: the cells are rendered column by column, with the caches of
+            #     the entities filled for the whole page (Optimisation time !!!)
+            for row in EntityCell.render_rows(
+                cells=cells, entities=entities_page.object_list, user=user, output='csv',
+            ):
+                total_count += 1
 
-            if use_distinct:
-                entities_qs = entities_qs.distinct()
+                yield [smart_str(res) if res else '' for res in row]
 
-            paginator = self.get_paginator(queryset=entities_qs, ordering=ordering)
+            if progress_callback is not None:
+                progress_callback(total_count)
 
-            total_count = 0
+        _HLTEntityExport.create_line(
+            ctype=ct, user=user, count=total_count, hfilter=header_filter, efilter=efilter,
+        )
 
-            for entities_page in paginator.pages():
-                entities = entities_page.object_list
+    def export_to_file(self, progress_callback=None) -> FileRef:
+        """Write the whole export in a (temporary) file.
+        Used by the job which performs the big exports.
+        @return: The FileRef instance corresponding to the created file.
+        """
+        user = self.request.user
+        backend = self.get_backend_class()()
+        model = self.get_ctype().model_class()
+        hf = self.get_header_filter()
+        cells = self.get_cells(header_filter=hf)
+        efilter = self.get_entity_filter()
+
+        name = backend.get_filename(model._meta.verbose_name_plural)
+        path = FileCreator(
+            dir_path=join(settings.MEDIA_ROOT, 'upload', *self.dir_parts),
+            name=name,
+        ).create()
+
+        with open(path, 'wb') as f:
+            backend.write(
+                self.iter_rows(
+                    header_filter=hf,
+                    cells=cells,
+                    queryset=self.get_entities_queryset(
+                        model=model, cells=cells, efilter=efilter,
+                    ),
+                    ordering=self.get_ordering(model=model, cells=cells),
+                    efilter=efilter,
+                    progress_callback=progress_callback,
+                ),
+                f,
+            )
 
-                hf.populate_entities(entities, user)  # Optimisation time !!!
+        return FileRef.objects.create(
+            user=user,
+            basename=name,
+            filedata='upload/{}/{}'.format('/'.join(self.dir_parts), basename(path)),
+        )
 
-                for entity in entities:
-                    total_count += 1
-                    line = []
+    def get(self, request, *args, **kwargs):
+        user = request.user
 
-                    for cell in cells:
-                        try:
-                            res = cell.render_csv(entity, user)
-                        except Exception as e:
-                            logger.debug('Exception in CSV export: %s', e)
-                            res = ''
+        header_only = self.get_header_only()
+        backend_cls = self.get_backend_class()
+        ct = self.get_ctype()
+        model = ct.model_class()
+        hf = self.get_header_filter()
 
-                        line.append(smart_str(res) if res else '')
+        cells = self.get_cells(header_filter=hf)
 
-                    writerow(line)
+        writer = backend_cls()
 
-            _HLTEntityExport.create_line(
-                ctype=ct, user=user, count=total_count, hfilter=hf, efilter=efilter,
+        if header_only:
+            # Doesn't accept generator expression... ;(
+            writer.writerow([smart_str(cell.title) for cell in cells])
+            writer.save(ct.model, user)
+
+            return writer.response
+
+        efilter = self.get_entity_filter()
+        entities_qs = self.get_entities_queryset(model=model, cells=cells, efilter=efilter)
+
+        threshold = self.get_job_threshold()
+        if threshold is not None and entities_qs.count() > threshold:
+            if Job.objects.not_finished(user).count() >= settings.MAX_JOBS_PER_USER:
+                raise ConflictError(gettext(
+                    'There are too many entities to export them directly ; '
+                    'you must wait that one of your jobs is finished in order '
+                    'to create a new one.'
+                ))
+
+            job = Job.objects.create(
+                user=user,
+                type=mass_export_type,
+                data={
+                    'ctype': ct.id,
+                    'GET':   request.GET.urlencode(),
+                },
             )
 
+            return redirect(job)
+
+        rows = self.iter_rows(
+            header_filter=hf,
+            cells=cells,
+            queryset=entities_qs,
+            ordering=self.get_ordering(model=model, cells=cells),
+            efilter=efilter,
+        )
+
+        if writer.streamable:
+            return writer.stream(rows, ct.model)
+
+        for row in rows:
+            writer.writerow(row)
+
         writer.save(ct.model, user)
 
         return writer.response
@@ -34,7 +34,7 @@ from django.utils.translation import gettext_lazy as _
 from creme.creme_core.auth import EntityCredentials
 from creme.creme_core.forms import CreatorEntityField, CremeModelForm
 from creme.creme_core.forms.widgets import CalendarWidget
-from creme.creme_core.models import HistoryLine, SettingValue
+from creme.creme_core.models import SettingValue
 from creme.creme_core.utils.dates import make_aware_dt
 
 from .. import get_emailtemplate_model
@@ -184,29 +184,33 @@ class SendingCreateForm(CremeModelForm):
             *self._get_variables(template.body_html),
         ]
 
-        disable_history = HistoryLine.disable
+        # NB: no HistoryLine is created by bulk_create()
+        LightWeightEmail.genid_n_bulk_create(
+            self._build_mail(address=address, recipient_entity=recipient_entity, varlist=varlist)
+            for address, recipient_entity in instance.campaign.all_recipients()
+        )
 
-        for address, recipient_entity in instance.campaign.all_recipients():
-            mail = LightWeightEmail(
-                sending=instance,
-                sender=instance.sender,
-                recipient=address,
-                sending_date=instance.sending_date,
-                recipient_entity=recipient_entity,
-            )
+        return instance
 
-            if recipient_entity:
-                context = {}
+    def _build_mail(self, address, recipient_entity, varlist):
+        instance = self.instance
+        mail = LightWeightEmail(
+            sending=instance,
+            sender=instance.sender,
+            recipient=address,
+            sending_date=instance.sending_date,
+            recipient_entity=recipient_entity,
+        )
 
-                for varname in varlist:
-                    val = getattr(recipient_entity, varname, None)
-                    if val:
-                        context[varname] = str(val)
+        if recipient_entity:
+            context = {}
 
-                if context:
-                    mail.body = json_dump(context, separators=(',', ':'))
+            for varname in varlist:
+                val = getattr(recipient_entity, varname, None)
+                if val:
+                    context[varname] = str(val)
 
-            disable_history(mail)
-            mail.genid_n_save()
+            if context:
+                mail.body = json_dump(context, separators=(',', ':'))
 
-        return instance
+        return mail
@@ -24,6 +24,7 @@ from django.urls import reverse
 from django.utils.translation import gettext_lazy as _
 
 from creme.creme_core.models import CremeEntity
+from creme.creme_core.utils.recipients import RecipientsResolver
 
 from .recipient import EmailRecipient
 
@@ -64,34 +65,34 @@ class AbstractEmailCampaign(CremeEntity):
         return reverse('emails__list_campaigns')
 
     def all_recipients(self):
-        # Merge all the mailing_lists and their children
-        lists = {
-            pk: ml
-            for ml in self.mailing_lists.filter(is_deleted=False)
-            for pk, ml in ml.get_family().items()
-        }.values()
-
-        # Manual recipients
-        recipients = {
-            addr: None
-            for addr in EmailRecipient.objects
-                                      .filter(ml__in=[ml.id for ml in lists])
-                                      .values_list('address', flat=True)
-        }
+        """Get the recipients of the campaign (from the mailing lists & their
+        children), with few queries ; the persons are streamed.
+        @return: Iterator on tuples (address, entity) ; "entity" is an instance
+                 of Organisation/Contact, or None for the manual recipients
+                 (EmailRecipient). Each address is yielded once (Organisations
+                 have the priority over Contacts, & Contacts over manual recipients).
+        """
+        mailing_lists = self.mailing_lists
+        resolver = RecipientsResolver(mailing_lists.model, children_field='children')
+        ml_ids = resolver.expand(
+            mailing_lists.filter(is_deleted=False).values_list('id', flat=True)
+        )
+        used_addresses = set()
 
         # Contacts & organisations recipients
-        def update(get_persons):
-            recipients.update(
-                (p.email, p)
-                for ml in lists
-                for p in get_persons(ml).filter(is_deleted=False)
-                if p.email
-            )
-
-        update(lambda ml: ml.contacts)
-        update(lambda ml: ml.organisations)
-
-        return recipients.items()
+        for persons_field in ('organisations', 'contacts'):
+            for address, person in resolver.iter_persons(ml_ids, persons_field, 'email'):
+                if address not in used_addresses:
+                    used_addresses.add(address)
+                    yield address, person
+
+        # Manual recipients
+        for address in EmailRecipient.objects.filter(
+            ml__in=ml_ids,
+        ).order_by().values_list('address', flat=True).distinct():
+            if address not in used_addresses:
+                used_addresses.add(address)
+                yield address, None
 
     def restore(self):
         CremeEntity.restore(self)
@@ -24,6 +24,7 @@ from django.urls import reverse
 from django.utils.translation import gettext_lazy as _
 
 from creme.creme_core.models import CremeEntity
+from creme.creme_core.utils.recipients import RecipientsResolver
 
 
 class AbstractMailingList(CremeEntity):
@@ -103,8 +104,15 @@ class AbstractMailingList(CremeEntity):
         """Return a dictionary<pk: MailingList> with self and all children,
          small children etc...
          """
-        family = {}
-        self.get_family_aux(family)
+        family_ids = RecipientsResolver(
+            type(self), children_field='children',
+        ).expand([self.id])
+        family_ids.discard(self.id)
+
+        family = {self.id: self}
+        family.update(
+            (ml.id, ml) for ml in type(self).objects.filter(id__in=family_ids)
+        )
 
         return family
 
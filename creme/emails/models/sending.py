@@ -21,24 +21,29 @@
 import logging
 # import warnings
 from json import loads as json_load
-from time import sleep
 
 from django.conf import settings
-from django.core.mail import get_connection, send_mail
+from django.core.mail import send_mail
 from django.db import IntegrityError, models
 from django.db.transaction import atomic
 from django.template import Context, Template
 from django.urls import reverse
 from django.utils.formats import date_format
-from django.utils.timezone import localtime
+from django.utils.timezone import localtime, now
 from django.utils.translation import gettext
 from django.utils.translation import gettext_lazy as _
 from django.utils.translation import pgettext, pgettext_lazy
 
 from creme.creme_core.models import CremeEntity, CremeModel
+from creme.creme_core.utils.chunktools import iter_as_chunk
 
 # from ..constants import MAIL_STATUS_NOTSENT, MAIL_STATUS_SENDINGERROR
-from ..utils import EMailSender, ImageFromHTMLError, generate_id
+from ..utils import (
+    EmailsDeliveryPool,
+    EMailSender,
+    ImageFromHTMLError,
+    generate_id,
+)
 from .mail import ID_LENGTH, _Email
 from .signature import EmailSignature
 
@@ -166,37 +171,58 @@ class EmailSending(CremeModel):
             # return SENDING_STATE_ERROR
             return self.State.ERROR
 
-        connection = get_connection(
+        Status = _Email.Status
+        mails_manager = LightWeightEmail.objects
+        mails_qs = mails_manager.filter(sending=self).exclude(status=Status.SENT).order_by('id')
+        chunk_size = settings.EMAILCAMPAIGN_CHUNK_SIZE
+        one_mail_sent = False
+        last_id = ''
+
+        with EmailsDeliveryPool(
+            size=settings.EMAILCAMPAIGN_CONNECTIONS,
+            # Avoiding the mails to be classed as spam
+            rate_limit=settings.EMAILCAMPAIGN_RATE_LIMIT,
             host=settings.EMAILCAMPAIGN_HOST,
             port=settings.EMAILCAMPAIGN_PORT,
             username=settings.EMAILCAMPAIGN_HOST_USER,
             password=settings.EMAILCAMPAIGN_PASSWORD,
             use_tls=settings.EMAILCAMPAIGN_USE_TLS,
-        )
-
-        mails_count = 0
-        one_mail_sent = False
-        SENDING_SIZE = getattr(settings, 'EMAILCAMPAIGN_SIZE', 40)
-        SLEEP_TIME = getattr(settings, 'EMAILCAMPAIGN_SLEEP_TIME', 2)
-
-        for mail in LightWeightEmail.objects.filter(sending=self):
-            if sender.send(mail, connection=connection):
-                mails_count += 1
-                one_mail_sent = True
-                logger.debug('Mail sent to %s', mail.recipient)
-
-            if mails_count > SENDING_SIZE:
-                logger.debug('Sending: waiting timeout')
-
-                mails_count = 0
-                sleep(SLEEP_TIME)  # Avoiding the mail to be classed as spam
+        ) as pool:
+            while True:
+                mails = [*mails_qs.filter(id__gt=last_id)[:chunk_size]]
+                if not mails:
+                    break
+
+                last_id = mails[-1].id
+                sent_ids = []
+                error_ids = []
+
+                for mail, sent in zip(
+                    mails,
+                    pool.deliver(sender.build_message(mail) for mail in mails),
+                ):
+                    if sent:
+                        logger.debug('Mail sent to %s', mail.recipient)
+                        sent_ids.append(mail.id)
+                    else:
+                        error_ids.append(mail.id)
+
+                # NB: the statuses are updated by chunk
+                if sent_ids:
+                    one_mail_sent = True
+                    mails_manager.filter(id__in=sent_ids).update(
+                        status=Status.SENT, sending_date=now(),
+                    )
+
+                if error_ids:
+                    mails_manager.filter(id__in=error_ids).update(
+                        status=Status.SENDING_ERROR,
+                    )
 
         if not one_mail_sent:
             # return SENDING_STATE_ERROR
             return self.State.ERROR
 
-        # TODO: close the connection ??
-
     @property
     def unsent_mails(self):
         # return self.mails_set.filter(status__in=[MAIL_STATUS_NOTSENT, MAIL_STATUS_SENDINGERROR])
@@ -258,8 +284,50 @@ class LightWeightEmail(_Email):
             else:
                 return
 
+    @classmethod
+    def genid_n_bulk_create(cls, mails, batch_size=256):
+        """Generate the IDs of several mails & create them with few queries.
+        The collisions with the IDs of existing mails are avoided (the IDs are
+        re-generated).
+        @param mails: Iterable of (not saved) instances of LightWeightEmail.
+        @param batch_size: Number of mails created by query.
+        """
+        manager = cls.objects
+
+        for mails_chunk in iter_as_chunk(mails, batch_size):
+            while True:
+                used_ids = set()
+                to_check = mails_chunk
+
+                while to_check:
+                    for mail in to_check:
+                        mail_id = generate_id()
+                        while mail_id in used_ids:
+                            mail_id = generate_id()
+
+                        mail.id = mail_id
+                        used_ids.add(mail_id)
+
+                    existing_ids = {
+                        *manager.filter(
+                            id__in=[mail.id for mail in to_check],
+                        ).values_list('id', flat=True),
+                    }
+                    to_check = [mail for mail in to_check if mail.id in existing_ids]
+
+                try:
+                    with atomic():
+                        manager.bulk_create(mails_chunk)
+                except IntegrityError:  # Mails with these ids have been created meanwhile
+                    logger.debug('Mails ids already exist ; retrying.')
+                else:
+                    break
+
 
 class LightWeightEmailSender(EMailSender):
+    # Maximum number of rendered bodies which are kept in memory
+    rendered_bodies_cache_size = 1024
+
     def __init__(self, sending):
         super().__init__(
             body=sending.body,
@@ -270,12 +338,26 @@ class LightWeightEmailSender(EMailSender):
         self._sending = sending
         self._body_template = Template(self._body)
         self._body_html_template = Template(self._body_html)
+        # Rendered bodies per context (i.e. LightWeightEmail.body) ; the mails
+        # of recipients with the same values (e.g. no related entity) are rendered once.
+        self._rendered_bodies = {}
 
     def get_subject(self, mail):
         return self._sending.subject
 
     def _process_bodies(self, mail):
         body = mail.body
-        context = Context(json_load(body) if body else {})
+        rendered_bodies = self._rendered_bodies
+        bodies = rendered_bodies.get(body)
+
+        if bodies is None:
+            context = Context(json_load(body) if body else {})
+            bodies = (
+                self._body_template.render(context),
+                self._body_html_template.render(context),
+            )
+
+            if len(rendered_bodies) < self.rendered_bodies_cache_size:
+                rendered_bodies[body] = bodies
 
-        return self._body_template.render(context), self._body_html_template.render(context)
+        return bodies
@@ -687,3 +687,76 @@ class MailingListsTestCase(_EmailsTestCase):
         user = self.login()
         orga = FakeOrganisation.objects.create(user=user, name='Dojo')
         self.assertGET404(reverse('emails__add_child_mlists', args=(orga.id,)))
+
+    @skipIfCustomContact
+    @skipIfCustomOrganisation
+    def test_get_family(self):
+        user = self.login()
+
+        create_ml = partial(MailingList.objects.create, user=user)
+        ml1 = create_ml(name='ml01')
+        ml2 = create_ml(name='ml02')
+        ml3 = create_ml(name='ml03')
+        ml4 = create_ml(name='ml04', is_deleted=True)
+        create_ml(name='ml05')
+
+        ml1.children.set([ml2])
+        ml2.children.set([ml3, ml4])
+        ml3.children.set([ml1])  # Cycle (cannot be created with the UI)
+
+        self.assertDictEqual(
+            {ml2.id: ml2, ml3.id: ml3, ml1.id: ml1},
+            ml1.get_family(),
+        )
+
+    @skipIfCustomContact
+    @skipIfCustomOrganisation
+    def test_all_recipients(self):
+        user = self.login()
+
+        create_ml = partial(MailingList.objects.create, user=user)
+        ml1 = create_ml(name='ml01')
+        ml2 = create_ml(name='ml02')
+        ml3 = create_ml(name='ml03', is_deleted=True)
+        ml4 = create_ml(name='ml04')
+        ml1.children.set([ml2, ml3])
+
+        campaign = EmailCampaign.objects.create(user=user, name='camp01')
+        campaign.mailing_lists.set([ml1, ml4])
+
+        create_contact = partial(Contact.objects.create, user=user)
+        spike = create_contact(first_name='Spike', last_name='Spiegel', email='spike@bebop.mrs')
+        jet = create_contact(first_name='Jet', last_name='Black', email='jet@bebop.mrs')
+        faye = create_contact(
+            first_name='Faye', last_name='Valentine', email='faye@bebop.mrs', is_deleted=True,
+        )
+        ed = create_contact(first_name='Ed', last_name='Wong', email='')
+        vicious = create_contact(first_name='Vicious', last_name='?', email='vicious@rsa.mrs')
+
+        create_orga = partial(Organisation.objects.create, user=user)
+        bebop = create_orga(name='Bebop', email='jet@bebop.mrs')
+        rsa = create_orga(name='Red Snake', email='contact@rsa.mrs')
+
+        ml1.contacts.set([spike, faye])
+        ml2.contacts.set([jet, ed, spike])
+        ml3.contacts.set([vicious])
+        ml4.organisations.set([bebop])
+        ml3.organisations.set([rsa])
+
+        create_recipient = EmailRecipient.objects.create
+        create_recipient(ml=ml2, address='julia@mars.mrs')
+        create_recipient(ml=ml4, address='spike@bebop.mrs')
+        create_recipient(ml=ml3, address='gren@mars.mrs')
+
+        with self.assertNumQueries(6):
+            recipients = [*campaign.all_recipients()]
+
+        self.assertCountEqual(
+            [
+                ('jet@bebop.mrs',   bebop),
+                ('spike@bebop.mrs', spike),
+                ('julia@mars.mrs',  None),
+            ],
+            recipients,
+        )
+        self.assertEqual(('jet@bebop.mrs', bebop), recipients[0])
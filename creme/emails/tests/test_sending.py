@@ -2,6 +2,7 @@
 
 from datetime import timedelta
 from functools import partial
+from unittest.mock import patch
 
 from django.contrib.contenttypes.models import ContentType
 from django.core import mail as django_mail
@@ -34,6 +35,7 @@ from ..bricks import MailsBrick
 from ..constants import SETTING_EMAILCAMPAIGN_SENDER  # MAIL_STATUS_NOTSENT
 from ..creme_jobs import campaign_emails_send_type
 from ..models import EmailRecipient, EmailSending, LightWeightEmail
+from ..models.mail import ID_LENGTH
 # from ..models.sending import (
 #     SENDING_STATE_DONE,
 #     SENDING_STATE_PLANNED,
@@ -477,7 +479,7 @@ class SendingsTestCase(_EmailsTestCase):
 
     @skipIfCustomContact
     @skipIfCustomOrganisation
-    @override_settings(EMAILCAMPAIGN_SLEEP_TIME=0.1)
+    @override_settings(EMAILCAMPAIGN_RATE_LIMIT=None)
     def test_create03(self):
         "Job + outbox."
         # queue = JobSchedulerQueue.get_main_queue()
@@ -755,6 +757,158 @@ class SendingsTestCase(_EmailsTestCase):
         self.assertGET403(reverse('emails__sending_body', args=(sending.id,)))
         self.assertGET403(reverse('emails__view_lw_mail', args=(lw_mail.id,)))
 
+    def _create_sending(self, **kwargs):
+        user = self.login()
+        camp = EmailCampaign.objects.create(user=user, name='camp01')
+
+        return EmailSending.objects.create(
+            sender='vicious@reddragons.mrs',
+            campaign=camp,
+            sending_date=now(),
+            body='Hello {{first_name}}',
+            body_html='Hello <b>{{first_name}}</b>',
+            **kwargs
+        )
+
+    def test_genid_n_bulk_create(self):
+        sending = self._create_sending()
+
+        existing_id = 'c' * ID_LENGTH
+        LightWeightEmail.objects.create(id=existing_id, sending=sending)
+
+        mails = [
+            LightWeightEmail(sending=sending, recipient=f'agent{i}@reddragons.mrs')
+            for i in range(3)
+        ]
+
+        with patch(
+            'creme.emails.models.sending.generate_id',
+            side_effect=[c * ID_LENGTH for c in 'aabcd'],
+        ):
+            LightWeightEmail.genid_n_bulk_create(mails)
+
+        self.assertListEqual(
+            ['a' * ID_LENGTH, 'b' * ID_LENGTH, 'd' * ID_LENGTH],
+            [mail.id for mail in mails],
+        )
+        self.assertEqual(4, LightWeightEmail.objects.filter(sending=sending).count())
+
+    @override_settings(EMAILCAMPAIGN_RATE_LIMIT=None, EMAILCAMPAIGN_CHUNK_SIZE=2)
+    def test_send_mails(self):
+        sending = self._create_sending()
+
+        Status = LightWeightEmail.Status
+        create_mail = partial(LightWeightEmail, sending=sending, sender=sending.sender)
+        LightWeightEmail.genid_n_bulk_create([
+            create_mail(recipient='spike@bebop.mrs', body='{"first_name":"Spike"}'),
+            create_mail(recipient='jet@bebop.mrs', body='{"first_name":"Jet"}'),
+            create_mail(recipient='faye@bebop.mrs', body='{"first_name":"Faye"}'),
+            create_mail(recipient='ed@bebop.mrs', status=Status.SENT),
+        ])
+
+        self.assertIsNone(sending.send_mails())
+
+        messages = django_mail.outbox
+        self.assertEqual(3, len(messages))
+        self.assertSetEqual(
+            {'Hello Spike', 'Hello Jet', 'Hello Faye'},
+            {message.body for message in messages},
+        )
+        self.assertFalse(sending.unsent_mails.exists())
+
+        mail = sending.mails_set.get(recipient='spike@bebop.mrs')
+        self.assertEqual(Status.SENT, mail.status)
+        self.assertIsNotNone(mail.sending_date)
+
+    @override_settings(
+        EMAILCAMPAIGN_RATE_LIMIT=None,
+        EMAIL_BACKEND='creme.emails.tests.test_utils.FailingEmailBackend',
+    )
+    def test_send_mails_error(self):
+        sending = self._create_sending()
+        LightWeightEmail.genid_n_bulk_create([
+            LightWeightEmail(
+                sending=sending, sender=sending.sender, recipient='spike@bebop.mrs',
+            ),
+        ])
+
+        self.assertEqual(EmailSending.State.ERROR, sending.send_mails())
+        self.assertEqual(
+            LightWeightEmail.Status.SENDING_ERROR,
+            sending.mails_set.get().status,
+        )
+
+    def bench_send_mails(self):
+        """Little benchmark of EmailSending.send_mails() with a local stand-in
+        of SMTP server (which accepts all the mails) ; it displays the number
+        of mails sent per second with different sizes of pool.
+        """
+        import socketserver
+        import threading
+        import time
+
+        class SMTPHandler(socketserver.StreamRequestHandler):
+            def handle(self):
+                write = self.wfile.write
+                write(b'220 localhost ready\r\n')
+                in_data = False
+
+                for line in self.rfile:
+                    if in_data:
+                        if line == b'.\r\n':
+                            in_data = False
+                            time.sleep(0.002)  # Simulates the latency of a real server
+                            write(b'250 OK\r\n')
+                    else:
+                        command = line[:4].upper()
+
+                        if command == b'QUIT':
+                            write(b'221 Bye\r\n')
+                            break
+                        elif command == b'DATA':
+                            in_data = True
+                            write(b'354 Go ahead\r\n')
+                        else:
+                            write(b'250 OK\r\n')
+
+        class SMTPServer(socketserver.ThreadingMixIn, socketserver.TCPServer):
+            daemon_threads = True
+            allow_reuse_address = True
+
+        sending = self._create_sending()
+        mails_count = 1000
+        LightWeightEmail.genid_n_bulk_create(
+            LightWeightEmail(
+                sending=sending, sender=sending.sender,
+                recipient=f'agent{i}@bebop.mrs', body=f'{{"first_name":"Agent #{i}"}}',
+            ) for i in range(mails_count)
+        )
+
+        with SMTPServer(('127.0.0.1', 0), SMTPHandler) as server:
+            threading.Thread(target=server.serve_forever, daemon=True).start()
+
+            for pool_size in (1, 4, 8):
+                sending.mails_set.update(status=LightWeightEmail.Status.NOT_SENT)
+
+                with override_settings(
+                    EMAIL_BACKEND='django.core.mail.backends.smtp.EmailBackend',
+                    EMAILCAMPAIGN_HOST='127.0.0.1',
+                    EMAILCAMPAIGN_PORT=server.server_address[1],
+                    EMAILCAMPAIGN_USE_TLS=False,
+                    EMAILCAMPAIGN_CONNECTIONS=pool_size,
+                    EMAILCAMPAIGN_RATE_LIMIT=None,
+                ):
+                    start = time.perf_counter()
+                    sending.send_mails()
+                    elapsed = time.perf_counter() - start
+
+                print(
+                    f'Pool of {pool_size} connection(s): {mails_count} mails in '
+                    f'{elapsed:.2f}s => {mails_count / elapsed:.0f} mails/s'
+                )
+
+            server.shutdown()
+
     def test_reload_sending_bricks01(self):
         "Not super-user."
         user = self.login(is_superuser=False)
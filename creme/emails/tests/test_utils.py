@@ -1,16 +1,29 @@
 # -*- coding: utf-8 -*-
 
 from email.mime.image import MIMEImage
+from time import monotonic
 
 from django.core import mail as django_mail
+from django.core.mail import EmailMessage
+from django.core.mail.backends.base import BaseEmailBackend
 
 from creme.documents.tests.base import _DocumentsTestCase
 
 from ..models import EmailSignature
-from ..utils import EMailSender, get_mime_image
+from ..utils import (
+    EmailsDeliveryPool,
+    EMailSender,
+    RateLimiter,
+    get_mime_image,
+)
 from .base import EntityEmail, _EmailsTestCase
 
 
+class FailingEmailBackend(BaseEmailBackend):
+    def send_messages(self, email_messages):
+        raise ConnectionError('Cannot connect')
+
+
 class UtilsTestCase(_EmailsTestCase, _DocumentsTestCase):
     class TestEMailSender(EMailSender):
         subject = 'Test'
@@ -125,3 +138,55 @@ class UtilsTestCase(_EmailsTestCase, _DocumentsTestCase):
         self.assertIsInstance(attachments[1], MIMEImage)
 
     # TODO: test_get_images_from_html03() -> 'attachments' parameter
+
+    def test_rate_limiter(self):
+        limiter = RateLimiter(rate=100)
+
+        start = monotonic()
+        for __ in range(6):
+            limiter.wait()
+
+        # The first call does not wait
+        self.assertGreaterEqual(monotonic() - start, 0.05)
+
+        no_limiter = RateLimiter(rate=None)
+        start = monotonic()
+        for __ in range(100):
+            no_limiter.wait()
+
+        self.assertLess(monotonic() - start, 0.05)
+
+    def test_delivery_pool01(self):
+        messages = [
+            EmailMessage(
+                'Subject', 'Body', 'm.kusanagi@section9.jp', [f'agent{i}@section9.jp'],
+            ) for i in range(5)
+        ]
+
+        with EmailsDeliveryPool(size=2) as pool:
+            results = [*pool.deliver(messages)]
+
+        self.assertListEqual([True] * 5, results)
+        self.assertSetEqual(
+            {f'agent{i}@section9.jp' for i in range(5)},
+            {
+                recipient
+                for message in django_mail.outbox
+                for recipient in message.recipients()
+            },
+        )
+
+    def test_delivery_pool02(self):
+        "Errors."
+        message = EmailMessage(
+            'Subject', 'Body', 'm.kusanagi@section9.jp', ['bato@section9.jp'],
+        )
+
+        with EmailsDeliveryPool(backend=f'{__name__}.FailingEmailBackend') as pool:
+            results = [*pool.deliver([message, message])]
+
+        self.assertListEqual([False, False], results)
+        self.assertFalse(django_mail.outbox)
+
+        with self.assertRaises(AssertionError):
+            [*EmailsDeliveryPool().deliver([message])]
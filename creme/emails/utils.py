@@ -19,14 +19,19 @@
 ################################################################################
 
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from email.mime.image import MIMEImage
+from mimetypes import guess_type
 from os.path import basename, join
 from random import choice
 from re import compile as re_compile
 from string import ascii_letters, digits
+from time import monotonic, sleep
 
 from django.conf import settings
-from django.core.mail import EmailMultiAlternatives
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.core.mail.message import DEFAULT_ATTACHMENT_MIME_TYPE
 from django.utils.timezone import now
 
 # from .constants import MAIL_STATUS_SENDINGERROR, MAIL_STATUS_SENT
@@ -107,6 +112,7 @@ class EMailSender:
         self._body_html = body_html
 
         self._attachments = attachments
+        self._attachments_data = None  # Cache (see _get_attachments_data())
         self._mime_images = mime_images
 
     def get_subject(self, mail):
@@ -115,6 +121,49 @@ class EMailSender:
     def _process_bodies(self, mail):
         return self._body, self._body_html
 
+    def _get_attachments_data(self):
+        "Get the attachments as tuples (filename, content, mimetype) ; files are read only once."
+        data = self._attachments_data
+
+        if data is None:
+            self._attachments_data = data = []
+            MEDIA_ROOT = settings.MEDIA_ROOT
+
+            for attachment in self._attachments:
+                path = join(MEDIA_ROOT, attachment.filedata.name)
+
+                with open(path, 'rb') as attachment_file:
+                    data.append((
+                        basename(path),
+                        attachment_file.read(),
+                        guess_type(path)[0] or DEFAULT_ATTACHMENT_MIME_TYPE,
+                    ))
+
+        return data
+
+    def build_message(self, mail, connection=None):
+        """Build the message to send.
+        @param mail: Object with a class inheriting emails.models.mail._Email
+        @param connection: Connection to the e-mail backend
+               (see django.core.mail.get_connection()).
+        @return: An instance of EmailMultiAlternatives.
+        """
+        body, body_html = self._process_bodies(mail)
+
+        msg = EmailMultiAlternatives(
+            self.get_subject(mail), body, mail.sender, [mail.recipient],
+            connection=connection,
+        )
+        msg.attach_alternative(body_html, 'text/html')
+
+        for image in self._mime_images:
+            msg.attach(image)
+
+        for filename, content, mimetype in self._get_attachments_data():
+            msg.attach(filename, content, mimetype)
+
+        return msg
+
     def send(self, mail, connection=None):
         """
         @param mail: Object with a class inheriting emails.models.mail._Email
@@ -126,20 +175,7 @@ class EMailSender:
         if mail.status == mail.Status.SENT:
             logger.error('Mail already sent to the recipient')
         else:
-            body, body_html = self._process_bodies(mail)
-
-            msg = EmailMultiAlternatives(
-                self.get_subject(mail), body, mail.sender, [mail.recipient],
-                connection=connection,
-            )
-            msg.attach_alternative(body_html, 'text/html')
-
-            for image in self._mime_images:
-                msg.attach(image)
-
-            MEDIA_ROOT = settings.MEDIA_ROOT
-            for attachment in self._attachments:
-                msg.attach_file(join(MEDIA_ROOT, attachment.filedata.name))
+            msg = self.build_message(mail, connection=connection)
 
             try:
                 msg.send()
@@ -156,3 +192,135 @@ class EMailSender:
             mail.save()
 
         return ok
+
+
+class RateLimiter:
+    """Limit the rate of an action, even when it's performed by several threads.
+
+    Usage:
+        limiter = RateLimiter(rate=20)  # 20 actions per second at most
+
+        # In each thread
+        limiter.wait()
+        do_action()
+    """
+    def __init__(self, rate=None):
+        """Constructor.
+        @param rate: Maximum number of actions per second ; <None> (or 0) means "no limit".
+        """
+        self._interval = 1 / rate if rate else 0
+        self._next_time = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self):
+        "Block until the next action can be performed."
+        interval = self._interval
+
+        if interval:
+            with self._lock:
+                current_time = monotonic()
+                slot_time = max(current_time, self._next_time)
+                self._next_time = slot_time + interval
+
+            delay = slot_time - current_time
+            if delay > 0:
+                sleep(delay)
+
+
+class EmailsDeliveryPool:
+    """Send messages (instances of django.core.mail.EmailMessage) in parallel
+    with a pool of threads, each thread using its own connection to the e-mail
+    backend ; the global rate of sending can be limited.
+    The connections are kept open between the messages.
+
+    Usage:
+        with EmailsDeliveryPool(size=4, rate_limit=20, host='smtp.mydomain.org') as pool:
+            for message, sent in zip(messages, pool.deliver(messages)):
+                [...]
+    """
+    def __init__(self, size=1, rate_limit=None, **connection_kwargs):
+        """Constructor.
+        @param size: Number of threads/connections.
+        @param rate_limit: Maximum number of messages per second (see RateLimiter).
+        @param connection_kwargs: Arguments for django.core.mail.get_connection().
+        """
+        self._size = max(1, size)
+        self._connection_kwargs = connection_kwargs
+        self._rate_limiter = RateLimiter(rate_limit)
+        self._local = threading.local()
+        self._connections = []
+        self._connections_lock = threading.Lock()
+        self._executor = None
+
+    def __enter__(self):
+        self._executor = ThreadPoolExecutor(
+            max_workers=self._size, thread_name_prefix='emails-delivery',
+        )
+
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self._executor.shutdown()
+        self._executor = None
+
+        with self._connections_lock:
+            connections = self._connections
+            self._connections = []
+
+        for connection in connections:
+            try:
+                connection.close()
+            except Exception:
+                logger.exception('EmailsDeliveryPool: error when closing a connection.')
+
+    def _get_connection(self):
+        local = self._local
+        connection = getattr(local, 'connection', None)
+
+        if connection is None:
+            connection = get_connection(fail_silently=False, **self._connection_kwargs)
+            # NB: the connection stays open between the messages.
+            connection.open()
+            local.connection = connection
+
+            with self._connections_lock:
+                self._connections.append(connection)
+
+        return connection
+
+    def _drop_connection(self):
+        connection = self._local.connection
+        self._local.connection = None
+
+        with self._connections_lock:
+            self._connections.remove(connection)
+
+        try:
+            connection.close()
+        except Exception:
+            pass
+
+    def _deliver(self, message):
+        try:
+            message.connection = self._get_connection()
+            self._rate_limiter.wait()
+            message.send()
+        except Exception:
+            logger.exception('EmailsDeliveryPool: error during sending mail.')
+
+            # The connection may be broken ; a new one is opened for the next message.
+            if getattr(self._local, 'connection', None) is not None:
+                self._drop_connection()
+
+            return False
+
+        return True
+
+    def deliver(self, messages):
+        """Send some messages.
+        @param messages: Iterable of instances of EmailMessage.
+        @return: Iterator on booleans (<True> means "sent"), in the order of the messages.
+        """
+        assert self._executor is not None, 'EmailsDeliveryPool must be used as context manager'
+
+        return self._executor.map(self._deliver, messages)
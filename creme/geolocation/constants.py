@@ -2,6 +2,9 @@
 
 DEFAULT_SEPARATING_NEIGHBOURS = 10000  # in meters
 
+# Number of characters of the geohashes stored in GeoAddress (9 => cells of ~5m x 5m)
+GEOHASH_PRECISION = 9
+
 DEFAULT_OSM_NOMINATIM_URL = 'https://nominatim.openstreetmap.org/search'
 DEFAULT_OSM_TILEMAP_URL = 'https://{s}.tile.openstreetmap.org/{z}/{x}/{y}.png'
 DEFAULT_OSM_TILEMAP_COPYRIGHT = (
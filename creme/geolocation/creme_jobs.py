@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+
+################################################################################
+#    Creme is a free/open-source Customer Relationship Management software
+#    Copyright (C) 2021  Hybird
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU Affero General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#
+#    GNU Affero General Public License for more details.
+#    You should have received a copy of the GNU Affero General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+################################################################################
+
+
+from django.utils.translation import gettext as _
+from django.utils.translation import gettext_lazy, ngettext
+
+from creme.creme_core.creme_jobs.base import JobType
+from creme.creme_core.models import Job
+
+from .geocoding import Geocoder
+
+
+class _GeocodingType(JobType):
+    id           = JobType.generate_id('geolocation', 'geocoding')
+    verbose_name = gettext_lazy('Geolocate the addresses')
+    periodic     = JobType.PERIODIC
+
+    def _execute(self, job):
+        data = job.data or {}
+
+        # The position is stored after each chunk, so an interrupted run is
+        # resumed by the next one.
+        def progress(stats):
+            job.data = {**data, 'after': stats.last_id}
+            Job.objects.filter(id=job.id).update(data=job.data)
+
+        stats = Geocoder().run(after_id=data.get('after'), progress=progress)
+        job.data = {'after': None, 'stats': stats.as_dict()}
+
+    def get_description(self, job):
+        return [
+            _('Geolocate the addresses which are not localized yet, from their zip code & city'),
+        ]
+
+    def get_stats(self, job):
+        stats = (job.data or {}).get('stats')
+
+        if not stats:
+            return []
+
+        processed = stats['processed']
+        localized = processed - stats['not_found']
+
+        return [
+            ngettext(
+                '{count} address has been processed.',
+                '{count} addresses have been processed.',
+                processed
+            ).format(count=processed),
+            ngettext(
+                '{count} address has been localized.',
+                '{count} addresses have been localized.',
+                localized
+            ).format(count=localized),
+        ]
+
+
+geocoding_type = _GeocodingType()
+jobs = (geocoding_type,)
@@ -0,0 +1,279 @@
+# -*- coding: utf-8 -*-
+
+################################################################################
+#    Creme is a free/open-source Customer Relationship Management software
+#    Copyright (C) 2021  Hybird
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU Affero General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#
+#    GNU Affero General Public License for more details.
+#    You should have received a copy of the GNU Affero General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+################################################################################
+
+
+import logging
+from collections import defaultdict
+from time import monotonic
+
+from django.db.models import Q
+from django.db.transaction import atomic
+from django.template.defaultfilters import slugify
+
+from creme.creme_core.utils.chunktools import iter_as_chunk
+from creme.persons import get_address_model
+
+from .models import GeoAddress, Town
+
+logger = logging.getLogger(__name__)
+
+
+class TownsIndex:
+    """In-memory index of Towns by zipcode & by slug, to find the Towns of
+    many addresses without query.
+    The rules are the same as Town.search().
+    """
+    def __init__(self, towns):
+        """Constructor.
+        @param towns: Iterable of Towns ; they should be ordered by zipcode.
+        """
+        self._by_zipcode = by_zipcode = defaultdict(list)
+        self._by_slug = by_slug = defaultdict(list)
+
+        for town in towns:
+            by_zipcode[town.zipcode].append(town)
+            by_slug[town.slug].append(town)
+
+    def __len__(self):
+        return sum(len(towns) for towns in self._by_zipcode.values())
+
+    @classmethod
+    def all(cls):
+        "Index containing all the Towns (they are loaded with one query)."
+        return cls(Town.objects.order_by('zipcode', 'id').iterator(chunk_size=2000))
+
+    @classmethod
+    def for_addresses(cls, addresses):
+        "Index containing only the Towns which could match some addresses."
+        zipcodes = {a.zipcode for a in addresses if a.zipcode}
+        slugs = {slugify(a.city) for a in addresses if a.city}
+
+        if not zipcodes and not slugs:
+            return cls(())
+
+        return cls(
+            Town.objects.filter(
+                Q(zipcode__in=zipcodes) | Q(slug__in=slugs)
+            ).order_by('zipcode', 'id')
+        )
+
+    def search(self, address):
+        """Get the Town of an address.
+        @return: A Town instance, or None if no Town matches (or if several
+                 Towns match ambiguously).
+        """
+        zipcode = address.zipcode
+        slug = slugify(address.city) if address.city else None
+
+        if zipcode:
+            towns = self._by_zipcode.get(zipcode, ())
+        elif slug:
+            towns = self._by_slug.get(slug, ())
+        else:
+            return None
+
+        if len(towns) > 1 and slug:
+            return next((t for t in towns if t.slug == slug), None)
+
+        return towns[0] if len(towns) == 1 else None
+
+
+class GeocodingStats:
+    "Counters of a Geocoder."
+    def __init__(self):
+        self.processed = 0  # Number of addresses read
+        self.created = 0  # Number of GeoAddresses created
+        self.updated = 0  # Number of GeoAddresses updated
+        self.not_found = 0  # Number of addresses without Town
+        self.last_id = None  # ID of the last processed address
+        self._start = monotonic()
+
+    @property
+    def duration(self):
+        "Duration in seconds since the beginning."
+        return monotonic() - self._start
+
+    @property
+    def throughput(self):
+        "Number of processed addresses per second."
+        duration = self.duration
+        return self.processed / duration if duration else 0.0
+
+    def as_dict(self):
+        return {
+            'processed': self.processed,
+            'created':   self.created,
+            'updated':   self.updated,
+            'not_found': self.not_found,
+        }
+
+    def __str__(self):
+        return (
+            f'{self.processed} address(es) processed '
+            f'({self.created} created, {self.updated} updated, {self.not_found} not found) '
+            f'in {self.duration:.1f}s ({self.throughput:.1f} address(es)/s)'
+        )
+
+
+class Geocoder:
+    """Geolocate addresses in bulk, from the Towns.
+    The addresses are processed by chunks ; for each chunk the GeoAddresses are
+    read with the addresses, & written with bulk_create()/bulk_update().
+
+    Usage (backfill of all the addresses which are not localized yet):
+        stats = Geocoder().run()
+
+    The processing can be resumed (see the argument "after_id" of run()).
+    """
+    updated_fields = ('latitude', 'longitude', 'status', 'geohash')
+
+    def __init__(self, towns_index=None, chunk_size=500):
+        """Constructor.
+        @param towns_index: Instance of TownsIndex. <None> means the index is
+               built for each chunk, with the Towns which could match the chunk
+               (useful when there are few addresses) ; use TownsIndex.all() to
+               geolocate lots of addresses.
+        @param chunk_size: Number of addresses processed (& written) at once.
+        """
+        self.towns_index = towns_index
+        self.chunk_size = chunk_size
+
+    @staticmethod
+    def addresses_to_geolocate():
+        "QuerySet on the addresses which are not localized yet (or without GeoAddress)."
+        return get_address_model().objects.exclude(
+            zipcode='', city='',
+        ).filter(
+            Q(geoaddress__isnull=True) | Q(geoaddress__latitude__isnull=True)
+        )
+
+    @staticmethod
+    def _populate_geoaddresses(addresses):
+        "Retrieve the GeoAddresses of some addresses with one query."
+        if not addresses:
+            return
+
+        related = type(addresses[0]).geoaddress.related
+        not_cached = {a.id: a for a in addresses if not related.is_cached(a)}
+
+        if not_cached:
+            geoaddresses = GeoAddress.objects.in_bulk([*not_cached.keys()])
+
+            for address_id, address in not_cached.items():
+                related.set_cached_value(address, geoaddresses.get(address_id))
+
+    def geolocate(self, addresses, stats=None):
+        """Create/update the GeoAddresses of some addresses. The GeoAddresses
+        which are already localized are ignored.
+        @param addresses: Iterable of addresses ; the GeoAddresses which are not
+               already cached are retrieved with one query per chunk.
+        @param stats: Instance of GeocodingStats, updated by the method ;
+               <None> means a new instance is created.
+        @return: Instance of GeocodingStats.
+        """
+        if stats is None:
+            stats = GeocodingStats()
+
+        updated_fields = self.updated_fields
+
+        for chunk in iter_as_chunk(addresses, self.chunk_size):
+            self._populate_geoaddresses(chunk)
+            index = self.towns_index or TownsIndex.for_addresses(chunk)
+            search = index.search
+            create = []
+            update = []
+
+            for address in chunk:
+                try:
+                    geoaddress = address.geoaddress
+                except GeoAddress.DoesNotExist:
+                    geoaddress = GeoAddress(address=address)
+                    old_values = None
+                else:
+                    if geoaddress.latitude is not None:
+                        continue
+
+                    old_values = [getattr(geoaddress, fname) for fname in updated_fields]
+
+                town = search(address)
+                if town is None:
+                    stats.not_found += 1
+
+                geoaddress.set_town_position(town)
+                geoaddress.update_geohash()
+
+                if old_values is None:
+                    create.append(geoaddress)
+                elif old_values != [getattr(geoaddress, fname) for fname in updated_fields]:
+                    update.append(geoaddress)
+
+            with atomic():
+                GeoAddress.objects.bulk_create(create)
+
+                if update:
+                    GeoAddress.objects.bulk_update(update, updated_fields)
+
+            stats.processed += len(chunk)
+            stats.created += len(create)
+            stats.updated += len(update)
+            stats.last_id = chunk[-1].id
+
+        return stats
+
+    def run(self, after_id=None, progress=None):
+        """Geolocate all the addresses which are not localized yet.
+        The addresses are read by chunks (ordered by ID), so the memory usage
+        does not depend on the number of addresses.
+        @param after_id: If not <None>, the addresses with a smaller (or equal)
+               ID are ignored ; it's useful to resume an interrupted processing
+               (see GeocodingStats.last_id).
+        @param progress: Callable which takes the instance of GeocodingStats ;
+               it's called after each chunk.
+        @return: Instance of GeocodingStats.
+        """
+        if self.towns_index is None:
+            self.towns_index = TownsIndex.all()
+
+        stats = GeocodingStats()
+        addresses = self.addresses_to_geolocate().select_related(
+            'geoaddress',
+        ).order_by('id')
+        chunk_size = self.chunk_size
+        last_id = after_id
+
+        while True:
+            chunk = [
+                *(
+                    addresses if last_id is None else addresses.filter(id__gt=last_id)
+                )[:chunk_size]
+            ]
+            if not chunk:
+                break
+
+            self.geolocate(chunk, stats=stats)
+            last_id = stats.last_id
+            logger.debug('Geocoder: %s', stats)
+
+            if progress:
+                progress(stats)
+
+        logger.info('Geocoder: %s', stats)
+
+        return stats
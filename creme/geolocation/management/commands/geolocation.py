@@ -33,8 +33,8 @@ from django.template.defaultfilters import slugify
 from creme.creme_core.utils.chunktools import iter_as_chunk
 from creme.creme_core.utils.collections import OrderedSet
 from creme.creme_core.utils.url import parse_path
-from creme.persons import get_address_model
 
+from ...geocoding import Geocoder
 from ...models import GeoAddress, Town
 
 logger = logging.getLogger(__name__)
@@ -277,6 +277,19 @@ class Command(BaseCommand):
             '-i', '--import', action='store_true', dest='import', default=False,
             help='Import towns configured in GEOLOCATION_TOWNS setting',
         )
+        add_argument(
+            '--after', action='store', dest='after', type=int, default=None,
+            help='Populate only the addresses with a greater ID '
+                 '(useful to resume an interrupted populating)',
+        )
+        add_argument(
+            '--chunk-size', action='store', dest='chunk_size', type=int, default=500,
+            help='Number of addresses populated at once [default: %(default)s]',
+        )
+        add_argument(
+            '-g', '--geohash', action='store_true', dest='geohash', default=False,
+            help='Compute the geohashes (spatial index) of the geolocated addresses',
+        )
 
     def sysout(self, message, visible):
         if visible:
@@ -285,11 +298,19 @@ class Command(BaseCommand):
     def syserr(self, message):
         self.stderr.write(message)
 
-    def populate_addresses(self, verbosity=0):
+    def populate_addresses(self, verbosity=0, after=None, chunk_size=500):
         self.sysout('Populate geolocation information of addresses...', verbosity > 0)
-        GeoAddress.populate_geoaddresses(
-            get_address_model().objects.exclude(zipcode='', city='')
-        )
+
+        def progress(stats):
+            self.sysout(f'{stats} ; last address ID: {stats.last_id}', verbosity > 1)
+
+        stats = Geocoder(chunk_size=chunk_size).run(after_id=after, progress=progress)
+        self.sysout(str(stats), verbosity > 0)
+
+    def update_geohashes(self, verbosity=0):
+        self.sysout('Compute geohashes of addresses...', verbosity > 0)
+        count = GeoAddress.update_geohashes()
+        self.sysout(f'{count} address(es) updated.', verbosity > 0)
 
     def import_town_database(self, url, defaults):
         try:
@@ -311,6 +332,7 @@ class Command(BaseCommand):
         populate = options.get('populate')
         stats = options.get('stats')
         imports = options.get('import')
+        geohash = options.get('geohash')
         verbosity = options.get('verbosity')
 
         if stats:
@@ -320,4 +342,11 @@ class Command(BaseCommand):
             self.import_town_all(verbosity)
 
         if populate:
-            self.populate_addresses(verbosity)
+            self.populate_addresses(
+                verbosity,
+                after=options.get('after'),
+                chunk_size=options.get('chunk_size') or 500,
+            )
+
+        if geohash:
+            self.update_geohashes(verbosity)
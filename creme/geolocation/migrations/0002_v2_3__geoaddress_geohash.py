@@ -0,0 +1,38 @@
+from django.db import migrations, models
+
+from creme.geolocation.utils import geohash_encode
+
+
+def fill_geohashes(apps, schema_editor):
+    GeoAddress = apps.get_model('geolocation', 'GeoAddress')
+    chunk_size = 500
+    modified = []
+
+    for geoaddress in GeoAddress.objects.filter(
+        latitude__isnull=False, longitude__isnull=False,
+    ).only('latitude', 'longitude', 'geohash').order_by('pk').iterator(chunk_size=chunk_size):
+        geoaddress.geohash = geohash_encode(geoaddress.latitude, geoaddress.longitude)
+        modified.append(geoaddress)
+
+        if len(modified) >= chunk_size:
+            GeoAddress.objects.bulk_update(modified, ['geohash'])
+            modified = []
+
+    if modified:
+        GeoAddress.objects.bulk_update(modified, ['geohash'])
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('geolocation', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='geoaddress',
+            name='geohash',
+            field=models.CharField(max_length=12, blank=True, editable=False, db_index=True, default=''),
+            preserve_default=False,
+        ),
+        migrations.RunPython(fill_geohashes),
+    ]
@@ -18,20 +18,22 @@
 #    along with this program.  If not, see <http://www.gnu.org/licenses/>.
 ################################################################################
 
-from itertools import chain, groupby
-
 from django.conf import settings
 from django.db import models
 from django.db.models.query_utils import Q
-from django.db.transaction import atomic
 from django.template.defaultfilters import slugify
 from django.utils.translation import gettext_lazy as _
 from django.utils.translation import pgettext_lazy
 
 from creme.creme_core.utils import update_model_instance
-from creme.creme_core.utils.chunktools import iter_as_slices
+from creme.creme_core.utils.chunktools import iter_as_chunk
 
-from .utils import location_bounding_box
+from .utils import (
+    geohash_cells,
+    geohash_encode,
+    haversine_distance,
+    location_bounding_box,
+)
 
 
 class GeoAddress(models.Model):
@@ -71,6 +73,11 @@ class GeoAddress(models.Model):
         # choices=STATUS_LABELS.items(), default=UNDEFINED,
         choices=Status.choices, default=Status.UNDEFINED,
     )
+    # Spatial index used to retrieve the neighbours ; empty if not localized.
+    # It's updated by save() ; see update_geohashes() to fill it in bulk.
+    geohash = models.CharField(
+        max_length=12, blank=True, editable=False, db_index=True,
+    )
 
     creation_label = pgettext_lazy('geolocation-address', 'Create an address')
 
@@ -84,6 +91,15 @@ class GeoAddress(models.Model):
         super().__init__(*args, **kwargs)
         self._neighbours = {}
 
+    def save(self, *args, **kwargs):
+        self.update_geohash()
+
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and {'latitude', 'longitude'} & {*update_fields}:
+            kwargs['update_fields'] = {*update_fields, 'geohash'}
+
+        super().save(*args, **kwargs)
+
     @property
     def is_complete(self):
         # return self.status == self.COMPLETE
@@ -114,32 +130,12 @@ class GeoAddress(models.Model):
 
     @classmethod
     def populate_geoaddresses(cls, addresses):
-        for addresses in iter_as_slices(addresses, 50):
-            create = []
-            update = []
+        """Create/update the GeoAddresses (not localized yet) of some addresses.
+        See geocoding.Geocoder to geolocate lots of addresses.
+        """
+        from .geocoding import Geocoder
 
-            # TODO: regroup queries ?
-            for address in addresses:
-                try:
-                    geoaddress = address.geoaddress
-
-                    if geoaddress.latitude is None:
-                        update.append(geoaddress)
-                except GeoAddress.DoesNotExist:
-                    create.append(GeoAddress(address=address))
-
-            towns = Town.search_all([geo.address for geo in chain(create, update)])
-
-            for geoaddress, town in zip(chain(create, update), towns):
-                geoaddress.set_town_position(town)
-
-            GeoAddress.objects.bulk_create(create)
-
-            # TODO: only if has changed
-            # TODO: bulk_update() ?
-            with atomic():
-                for geoaddress in update:
-                    geoaddress.save(force_update=True)
+        Geocoder(chunk_size=50).geolocate(addresses)
 
     def set_town_position(self, town):
         if town is not None:
@@ -156,6 +152,70 @@ class GeoAddress(models.Model):
     def update(self, **kwargs):
         update_model_instance(self, **kwargs)
 
+    def update_geohash(self):
+        # NB: the coordinates can be strings (e.g. set from POST data) ; they
+        #     are converted by the model field when the instance is saved.
+        try:
+            self.geohash = geohash_encode(float(self.latitude), float(self.longitude))
+        except (TypeError, ValueError):  # Missing/invalid coordinates
+            self.geohash = ''
+
+    @classmethod
+    def update_geohashes(cls, queryset=None, chunk_size=500):
+        """Compute the geohashes of some instances in bulk (useful to fill the
+        spatial index of existing instances).
+        @param queryset: QuerySet on GeoAddress ; <None> means all the instances.
+        @param chunk_size: Number of instances updated by query.
+        @return: Number of updated instances.
+        """
+        if queryset is None:
+            queryset = cls.objects.all()
+
+        count = 0
+        geoaddresses = queryset.only('latitude', 'longitude', 'geohash').order_by('pk')
+
+        for chunk in iter_as_chunk(geoaddresses.iterator(chunk_size=chunk_size), chunk_size):
+            modified = []
+
+            for geoaddress in chunk:
+                old_geohash = geoaddress.geohash
+                geoaddress.update_geohash()
+
+                if geoaddress.geohash != old_geohash:
+                    modified.append(geoaddress)
+
+            if modified:
+                cls.objects.bulk_update(modified, ['geohash'])
+                count += len(modified)
+
+        return count
+
+    def distance(self, other):
+        "Distance in meters to another (localized) GeoAddress."
+        return haversine_distance(
+            self.latitude, self.longitude, other.latitude, other.longitude,
+        )
+
+    def nearest(self, geoaddresses, distance):
+        """Keep the GeoAddresses which are really in a radius (the neighbours()
+        are in a square), & sort them by distance.
+        @param geoaddresses: Iterable of GeoAddresses (e.g. neighbours(distance)).
+        @param distance: Radius in meters.
+        @return: List of tuples (GeoAddress, distance in meters).
+        """
+        get_distance = self.distance
+        ranked = []
+
+        for geoaddress in geoaddresses:
+            geo_distance = get_distance(geoaddress)
+
+            if geo_distance <= distance:
+                ranked.append((geoaddress, geo_distance))
+
+        ranked.sort(key=lambda t: t[1])
+
+        return ranked
+
     def neighbours(self, distance):
         neighbours = self._neighbours.get(distance)
 
@@ -172,8 +232,19 @@ class GeoAddress(models.Model):
             return GeoAddress.objects.none()
 
         upper_left, lower_right = location_bounding_box(latitude, longitude, distance)
+        neighbours = GeoAddress.objects.all()
 
-        return GeoAddress.objects.exclude(
+        # The cells of the spatial index reduce the number of rows to read
+        # before the (not indexed) filtering on the coordinates.
+        cells = geohash_cells(latitude, longitude, distance)
+        if cells is not None:
+            q = Q()
+            for cell in cells:
+                q |= Q(geohash__startswith=cell)
+
+            neighbours = neighbours.filter(q)
+
+        return neighbours.exclude(
             address_id=self.address.pk,
         ).exclude(
             address__object_id=self.address.object_id,
@@ -233,30 +304,13 @@ class Town(models.Model):
 
     @classmethod
     def search_all(cls, addresses):
-        candidates = [
-            *Town.objects.filter(
-                Q(zipcode__in=(a.zipcode for a in addresses if a.zipcode))
-                | Q(slug__in=(slugify(a.city) for a in addresses if a.city))
-            ).order_by('zipcode'),
-        ]
-
-        cities = {key: [*c] for key, c in groupby(candidates, lambda c: c.slug)}
-        zipcodes = {key: [*c] for key, c in groupby(candidates, lambda c: c.zipcode)}
+        """Search the Towns of several addresses with one query.
+        @param addresses: Sequence of addresses.
+        @return: Iterator of Towns (or None), in the order of the addresses.
+        """
+        from .geocoding import TownsIndex
 
-        get_city = cities.get
-        get_zipcode = zipcodes.get
+        search = TownsIndex.for_addresses(addresses).search
 
         for address in addresses:
-            zipcode = address.zipcode
-            slug = slugify(address.city) if address.city else None
-            towns = []
-
-            if zipcode:
-                towns = get_zipcode(zipcode, [])
-            elif slug:
-                towns = get_city(slug, [])
-
-            if len(towns) > 1 and slug:
-                yield next((t for t in towns if t.slug == slug), None)
-            else:
-                yield towns[0] if len(towns) == 1 else None
+            yield search(address)
@@ -2,7 +2,7 @@
 
 ################################################################################
 #    Creme is a free/open-source Customer Relationship Management software
-#    Copyright (C) 2014-2020  Hybird
+#    Copyright (C) 2014-2021  Hybird
 #
 #    This program is free software: you can redistribute it and/or modify
 #    it under the terms of the GNU Affero General Public License as published by
@@ -20,6 +20,7 @@
 
 import logging
 
+from django.conf import settings
 from django.contrib.auth import get_user_model
 
 from creme import persons
@@ -27,10 +28,13 @@ from creme.creme_core.management.commands.creme_populate import BasePopulator
 from creme.creme_core.models import (
     BrickDetailviewLocation,
     BrickMypageLocation,
+    Job,
     SettingValue,
 )
+from creme.creme_core.utils.date_period import date_period_registry
 
 from . import bricks, constants, setting_keys
+from .creme_jobs import geocoding_type
 from .management.commands.geolocation import Command as GeolocationCommand
 
 logger = logging.getLogger(__name__)
@@ -40,6 +44,15 @@ class Populator(BasePopulator):
     dependencies = ['creme_core', 'persons']
 
     def populate(self):
+        Job.objects.get_or_create(
+            type_id=geocoding_type.id,
+            defaults={
+                'language':    settings.LANGUAGE_CODE,
+                'periodicity': date_period_registry.get_period('days', 1),
+                'status':      Job.STATUS_OK,
+            },
+        )
+
         already_populated = SettingValue.objects.exists_4_key(setting_keys.NEIGHBOURHOOD_DISTANCE)
 
         if already_populated:
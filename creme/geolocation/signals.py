@@ -41,4 +41,4 @@ def update_geoaddresses(sender, instance, **kwargs):
         geoaddress = GeoAddress(address=instance)
 
     geoaddress.set_town_position(Town.search(instance))
-    geoaddress.save()
+    geoaddress.save()  # NB: the geohash is updated too
@@ -0,0 +1,200 @@
+# -*- coding: utf-8 -*-
+
+from functools import partial
+
+from django.utils.translation import ngettext
+
+from creme.creme_core.models import Job
+from creme.persons.tests.base import (
+    skipIfCustomAddress,
+    skipIfCustomOrganisation,
+)
+
+from ..creme_jobs import geocoding_type
+from ..geocoding import Geocoder, TownsIndex
+from ..models import GeoAddress, Town
+from .base import Address, GeoLocationBaseTestCase, Organisation
+
+
+@skipIfCustomOrganisation
+@skipIfCustomAddress
+class GeocodingTestCase(GeoLocationBaseTestCase):
+    def setUp(self):
+        super().setUp()
+        user = self.login()
+
+        create_town = partial(Town.objects.create, name='Marseille', country='FRANCE')
+        self.marseille1 = create_town(zipcode='13001', latitude=43.299985, longitude=5.378865)
+        self.marseille2 = create_town(zipcode='13002', latitude=43.298642, longitude=5.364956)
+        self.aubagne    = create_town(
+            zipcode='13400', latitude=43.2833, longitude=5.56667, name='Aubagne',
+        )
+
+        self.orga = Organisation.objects.create(name='Orga 1', user=user)
+
+    def _create_addresses(self):
+        town1 = self.marseille1
+        town2 = self.marseille2
+        town3 = self.aubagne
+
+        create_address = partial(Address.objects.create, owner=self.orga, address='Mairie')
+        addresses = [
+            create_address(address='La Major', zipcode=town2.zipcode, city=town2.name),
+            create_address(zipcode=town1.zipcode, city=town1.name),
+            create_address(zipcode=town3.zipcode),
+            create_address(city=town1.name),
+            create_address(zipcode='unknown'),
+        ]
+        GeoAddress.objects.all().delete()
+
+        return addresses
+
+    def test_towns_index(self):
+        town1 = self.marseille1
+        town2 = self.marseille2
+        town3 = self.aubagne
+
+        build_address = partial(Address, owner=self.orga)
+        addresses = [
+            build_address(zipcode=town2.zipcode, city=town2.name),
+            build_address(zipcode=town1.zipcode, city=town1.name),
+            build_address(zipcode=town3.zipcode),
+            build_address(zipcode=town3.zipcode, city=town1.name),
+            build_address(),
+            build_address(zipcode='unknown'),
+            build_address(city=town1.name),
+            build_address(city='unknown'),
+        ]
+        expected = [town2, town1, town3, town3, None, None, town1, None]
+
+        with self.assertNumQueries(1):
+            index = TownsIndex.all()
+
+        self.assertEqual(3, len(index))
+
+        with self.assertNumQueries(0):
+            towns = [index.search(address) for address in addresses]
+
+        self.assertListEqual(expected, towns)
+        self.assertListEqual(expected, [Town.search(address) for address in addresses])
+
+        index = TownsIndex.for_addresses(addresses[2:3])
+        self.assertEqual(1, len(index))
+        self.assertIsNone(index.search(addresses[1]))
+
+        with self.assertNumQueries(0):
+            index = TownsIndex.for_addresses([build_address()])
+
+        self.assertEqual(0, len(index))
+
+    def test_run(self):
+        addresses = self._create_addresses()
+
+        # Already localized => ignored
+        complete = self.create_address(self.orga, geoloc=(43.290347, 5.365572))
+
+        stats = Geocoder(chunk_size=2).run()
+        self.assertEqual(5, stats.processed)
+        self.assertEqual(5, stats.created)
+        self.assertEqual(0, stats.updated)
+        self.assertEqual(1, stats.not_found)
+        self.assertEqual(addresses[-1].id, stats.last_id)
+        self.assertGreater(stats.throughput, 0)
+
+        geoaddress = self.refresh(addresses[0]).geoaddress
+        town = self.marseille2
+        self.assertGeoAddress(
+            geoaddress,
+            latitude=town.latitude, longitude=town.longitude,
+            status=GeoAddress.Status.PARTIAL,
+        )
+        self.assertTrue(geoaddress.geohash)
+
+        self.assertGeoAddress(
+            self.refresh(addresses[3]).geoaddress,
+            latitude=self.marseille1.latitude, status=GeoAddress.Status.PARTIAL,
+        )  # 13001 first
+        self.assertGeoAddress(
+            self.refresh(addresses[4]).geoaddress,
+            latitude=None, status=GeoAddress.Status.UNDEFINED,
+        )
+        self.assertGeoAddress(
+            self.refresh(complete).geoaddress,
+            latitude=43.290347, status=GeoAddress.Status.COMPLETE,
+        )
+
+        # Not localized addresses are updated only if a town is found
+        GeoAddress.objects.filter(address=addresses[1]).update(latitude=None, longitude=None)
+
+        stats = Geocoder().run()
+        self.assertEqual(2, stats.processed)
+        self.assertEqual(0, stats.created)
+        self.assertEqual(1, stats.updated)
+        self.assertEqual(1, stats.not_found)
+        self.assertEqual(
+            self.marseille1.latitude,
+            self.refresh(addresses[1]).geoaddress.latitude,
+        )
+
+    def test_run_resume(self):
+        addresses = self._create_addresses()
+
+        stats = Geocoder().run(after_id=addresses[2].id)
+        self.assertEqual(2, stats.processed)
+        self.assertEqual(2, GeoAddress.objects.count())
+        self.assertFalse(GeoAddress.objects.filter(address__in=addresses[:3]))
+
+        progressions = []
+        Geocoder(chunk_size=2).run(progress=lambda s: progressions.append(s.last_id))
+        self.assertListEqual([addresses[1].id, addresses[4].id], progressions)
+        self.assertEqual(5, GeoAddress.objects.count())
+
+    def test_geolocate_queries(self):
+        addresses = [self.refresh(address) for address in self._create_addresses()]
+
+        # GeoAddresses + Towns + SAVEPOINT + bulk_create() + RELEASE SAVEPOINT
+        with self.assertNumQueries(5):
+            stats = Geocoder().geolocate(addresses)
+
+        self.assertEqual(5, stats.created)
+
+    def test_job(self):
+        addresses = self._create_addresses()
+
+        job = self.get_object_or_fail(Job, type_id=geocoding_type.id)
+        self.assertIsNone(job.user)
+        self.assertEqual('days', job.periodicity.name)
+        self.assertListEqual([], geocoding_type.get_stats(job))
+
+        job.data = {'after': addresses[0].id}
+        geocoding_type.execute(job)
+
+        job = self.refresh(job)
+        self.assertEqual(Job.STATUS_OK, job.status)
+        self.assertDictEqual(
+            {
+                'after': None,
+                'stats': {'processed': 4, 'created': 4, 'updated': 0, 'not_found': 1},
+            },
+            job.data,
+        )
+        self.assertEqual(4, GeoAddress.objects.count())
+        self.assertListEqual(
+            [
+                ngettext(
+                    '{count} address has been processed.',
+                    '{count} addresses have been processed.',
+                    4
+                ).format(count=4),
+                ngettext(
+                    '{count} address has been localized.',
+                    '{count} addresses have been localized.',
+                    3
+                ).format(count=3),
+            ],
+            geocoding_type.get_stats(job),
+        )
+
+        # Not resumed
+        geocoding_type.execute(job)
+        self.assertEqual(5, GeoAddress.objects.count())
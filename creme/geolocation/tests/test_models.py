@@ -11,6 +11,7 @@ from creme.persons.tests.base import (
 )
 
 from ..models import GeoAddress, Town
+from ..utils import geohash_encode
 from .base import Address, Contact, GeoLocationBaseTestCase, Organisation
 
 
@@ -648,6 +649,90 @@ class GeoLocationModelsTestCase(GeoLocationBaseTestCase):
         self.assertFalse(address.geoaddress.neighbours(distance=1000))
         self.assertFalse(address.geoaddress.neighbours(distance=10000))
 
+    def test_geohash(self):
+        town = self.marseille2
+        address = self.create_address(
+            self.orga,
+            address='La Major', zipcode=town.zipcode, town=town.name,
+        )
+        geoaddress = address.geoaddress
+        self.assertEqual(
+            geohash_encode(town.latitude, town.longitude),
+            self.refresh(geoaddress).geohash,
+        )
+
+        # Updated by the signal handler
+        address.zipcode = 'unknown'
+        address.city = 'Unknown'
+        address.save()
+        self.assertEqual('', self.refresh(geoaddress).geohash)
+
+        # Partial update
+        geoaddress.latitude = 43.290347
+        geoaddress.longitude = 5.365572
+        geoaddress.save(update_fields=['latitude', 'longitude'])
+        self.assertEqual(
+            geohash_encode(43.290347, 5.365572),
+            self.refresh(geoaddress).geohash,
+        )
+
+    def test_update_geohashes(self):
+        create_address = partial(self.create_address, self.orga)
+        address1 = create_address(address='St Victor', geoloc=(43.290347, 5.365572))
+        address2 = create_address(address='Commanderie', geoloc=(43.301963, 5.462410))
+        address3 = create_address(address='Nowhere', zipcode='0', town='Unknown')
+
+        GeoAddress.objects.update(geohash='')
+        self.assertEqual(2, GeoAddress.update_geohashes(chunk_size=1))
+        self.assertEqual(
+            geohash_encode(43.290347, 5.365572), self.refresh(address1.geoaddress).geohash,
+        )
+        self.assertEqual(
+            geohash_encode(43.301963, 5.462410), self.refresh(address2.geoaddress).geohash,
+        )
+        self.assertEqual('', self.refresh(address3.geoaddress).geohash)
+
+        # Nothing to update
+        self.assertEqual(0, GeoAddress.update_geohashes())
+
+    @skipIfCustomContact
+    def test_nearest(self):
+        contact = Contact.objects.create(last_name='Contact 1', user=self.user)
+        orga2   = Organisation.objects.create(name='Orga 2', user=self.user)
+
+        create_address = self.create_address
+        ST_VICTOR   = create_address(
+            self.orga, address='St Victor', zipcode='13007', town='Marseille',
+            geoloc=(43.290347, 5.365572),
+        )
+        COMMANDERIE = create_address(
+            contact, address='Commanderie', zipcode='13011', town='Marseille',
+            geoloc=(43.301963, 5.462410),
+        )
+        AUBAGNE = create_address(
+            orga2, address='Maire Aubagne', zipcode='13400', town='Aubagne',
+            geoloc=(43.295783, 5.565589),
+        )
+
+        geoaddress = COMMANDERIE.geoaddress
+        neighbours = geoaddress.neighbours(distance=10000)
+        # Sorted by distance (St Victor: ~7.94 km ; Aubagne: ~8.38 km)
+        self.assertListEqual(
+            [ST_VICTOR.geoaddress, AUBAGNE.geoaddress],
+            [g for g, __ in geoaddress.nearest(reversed([*neighbours]), 10000)],
+        )
+
+        # Out of the radius
+        self.assertListEqual(
+            [ST_VICTOR.geoaddress],
+            [g for g, __ in geoaddress.nearest(neighbours, 8000)],
+        )
+
+        ranked = geoaddress.nearest(neighbours, 10000)
+        self.assertAlmostEqual(
+            geoaddress.distance(ST_VICTOR.geoaddress), ranked[0][1],
+        )
+
     def test_town_unicode(self):
         self.assertEqual('13001 Marseille FRANCE', str(self.marseille1))
         self.assertEqual('13002 Marseille FRANCE', str(self.marseille2))
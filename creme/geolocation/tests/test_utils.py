@@ -18,7 +18,11 @@ from ..utils import (
     address_as_dict,
     addresses_from_persons,
     get_google_api_key,
+    geohash_cell_size,
+    geohash_cells,
+    geohash_encode,
     get_radius,
+    haversine_distance,
     location_bounding_box,
 )
 from .base import Address, Contact, GeoLocationBaseTestCase, Organisation
@@ -299,3 +303,45 @@ class GeoLocationUtilsTestCase(GeoLocationBaseTestCase):
             ),
             location_bounding_box(20.0, 5.0, 10000),
         )
+
+    def test_geohash_encode(self):
+        self.assertEqual('u4pruydqqvj', geohash_encode(57.64911, 10.40744, precision=11))
+        self.assertEqual('spey61yht',   geohash_encode(43.296524, 5.369821))
+        self.assertEqual('spey6',       geohash_encode(43.296524, 5.369821, precision=5))
+        self.assertEqual(constants.GEOHASH_PRECISION, len(geohash_encode(0, 0)))
+
+        # Limits
+        self.assertEqual('zzzzz', geohash_encode(90, 179.99999, precision=5))
+        self.assertEqual('00000', geohash_encode(-90, -180, precision=5))
+        self.assertEqual(geohash_encode(10, -170), geohash_encode(10, 190))
+
+    def test_geohash_cell_size(self):
+        self.assertTupleEqual((45.0, 45.0), geohash_cell_size(1))
+        self.assertTupleEqual((5.625, 11.25), geohash_cell_size(2))
+        self.assertTupleEqual((180 / 2 ** 12, 360 / 2 ** 13), geohash_cell_size(5))
+
+    def test_geohash_cells(self):
+        self.assertSetEqual(
+            {'spey3', 'spey6'},
+            geohash_cells(43.296524, 5.369821, 1000),
+        )
+        self.assertSetEqual(
+            {'spet', 'spev', 'spew', 'spey'},
+            geohash_cells(43.296524, 5.369821, 10000),
+        )
+
+        # Antimeridian
+        self.assertSetEqual({'xbpbp', 'rzzzz'}, geohash_cells(0, 179.99, 1000))
+
+        # Too big
+        self.assertIsNone(geohash_cells(43.296524, 5.369821, 5000000))
+
+    def test_haversine_distance(self):
+        self.assertEqual(0, haversine_distance(43.296524, 5.369821, 43.296524, 5.369821))
+        self.assertAlmostEqual(
+            7517.2, haversine_distance(43.296524, 5.369821, 43.301963, 5.462410), delta=0.1,
+        )
+        # Paris -> London
+        self.assertAlmostEqual(
+            343.5, haversine_distance(48.8566, 2.3522, 51.5074, -0.1278) / 1000, delta=0.5,
+        )
@@ -13,7 +13,7 @@ from creme.persons.tests.base import (
 )
 
 from ..models import GeoAddress, Town
-from ..utils import address_as_dict
+from ..utils import address_as_dict, geohash_encode
 from .base import Contact, GeoLocationBaseTestCase, Organisation
 
 create_town = Town.objects.create
@@ -49,6 +49,9 @@ class SetAddressInfoTestCase(GeoLocationBaseTestCase):
         geoaddress = geoaddresses[0]
         self.assertGeoAddress(geoaddress, address=address, draggable=True, **data1)
         self.assertEqual(self.refresh(address).geoaddress, geoaddress)
+        self.assertEqual(
+            geohash_encode(data1['latitude'], data1['longitude']), geoaddress.geohash,
+        )
 
         data2 = {
             'latitude':  28.411,
@@ -62,6 +65,9 @@ class SetAddressInfoTestCase(GeoLocationBaseTestCase):
         geoaddresses = GeoAddress.objects.all()
         self.assertEqual(1, len(geoaddresses))
         self.assertGeoAddress(geoaddresses[0], address=address, draggable=True, **data2)
+        self.assertEqual(
+            geohash_encode(data2['latitude'], data2['longitude']), geoaddresses[0].geohash,
+        )
 
     @skipIfCustomOrganisation
     @skipIfCustomAddress
@@ -2,7 +2,7 @@
 
 ################################################################################
 #    Creme is a free/open-source Customer Relationship Management software
-#    Copyright (C) 2014-2020  Hybird
+#    Copyright (C) 2014-2021  Hybird
 #
 #    This program is free software: you can redistribute it and/or modify
 #    it under the terms of the GNU Affero General Public License as published by
@@ -18,7 +18,7 @@
 #    along with this program.  If not, see <http://www.gnu.org/licenses/>.
 ################################################################################
 
-from math import cos, radians
+from math import asin, cos, radians, sin, sqrt
 
 from django.conf import settings
 from django.contrib.contenttypes.models import ContentType
@@ -142,3 +142,117 @@ def location_bounding_box(latitude, longitude, distance):
         (latitude - offset_latitude, longitude - offset_longitude),
         (latitude + offset_latitude, longitude + offset_longitude),
     )
+
+
+# Geohash ----------------------------------------------------------------------
+# A geohash is a string which identifies a cell of a grid over the earth ; each
+# additional character divides the cell in 32 sub-cells, so the addresses which
+# are in a same cell share the prefix of their geohashes (which can be indexed).
+GEOHASH_ALPHABET = '0123456789bcdefghjkmnpqrstuvwxyz'
+EARTH_RADIUS = 6371008.8  # Mean radius, in meters
+
+
+def geohash_encode(latitude, longitude, precision=constants.GEOHASH_PRECISION):
+    "Get the geohash (string of <precision> characters) of a position."
+    latitude = min(max(latitude, -90.0), 90.0)
+    longitude = (longitude + 180.0) % 360.0 - 180.0
+
+    lat_min, lat_max = -90.0, 90.0
+    lon_min, lon_max = -180.0, 180.0
+    chars = []
+    char_index = 0
+    even_bit = True  # Longitude first
+    bits_count = 0
+
+    while len(chars) < precision:
+        if even_bit:
+            middle = (lon_min + lon_max) / 2
+
+            if longitude >= middle:
+                char_index = (char_index << 1) | 1
+                lon_min = middle
+            else:
+                char_index <<= 1
+                lon_max = middle
+        else:
+            middle = (lat_min + lat_max) / 2
+
+            if latitude >= middle:
+                char_index = (char_index << 1) | 1
+                lat_min = middle
+            else:
+                char_index <<= 1
+                lat_max = middle
+
+        even_bit = not even_bit
+        bits_count += 1
+
+        if bits_count == 5:
+            chars.append(GEOHASH_ALPHABET[char_index])
+            bits_count = 0
+            char_index = 0
+
+    return ''.join(chars)
+
+
+def geohash_cell_size(precision):
+    "Get the size (latitude, longitude) in degrees of the cells for a precision."
+    bits = 5 * precision
+    lon_bits = (bits + 1) // 2
+
+    return 180.0 / (1 << (bits - lon_bits)), 360.0 / (1 << lon_bits)
+
+
+def geohash_cells(latitude, longitude, distance):
+    """Get the geohashes of the cells (the cell of the position & the adjacent
+    ones) which contain all the positions around a given one.
+    @param latitude: Latitude of the center, in degrees.
+    @param longitude: Longitude of the center, in degrees.
+    @param distance: Radius in meters.
+    @return: A set of geohashes (their length depends on the distance), or
+             None if the distance is too big to restrict the search.
+    """
+    (lat_min, lon_min), (lat_max, lon_max) = location_bounding_box(
+        latitude, longitude, distance,
+    )
+    offset_latitude = lat_max - latitude
+    offset_longitude = lon_max - longitude
+
+    # We search the smallest cells which are bigger than the half of the
+    # bounding box, so the box overlaps 3x3 cells at most.
+    for precision in range(constants.GEOHASH_PRECISION, 0, -1):
+        cell_latitude, cell_longitude = geohash_cell_size(precision)
+
+        if cell_latitude >= offset_latitude and cell_longitude >= offset_longitude:
+            break
+    else:
+        return None
+
+    lat_min = max(lat_min, -90.0)
+    lat_max = min(lat_max, 90.0)
+
+    def steps(start, stop, step):
+        # NB: each cell of the row/column contains one of these values.
+        while start < stop:
+            yield start
+            start += step
+
+        yield stop
+
+    return {
+        geohash_encode(lat, lon, precision)
+        for lat in steps(lat_min, lat_max, cell_latitude)
+        for lon in steps(lon_min, lon_max, cell_longitude)
+    }
+
+
+def haversine_distance(latitude1, longitude1, latitude2, longitude2):
+    "Get the distance in meters between 2 positions (great-circle distance)."
+    lat1 = radians(latitude1)
+    lat2 = radians(latitude2)
+    half_dlat = (lat2 - lat1) / 2
+    half_dlon = radians(longitude2 - longitude1) / 2
+
+    return 2 * EARTH_RADIUS * asin(sqrt(
+        sin(half_dlat) ** 2 + cos(lat1) * cos(lat2) * sin(half_dlon) ** 2
+    ))
@@ -26,7 +26,7 @@ from django.shortcuts import get_object_or_404
 
 from creme import persons
 from creme.creme_core.http import CremeJsonResponse
-from creme.creme_core.models import EntityFilter
+from creme.creme_core.models import CremeEntity, EntityFilter
 from creme.creme_core.utils import (
     bool_from_str_extended,
     get_from_GET_or_404,
@@ -133,7 +133,8 @@ class NeighboursInformation(BaseAddressesInformation):
         query_distance = GET.get('distance', '')
         distance = float(query_distance) if query_distance.isdigit() else get_radius()
 
-        neighbours = source.geoaddress.neighbours(distance).select_related('address')
+        source_geoaddress = source.geoaddress
+        neighbours = source_geoaddress.neighbours(distance).select_related('address__object')
 
         if entity_filter:
             ctype = entity_filter.entity_type
@@ -150,12 +151,19 @@ class NeighboursInformation(BaseAddressesInformation):
                 address__object_id__in=owner_ids,
             )
 
+        # Sort by real distance
+        neighbours = [
+            neighbour
+            for neighbour, __ in source_geoaddress.nearest(neighbours, distance)
+        ]
+        CremeEntity.populate_real_entities([n.address.object for n in neighbours])
+
         # Filter credentials
         has_perm = request.user.has_perm_to_view
         addresses = [
             address_as_dict(neighbour.address)
             for neighbour in neighbours
-            if has_perm(neighbour.address.owner)  # TODO: populate owner ?
+            if has_perm(neighbour.address.owner)
         ]
 
         return {
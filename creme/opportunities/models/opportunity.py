@@ -124,6 +124,10 @@ class AbstractOpportunity(core_models.CremeEntity):
 
     search_score = 100
 
+    # The method save() only manages the Relations with the emitter & the
+    # target ; the ForeignKeys can be replaced in bulk by the deletion jobs.
+    replacement_needs_save = False
+
     _opp_emitter = None
     _opp_target  = None
     _opp_target_rel = None
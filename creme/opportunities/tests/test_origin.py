@@ -4,6 +4,7 @@ from functools import partial
 
 from django.urls import reverse
 
+from creme.creme_core.creme_jobs import deletor_type
 from creme.creme_core.tests.base import CremeTestCase
 from creme.opportunities.models import Origin, SalesPhase
 
@@ -44,6 +45,8 @@ class OriginTestCase(CremeTestCase):
     @skipIfCustomOpportunity
     def test_delete02(self):
         "Set to another value."
+        self.assertFalse(deletor_type.needs_save(Opportunity))
+
         origin1 = Origin.objects.create(name='Web site')
         origin2 = Origin.objects.exclude(id=origin1.id)[0]
 
@@ -70,3 +73,4 @@ class OriginTestCase(CremeTestCase):
 
         opp = self.assertStillExists(opp)
         self.assertEqual(origin2, opp.origin)
+        self.assertEqual('Target renegade', opp.target.name)
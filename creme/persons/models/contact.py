@@ -96,6 +96,10 @@ class AbstractContact(CremeEntity, PersonWithAddressesMixin):
 
     search_score = 101
 
+    # The method save() only synchronises the related user ; the ForeignKeys
+    # can be replaced in bulk by the deletion jobs.
+    replacement_needs_save = False
+
     creation_label = _('Create a contact')
     save_label     = _('Save the contact')
 
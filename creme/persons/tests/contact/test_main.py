@@ -9,6 +9,7 @@ from django.utils.translation import gettext as _
 from django.utils.translation import pgettext
 
 from creme.creme_core.auth.entity_credentials import EntityCredentials
+from creme.creme_core.creme_jobs import deletor_type
 from creme.creme_core.gui.field_printers import field_printers_registry
 from creme.creme_core.models import (
     CremeUser,
@@ -798,6 +799,8 @@ class ContactTestCase(_BaseTestCase):
     def test_delete_civility02(self):
         "Set to another value."
         user = self.login()
+        self.assertFalse(deletor_type.needs_save(Contact))
+
         civ2 = Civility.objects.first()
         captain = Civility.objects.create(title='Captain')
         harlock = Contact.objects.create(
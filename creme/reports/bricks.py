@@ -146,19 +146,35 @@ class ReportGraphBrick(core_bricks.InstanceBrick):
             **extra_context
         ))
 
+    def _get_fetchers(self, context):
+        "The fetchers of all the graphs' bricks of the page (this one first)."
+        yield self.fetcher
+
+        bricks_manager = context.get(core_bricks.BricksManager.var_name)
+        if bricks_manager is not None:
+            for brick in bricks_manager.bricks:
+                if isinstance(brick, ReportGraphBrick) and brick is not self:
+                    yield brick.fetcher
+
     def detailview_display(self, context):
         kwargs = {}
-        try:
-            x, y = self.fetcher.fetch_4_entity(
-                entity=context['object'],
-                user=context['user'],
-            )
-        except GraphFetcher.IncompatibleContentType as e:
+        # NB: the results of the other graphs' bricks are computed too (their
+        #     linked entities are retrieved together), & stored in the
+        #     per-request cache for their own display.
+        result = GraphFetcher.fetch_4_entity_in_bulk(
+            fetchers=[*self._get_fetchers(context)],
+            entity=context['object'],
+            user=context['user'],
+        )[0]
+
+        if isinstance(result, GraphFetcher.IncompatibleContentType):
             x = y = None
-            kwargs['error'] = str(e)
-        except GraphFetcher.UselessResult:
+            kwargs['error'] = str(result)
+        elif isinstance(result, GraphFetcher.UselessResult):
             x = y = None
             kwargs['hide_brick'] = True
+        else:
+            x, y = result
 
         return self._auxiliary_display(context=context, x=x, y=y, **kwargs)
 
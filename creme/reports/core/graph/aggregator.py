@@ -19,7 +19,7 @@
 ################################################################################
 
 import logging
-from typing import TYPE_CHECKING, Dict, Optional, Type
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Type
 
 from django.db.models import QuerySet, aggregates
 from django.utils.translation import gettext_lazy as _
@@ -54,6 +54,18 @@ class ReportGraphAggregator:
     def aggregrate(self, entities: QuerySet):
         return 0
 
+    @property
+    def value_path(self) -> str:
+        "Path (for QuerySet.values_list()) of the values which are aggregated."
+        raise NotImplementedError()
+
+    def reduce(self, values: List[Any]):
+        """Aggregate in Python some values retrieved with the path "value_path"
+        (i.e. it's the equivalent of aggregrate() when the values have already
+        been retrieved).
+        """
+        return 0
+
     @property
     def cell(self) -> Optional[EntityCell]:
         return self._cell
@@ -138,11 +150,19 @@ class RGACount(ReportGraphAggregator):
     def aggregrate(self, entities):
         return entities.count()
 
+    @property
+    def value_path(self):
+        return 'pk'
+
+    def reduce(self, values):
+        return len(values)
+
 
 class _RGAFieldAggregation(ReportGraphAggregator):
     aggregate_cls = aggregates.Aggregate
 
     _aggregate: aggregates.Aggregate
+    _value_path: str
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
@@ -157,18 +177,18 @@ class _RGAFieldAggregation(ReportGraphAggregator):
             if FieldsConfig.objects.get_for_model(cell.model).is_field_hidden(finfo[-1]):
                 self._error = _('this field should be hidden.')
 
-            self._aggregate = self.aggregate_cls(finfo[0].name)
+            self._value_path = finfo[0].name
         elif isinstance(cell, EntityCellCustomField):
             cfield = cell.custom_field
             if cfield.is_deleted:
                 self._error = _('this custom field is deleted.')
 
-            self._aggregate = self.aggregate_cls(
-                f'{cfield.value_class.get_related_name()}__value'
-            )
+            self._value_path = f'{cfield.value_class.get_related_name()}__value'
         else:  # Should not happen (cell constraint used before to retrieve the cell)
             raise ValueError(f'RGARegularField: invalid type of cell <{type(cell)}>')
 
+        self._aggregate = self.aggregate_cls(self._value_path)
+
     def annotate(self):
         return self._aggregate
 
@@ -177,26 +197,51 @@ class _RGAFieldAggregation(ReportGraphAggregator):
             rga_value_agg=self._aggregate,
         ).get('rga_value_agg') or 0
 
+    @property
+    def value_path(self):
+        return self._value_path
+
+    def reduce(self, values):
+        # NB: NULL values are ignored, like in SQL
+        values = [value for value in values if value is not None]
+
+        return self._reduce(values) if values else 0
+
+    def _reduce(self, values: List[Any]):
+        raise NotImplementedError()
+
 
 # @AGGREGATORS_MAP(constants.RGA_AVG)
 @AGGREGATORS_MAP(OrdinateAggregator.AVG)
 class RGAAverage(_RGAFieldAggregation):
     aggregate_cls = aggregates.Avg
 
+    def _reduce(self, values):
+        return sum(values) / len(values)
+
 
 # @AGGREGATORS_MAP(constants.RGA_MAX)
 @AGGREGATORS_MAP(OrdinateAggregator.MAX)
 class RGAMax(_RGAFieldAggregation):
     aggregate_cls = aggregates.Max
 
+    def _reduce(self, values):
+        return max(values)
+
 
 # @AGGREGATORS_MAP(constants.RGA_MIN)
 @AGGREGATORS_MAP(OrdinateAggregator.MIN)
 class RGAMin(_RGAFieldAggregation):
     aggregate_cls = aggregates.Min
 
+    def _reduce(self, values):
+        return min(values)
+
 
 # @AGGREGATORS_MAP(constants.RGA_SUM)
 @AGGREGATORS_MAP(OrdinateAggregator.SUM)
 class RGASum(_RGAFieldAggregation):
     aggregate_cls = aggregates.Sum
+
+    def _reduce(self, values):
+        return sum(values)
@@ -0,0 +1,180 @@
+# -*- coding: utf-8 -*-
+
+################################################################################
+#    Creme is a free/open-source Customer Relationship Management software
+#    Copyright (C) 2021  Hybird
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU Affero General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU Affero General Public License for more details.
+#
+#    You should have received a copy of the GNU Affero General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+################################################################################
+
+"""Cache of the results of the ReportGraphs.
+
+The graphs are displayed by bricks (home pages, detail-views...) & each
+display runs the aggregation queries of the graph ; with big tables & several
+graphs per page, these queries dominate the response time.
+
+So the results are stored in the cache of Django (see the setting
+"REPORTS_GRAPH_CACHE_TIMEOUT"), with keys built from the graph (& its report,
+filter included), the extra query of the fetcher, the order, the language &
+the credentials of the user (so users with the same credentials share the
+results).
+The results related to a type of entity are invalidated when entities of this
+type are saved/deleted, or when their relationships/properties change ; the
+other changes (e.g. labels of ForeignKeys) are taken into account when the
+results expire.
+"""
+
+import json
+import logging
+from hashlib import sha1
+from typing import Optional, Tuple
+from uuid import uuid4
+
+from django.conf import settings
+from django.core.cache import DEFAULT_CACHE_ALIAS, caches
+from django.db.models import Q
+from django.utils.translation import get_language
+
+from creme.creme_core.core.entity_count import EntitiesCountCache
+from creme.creme_core.utils.queries import QSerializer
+
+logger = logging.getLogger(__name__)
+
+
+class GraphResultsCache:
+    """Cache for the results of the ReportGraphs.
+    The results related to a type of entity are stored with a "generation" of
+    this type in their keys ; invalidating the results of a type just means
+    changing its generation (the old results will expire).
+
+    The numbers of hits & misses (of the current process) are counted in the
+    attributes "hits" & "misses".
+    """
+    key_prefix = 'reports-graph_results'
+
+    def __init__(self, cache_alias: str = DEFAULT_CACHE_ALIAS):
+        self._cache_alias = cache_alias
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def cache(self):
+        return caches[self._cache_alias]
+
+    @property
+    def timeout(self) -> int:
+        return settings.REPORTS_GRAPH_CACHE_TIMEOUT
+
+    @property
+    def enabled(self) -> bool:
+        return self.timeout > 0
+
+    def _generation_key(self, ctype_id: int) -> str:
+        return f'{self.key_prefix}-generation-{ctype_id}'
+
+    def _get_generation(self, ctype_id: int) -> str:
+        cache = self.cache
+        key = self._generation_key(ctype_id)
+        generation = cache.get(key)
+
+        if generation is None:
+            # NB: add() to avoid overriding the generation set by another process.
+            cache.add(key, uuid4().hex, None)
+            generation = cache.get(key)
+
+        return generation
+
+    def invalidate(self, ctype_id: int) -> None:
+        "Invalidate the results related to a type of entity."
+        if self.enabled:
+            self.cache.set(self._generation_key(ctype_id), uuid4().hex, None)
+
+    def build_key(self, *,
+                  graph,
+                  user,
+                  extra_q: Optional[Q] = None,
+                  order: str = 'ASC',
+                  ) -> Optional[str]:
+        """Build the key of the results of a graph.
+        @param graph: Instance of AbstractReportGraph.
+        @param user: User who fetches the results.
+        @param extra_q: Additional Q (see GraphFetcher).
+        @param order: 'ASC' or 'DESC'.
+        @return: A string, or None if the results cannot be cached (the cache
+                 is disabled, the query depends on the context...).
+        """
+        if not self.enabled:
+            return None
+
+        report = graph.linked_report
+        efilter = report.filter
+
+        if efilter is None:
+            efilter_signature = None
+        elif efilter.is_dynamic:
+            return None
+        else:
+            efilter_signature = (efilter.id, efilter.revision.hex)
+
+        ctype_id = report.ct_id
+        creds_signature = EntitiesCountCache._credentials_signature(ctype_id, user)
+        if creds_signature is None:
+            return None
+
+        try:
+            raw_key = json.dumps(
+                [
+                    graph.id,
+                    graph.modified,
+                    report.modified,
+                    efilter_signature,
+                    None if extra_q is None else QSerializer().serialize(extra_q),
+                    order,
+                    get_language(),
+                    creds_signature,
+                ],
+                default=str,
+            )
+        except Exception as e:
+            logger.debug('GraphResultsCache.build_key(): the query cannot be serialized (%s)', e)
+            return None
+
+        return '{prefix}-{ctype_id}-{generation}-{hash}'.format(
+            prefix=self.key_prefix,
+            ctype_id=ctype_id,
+            generation=self._get_generation(ctype_id),
+            hash=sha1(raw_key.encode()).hexdigest(),
+        )
+
+    def get(self, key: str) -> Optional[Tuple[list, list]]:
+        results = self.cache.get(key)
+
+        if results is None:
+            self.misses += 1
+            logger.debug('GraphResultsCache: MISS for key=%s', key)
+        else:
+            self.hits += 1
+            logger.debug('GraphResultsCache: HIT for key=%s', key)
+
+        return results
+
+    def has(self, key: str) -> bool:
+        "Are the results stored? (the counters of hits/misses are not updated)."
+        return self.cache.has_key(key)
+
+    def set(self, key: str, results: Tuple[list, list]) -> None:
+        self.cache.set(key, results, self.timeout)
+
+
+graph_results_cache = GraphResultsCache()
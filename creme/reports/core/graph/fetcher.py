@@ -19,9 +19,20 @@
 ################################################################################
 
 import logging
+from collections import defaultdict
 # import warnings
 from functools import partial
-from typing import TYPE_CHECKING, Iterator, List, Optional, Tuple, Type, Union
+from typing import (
+    TYPE_CHECKING,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Type,
+    Union,
+)
 
 from django.core.exceptions import FieldDoesNotExist
 from django.db.models import ForeignKey, Q
@@ -30,10 +41,12 @@ from django.utils.translation import gettext_lazy as _
 from django.utils.translation import pgettext
 
 from creme.creme_core.core.field_tags import FieldTag
+from creme.creme_core.global_info import get_per_request_cache
 from creme.creme_core.models import (
     CremeEntity,
     FieldsConfig,
     InstanceBrickConfigItem,
+    Relation,
     RelationType,
 )
 from creme.creme_core.utils.meta import ModelFieldEnumerator
@@ -140,6 +153,77 @@ class GraphFetcher:
             entity=entity, user=user, order=order,
         )
 
+    def _cache_key_4_entity(self, entity: CremeEntity, user, order: str) -> str:
+        return 'reports-graph_fetcher-{graph}-{type}-{value}-{entity}-{user}-{order}'.format(
+            graph=self.graph.id,
+            type=self.type_id,
+            value=self.value,
+            entity=entity.id,
+            user=user.id,
+            order=order,
+        )
+
+    @classmethod
+    def _prefetch_4_entity(cls,
+                           fetchers: List['GraphFetcher'],
+                           entity: CremeEntity) -> None:
+        """Retrieve, with grouped queries, the data used by several fetchers
+        of this class to narrow their results to one entity ; the data are
+        stored in the fetchers (see fetch_4_entity_in_bulk()).
+        Nothing is retrieved by default.
+        """
+        pass
+
+    @staticmethod
+    def fetch_4_entity_in_bulk(fetchers: Sequence['GraphFetcher'],
+                               entity: CremeEntity,
+                               user,
+                               order: str = 'ASC') -> list:
+        """Data of several fetchers narrowed to the same entity (eg: all the
+        graphs' bricks of a detail-view).
+        The data used to narrow the results (eg: the linked entities) are
+        retrieved once for all the fetchers of a same class. The results are
+        stored in the per-request cache ; so they are reused when the
+        fetchers are used again in the same request (eg: bricks reloading).
+        @param fetchers: Sequence of GraphFetchers.
+        @param entity: Entity used to narrow the results.
+        @param user: logged user.
+        @param order: 'ASC' or 'DESC'.
+        @return: A list with one item per fetcher (in the same order) ; an item
+                 is the result of <fetch_4_entity()>, or the exception
+                 (GraphFetcher.IncompatibleContentType/UselessResult) it raised.
+        """
+        cache = get_per_request_cache()
+        results = [None] * len(fetchers)
+        missing = []
+
+        for index, fetcher in enumerate(fetchers):
+            key = fetcher._cache_key_4_entity(entity=entity, user=user, order=order)
+            result = cache.get(key)
+
+            if result is None:
+                missing.append((index, fetcher, key))
+            else:
+                results[index] = result
+
+        fetchers_per_class: Dict[Type[GraphFetcher], List[GraphFetcher]] = defaultdict(list)
+        for _index, fetcher, _key in missing:
+            if not fetcher.error:
+                fetchers_per_class[type(fetcher)].append(fetcher)
+
+        for fetcher_cls, cls_fetchers in fetchers_per_class.items():
+            fetcher_cls._prefetch_4_entity(fetchers=cls_fetchers, entity=entity)
+
+        for index, fetcher, key in missing:
+            try:
+                result = fetcher.fetch_4_entity(entity=entity, user=user, order=order)
+            except (GraphFetcher.IncompatibleContentType, GraphFetcher.UselessResult) as e:
+                result = e
+
+            cache[key] = results[index] = result
+
+        return results
+
     @property
     def linked_models(self) -> List[Type[CremeEntity]]:
         """List of models which are compatible for the volatile link.
@@ -284,6 +368,8 @@ class RelationLinkedGraphFetcher(GraphFetcher):
         super().__init__(*args, **kwargs)
         self.verbose_name = '??'
         self._rtype: Optional[RelationType] = None
+        # Linked entities exist? (per entity ID) -- see _prefetch_4_entity()
+        self._linked_entities_exist: Dict[int, bool] = {}
         rtype_id = self.value
 
         if not rtype_id:
@@ -310,19 +396,40 @@ class RelationLinkedGraphFetcher(GraphFetcher):
                     ).format(rtype=rtype)
                     self._rtype = rtype
 
+    @classmethod
+    def _prefetch_4_entity(cls, fetchers, entity):
+        # NB: one query for all the types of relationship
+        rtype_ids = {fetcher._rtype.id for fetcher in fetchers}
+        linked_rtype_ids = {
+            *Relation.objects.filter(
+                object_entity=entity.id, type__in=rtype_ids,
+            ).values_list('type', flat=True).distinct(),
+        }
+
+        for fetcher in fetchers:
+            fetcher._linked_entities_exist[entity.id] = fetcher._rtype.id in linked_rtype_ids
+
     def _aux_fetch_4_entity(self, entity, order, user):
         rtype = self._rtype
         assert rtype is not None
 
-        return self.graph.fetch(
-            extra_q=Q(
-                relations__type=rtype,
-                relations__object_entity=entity.pk,
-            ),
-            user=user,
-            order=order,
+        extra_q = Q(
+            relations__type=rtype,
+            relations__object_entity=entity.pk,
         )
 
+        if not self._linked_entities_exist.get(entity.id, True):
+            # No linked entity => the results are computed without querying
+            # the aggregates (the labels of the abscissa are still retrieved).
+            graph = self.graph
+
+            return graph.hand.fetch(
+                entities=graph.model.objects.none(),
+                order=order, user=user, extra_q=extra_q,
+            )
+
+        return self.graph.fetch(extra_q=extra_q, user=user, order=order)
+
     @classmethod
     def choices(cls, model):
         for rtype in RelationType.objects.compatible(model, include_internals=True):
@@ -19,6 +19,7 @@
 ################################################################################
 
 import logging
+from collections import defaultdict
 # import warnings
 from datetime import datetime, timedelta
 from typing import (
@@ -359,6 +360,9 @@ class DateInterval:
 
 
 class _DateRangeMixin:
+    _days: int
+    _y_calculator: ReportGraphAggregator
+
     @staticmethod
     def get_days(graph):
         try:
@@ -369,6 +373,61 @@ class _DateRangeMixin:
 
         return days
 
+    @staticmethod
+    def _interval_label(interval: DateInterval) -> str:
+        return '{}-{}'.format(
+            interval.begin.strftime('%d/%m/%Y'),  # TODO: use format from settings ??
+            interval.end.strftime('%d/%m/%Y'),
+        )
+
+    @staticmethod
+    def _interval_range(interval: DateInterval) -> List[str]:
+        return [
+            interval.before.strftime('%Y-%m-%d'),
+            interval.after.strftime('%Y-%m-%d'),
+        ]
+
+    def _aggregate_in_buckets(self,
+                              date_values: Iterator[Tuple[Any, Any]],
+                              order: str,
+                              ) -> Iterator[Tuple[DateInterval, Any]]:
+        """Group some values by buckets of X days, & aggregate them in Python.
+        The values are read once ; the index of the bucket of a date is
+        computed from the first date (i.e. the minimum with the order 'ASC',
+        the maximum with 'DESC'), like the DB does with the 'group by' query.
+        @param date_values: Iterator of tuples (date, value) ; the dates can be
+               instances of <date> or <datetime> (only the day is used).
+        @param order: 'ASC' or 'DESC'.
+        @return: Iterator of tuples (DateInterval, aggregated_value) ; the
+                 intervals without value are included.
+        """
+        values_per_day = defaultdict(list)
+        for value_date, value in date_values:
+            if value_date is not None:
+                if isinstance(value_date, datetime):
+                    value_date = value_date.date()
+
+                values_per_day[value_date].append(value)
+
+        if not values_per_day:
+            return
+
+        min_date = min(values_per_day)
+        max_date = max(values_per_day)
+        days = self._days
+
+        buckets = defaultdict(list)
+        for day, values in values_per_day.items():
+            delta = (day - min_date) if order == 'ASC' else (max_date - day)
+            buckets[delta.days // days].extend(values)
+
+        reduce = self._y_calculator.reduce
+
+        for index, interval in enumerate(
+            DateInterval.generate(days - 1, min_date, max_date, order)
+        ):
+            yield interval, reduce(buckets.get(index, []))
+
 
 # @RGRAPH_HANDS_MAP(constants.RGT_RANGE)
 @RGRAPH_HANDS_MAP(AbscissaGroup.RANGE)
@@ -381,9 +440,9 @@ class RGHRange(_DateRangeMixin, _RGHRegularField):
         self._fetch_method = self._fetch_with_group_by
         vendor = connection.vendor
         if vendor not in {'sqlite', 'mysql', 'postgresql'}:
-            logger.warning(
-                'Report graph data optimizations not available with DB vendor "%s",'
-                ' reverting to slower fallback method.',
+            logger.info(
+                'Report graph: the computation of the buckets in SQL is not '
+                'available with DB vendor "%s", the buckets are computed in Python.',
                 vendor,
             )
             self._fetch_method = self._fetch_fallback
@@ -430,58 +489,31 @@ class RGHRange(_DateRangeMixin, _RGHRegularField):
 
             # Fill missing aggregate values and zip them with the date intervals
             for interval, value in sparsezip(intervals, aggregates, 0):
-                range_label = '{}-{}'.format(
-                    interval.begin.strftime('%d/%m/%Y'),  # TODO: use format from settings ??
-                    interval.end.strftime('%d/%m/%Y')
+                yield (
+                    self._interval_label(interval),
+                    [value or 0, build_url({query_cmd: self._interval_range(interval)})],
                 )
-                url = build_url({
-                    query_cmd: [
-                        interval.before.strftime('%Y-%m-%d'),
-                        interval.after.strftime('%Y-%m-%d'),
-                    ],
-                })
-
-                yield range_label, [value, url]
 
     def _fetch_fallback(self, entities, order, extra_q):
-        """Aggregate values with 'manual group by' by iterating over group
-        values and executing an aggregate query per group.
+        """Aggregate values with only one query, which retrieves the pairs
+        (date, value) ; the buckets are computed in Python.
         """
-        graph = self._graph
-        abscissa = graph.abscissa
-
-        date_aggregates = entities.aggregate(min_date=Min(abscissa), max_date=Max(abscissa))
-        min_date = date_aggregates['min_date']
-        max_date = date_aggregates['max_date']
-
-        if min_date is not None and max_date is not None:
-            build_url = self._listview_url_builder(extra_q=extra_q)
-            query_cmd = f'{abscissa}__range'
-            entities_filter = entities.filter
-            y_value_func = self._y_calculator.aggregrate
-
-            for interval in DateInterval.generate(
-                    (graph.days or 1) - 1, min_date, max_date, order,
-            ):
-                before = interval.before
-                after  = interval.after
-                sub_entities = entities_filter(**{query_cmd: (before, after)})
-
-                yield (
-                    '{}-{}'.format(
-                        interval.begin.strftime('%d/%m/%Y'),  # TODO: use format from settings ??
-                        interval.end.strftime('%d/%m/%Y'),
-                    ),
-                    [
-                        y_value_func(sub_entities),
-                        build_url({
-                            query_cmd: [
-                                before.strftime('%Y-%m-%d'),
-                                after.strftime('%Y-%m-%d'),
-                            ],
-                        }),
-                    ],
-                )
+        abscissa = self._field.name
+        build_url = self._listview_url_builder(extra_q=extra_q)
+        query_cmd = f'{abscissa}__range'
+
+        for interval, value in self._aggregate_in_buckets(
+            date_values=entities.exclude(
+                **{f'{abscissa}__isnull': True}
+            ).order_by().values_list(
+                abscissa, self._y_calculator.value_path,
+            ).iterator(),
+            order=order,
+        ):
+            yield (
+                self._interval_label(interval),
+                [value, build_url({query_cmd: self._interval_range(interval)})],
+            )
 
 
 # @RGRAPH_HANDS_MAP(constants.RGT_FK)
@@ -719,9 +751,9 @@ class RGHCustomRange(_DateRangeMixin, _RGHCustomField):
         self._fetch_method = self._fetch_with_group_by
         vendor = connection.vendor
         if vendor not in {'sqlite', 'mysql', 'postgresql'}:
-            logger.warning(
-                'Report graph data optimizations not available with DB vendor "%s",'
-                ' reverting to slower fallback method.',
+            logger.info(
+                'Report graph: the computation of the buckets in SQL is not '
+                'available with DB vendor "%s", the buckets are computed in Python.',
                 vendor,
             )
             self._fetch_method = self._fetch_fallback
@@ -731,6 +763,12 @@ class RGHCustomRange(_DateRangeMixin, _RGHCustomField):
     def _fetch(self, *, entities, order, user, extra_q):
         return self._fetch_method(entities, order, extra_q)
 
+    def _build_interval_url(self, build_url, interval):
+        return build_url({
+            'customfielddatetime__custom_field': self._cfield.id,
+            'customfielddatetime__value__range': self._interval_range(interval),
+        })
+
     # TODO: This is almost identical to RGHRange and most of it could be factored together
     def _fetch_with_group_by(self, entities, order, extra_q):
         cfield = self._cfield
@@ -760,63 +798,27 @@ class RGHCustomRange(_DateRangeMixin, _RGHCustomField):
             aggregates = self._aggregate_by_key(entities, x_value_key, 'ASC')
 
             for interval, value in sparsezip(intervals, aggregates, 0):
-                range_label = '{}-{}'.format(
-                    interval.begin.strftime('%d/%m/%Y'),  # TODO: use format from settings ??
-                    interval.end.strftime('%d/%m/%Y'),
+                yield (
+                    self._interval_label(interval),
+                    [value or 0, self._build_interval_url(build_url, interval)],
                 )
-                value_range = [
-                    interval.before.strftime('%Y-%m-%d'),
-                    interval.after.strftime('%Y-%m-%d'),
-                ]
-                url = build_url({
-                    'customfielddatetime__custom_field': cfield.id,
-                    'customfielddatetime__value__range': value_range,
-                })
-
-                yield range_label, [value, url]
 
     def _fetch_fallback(self, entities, order, extra_q):
-        cfield = self._cfield
-        entities_filter = entities.filter
-        date_aggregates = entities_filter(
-            customfielddatetime__custom_field=cfield
-        ).aggregate(
-            min_date=Min('customfielddatetime__value'),
-            max_date=Max('customfielddatetime__value'),
-        )
-        min_date = date_aggregates['min_date']
-        max_date = date_aggregates['max_date']
-
-        if min_date is not None and max_date is not None:
-            y_value_func = self._y_calculator.aggregrate
-            build_url = self._listview_url_builder(extra_q=extra_q)
-
-            for interval in DateInterval.generate(
-                (self._graph.days or 1) - 1, min_date, max_date, order,
-            ):
-                before = interval.before
-                after  = interval.after
-                sub_entities = entities_filter(
-                    customfielddatetime__custom_field=cfield,
-                    customfielddatetime__value__range=(before, after),
-                )
+        "See RGHRange._fetch_fallback()."
+        build_url = self._listview_url_builder(extra_q=extra_q)
 
-                yield (
-                    '{}-{}'.format(
-                        interval.begin.strftime('%d/%m/%Y'),  # TODO: use format from settings ??
-                        interval.end.strftime('%d/%m/%Y'),
-                    ),
-                    [
-                        y_value_func(sub_entities),
-                        build_url({
-                            'customfielddatetime__custom_field': cfield.id,
-                            'customfielddatetime__value__range': [
-                                before.strftime('%Y-%m-%d'),
-                                after.strftime('%Y-%m-%d'),
-                            ],
-                        }),
-                    ]
-                )
+        for interval, value in self._aggregate_in_buckets(
+            date_values=entities.filter(
+                customfielddatetime__custom_field=self._cfield,
+            ).order_by().values_list(
+                'customfielddatetime__value', self._y_calculator.value_path,
+            ).iterator(),
+            order=order,
+        ):
+            yield (
+                self._interval_label(interval),
+                [value, self._build_interval_url(build_url, interval)],
+            )
 
 
 # @RGRAPH_HANDS_MAP(constants.RGT_CUSTOM_FK)
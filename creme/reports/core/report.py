@@ -19,6 +19,7 @@
 ################################################################################
 
 import logging
+from collections import defaultdict
 from typing import (
     TYPE_CHECKING,
     Dict,
@@ -26,6 +27,7 @@ from typing import (
     Iterator,
     List,
     Optional,
+    Sequence,
     Tuple,
     Type,
     Union,
@@ -34,7 +36,7 @@ from typing import (
 from django.conf import settings
 from django.contrib.contenttypes.models import ContentType
 from django.core.exceptions import FieldDoesNotExist, ObjectDoesNotExist
-from django.db.models import ForeignKey, ManyToManyField
+from django.db.models import F, ForeignKey, ManyToManyField
 from django.utils.formats import number_format
 from django.utils.functional import cached_property
 from django.utils.translation import gettext_lazy as _
@@ -42,7 +44,12 @@ from django.utils.translation import gettext_lazy as _
 from creme.creme_core.auth.entity_credentials import EntityCredentials
 from creme.creme_core.core.function_field import function_field_registry
 from creme.creme_core.gui.field_printers import field_printers_registry
-from creme.creme_core.models import CremeEntity, CustomField, RelationType
+from creme.creme_core.models import (
+    CremeEntity,
+    CustomField,
+    Relation,
+    RelationType,
+)
 from creme.creme_core.utils.meta import FieldInfo
 
 from .. import constants
@@ -66,6 +73,10 @@ class ReportHand:
     "Class which computes values of a report column (ie reports.models.Field)."
     verbose_name = 'OVERLOADME'
 
+    # Name of the annotation which contains the ID of the entity related to an
+    # instance (see _get_related_instances_4_entities()).
+    related_entity_annotation = 'reports_related_entity_id'
+
     class ValueError(Exception):
         pass
 
@@ -78,6 +89,9 @@ class ReportHand:
         self._title = title
         self._support_subreport = support_subreport
 
+        # Related instances retrieved by prefetch() ; key: ID of entity.
+        self._prefetched_instances: Dict[int, list] = {}
+
     def _generate_flattened_report(self, entities, user, scope: 'QuerySet') -> str:
         columns = self._report_field.sub_report.columns
 
@@ -92,10 +106,26 @@ class ReportHand:
     def _get_related_instances(self, entity: CremeEntity, user) -> 'QuerySet':
         raise NotImplementedError
 
+    def _get_related_instances_4_entities(self,
+                                          entity_ids: Iterable[int],
+                                          user,
+                                          ) -> Optional['QuerySet']:
+        """Get the related instances of several entities with one query.
+        The instances must be annotated with the ID of their related entity
+        (see the attribute 'related_entity_annotation').
+        @return A QuerySet, or None if the related instances can only be
+                retrieved entity by entity (see _get_related_instances()).
+        """
+        return None
+
     def _get_filtered_related_entities(self, entity: CremeEntity, user) -> 'QuerySet':
+        return self._filter_related_entities(
+            self._get_related_instances(entity, user), user,
+        )
+
+    def _filter_related_entities(self, related_entities: 'QuerySet', user) -> 'QuerySet':
         related_entities = EntityCredentials.filter(
-            user=user,
-            queryset=self._get_related_instances(entity, user),
+            user=user, queryset=related_entities,
         )
         report = self._report_field.sub_report
 
@@ -137,11 +167,17 @@ class ReportHand:
         """Used as _get_value() method by subclasses which manage
         sub-reports (extended sub-report case).
         """
+        # NB: the QuerySet is only evaluated if the instances have not been
+        #     prefetched (but it can be used by aggregates as scope).
         related_entities = self._get_filtered_related_entities(entity, user)
+        prefetched = self._prefetched_instances.get(entity.id)
         gen_values = self._handle_report_values
 
         # "(None,)" : even if sub-scope if empty, with must generate empty columns for this line
-        return [gen_values(e, user, related_entities) for e in related_entities or (None,)]
+        return [
+            gen_values(e, user, related_entities)
+            for e in (related_entities if prefetched is None else prefetched) or (None,)
+        ]
 
     def _get_value_flattened_subreport(self,
                                        entity: CremeEntity,
@@ -151,9 +187,11 @@ class ReportHand:
         """Used as _get_value() method by subclasses which manage
         sub-reports (flattened sub-report case).
         """
-        return self._generate_flattened_report(
-            self._get_filtered_related_entities(entity, user), user, scope,
-        )
+        related_entities = self._prefetched_instances.get(entity.id)
+        if related_entities is None:
+            related_entities = self._get_filtered_related_entities(entity, user)
+
+        return self._generate_flattened_report(related_entities, user, scope)
 
     def _get_value_no_subreport(self,
                                 entity: CremeEntity,
@@ -163,13 +201,16 @@ class ReportHand:
         """Used as _get_value() method by subclasses which manage
         sub-reports (no sub-report case).
         """
-        qs = self._get_related_instances(entity, user)
         extract = self._related_model_value_extractor
+        instances = self._prefetched_instances.get(entity.id)
 
-        if issubclass(qs.model, CremeEntity):
-            qs = EntityCredentials.filter(user, qs)
+        if instances is None:
+            instances = self._get_related_instances(entity, user)
 
-        return ', '.join(str(extract(instance)) for instance in qs)
+            if issubclass(instances.model, CremeEntity):
+                instances = EntityCredentials.filter(user, instances)
+
+        return ', '.join(str(extract(instance)) for instance in instances)
 
     def _get_value_single(self,
                           entity: CremeEntity,
@@ -237,6 +278,48 @@ class ReportHand:
 
         return '' if value is None else value
 
+    def prefetch(self, entities: Sequence[CremeEntity], user) -> None:
+        """Retrieve, with grouped queries, the data needed by get_value() for
+        several entities (typically a page of the report's entities) ; the
+        values of the entities which have not been prefetched are still
+        computed with their own queries.
+        The data of the previous call are forgotten.
+        @param entities: Sequence of CremeEntities (iterated several times).
+        @param user: User instance ; used to compute credentials.
+        """
+        self._prefetched_instances = prefetched = {}
+
+        if not self._support_subreport or not entities:
+            return
+
+        related_instances = self._get_related_instances_4_entities(
+            {entity.id for entity in entities}, user,
+        )
+        if related_instances is None:
+            return
+
+        sub_report = self._report_field.sub_report
+        if sub_report:
+            related_instances = self._filter_related_entities(related_instances, user)
+        elif issubclass(related_instances.model, CremeEntity):
+            related_instances = EntityCredentials.filter(user, related_instances)
+
+        instances_per_entity = defaultdict(list)
+        annotation = self.related_entity_annotation
+        related_instances = [*related_instances]
+
+        for instance in related_instances:
+            instances_per_entity[getattr(instance, annotation)].append(instance)
+
+        for entity in entities:
+            prefetched[entity.id] = instances_per_entity[entity.id]
+
+        if sub_report:
+            # NB: the columns of the sub-report are prefetched for all the
+            #     related entities of the page at once.
+            for column in sub_report.columns:
+                column.prefetch(related_instances, user)
+
     @property
     def hidden(self) -> bool:
         "Is the hand hidden ? (see FieldsConfig or deleted CustomFields)."
@@ -376,6 +459,8 @@ class RHForeignKey(RHRegularField):
                 self._value_extractor = lambda fk_instance, user: str(fk_instance)
 
         self._qs = qs
+        # Instances retrieved by prefetch() ; key: ID of the instance.
+        self._fk_instances: Dict[int, Optional['Model']] = {}
         super().__init__(
             report_field,
             support_subreport=True,
@@ -385,8 +470,17 @@ class RHForeignKey(RHRegularField):
     # NB: cannot rename to _get_related_instances() because forbidden entities
     #     are filtered instead of outputting '??'
     def _get_fk_instance(self, entity: CremeEntity) -> Optional[CremeEntity]:
+        fk_id = getattr(entity, self._fk_attr_name)
+        if fk_id is None:
+            return None
+
+        try:
+            return self._fk_instances[fk_id]
+        except KeyError:
+            pass
+
         try:
-            rel_entity = self._qs.get(pk=getattr(entity, self._fk_attr_name))
+            rel_entity = self._qs.get(pk=fk_id)
         except ObjectDoesNotExist:
             rel_entity = None
 
@@ -410,6 +504,24 @@ class RHForeignKey(RHRegularField):
 
             return self._value_extractor(fk_instance, user)
 
+    def prefetch(self, entities, user):
+        super().prefetch(entities, user)
+
+        attr_name = self._fk_attr_name
+        fk_ids = {getattr(entity, attr_name) for entity in entities}
+        fk_ids.discard(None)
+
+        instances = self._qs.in_bulk(fk_ids) if fk_ids else {}
+        # NB: the IDs which are not found (filtered instances) are stored too.
+        self._fk_instances = {fk_id: instances.get(fk_id) for fk_id in fk_ids}
+
+        sub_report = self._report_field.sub_report
+        if sub_report and instances:
+            related_instances = [*instances.values()]
+
+            for column in sub_report.columns:
+                column.prefetch(related_instances, user)
+
     def get_linkable_ctypes(self):
         return (
             ContentType.objects.get_for_model(self._qs.model),
@@ -437,6 +549,18 @@ class RHManyToManyField(RHRegularField):
     def _get_related_instances(self, entity, user):
         return getattr(entity, self._field_info[0].name).all()
 
+    def _get_related_instances_4_entities(self, entity_ids, user):
+        m2m_field = self._field_info[0]
+        query_name = m2m_field.related_query_name()
+
+        if query_name.endswith('+'):  # Hidden reverse relation
+            return None
+
+        # NB: the annotation uses the JOIN of the filter()
+        return m2m_field.remote_field.model._default_manager.filter(
+            **{f'{query_name}__in': entity_ids}
+        ).annotate(**{self.related_entity_annotation: F(query_name)})
+
     def get_linkable_ctypes(self):
         m2m_model = self._field_info[0].remote_field.model
 
@@ -459,6 +583,10 @@ class RHCustomField(ReportHand):
 
         super().__init__(report_field, title=cf.name)
 
+    def prefetch(self, entities, user):
+        super().prefetch(entities, user)
+        CremeEntity.populate_custom_values(entities, [self._cfield])
+
     def _get_value_single_on_allowed(self, entity, user, scope):
         cvalue = entity.get_custom_value(self._cfield)
         # TODO: use a EntityCellCustomField & remove __str__ methods of CustomFieldValue models ?
@@ -498,6 +626,40 @@ class RHRelation(ReportHand):
             relations__object_entity=entity.id,
         )
 
+    def _get_related_instances_4_entities(self, entity_ids, user):
+        if not self._report_field.sub_report:
+            return None
+
+        # NB: the annotation uses the JOIN of the filter()
+        return self._related_model.objects.filter(
+            relations__type=self._rtype.symmetric_type,
+            relations__object_entity__in=entity_ids,
+        ).annotate(**{
+            self.related_entity_annotation: F('relations__object_entity'),
+        })
+
+    def prefetch(self, entities, user):
+        super().prefetch(entities, user)
+
+        if entities and not self._report_field.sub_report:
+            # NB: we fill the cache used by CremeEntity.get_related_entities()
+            #     (see _get_value_no_subreport())
+            rtype_id = self._rtype.id
+            relations = [
+                *Relation.objects.filter(
+                    subject_entity__in={entity.id for entity in entities},
+                    type=rtype_id,
+                ).select_related('object_entity').order_by('id'),
+            ]
+            Relation.populate_real_object_entities(relations)
+
+            relations_per_entity = defaultdict(list)
+            for relation in relations:
+                relations_per_entity[relation.subject_entity_id].append(relation)
+
+            for entity in entities:
+                entity._relations_map[rtype_id] = relations_per_entity[entity.id]
+
     # TODO: add a feature in base class to retrieved efficiently real entities ??
     # TODO: extract algorithm that retrieve efficiently real entity from
     #       CremeEntity.get_related_entities()
@@ -533,6 +695,10 @@ class RHFunctionField(ReportHand):
 
         super().__init__(report_field, title=str(funcfield.verbose_name))
 
+    def prefetch(self, entities, user):
+        super().prefetch(entities, user)
+        self._funcfield.populate_entities(entities, user)
+
     def _get_value_single_on_allowed(self, entity, user, scope):
         return self._funcfield(entity, user).for_csv()
 
@@ -707,6 +873,15 @@ class RHRelated(ReportHand):
     def _get_related_instances(self, entity, user):
         return getattr(entity, self._attr_name).filter(is_deleted=False)
 
+    def _get_related_instances_4_entities(self, entity_ids, user):
+        related_field = self._related_field
+        field_name = related_field.field.name
+
+        # NB: the annotation uses the JOIN of the filter()
+        return related_field.related_model._default_manager.filter(
+            is_deleted=False, **{f'{field_name}__in': entity_ids}
+        ).annotate(**{self.related_entity_annotation: F(field_name)})
+
     def get_linkable_ctypes(self):
         return (
             ContentType.objects.get_for_model(self._related_field.related_model),
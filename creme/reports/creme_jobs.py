@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+
+################################################################################
+#    Creme is a free/open-source Customer Relationship Management software
+#    Copyright (C) 2021  Hybird
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU Affero General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU Affero General Public License for more details.
+#
+#    You should have received a copy of the GNU Affero General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+################################################################################
+
+from django.contrib.auth import get_user_model
+from django.utils.translation import gettext as _
+from django.utils.translation import gettext_lazy, ngettext
+
+from creme.creme_core.creme_jobs.base import JobType
+from creme.creme_core.models import BrickHomeLocation, InstanceBrickConfigItem
+
+from .core.graph.cache import graph_results_cache
+
+
+class _GraphsResultsType(JobType):
+    id           = JobType.generate_id('reports', 'graphs_results')
+    verbose_name = gettext_lazy('Pre-compute the graphs of the home pages')
+    periodic     = JobType.PERIODIC
+
+    results_cache = graph_results_cache
+
+    def _execute(self, job):
+        from .bricks import ReportGraphBrick
+
+        results_cache = self.results_cache
+        stats = {'enabled': results_cache.enabled, 'graphs': 0, 'computed': 0}
+
+        if results_cache.enabled:
+            home_brick_ids = {
+                *BrickHomeLocation.objects.values_list('brick_id', flat=True),
+            }
+            # NB: the users with the same credentials share the results ; so
+            #     the results are computed once per group of users.
+            users = [*get_user_model().objects.filter(is_active=True, is_team=False)]
+
+            for ibci in InstanceBrickConfigItem.objects.filter(
+                brick_class_id=ReportGraphBrick.id_,
+            ).select_related('entity'):
+                if ibci.brick_id not in home_brick_ids:
+                    continue
+
+                fetcher = ReportGraphBrick(ibci).fetcher
+                if fetcher.error:
+                    continue
+
+                stats['graphs'] += 1
+                graph = fetcher.graph
+
+                for user in users:
+                    key = results_cache.build_key(graph=graph, user=user)
+
+                    if key is not None and not results_cache.has(key):
+                        # NB: the results are stored by the method fetch()
+                        fetcher.fetch(user=user)
+                        stats['computed'] += 1
+
+        job.data = {'stats': stats}
+
+    def get_description(self, job):
+        return [
+            _(
+                'Compute the results of the graphs displayed on the home '
+                'pages, & store them in the cache'
+            ),
+        ]
+
+    def get_stats(self, job):
+        stats = (job.data or {}).get('stats')
+
+        if not stats:
+            return []
+
+        if not stats['enabled']:
+            return [_('The cache of the graphs is disabled.')]
+
+        graphs = stats['graphs']
+        computed = stats['computed']
+
+        return [
+            ngettext(
+                '{count} graph has been processed.',
+                '{count} graphs have been processed.',
+                graphs
+            ).format(count=graphs),
+            ngettext(
+                '{count} result has been computed.',
+                '{count} results have been computed.',
+                computed
+            ).format(count=computed),
+        ]
+
+
+graphs_results_type = _GraphsResultsType()
+jobs = (graphs_results_type,)
@@ -43,6 +43,7 @@ from ..core.graph import (
     abscissa_constraints,
     ordinate_constraints,
 )
+from ..core.graph.cache import graph_results_cache
 from ..graph_fetcher_registry import graph_fetcher_registry
 
 if TYPE_CHECKING:
@@ -93,6 +94,7 @@ class AbstractReportGraph(CremeEntity):
     abscissa_constraints = abscissa_constraints
     ordinate_constraints = ordinate_constraints
     fetcher_registry = graph_fetcher_registry
+    results_cache = graph_results_cache
     _hand: Optional['ReportGraphHand'] = None
 
     class Meta:
@@ -192,6 +194,16 @@ class AbstractReportGraph(CremeEntity):
               order: str = 'ASC') -> Tuple[List[str], list]:
         assert order == 'ASC' or order == 'DESC'
 
+        results_cache = self.results_cache
+        cache_key = results_cache.build_key(
+            graph=self, user=user, extra_q=extra_q, order=order,
+        )
+        if cache_key is not None:
+            results = results_cache.get(cache_key)
+
+            if results is not None:
+                return results
+
         report = self.linked_report
         entities = EntityCredentials.filter(
             user=user,
@@ -201,7 +213,12 @@ class AbstractReportGraph(CremeEntity):
         if report.filter is not None:
             entities = report.filter.filter(entities)
 
-        return self.hand.fetch(entities=entities, order=order, user=user, extra_q=extra_q)
+        results = self.hand.fetch(entities=entities, order=order, user=user, extra_q=extra_q)
+
+        if cache_key is not None:
+            results_cache.set(cache_key, results)
+
+        return results
 
     # @staticmethod
     # def get_fetcher_from_instance_brick(
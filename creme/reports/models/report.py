@@ -26,6 +26,7 @@ from typing import (  # Tuple
     Iterator,
     List,
     Optional,
+    Sequence,
     Set,
     Type,
     Union,
@@ -48,6 +49,7 @@ from creme.creme_core.models import (
     FieldsConfig,
 )
 from creme.creme_core.models.fields import EntityCTypeForeignKey
+from creme.creme_core.utils.chunktools import iter_as_chunk
 
 if TYPE_CHECKING:
     from ..core.report import ReportHand
@@ -67,6 +69,10 @@ class AbstractReport(CremeEntity):
     creation_label = _('Create a report')
     save_label     = _('Save the report')
 
+    # Number of entities retrieved (& prefetched, see ReportHand.prefetch())
+    # at once when the lines are generated.
+    fetch_chunk_size = 256
+
     _columns: Optional[List['Field']] = None
 
     class Meta:
@@ -171,13 +177,33 @@ class AbstractReport(CremeEntity):
 
         fields = self.filtered_columns
 
-        for entity in entities:
-            yield [
-                field.get_value(entity, scope=entities, user=user)
-                for field in fields
-            ]
+        # NB: the entities are retrieved page by page, & the values of each
+        #     column are prefetched for the whole page.
+        for entities_page in iter_as_chunk(
+            entities.iterator(chunk_size=self.fetch_chunk_size),
+            self.fetch_chunk_size,
+        ):
+            for field in fields:
+                field.prefetch(entities_page, user=user)
+
+            for entity in entities_page:
+                yield [
+                    field.get_value(entity, scope=entities, user=user)
+                    for field in fields
+                ]
+
+    def iter_lines(self,
+                   extra_q: Optional[models.Q] = None,
+                   user=None) -> Iterator[List[str]]:
+        """Generate the lines of the report (sub-reports are expanded) ; the
+        entities are retrieved page by page, so the memory usage does not depend
+        on the number of entities (useful to stream the exported file).
+        """
+        from ..core.report import ExpandableLine  # Lazy loading
+
+        for values in self._fetch(extra_q=extra_q, user=user):
+            yield from ExpandableLine(values).get_lines()
 
-    # TODO: transform into generator (--> StreamResponse)
     def fetch_all_lines(self,
                         limit_to: Optional[int] = None,
                         extra_q: Optional[models.Q] = None,
@@ -344,6 +370,14 @@ class Field(CremeModel):
         hand = self.hand
         return hand.get_value(entity, user, scope) if hand else '??'
 
+    def prefetch(self, entities: Sequence[CremeEntity], user) -> None:
+        """Retrieve with grouped queries the data needed to compute the values
+        of several entities (see ReportHand.prefetch()).
+        """
+        hand = self.hand
+        if hand:
+            hand.prefetch(entities, user)
+
     @property
     def model(self) -> Type[CremeEntity]:
         return self.report.ct.model_class()
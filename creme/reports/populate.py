@@ -21,6 +21,7 @@
 import logging
 
 from django.apps import apps
+from django.conf import settings
 from django.utils.translation import gettext as _
 
 from creme.creme_core import bricks as core_bricks
@@ -32,11 +33,14 @@ from creme.creme_core.models import (
     BrickDetailviewLocation,
     CustomFormConfigItem,
     HeaderFilter,
+    Job,
     MenuConfigItem,
     SearchConfigItem,
 )
+from creme.creme_core.utils.date_period import date_period_registry
 
 from . import bricks, constants, custom_forms, get_report_model
+from .creme_jobs import graphs_results_type
 from .forms.report import FilteredCTypeSubCell, FilterSubCell
 from .menu import ReportsEntry
 
@@ -133,6 +137,16 @@ class Populator(BasePopulator):
         # ---------------------------
         SearchConfigItem.objects.create_if_needed(Report, ['name'])
 
+        # ---------------------------
+        Job.objects.get_or_create(
+            type_id=graphs_results_type.id,
+            defaults={
+                'language':    settings.LANGUAGE_CODE,
+                'periodicity': date_period_registry.get_period('hours', 1),
+                'status':      Job.STATUS_OK,
+            },
+        )
+
         # ---------------------------
         # TODO: move to "not already_populated" section in creme2.4
         if not MenuConfigItem.objects.filter(entry_id__startswith='reports-').exists():
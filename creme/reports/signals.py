@@ -18,9 +18,14 @@
 #    along with this program.  If not, see <http://www.gnu.org/licenses/>.
 ################################################################################
 
+from django.conf import settings
+from django.db.models import signals
 from django.dispatch import receiver
 
-from creme.creme_core.signals import pre_uninstall_flush
+from creme.creme_core.models import CremeEntity, CremeProperty, Relation
+from creme.creme_core.signals import post_replace_in_bulk, pre_uninstall_flush
+
+from .core.graph.cache import graph_results_cache
 
 
 @receiver(pre_uninstall_flush)
@@ -52,3 +57,37 @@ def _uninstall_reports(sender, content_types, verbosity, stdout_write, style, **
 
     if verbosity:
         stdout_write(' [OK]', style.SUCCESS)
+
+
+@receiver((signals.post_save, signals.post_delete))
+def _invalidate_graph_results(sender, instance, **kwargs):
+    if settings.REPORTS_GRAPH_CACHE_TIMEOUT and isinstance(instance, CremeEntity):
+        graph_results_cache.invalidate(instance.entity_type_id)
+
+
+@receiver(post_replace_in_bulk)
+def _invalidate_graph_results_4_bulk(sender, instances, **kwargs):
+    if settings.REPORTS_GRAPH_CACHE_TIMEOUT and issubclass(sender, CremeEntity) and instances:
+        graph_results_cache.invalidate(instances[0].entity_type_id)
+
+
+@receiver((signals.post_save, signals.post_delete), sender=Relation)
+def _invalidate_graph_results_4_relation(sender, instance, **kwargs):
+    if settings.REPORTS_GRAPH_CACHE_TIMEOUT:
+        try:
+            entity = instance.subject_entity
+        except CremeEntity.DoesNotExist:
+            pass
+        else:
+            graph_results_cache.invalidate(entity.entity_type_id)
+
+
+@receiver((signals.post_save, signals.post_delete), sender=CremeProperty)
+def _invalidate_graph_results_4_property(sender, instance, **kwargs):
+    if settings.REPORTS_GRAPH_CACHE_TIMEOUT:
+        try:
+            entity = instance.creme_entity
+        except CremeEntity.DoesNotExist:
+            pass
+        else:
+            graph_results_cache.invalidate(entity.entity_type_id)
@@ -174,6 +174,30 @@ class AggregatorTestCase(CremeTestCase):
         agg2 = RGAAverage(cell=EntityCellCustomField(cfield2))
         self.assertEqual(_('this custom field is deleted.'), agg2.error)
 
+    def test_reduce(self):
+        agg1 = RGACount()
+        self.assertEqual('pk', agg1.value_path)
+        self.assertEqual(3, agg1.reduce([1, 2, 3]))
+        self.assertEqual(0, agg1.reduce([]))
+
+        cell = EntityCellRegularField.build(FakeOrganisation, 'capital')
+        agg2 = RGASum(cell=cell)
+        self.assertEqual('capital', agg2.value_path)
+        self.assertEqual(60, agg2.reduce([10, None, 50]))
+        self.assertEqual(0, agg2.reduce([None]))
+
+        agg3 = RGAAverage(cell=cell)
+        self.assertEqual(30, agg3.reduce([10, None, 50]))
+        self.assertEqual(0, agg3.reduce([]))
+
+        cfield = CustomField.objects.create(
+            content_type=FakeContact, field_type=CustomField.INT, name='Hair size',
+        )
+        self.assertEqual(
+            'customfieldinteger__value',
+            RGASum(cell=EntityCellCustomField(cfield)).value_path,
+        )
+
 
 class AggregatorCellConstraintsTestCase(CremeTestCase):
     def test_count(self):
@@ -0,0 +1,204 @@
+# -*- coding: utf-8 -*-
+
+from datetime import date
+from functools import partial
+
+from django.db.models import Q
+from django.test.utils import override_settings
+from django.utils.translation import gettext as _
+from django.utils.translation import ngettext
+
+from creme.creme_core.core.deletion import FixedValueReplacer
+from creme.creme_core.creme_jobs import deletor_type
+from creme.creme_core.models import (
+    BrickHomeLocation,
+    DeletionCommand,
+    FakeOrganisation,
+    FakeSector,
+    Job,
+    Relation,
+)
+from creme.creme_core.tests.fake_constants import FAKE_REL_SUB_EMPLOYED_BY
+from creme.reports.core.graph.cache import GraphResultsCache
+from creme.reports.core.graph.fetcher import SimpleGraphFetcher
+from creme.reports.creme_jobs import graphs_results_type
+from creme.reports.tests.base import (
+    BaseReportsTestCase,
+    ReportGraph,
+    skipIfCustomReport,
+    skipIfCustomRGraph,
+)
+
+
+@skipIfCustomReport
+@skipIfCustomRGraph
+@override_settings(REPORTS_GRAPH_CACHE_TIMEOUT=60)
+class GraphResultsCacheTestCase(BaseReportsTestCase):
+    def _create_graph(self):
+        return ReportGraph.objects.create(
+            user=self.user,
+            linked_report=self._create_simple_organisations_report(),
+            name='Number of organisation created by day',
+            abscissa_cell_value='creation_date',
+            abscissa_type=ReportGraph.Group.DAY,
+            ordinate_type=ReportGraph.Aggregator.COUNT,
+        )
+
+    def test_build_key(self):
+        user = self.login()
+        graph = self._create_graph()
+        results_cache = GraphResultsCache()
+        build_key = results_cache.build_key
+
+        key1 = build_key(graph=graph, user=user)
+        self.assertIsInstance(key1, str)
+        self.assertEqual(key1, build_key(graph=graph, user=user))
+
+        key2 = build_key(graph=graph, user=user, order='DESC')
+        key3 = build_key(graph=graph, user=user, extra_q=Q(name='Bebop'))
+        self.assertEqual(3, len({key1, key2, key3}))
+
+        results_cache.set(key1, (['2021-06-01'], [1]))
+        self.assertTupleEqual((['2021-06-01'], [1]), results_cache.get(key1))
+        self.assertTrue(results_cache.has(key1))
+
+        # Invalidation
+        FakeOrganisation.objects.create(user=user, name='Bebop')
+        key4 = build_key(graph=graph, user=user)
+        self.assertNotEqual(key1, key4)
+        self.assertIsNone(results_cache.get(key4))
+
+        Relation.objects.create(
+            user=user, type_id=FAKE_REL_SUB_EMPLOYED_BY,
+            subject_entity=FakeOrganisation.objects.create(user=user, name='Red Dragons'),
+            object_entity=FakeOrganisation.objects.create(user=user, name='Swordfish'),
+        )
+        self.assertNotEqual(key4, build_key(graph=graph, user=user))
+
+    def test_build_key_invalidation_bulk_replace(self):
+        "The deletor job replaces ForeignKeys in bulk (no signal 'post_save')."
+        user = self.login()
+        graph = self._create_graph()
+
+        sector = FakeSector.objects.first()
+        sector2del = FakeSector.objects.create(title='Bounty hunting')
+        FakeOrganisation.objects.create(user=user, name='Bebop', sector=sector2del)
+
+        results_cache = GraphResultsCache()
+        key1 = results_cache.build_key(graph=graph, user=user)
+        results_cache.set(key1, (['2021-06-01'], [1]))
+
+        job = Job.objects.create(type_id=deletor_type.id, user=user)
+        DeletionCommand.objects.create(
+            job=job,
+            instance_to_delete=sector2del,
+            replacers=[
+                FixedValueReplacer(
+                    model_field=FakeOrganisation._meta.get_field('sector'),
+                    value=sector,
+                ),
+            ],
+            total_count=1,
+        )
+        self.assertFalse(deletor_type.needs_save(FakeOrganisation))
+
+        deletor_type.execute(job)
+
+        key2 = results_cache.build_key(graph=graph, user=user)
+        self.assertNotEqual(key1, key2)
+        self.assertIsNone(results_cache.get(key2))
+
+    @override_settings(REPORTS_GRAPH_CACHE_TIMEOUT=0)
+    def test_build_key_disabled(self):
+        user = self.login()
+        self.assertIsNone(GraphResultsCache().build_key(graph=self._create_graph(), user=user))
+
+    def test_fetch(self):
+        user = self.login()
+        graph = self._create_graph()
+        creation_date = date(year=2021, month=6, day=1)
+        create_orga = partial(
+            FakeOrganisation.objects.create, user=user, creation_date=creation_date,
+        )
+        create_orga(name='Bebop')
+
+        results_cache = GraphResultsCache()
+        graph.results_cache = results_cache
+
+        x1, y1 = graph.fetch(user=user)
+        self.assertEqual(1, len(x1))
+        self.assertEqual(0, results_cache.hits)
+        self.assertEqual(1, results_cache.misses)
+
+        graph = self.refresh(graph)
+        graph.results_cache = results_cache
+        graph.linked_report.filter  # NOQA (retrieve the report)
+
+        with self.assertNumQueries(0):
+            x2, y2 = graph.fetch(user=user)
+
+        self.assertListEqual(x1, x2)
+        self.assertListEqual(y1, y2)
+        self.assertEqual(1, results_cache.hits)
+
+        # Invalidation
+        create_orga(name='Swordfish')
+        x3, y3 = graph.fetch(user=user)
+        self.assertEqual(2, results_cache.misses)
+        self.assertEqual(2, y3[0][0])
+
+    def test_job(self):
+        user = self.login()
+        graph = self._create_graph()
+        FakeOrganisation.objects.create(
+            user=user, name='Bebop', creation_date=date(year=2021, month=6, day=1),
+        )
+
+        # NB: the populate script puts some graphs on the home page
+        BrickHomeLocation.objects.all().delete()
+
+        ibci = SimpleGraphFetcher(graph=graph).create_brick_config_item()
+        BrickHomeLocation.objects.create(brick_id=ibci.brick_id, order=1)
+
+        job = self.get_object_or_fail(Job, type_id=graphs_results_type.id)
+        graphs_results_type.execute(job)
+
+        self.assertTrue(
+            graphs_results_type.results_cache.has(
+                graphs_results_type.results_cache.build_key(graph=graph, user=user),
+            )
+        )
+
+        job = self.refresh(job)
+        self.assertEqual(1, job.data['stats']['graphs'])
+        self.assertGreaterEqual(job.data['stats']['computed'], 1)
+        self.assertListEqual(
+            [
+                ngettext(
+                    '{count} graph has been processed.',
+                    '{count} graphs have been processed.',
+                    1
+                ).format(count=1),
+                ngettext(
+                    '{count} result has been computed.',
+                    '{count} results have been computed.',
+                    job.data['stats']['computed']
+                ).format(count=job.data['stats']['computed']),
+            ],
+            graphs_results_type.get_stats(job),
+        )
+
+        # Already computed
+        graphs_results_type.execute(job)
+        self.assertEqual(0, self.refresh(job).data['stats']['computed'])
+
+    @override_settings(REPORTS_GRAPH_CACHE_TIMEOUT=0)
+    def test_job_disabled(self):
+        self.login()
+        job = self.get_object_or_fail(Job, type_id=graphs_results_type.id)
+        graphs_results_type.execute(job)
+
+        self.assertListEqual(
+            [_('The cache of the graphs is disabled.')],
+            graphs_results_type.get_stats(self.refresh(job)),
+        )
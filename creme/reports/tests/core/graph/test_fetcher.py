@@ -1,5 +1,7 @@
 # -*- coding: utf-8 -*-
 
+from functools import partial
+
 from django.utils.translation import gettext as _
 from django.utils.translation import pgettext
 
@@ -9,6 +11,8 @@ from creme.creme_core.models import (
     FakeOrganisation,
     FieldsConfig,
     InstanceBrickConfigItem,
+    Relation,
+    RelationType,
 )
 from creme.creme_core.tests.base import CremeTestCase
 from creme.creme_core.tests.fake_constants import (
@@ -32,6 +36,7 @@ from creme.reports.constants import (
 )
 # from creme.reports.constants import AbscissaGroup
 from creme.reports.core.graph.fetcher import (
+    GraphFetcher,
     RegularFieldLinkedGraphFetcher,
     RelationLinkedGraphFetcher,
     SimpleGraphFetcher,
@@ -241,6 +246,62 @@ class GraphFetcherTestCase(CremeTestCase):
         self.assertIsNone(brick.errors)
         self.assertListEqual([FakeOrganisation], brick.target_ctypes)
 
+    def test_fetch_4_entity_in_bulk(self):
+        user = self.create_user()
+        report = Report.objects.create(user=user, name='Field Test', ct=FakeContact)
+        graph = ReportGraph.objects.create(
+            user=user, name='Field Test', linked_report=report,
+            abscissa_cell_value='created', abscissa_type=AbscissaGroup.YEAR,
+            ordinate_type=OrdinateAggregator.COUNT,
+        )
+        sponsored_rtype = RelationType.objects.smart_update_or_create(
+            ('reports-subject_sponsored', 'is sponsored by', [FakeContact]),
+            ('reports-object_sponsored',  'sponsors',        [FakeOrganisation]),
+        )[0]
+
+        create_contact = partial(FakeContact.objects.create, user=user)
+        sonsaku = create_contact(first_name='Sonsaku', last_name='Hakufu')
+        create_contact(first_name='Ryomou', last_name='Shimei')
+
+        nanyo = FakeOrganisation.objects.create(user=user, name='Nanyô')
+        Relation.objects.create(
+            user=user, type_id=FAKE_REL_SUB_EMPLOYED_BY,
+            subject_entity=sonsaku, object_entity=nanyo,
+        )
+
+        fetchers = [
+            RelationLinkedGraphFetcher(graph=graph, value=FAKE_REL_SUB_EMPLOYED_BY),
+            RelationLinkedGraphFetcher(graph=graph, value=sponsored_rtype.id),
+            RelationLinkedGraphFetcher(graph=graph, value='invalid'),
+            RegularFieldLinkedGraphFetcher(graph=graph, value='image'),
+        ]
+        expected = [
+            fetcher.fetch_4_entity(entity=nanyo, user=user) for fetcher in fetchers
+        ]
+
+        results = GraphFetcher.fetch_4_entity_in_bulk(
+            fetchers=fetchers, entity=nanyo, user=user,
+        )
+        self.assertListEqual(expected, results)
+        self.assertListEqual([str(sonsaku.created.year)], results[0][0])
+        self.assertEqual(1, results[0][1][0][0])
+        self.assertTupleEqual(([], []), results[1])
+        self.assertIs(False, fetchers[1]._linked_entities_exist[nanyo.id])
+
+        # The results are stored in the per-request cache
+        with self.assertNumQueries(0):
+            cached_results = GraphFetcher.fetch_4_entity_in_bulk(
+                fetchers=fetchers, entity=nanyo, user=user,
+            )
+
+        self.assertListEqual(results, cached_results)
+
+        # Other order => not in the cache
+        desc_results = GraphFetcher.fetch_4_entity_in_bulk(
+            fetchers=fetchers[:1], entity=nanyo, user=user, order='DESC',
+        )
+        self.assertListEqual(results[:1], desc_results)
+
     def test_create_brick_config_item(self):
         "Other brick class."
         class OtherReportGraphBrick(ReportGraphBrick):
@@ -1591,6 +1591,54 @@ class ReportGraphTestCase(BrickTestCaseMixin,
         self.assertListEqual([150, fmt('2013-06-26', '2013-07-05')], y_desc[0])
         self.assertListEqual([300, fmt('2013-06-16', '2013-06-25')], y_desc[1])
 
+    def test_fetch_with_date_range03(self):
+        "Buckets computed in Python (DB vendors without the SQL optimization)."
+        user = self.login()
+        report = self._create_simple_organisations_report()
+
+        create_orga = partial(FakeOrganisation.objects.create, user=user)
+        create_orga(name='Orga1', creation_date='2013-06-01', capital=100)
+        create_orga(name='Orga2', creation_date='2013-06-05', capital=200)
+        create_orga(name='Orga3', creation_date='2013-06-20', capital=150)
+        create_orga(name='Orga4', creation_date='2013-07-01')
+        create_orga(name='Orga5', creation_date='2013-07-03', capital=1000, is_deleted=True)
+        create_orga(name='Orga6', creation_date='2014-06-03', capital=300)
+
+        for aggregator, cell_key in [
+            (ReportGraph.Aggregator.COUNT, ''),
+            (ReportGraph.Aggregator.AVG, 'regular_field-capital'),
+            (ReportGraph.Aggregator.SUM, 'regular_field-capital'),
+            (ReportGraph.Aggregator.MIN, 'regular_field-capital'),
+            (ReportGraph.Aggregator.MAX, 'regular_field-capital'),
+        ]:
+            rgraph = ReportGraph.objects.create(
+                user=user, linked_report=report,
+                name=f'Capital by creation date ({aggregator})',
+                abscissa_cell_value='creation_date',
+                abscissa_type=ReportGraph.Group.RANGE, abscissa_parameter='7',
+                ordinate_type=aggregator,
+                ordinate_cell_key=cell_key,
+            )
+            hand = rgraph.hand
+
+            for order in ('ASC', 'DESC'):
+                hand._fetch_method = hand._fetch_with_group_by
+                x_expected, y_expected = rgraph.fetch(user=user, order=order)
+
+                hand._fetch_method = hand._fetch_fallback
+                x_fallback, y_fallback = rgraph.fetch(user=user, order=order)
+                self.assertListEqual(x_expected, x_fallback)
+                self.assertListEqual(y_expected, y_fallback)
+
+        # Only one query, whatever the number of buckets
+        self.assertEqual(53, len(x_fallback))
+
+        with self.assertNumQueries(1):
+            hand.fetch(
+                entities=FakeOrganisation.objects.filter(is_deleted=False),
+                order='ASC', user=user,
+            )
+
     def test_fetch_with_asymmetrical_date_range01(self):
         "Count, where the ASC values are different from the DESC ones."
         user = self.login()
@@ -1805,6 +1853,62 @@ class ReportGraphTestCase(BrickTestCaseMixin,
         self.assertListEqual([], x_asc)
         self.assertListEqual([], y_asc)
 
+    def test_fetch_with_custom_date_range03(self):
+        "Buckets computed in Python (DB vendors without the SQL optimization)."
+        user = self.login()
+
+        create_cf = partial(
+            CustomField.objects.create,
+            content_type=self.ct_orga,
+            field_type=CustomField.DATETIME,
+        )
+        cf = create_cf(name='First victory')
+        cf2 = create_cf(name='First defeat')
+
+        create_orga = partial(FakeOrganisation.objects.create, user=user)
+        targaryens = create_orga(name='House Targaryen', capital=100)
+        lannisters = create_orga(name='House Lannister', capital=1000)
+        starks     = create_orga(name='House Stark')
+        baratheons = create_orga(name='House Baratheon', capital=500)
+
+        create_cf_value = partial(cf.value_class.objects.create, custom_field=cf)
+        create_dt = partial(self.create_datetime, utc=True)
+        create_cf_value(entity=targaryens, value=create_dt(year=2013, month=12, day=21))
+        create_cf_value(entity=lannisters, value=create_dt(year=2013, month=12, day=26))
+        create_cf_value(entity=starks,     value=create_dt(year=2014, month=1,  day=3))
+        create_cf_value(entity=baratheons, value=create_dt(year=2014, month=3,  day=7))
+
+        create_cf_value(
+            custom_field=cf2, entity=starks, value=create_dt(year=2014, month=1, day=6),
+        )
+
+        report = self._create_simple_organisations_report()
+
+        for aggregator, cell_key in [
+            (ReportGraph.Aggregator.COUNT, ''),
+            (ReportGraph.Aggregator.SUM, 'regular_field-capital'),
+        ]:
+            rgraph = ReportGraph.objects.create(
+                user=user, linked_report=report,
+                name=f'First victory / 5 days ({aggregator})',
+                abscissa_cell_value=cf.id,
+                abscissa_type=ReportGraph.Group.CUSTOM_RANGE, abscissa_parameter='5',
+                ordinate_type=aggregator,
+                ordinate_cell_key=cell_key,
+            )
+            hand = rgraph.hand
+
+            for order in ('ASC', 'DESC'):
+                hand._fetch_method = hand._fetch_with_group_by
+                x_expected, y_expected = rgraph.fetch(user=user, order=order)
+
+                hand._fetch_method = hand._fetch_fallback
+                x_fallback, y_fallback = rgraph.fetch(user=user, order=order)
+                self.assertListEqual(x_expected, x_fallback)
+                self.assertListEqual(y_expected, y_fallback)
+
+        self.assertEqual(100, y_fallback[-1][0])
+
     def test_fetch_by_day(self):
         "Aggregate."
         user = self.login()
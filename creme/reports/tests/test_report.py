@@ -6,6 +6,8 @@ from functools import partial
 
 from django.conf import settings
 from django.contrib.contenttypes.models import ContentType
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from django.utils.encoding import smart_str
 from django.utils.formats import date_format, number_format
@@ -1182,7 +1184,7 @@ class ReportTestCase(BaseReportsTestCase):
             '"{}","{}","{}","{}"\r\n'.format(
                 _('Name'), _('Owner user'), rt.predicate, _('Properties'),
             ),
-            response.content.decode(),
+            b''.join(response.streaming_content).decode(),
         )
 
     def test_report_csv02(self):
@@ -1196,7 +1198,7 @@ class ReportTestCase(BaseReportsTestCase):
             self._build_export_url(report), data={'doc_type': 'csv'},
         )
 
-        content = (s for s in response.content.decode().split('\r\n') if s)
+        content = (s for s in b''.join(response.streaming_content).decode().split('\r\n') if s)
         self.assertEqual(
             smart_str('"{}","{}","{}","{}"'.format(
                 _('Last name'), _('Owner user'), _('owns'), _('Properties'),
@@ -1229,7 +1231,7 @@ class ReportTestCase(BaseReportsTestCase):
             },
         )
 
-        content = [s for s in response.content.decode().split('\r\n') if s]
+        content = [s for s in b''.join(response.streaming_content).decode().split('\r\n') if s]
         self.assertEqual(3, len(content))
 
         self.assertEqual(f'"Ayanami","{user}","","Kawaii"', content[1])
@@ -1255,7 +1257,7 @@ class ReportTestCase(BaseReportsTestCase):
             },
         )
 
-        content = [s for s in response.content.decode().split('\r\n') if s]
+        content = [s for s in b''.join(response.streaming_content).decode().split('\r\n') if s]
         self.assertEqual(2, len(content))
         self.assertEqual(f'"Baby","{user}","",""', content[1])
 
@@ -1306,7 +1308,7 @@ class ReportTestCase(BaseReportsTestCase):
 
         response = self.assertGET200(self._build_export_url(report), data={'doc_type': 'csv'})
 
-        content = (s for s in response.content.decode().split('\r\n') if s)
+        content = (s for s in b''.join(response.streaming_content).decode().split('\r\n') if s)
         self.assertEqual(smart_str('"{}"'.format(_('Last name'))), next(content))
 
         self.assertEqual('"Ayanami"',   next(content))
@@ -1329,7 +1331,7 @@ class ReportTestCase(BaseReportsTestCase):
 
         response = self.assertGET200(self._build_export_url(report), data={'doc_type': 'csv'})
 
-        content = (s for s in response.content.decode().split('\r\n') if s)
+        content = (s for s in b''.join(response.streaming_content).decode().split('\r\n') if s)
         self.assertEqual(smart_str('"{}"'.format(_('Last name'))), next(content))
 
         self.assertEqual('"Ayanami"',   next(content))
@@ -3222,6 +3224,106 @@ class ReportTestCase(BaseReportsTestCase):
             report_orga.fetch_all_lines(),
         )
 
+    def _build_nested_subreports(self):
+        "Organisations => employed Contacts => owned Documents (expanded)."
+        report_orga = self.report_orga
+        create_field = partial(Field.objects.create, type=RFT_RELATION, selected=True)
+        create_field(
+            report=report_orga, name=FAKE_REL_OBJ_EMPLOYED_BY, order=2,
+            sub_report=self.report_contact,
+        )
+        create_field(
+            report=self.report_contact, name=REL_SUB_HAS, order=3,
+            sub_report=self._create_simple_documents_report(),
+        )
+
+        return report_orga
+
+    def test_fetch_relation_06(self):
+        "Nested sub-reports: the number of queries does not depend on the number of entities."
+        user = self.login()
+        self._aux_test_fetch_persons()
+        report_orga = self._build_nested_subreports()
+
+        folder = FakeReportsFolder.objects.create(user=user, title='Archives')
+        create_doc = partial(FakeReportsDocument.objects.create, user=user, linked_folder=folder)
+        create_rel = partial(Relation.objects.create, user=user)
+        create_rel(
+            subject_entity=self.ned, type_id=REL_SUB_HAS, object_entity=create_doc(title='Ice'),
+        )
+
+        report_orga.fetch_all_lines()  # Fill the caches (ContentTypes...)
+
+        with CaptureQueriesContext(connection) as ctxt1:
+            lines1 = report_orga.fetch_all_lines()
+
+        self.assertEqual(3, len(lines1))
+
+        greyjoys = FakeOrganisation.objects.create(user=user, name='House Greyjoy')
+        create_contact = partial(FakeContact.objects.create, user=user, last_name='Greyjoy')
+
+        for first_name in ('Theon', 'Yara', 'Balon'):
+            contact = create_contact(first_name=first_name)
+            create_rel(
+                subject_entity=greyjoys, type_id=FAKE_REL_OBJ_EMPLOYED_BY, object_entity=contact,
+            )
+            create_rel(
+                subject_entity=contact, type_id=REL_SUB_HAS,
+                object_entity=create_doc(title=f'Ship of {first_name}'),
+            )
+
+        with CaptureQueriesContext(connection) as ctxt2:
+            lines2 = report_orga.fetch_all_lines()
+
+        self.assertEqual(6, len(lines2))
+        self.assertIn(['House Greyjoy', 'Greyjoy', 'Yara', 'Ship of Yara', ''], lines2)
+        self.assertEqual(len(ctxt1), len(ctxt2))
+
+    def bench_export_nested_subreports(self):
+        """Little benchmark of the export of a report with 2 levels of
+        sub-reports (expanded) on a big data-set ; it displays the duration &
+        the number of queries.
+        """
+        import time
+
+        user = self.login()
+        self._aux_test_fetch_persons(create_contacts=False)
+        report_orga = self._build_nested_subreports()
+
+        entities_count = 50000
+        folder = FakeReportsFolder.objects.create(user=user, title='Archives')
+
+        create_orga = partial(FakeOrganisation.objects.create, user=user)
+        create_contact = partial(FakeContact.objects.create, user=user, last_name='Member')
+        create_doc = partial(FakeReportsDocument.objects.create, user=user, linked_folder=folder)
+        create_rel = partial(Relation.objects.create, user=user)
+
+        for i in range(entities_count):
+            orga = create_orga(name=f'House #{i}')
+            contact = create_contact(first_name=f'#{i}')
+            create_rel(
+                subject_entity=orga, type_id=FAKE_REL_OBJ_EMPLOYED_BY, object_entity=contact,
+            )
+            create_rel(
+                subject_entity=contact, type_id=REL_SUB_HAS,
+                object_entity=create_doc(title=f'Document #{i}'),
+            )
+
+        start = time.perf_counter()
+
+        with CaptureQueriesContext(connection) as ctxt:
+            response = self.assertGET200(
+                self._build_export_url(report_orga), data={'doc_type': 'csv'},
+            )
+            lines_count = sum(
+                chunk.count(b'\r\n') for chunk in response.streaming_content
+            )
+
+        print(
+            f'Export of {lines_count} lines: {time.perf_counter() - start}s '
+            f'({len(ctxt)} queries)'
+        )
+
     def _aux_test_fetch_aggregate(self, invalid_ones=False):
         user = self.login()
         self._aux_test_fetch_persons(create_contacts=False, report_4_contact=False)
@@ -147,15 +147,26 @@ class Export(generic.base.EntityRelatedMixin, generic.CheckedView):
         if writer is None:
             raise ConflictError('Unknown extension')
 
-        writerow = writer.writerow
+        rows = self.iter_rows(report=report, extra_q=q_filter, user=user)
 
-        writerow([
-            smart_str(column.title) for column in report.get_children_fields_flat()
-        ])
+        if writer.streamable:
+            return writer.stream(rows, smart_str(report.name))
 
-        for line in report.fetch_all_lines(extra_q=q_filter, user=user):
-            writerow([smart_str(value) for value in line])
+        for row in rows:
+            writer.writerow(row)
 
         writer.save(smart_str(report.name), user)
 
         return writer.response
+
+    def iter_rows(self, *, report, extra_q, user):
+        """Generate the rows of the exported file (the header is included) ;
+        the lines of the report are generated page by page, so the whole file
+        does not have to be kept in memory.
+        """
+        yield [
+            smart_str(column.title) for column in report.get_children_fields_flat()
+        ]
+
+        for line in report.iter_lines(extra_q=extra_q, user=user):
+            yield [smart_str(value) for value in line]
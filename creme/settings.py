@@ -74,6 +74,22 @@ DEFAULT_AUTO_FIELD = 'django.db.models.AutoField'
 # - the paginator only allows to go to the next & the previous pages (& the main query is faster).
 FAST_QUERY_MODE_THRESHOLD = 100000
 
+# Number of seconds during which the number of entities displayed by a list-view
+# is cached (so it is not counted again when the user changes the page or the
+# ordering) ; 0 means that the numbers are not cached.
+# The cache is invalidated when entities of the type are saved/deleted, or when
+# their relationships/properties are changed ; the other changes (credentials...)
+# are taken into account when the cached value expires.
+# The cache "default" of Django is used (see the setting 'CACHES') ; if you run
+# several processes, use a shared backend (memcached...) to share the invalidations.
+LISTVIEW_COUNT_CACHE_TIMEOUT = 0
+
+# When a list-view is not filtered & the user is a super-user, the number of
+# entities can be estimated with the statistics of the DBMS (PostgreSQL & MySQL only)
+# instead of being counted. The estimation is used when it is greater than this
+# value (& than 'FAST_QUERY_MODE_THRESHOLD') ; 'None' means "never estimate".
+LISTVIEW_ESTIMATED_COUNT_THRESHOLD = None
+
 # JOBS #########################################################################
 # Maximum number of not finished jobs each user can have at the same time.
 #  When this number is reached for a user, he must wait one of his
@@ -93,6 +109,19 @@ MAX_JOBS_PER_USER = 2
 # periodicity can be precisely managed).
 MAX_USER_JOBS = 5
 
+# Number of worker processes used by the job scheduler to run the jobs.
+#  - 0 (default) means that each job is run in its own new process ; so the
+#    Python interpreter is started & Django is set up for each job.
+#  - N > 0 means that the jobs are run by a pool of N processes, which are
+#    re-used (Django is set up once per process) ; it reduces a lot the
+#    starting time of the jobs. Notice that it limits the number of jobs
+#    (system jobs included) which can run at the same time (the other jobs
+#    wait for a free worker).
+# Hint: the metrics of the job scheduler (waiting time & running time of the
+#       jobs...) can be displayed with "python manage.py creme_job_manager --metrics"
+#       (the cache "default" of Django must be shared, see the setting 'CACHES').
+JOB_WORKERS_POOL_SIZE = 0
+
 # 'security' period for pseudo-periodic jobs : they will be run at least with
 # this periodicity, even if they do not receive a new request (in order to reduce
 # the effects of an hypothetical redis problem).
@@ -477,6 +506,31 @@ EXPORT_BACKENDS = [
     'creme.creme_core.backends.xls_export.XLSExportBackend',
 ]
 
+# Mass export (from the list-views): when the number of exported entities is
+# greater than this value, the export is done by a job (the file can be
+# downloaded from the job's page when the job is finished) instead of being
+# built during the request.
+# <None> means that the export is always built during the request.
+MASS_EXPORT_JOB_THRESHOLD = 10000
+
+# Search (global search & quick search): by default, the configured fields are
+# searched with "LIKE" queries, which scan all the entities tables.
+# A search-index backend can be used instead ; it keeps an index of the
+# searched contents up to date (it's updated when the entities are saved).
+# The fields which reference other instances (e.g. "sector__title") are not
+# indexed, & are still searched with "LIKE" queries.
+# Available backends:
+#   - 'creme.creme_core.core.search_index.PythonSearchIndexBackend'
+#     (works with all DBMS, but the index is searched with LIKE queries too)
+#   - 'creme.creme_core.core.search_index.SQLiteFTS5SearchIndexBackend'
+#   - 'creme.creme_core.core.search_index.PostgreSQLSearchIndexBackend'
+# Notice that words are searched as prefixes of the indexed words with the
+# full-text backends (SQLite & PostgreSQL).
+# After setting this value (or after modifying the search configuration), run
+# the command "python creme/manage.py creme_search_index" to (re-)build the index.
+# <None> means that no index is used.
+SEARCH_INDEX_BACKEND = None
+
 # EMAILS [internal] ############################################################
 
 # Emails sent to the users of Creme
@@ -1182,6 +1236,16 @@ REPORTS_GRAPH_MODEL  = 'reports.ReportGraph'
 REPORTS_REPORT_FORCE_NOT_CUSTOM = False
 REPORTS_GRAPH_FORCE_NOT_CUSTOM  = False
 
+# Number of seconds during which the results of the graphs (displayed by the
+# bricks & the detail-views) are cached ; 0 means that they are not cached.
+# The results are shared by the users with the same credentials. The cache is
+# invalidated when the entities of the type are saved/deleted, or when their
+# relationships/properties are changed ; the other changes are taken into
+# account when the cached results expire.
+# The job "Pre-compute the graphs of the home pages" fills the cache periodically.
+# The cache "default" of Django is used (see the setting 'CACHES').
+REPORTS_GRAPH_CACHE_TIMEOUT = 0
+
 # ACTIVITIES -------------------------------------------------------------------
 ACTIVITIES_ACTIVITY_MODEL = 'activities.Activity'
 ACTIVITIES_ACTIVITY_FORCE_NOT_CUSTOM = False
@@ -1194,6 +1258,14 @@ ACTIVITIES_ACTIVITY_FORCE_NOT_CUSTOM = False
 #       creates the "missing" calendars for the existing users.
 ACTIVITIES_DEFAULT_CALENDAR_IS_PUBLIC = True
 
+# Number of seconds during which the activities displayed by the calendar view
+# are cached (per user, set of calendars & period) ; 0 means that they are not cached.
+# The cache is invalidated when the activities or the calendars are modified ;
+# the other changes (credentials, types of activity...) are taken into account
+# when the cached data expire.
+# The cache "default" of Django is used (see the setting 'CACHES').
+ACTIVITIES_CALENDAR_CACHE_TIMEOUT = 0
+
 # GRAPHS -----------------------------------------------------------------------
 GRAPHS_GRAPH_MODEL = 'graphs.Graph'
 GRAPHS_GRAPH_FORCE_NOT_CUSTOM = False
@@ -1279,9 +1351,13 @@ EMAILCAMPAIGN_PASSWORD  = ''
 EMAILCAMPAIGN_PORT      = 25
 EMAILCAMPAIGN_USE_TLS   = True
 
-# Emails are sent by chunks, and sleep between 2 chunks.
-EMAILCAMPAIGN_SIZE = 40
-EMAILCAMPAIGN_SLEEP_TIME = 2
+# Emails are sent in parallel by several SMTP connections (one per thread).
+EMAILCAMPAIGN_CONNECTIONS = 1
+# Maximum number of emails sent per second (by all the connections), in order
+# to avoid the emails to be classed as spam ; 'None' means "no limit".
+EMAILCAMPAIGN_RATE_LIMIT = 20
+# Number of emails which are loaded (& then marked as sent) at once.
+EMAILCAMPAIGN_CHUNK_SIZE = 256
 
 # SMS --------------------------------------------------------------------------
 SMS_CAMPAIGN_MODEL = 'sms.SMSCampaign'
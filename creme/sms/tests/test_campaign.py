@@ -8,8 +8,11 @@ from django.utils.translation import gettext as _
 from creme.creme_core.auth.entity_credentials import EntityCredentials
 from creme.creme_core.models import SetCredentials
 from creme.creme_core.tests.base import CremeTestCase
+from creme.persons.tests.base import skipIfCustomContact
+from creme.sms.models import Recipient
 
 from .base import (
+    Contact,
     MessagingList,
     SMSCampaign,
     skipIfCustomMessagingList,
@@ -195,3 +198,36 @@ class SMSCampaignTestCase(CremeTestCase):
             self._build_remove_list(campaign),
             follow=True, data={'id': mlist.id},
         )
+
+    @skipIfCustomContact
+    @skipIfCustomMessagingList
+    def test_all_phone_numbers(self):
+        user = self.login()
+
+        create_ml = partial(MessagingList.objects.create, user=user)
+        mlist1 = create_ml(name='List #1')
+        mlist2 = create_ml(name='List #2')
+        mlist3 = create_ml(name='List #3', is_deleted=True)
+
+        camp = SMSCampaign.objects.create(user=user, name='Camp #1')
+        camp.lists.set([mlist1, mlist2, mlist3])
+
+        create_contact = partial(Contact.objects.create, user=user)
+        spike = create_contact(first_name='Spike', last_name='Spiegel', mobile='0601')
+        jet   = create_contact(first_name='Jet',   last_name='Black',   mobile='0602')
+        faye  = create_contact(
+            first_name='Faye', last_name='Valentine', mobile='0603', is_deleted=True,
+        )
+        ed    = create_contact(first_name='Ed', last_name='Wong', mobile='0604')
+
+        mlist1.contacts.set([spike, jet, faye])
+        mlist2.contacts.set([spike])
+        mlist3.contacts.set([ed])
+
+        create_recipient = Recipient.objects.create
+        create_recipient(messaging_list=mlist1, phone='0611')
+        create_recipient(messaging_list=mlist2, phone='0611')
+        create_recipient(messaging_list=mlist2, phone='0602')
+        create_recipient(messaging_list=mlist3, phone='0612')
+
+        self.assertCountEqual(['0601', '0602', '0611'], [*camp.all_phone_numbers()])
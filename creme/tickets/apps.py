@@ -36,6 +36,8 @@ class TicketsConfig(CremeAppConfig):
         self.TicketTemplate = get_tickettemplate_model()
         super().all_apps_ready()
 
+        from . import signals  # NOQA
+
     def register_entity_models(self, creme_registry):
         creme_registry.register_entity_models(self.Ticket)
 
@@ -80,6 +80,10 @@ class AbstractTicket(TicketMixin):
     creation_label = _('Create a ticket')
     save_label     = _('Save the ticket')
 
+    # The ForeignKeys can be replaced in bulk by the deletion jobs ; the
+    # closing date is managed by a signal handler (see tickets.signals).
+    replacement_needs_save = False
+
     class Meta:
         abstract = True
         # manager_inheritance_from_future = True
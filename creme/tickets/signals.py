@@ -0,0 +1,39 @@
+# -*- coding: utf-8 -*-
+
+################################################################################
+#    Creme is a free/open-source Customer Relationship Management software
+#    Copyright (C) 2021  Hybird
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU Affero General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU Affero General Public License for more details.
+#
+#    You should have received a copy of the GNU Affero General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+################################################################################
+
+from django.dispatch import receiver
+from django.utils.timezone import now
+
+from creme.creme_core.signals import post_replace_in_bulk
+
+from . import get_ticket_model
+
+Ticket = get_ticket_model()
+
+
+# NB: same logic than Ticket.save() for the statuses replaced in bulk.
+@receiver(post_replace_in_bulk, sender=Ticket)
+def _set_closing_date(sender, instances, model_field, **kwargs):
+    if model_field.name == 'status':
+        Ticket.objects.filter(
+            id__in=[instance.id for instance in instances],
+            status__is_closed=True,
+            closing_date=None,
+        ).update(closing_date=now())
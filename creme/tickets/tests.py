@@ -11,6 +11,7 @@ from django.urls import reverse
 from django.utils.timezone import now
 
 from creme.creme_core.core.function_field import function_field_registry
+from creme.creme_core.creme_jobs import deletor_type
 from creme.creme_core.models import HeaderFilter, RelationType
 from creme.creme_core.templatetags.creme_date import timedelta_pprint
 from creme.creme_core.tests.base import CremeTestCase
@@ -460,7 +461,53 @@ class TicketTestCase(CremeTestCase, MassImportBaseTestCaseMixin):
         ticket = self.assertStillExists(ticket)
         self.assertEqual(status2, ticket.status)
 
-    def test_delete_priority(self):
+    def test_delete_status02(self):
+        "Replaced by a closed status (in bulk) => closing date is set."
+        user = self.login()
+
+        self.assertFalse(deletor_type.needs_save(Ticket))
+
+        status = Status.objects.create(name='Delete me please')
+        closed = self.get_object_or_fail(Status, pk=CLOSED_PK)
+
+        create_ticket = partial(
+            Ticket.objects.create,
+            user=user,
+            description='description',
+            priority=Priority.objects.all()[0],
+            criticity=Criticity.objects.all()[0],
+        )
+        ticket1 = create_ticket(title='Ticket #1', status=status)
+        ticket2 = create_ticket(title='Ticket #2', status=status)
+        self.assertIsNone(ticket1.closing_date)
+
+        closing_date2 = self.create_datetime(year=2020, month=3, day=12)
+        Ticket.objects.filter(id=ticket2.id).update(closing_date=closing_date2)
+
+        response = self.client.post(
+            reverse(
+                'creme_config__delete_instance',
+                args=('tickets', 'status', status.id),
+            ),
+            data={
+                'replace_tickets__ticket_status':         closed.id,
+                'replace_tickets__tickettemplate_status': closed.id,
+            },
+        )
+        self.assertNoFormError(response)
+
+        job = self.get_deletion_command_or_fail(Status).job
+        job.type.execute(job)
+        self.assertDoesNotExist(status)
+
+        ticket1 = self.assertStillExists(ticket1)
+        self.assertEqual(closed, ticket1.status)
+        self.assertDatetimesAlmostEqual(now(), ticket1.closing_date)
+
+        ticket2 = self.refresh(ticket2)
+        self.assertEqual(closed, ticket2.status)
+        self.assertEqual(closing_date2, ticket2.closing_date)
+
         user = self.login()
 
         priority2 = Priority.objects.first()
@@ -1,12 +1,16 @@
+import json
 import logging
 import os
 import shutil
 from collections import OrderedDict, defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from time import perf_counter
 from urllib.parse import quote
 
 # from django.utils.http import urlquote
 from . import utils  # settings
 from .settings import (
+    GENERATED_MEDIA_BUILD_FILE,
     GENERATED_MEDIA_DIR,
     GENERATED_MEDIA_NAMES_FILE,
     MEDIA_GENERATORS,
@@ -18,40 +22,233 @@ global_errors = defaultdict(OrderedDict)
 # logger = logging.getLogger(__name__)
 logger = logging.getLogger('mediagenerator')
 
+# Version of the data stored in GENERATED_MEDIA_BUILD_FILE (the fingerprints &
+# the outputs of the tasks, in order to skip the unchanged tasks in the
+# incremental mode).
+BUILD_INFO_VERSION = 1
 
-def generate_media():
-    if os.path.exists(GENERATED_MEDIA_DIR):
-        shutil.rmtree(GENERATED_MEDIA_DIR)
+
+def _load_build_info(path):
+    try:
+        with open(path, 'r') as fp:
+            build_info = json.load(fp)
+    except (OSError, ValueError):
+        return {}
+
+    if build_info.get('version') != BUILD_INFO_VERSION:
+        return {}
+
+    return build_info.get('tasks', {})
+
+
+def _init_worker(names):
+    # With the "spawn" start method, the workers do not inherit the set-up
+    # of Django & the names of the files generated before the bundles.
+    from django import setup
+    from django.apps import apps
+
+    if not apps.ready:
+        setup()
+
+    utils.NAMES = names
+
+
+def _generate_task(backend_name, task):
+    """Generate the content of a task (in a worker process).
+    @return A tuple (outputs, errors, duration), where outputs is a list of
+            tuples (key, url, content).
+    """
+    start = perf_counter()
+    global_errors.clear()
+
+    backend = load_backend(backend_name)()
+    outputs = [*backend.get_task_output(task)]
+
+    return (
+        outputs,
+        {category: dict(errors) for category, errors in global_errors.items()},
+        perf_counter() - start,
+    )
+
+
+def _write_file(media_dir, url, content):
+    path = os.path.join(media_dir, url)
+
+    parent = os.path.dirname(path)
+    if not os.path.exists(parent):
+        os.makedirs(parent)
+
+    if isinstance(content, str):
+        content = content.encode('utf8')
+
+    with open(path, 'wb') as fp:
+        fp.write(content)
+
+
+def _write_task_outputs(backend, build_dir, outputs):
+    "@return The list of the generated files, as pairs [key, url]."
+    files = []
+
+    for key, url, content in outputs:
+        version = backend.generate_version(key, url, content)
+        if version:
+            base, ext = os.path.splitext(url)
+            url = f'{base}-{version}{ext}'
+
+        _write_file(build_dir, url, content)
+
+        # utils.NAMES[key] = urlquote(url)
+        utils.NAMES[key] = quote(url)
+        files.append([key, url])
+
+    return files
+
+
+def _reuse_task_outputs(build_dir, files):
+    """Copy the files of a task from the previous generation.
+    @return False if a file is missing (the task must be generated again).
+    """
+    for key, url in files:
+        if not os.path.isfile(os.path.join(GENERATED_MEDIA_DIR, url)):
+            return False
+
+    for key, url in files:
+        path = os.path.join(build_dir, url)
+
+        parent = os.path.dirname(path)
+        if not os.path.exists(parent):
+            os.makedirs(parent)
+
+        shutil.copy2(os.path.join(GENERATED_MEDIA_DIR, url), path)
+        utils.NAMES[key] = quote(url)
+
+    return True
+
+
+def _generate_in_directory(build_dir, incremental, workers):
+    """@return A dictionary with the fingerprints & the files of the tasks
+               (empty if the mode is not incremental).
+    """
+    previous_tasks = _load_build_info(GENERATED_MEDIA_BUILD_FILE) if incremental else {}
+    build_tasks = {}
+    start = perf_counter()
 
     utils.NAMES = {}
 
     for backend_name in MEDIA_GENERATORS:
         backend = load_backend(backend_name)()
+        pending = []
+
+        for task in backend.get_tasks():
+            task_id = f'{backend_name}|{json.dumps(task)}'
+            # NB: the fingerprints are only computed (& stored) in incremental mode.
+            fingerprint = backend.get_task_fingerprint(task) if incremental else None
+            label = backend.get_task_label(task)
+
+            if fingerprint is not None:
+                previous = previous_tasks.get(task_id)
+
+                if (
+                    previous
+                    and previous['fingerprint'] == fingerprint
+                    and _reuse_task_outputs(build_dir, previous['files'])
+                ):
+                    print(f'Unchanged: {label}')
+                    build_tasks[task_id] = previous
+                    continue
+
+            pending.append((task, task_id, fingerprint, label))
 
-        for key, url, content in backend.get_output():
-            version = backend.generate_version(key, url, content)
-            if version:
-                base, ext = os.path.splitext(url)
-                url = f'{base}-{version}{ext}'
+        def register(task_id, fingerprint, label, outputs, duration):
+            files = _write_task_outputs(backend, build_dir, outputs)
+            print(f'Generated: {label} [{duration:.2f}s]')
 
-            path = os.path.join(GENERATED_MEDIA_DIR, url)
+            if fingerprint is not None:
+                build_tasks[task_id] = {'fingerprint': fingerprint, 'files': files}
 
-            parent = os.path.dirname(path)
-            if not os.path.exists(parent):
-                os.makedirs(parent)
+        if workers != 1 and len(pending) > 1:
+            # NB: the names of the files generated by the previous backends
+            #     are needed by the workers (e.g. CSS URLs rewriting).
+            with ProcessPoolExecutor(
+                max_workers=workers or None,
+                initializer=_init_worker,
+                initargs=(dict(utils.NAMES),),
+            ) as executor:
+                futures = [
+                    (task_id, fingerprint, label,
+                     executor.submit(_generate_task, backend_name, task))
+                    for task, task_id, fingerprint, label in pending
+                ]
 
-            if isinstance(content, str):
-                content = content.encode('utf8')
+                # NB: the results are registered in the order of the tasks,
+                #     so the generated names do not depend on the scheduling.
+                for task_id, fingerprint, label, future in futures:
+                    outputs, errors, duration = future.result()
 
-            with open(path, 'wb') as fp:
-                fp.write(content)
+                    for category, category_errors in errors.items():
+                        global_errors[category].update(category_errors)
 
-            # utils.NAMES[key] = urlquote(url)
-            utils.NAMES[key] = quote(url)
+                    register(task_id, fingerprint, label, outputs, duration)
+        else:
+            for task, task_id, fingerprint, label in pending:
+                task_start = perf_counter()
+                outputs = [*backend.get_task_output(task)]
+                register(task_id, fingerprint, label, outputs, perf_counter() - task_start)
+
+    print(f'Media generated in {perf_counter() - start:.2f}s')
+
+    return build_tasks
+
+
+def generate_media(incremental=False, workers=1):
+    """Generate the media files in GENERATED_MEDIA_DIR.
+
+    The files are generated in a temporary directory which replaces the
+    previous one at the end ; so a failed generation keeps the previous files.
+
+    @param incremental: If True, the tasks (e.g. bundles) whose inputs (source
+           files & configuration of the filters) have not changed since the
+           previous generation are not generated again (their files are copied).
+    @param workers: Number of processes which generate the tasks of a backend
+           (e.g. the bundles & their variations) ; 0 means the number of CPUs.
+    """
+    build_dir = f'{GENERATED_MEDIA_DIR}.tmp-{os.getpid()}'
+    if os.path.exists(build_dir):
+        shutil.rmtree(build_dir)
+
+    os.makedirs(build_dir)
+
+    try:
+        build_tasks = _generate_in_directory(
+            build_dir, incremental=incremental, workers=workers,
+        )
+    except BaseException:
+        shutil.rmtree(build_dir, ignore_errors=True)
+        raise
+
+    # Replace the previous directory
+    if os.path.exists(GENERATED_MEDIA_DIR):
+        old_dir = f'{GENERATED_MEDIA_DIR}.old-{os.getpid()}'
+        os.rename(GENERATED_MEDIA_DIR, old_dir)
+        os.rename(build_dir, GENERATED_MEDIA_DIR)
+        shutil.rmtree(old_dir)
+    else:
+        os.rename(build_dir, GENERATED_MEDIA_DIR)
 
     # Generate a module with media file name mappings
-    with open(GENERATED_MEDIA_NAMES_FILE, 'w') as fp:
+    tmp_names_file = f'{GENERATED_MEDIA_NAMES_FILE}.tmp'
+    with open(tmp_names_file, 'w') as fp:
         fp.write('NAMES = %r' % utils.NAMES)
+    os.replace(tmp_names_file, GENERATED_MEDIA_NAMES_FILE)
+
+    if incremental:
+        tmp_build_file = f'{GENERATED_MEDIA_BUILD_FILE}.tmp'
+        with open(tmp_build_file, 'w') as fp:
+            json.dump({'version': BUILD_INFO_VERSION, 'tasks': build_tasks}, fp)
+        os.replace(tmp_build_file, GENERATED_MEDIA_BUILD_FILE)
+    elif os.path.exists(GENERATED_MEDIA_BUILD_FILE):
+        # NB: the stored fingerprints do not correspond to the new files.
+        os.remove(GENERATED_MEDIA_BUILD_FILE)
 
     for category, errors in global_errors.items():
         for error in errors.values():
@@ -19,6 +19,41 @@ class Generator:
         for key, url, hash in self.get_dev_output_names():
             yield key, url, self.get_dev_output(url)[0]
 
+    def get_tasks(self):
+        """
+        Yields the independent units of work of the production mode ; they
+        must be picklable, because they can be processed by other processes
+        (see get_task_output()).
+
+        By default, there is only one task (None) which generates all the
+        content.
+        """
+        yield None
+
+    def get_task_label(self, task):
+        """
+        Returns a human readable name for the task (used in the reports).
+        """
+        return type(self).__name__
+
+    def get_task_fingerprint(self, task):
+        """
+        Returns a string which changes when the content generated by the task
+        changes, or None if the content must always be generated (default).
+
+        It's used by the incremental generation to skip the unchanged tasks.
+        """
+        return None
+
+    def get_task_output(self, task):
+        """
+        Generates content for production mode for one task (see get_tasks()).
+
+        Yields tuples of the form:
+        key, url, content
+        """
+        yield from self.get_output()
+
     def get_dev_output(self, name):
         """
         Generates content for dev mode.
@@ -1,13 +1,15 @@
 from base64 import b64encode
+from hashlib import sha1
 from mimetypes import guess_type
 import os
 import posixpath
 import re
 
 from django.conf import settings
+from django.utils.encoding import smart_bytes
 
 from mediagenerator.generators.bundles.base import Filter, FileFilter
-from mediagenerator.utils import media_url, prepare_patterns, find_file
+from mediagenerator.utils import media_url, prepare_patterns, find_file, get_media_mapping
 from ..api import global_errors
 
 url_re = re.compile(r'url\s*\(["\']?([\w\.][^:]*?)["\']?\)', re.UNICODE)
@@ -82,6 +84,16 @@ class CSSURL(Filter):
             f'CSSURL only supports CSS output. '
             f'The parent filter expects "{self.filetype}".')
 
+    def get_fingerprint(self, variation):
+        # The URLs are rewritten with the names of the generated files
+        fingerprint = sha1(smart_bytes(super().get_fingerprint(variation)))
+        fingerprint.update(smart_bytes(repr(sorted(get_media_mapping().items()))))
+        fingerprint.update(smart_bytes(repr((
+            REWRITE_CSS_URLS, GENERATE_DATA_URIS, MAX_DATA_URI_FILE_SIZE,
+        ))))
+
+        return fingerprint.hexdigest()
+
     def get_output(self, variation):
         rewriter = URLRewriter()
         for input in self.get_input(variation):
@@ -3,7 +3,7 @@ from hashlib import sha1
 from django.apps import apps
 from django.conf import settings
 from django.http import HttpRequest
-from django.utils.encoding import smart_str
+from django.utils.encoding import smart_bytes
 from django.utils import translation
 from django.views.i18n import JavaScriptCatalog  # javascript_catalog
 
@@ -40,7 +40,7 @@ class I18N(Filter):
     def get_dev_output_names(self, variation):
         language = variation['language']
         content = self._generate(language)
-        hash = sha1(smart_str(content)).hexdigest()
+        hash = sha1(smart_bytes(content)).hexdigest()
         yield language, hash
 
     def _generate(self, language):
@@ -5,7 +5,7 @@ import sys
 import re
 from subprocess import Popen, PIPE
 
-from django.utils.encoding import smart_str
+from django.utils.encoding import smart_bytes
 from django.conf import settings
 
 from mediagenerator.generators.bundles.base import Filter
@@ -144,7 +144,7 @@ class Less(Filter):
 
         main_module_path = self._find_file(self.main_module)
         self._compiled = self._compile(main_module_path, debug=debug)
-        self._compiled_hash = sha1(smart_str(self._compiled)).hexdigest()
+        self._compiled_hash = sha1(smart_bytes(self._compiled)).hexdigest()
 
     def _compile(self, path, debug=False):
         try:
@@ -1,7 +1,7 @@
 from hashlib import sha1
 from json import dumps
 
-from django.utils.encoding import smart_str
+from django.utils.encoding import smart_bytes
 
 from mediagenerator.generators.bundles.base import Filter
 from mediagenerator.utils import get_media_url_mapping
@@ -43,7 +43,7 @@ class MediaURL(Filter):
 
     def get_dev_output_names(self, variation):
         content = self._compile()
-        hash = sha1(smart_str(content)).hexdigest()
+        hash = sha1(smart_bytes(content)).hexdigest()
         yield '.media_url.js', hash
 
     def _compile(self):
@@ -1,7 +1,7 @@
 import os
 from hashlib import sha1
 
-from django.utils.encoding import smart_str
+from django.utils.encoding import smart_bytes, smart_str
 
 from mediagenerator.utils import find_file, load_backend, read_text_file
 
@@ -69,6 +69,37 @@ class Filter:
             for name, hash in filter.get_dev_output_names(variation):
                 yield f'{index}/{name}', hash
 
+    def get_fingerprint(self, variation):
+        """
+        Returns a hash of everything the output for the given variation depends
+        on: the configuration of the filter & its input (the fingerprints of
+        the input filters, or the hashes of the dev output if the filter does
+        not take input).
+
+        It's used to skip the generation of the unchanged bundles.
+        """
+        fingerprint = sha1(smart_bytes(self._get_config_signature()))
+        fingerprint.update(smart_bytes(repr(sorted(variation.items()))))
+
+        if self.takes_input:
+            for filter in self.get_input_filters():
+                fingerprint.update(smart_bytes(filter.get_fingerprint(variation)))
+        else:
+            for name, hash in self.get_dev_output_names(variation):
+                fingerprint.update(smart_bytes(f'{name}:{hash}'))
+
+        return fingerprint.hexdigest()
+
+    def _get_config_signature(self):
+        # NB: the input filters have their own fingerprints
+        config = sorted(
+            (key, repr(value)) for key, value in vars(self).items()
+            if not key.startswith('_') and key != 'input'
+        )
+        cls = type(self)
+
+        return f'{cls.__module__}.{cls.__qualname__}{config!r}'
+
     def get_input(self, variation):
         """Yields contents for each input item."""
         for filter in self.get_input_filters():
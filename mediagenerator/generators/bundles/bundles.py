@@ -10,26 +10,49 @@ from mediagenerator.base import Generator
 
 class Bundles(Generator):
     def get_output(self):
+        for task in self.get_tasks():
+            yield from self.get_task_output(task)
+
+    def get_tasks(self):
+        # One task per bundle & combination of variations
         for items in MEDIA_BUNDLES:
             bundle = items[0]
             backend = _load_root_filter(bundle)
             variations = backend._get_variations_with_input()
             if not variations:
-                name, content = self.generate_file(backend, bundle, {})
-                yield _get_key(bundle), name, content
+                yield bundle, ()
             else:
                 # Generate media files for all variation combinations
                 combinations = product(*(variations[key]
                                          for key in sorted(variations.keys())))
                 for combination in combinations:
-                    variation_map = [*zip(sorted(variations.keys()), combination)]
-                    variation = dict(variation_map)
-                    name, content = self.generate_file(backend, bundle,
-                                                       variation, combination)
+                    yield bundle, combination
+
+    def get_task_label(self, task):
+        bundle, combination = task
+        variation = dict(self._get_variation_map(bundle, combination))
+
+        return f'{bundle} with variation {variation !r}'
+
+    def get_task_fingerprint(self, task):
+        bundle, combination = task
+        variation = dict(self._get_variation_map(bundle, combination))
 
-                    key = _get_key(bundle, variation_map)
+        return _load_root_filter(bundle).get_fingerprint(variation)
 
-                    yield key, name, content
+    def get_task_output(self, task):
+        bundle, combination = task
+        backend = _load_root_filter(bundle)
+        variation_map = self._get_variation_map(bundle, combination)
+        name, content = self.generate_file(backend, bundle,
+                                           dict(variation_map), combination)
+
+        yield _get_key(bundle, variation_map), name, content
+
+    def _get_variation_map(self, bundle, combination):
+        variations = _load_root_filter(bundle)._get_variations_with_input()
+
+        return [*zip(sorted(variations.keys()), combination)]
 
     def get_dev_output(self, name):
         bundle_combination, path = name.split('|', 1)
@@ -65,8 +88,6 @@ class Bundles(Generator):
                         yield _get_key(bundle, variation_map), url, hash
 
     def generate_file(self, backend, bundle, variation, combination=()):
-        print(f'Generating {bundle} with variation {variation !r}')
-
         output = [*backend.get_output(variation)]
         if len(output) == 0:
             output = ('',)
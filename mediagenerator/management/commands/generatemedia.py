@@ -9,5 +9,23 @@ class Command(BaseCommand):
     # requires_system_checks = False
     requires_system_checks = []
 
+    def add_arguments(self, parser):
+        add_argument = parser.add_argument
+        add_argument(
+            '-i', '--incremental',
+            action='store_true', dest='incremental', default=False,
+            help='Do not generate again the bundles which have not changed '
+                 'since the previous generation [default: %(default)s]',
+        )
+        add_argument(
+            '-w', '--workers',
+            type=int, dest='workers', default=1,
+            help='Number of processes which generate the bundles '
+                 '(0 means the number of CPUs) [default: %(default)s]',
+        )
+
     def handle(self, **options):
-        generate_media()
+        generate_media(
+            incremental=options['incremental'],
+            workers=options['workers'],
+        )
@@ -22,6 +22,14 @@ GENERATED_MEDIA_NAMES_FILE = os_path.abspath(
     getattr(settings, 'GENERATED_MEDIA_NAMES_FILE', _map_file_path)
 )
 
+# File which stores the fingerprints of the generated bundles (option
+# "--incremental" of the command "generatemedia") ; NB: it must not be in
+# GENERATED_MEDIA_DIR, which is served publicly.
+GENERATED_MEDIA_BUILD_FILE = os_path.abspath(getattr(
+    settings, 'GENERATED_MEDIA_BUILD_FILE',
+    os_path.join(os_path.dirname(GENERATED_MEDIA_NAMES_FILE), '.mediagenerator-build.json'),
+))
+
 PRODUCTION_MEDIA_URL = getattr(
     settings, 'PRODUCTION_MEDIA_URL',
     getattr(settings, 'STATIC_URL', settings.MEDIA_URL)